@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from src.utils.config_loader import load_settings
+from src.utils.llm_cache import cache_enabled, get_llm_cache
+from src.utils.llm_client_batch import BatchItem, LLMClientBatch
+
+from .build_batch_input import BatchInput, build_batch_input, DEFAULT_MAX_REQUESTS_PER_FILE
+from .download_batch_results import download_batch_results
+from .poll_batch_job import poll_batch_job
+from .submit_batch_job import load_job_records, save_job_records, submit_batch_job
+from .unpack_batch_results import unpack_batch_results
+
+logger = logging.getLogger("batch")
+
+DEFAULT_WORK_DIR = "data/batch"
+
+STAGES = ("stage2_6", "review", "stage2_8_claims")
+
+
+@dataclass
+class BatchRunSummary:
+    submitted: int = 0
+    stored: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)
+
+
+def _batch_settings() -> Dict[str, Any]:
+    return load_settings().get("batch", {}) or {}
+
+
+# -------------------------------------------------
+# Core: items → batch jobs → LLM cache
+# -------------------------------------------------
+
+def run_batch(
+    items: List[BatchItem],
+    *,
+    name: str,
+    client: LLMClientBatch | None = None,
+    work_dir: Path | None = None,
+    sleep: Callable[[float], None] | None = None,
+) -> BatchRunSummary:
+    """
+    Send items through the Batch API and store every accepted result in
+    the LLM response cache under its realtime cache key.
+
+    Stage runners then apply the results with all their usual
+    validation simply by running: each batched call is a cache hit, and
+    anything the batch could not answer falls through to realtime.
+
+    Job ids are recorded under <work_dir>/jobs/<name>.json; re-running
+    with the same inputs resumes polling instead of resubmitting.
+    """
+    if not cache_enabled():
+        raise RuntimeError("Batch mode needs the LLM cache (cache.enabled / LLM_CACHE_DISABLE)")
+
+    cfg = _batch_settings()
+    work_dir = Path(work_dir or cfg.get("work_dir", DEFAULT_WORK_DIR))
+    client = client or LLMClientBatch()
+    cache = get_llm_cache()
+
+    inputs = build_batch_input(
+        items,
+        out_dir=work_dir / "inputs",
+        name=name,
+        max_requests_per_file=int(cfg.get("max_requests_per_file", DEFAULT_MAX_REQUESTS_PER_FILE)),
+    )
+
+    records_path = work_dir / "jobs" / f"{name}.json"
+    records = load_job_records(records_path)
+    summary = BatchRunSummary()
+
+    poll_kwargs: Dict[str, Any] = {
+        "poll_interval_s": float(cfg.get("poll_interval_seconds", 30)),
+        "max_poll_interval_s": float(cfg.get("max_poll_interval_seconds", 600)),
+        "max_wait_s": float(cfg.get("max_wait_hours", 26)) * 3600,
+    }
+    if sleep is not None:
+        poll_kwargs["sleep"] = sleep
+
+    max_in_flight = max(1, int(cfg.get("max_jobs_in_flight", 3)))
+
+    for start in range(0, len(inputs), max_in_flight):
+        wave: List[BatchInput] = inputs[start : start + max_in_flight]
+
+        # ---- submit (or resume) every job of the wave
+        wave_records = []
+        for batch_input in wave:
+            sha = batch_input.sha256
+            record = records.get(sha)
+            if record is None or record.get("status") in ("failed", "expired", "cancelled"):
+                record = submit_batch_job(
+                    batch_input,
+                    client=client,
+                    metadata={"pipeline": name},
+                )
+                records[sha] = record
+                save_job_records(records_path, records)
+                summary.submitted += len(batch_input.items)
+            else:
+                logger.info(f"[BATCH] resuming batch_id={record['batch_id']} for {batch_input.path.name}")
+            wave_records.append((batch_input, record))
+
+        # ---- wait, download, unpack
+        for batch_input, record in wave_records:
+            batch = poll_batch_job(record["batch_id"], client=client, **poll_kwargs)
+            record["status"] = batch.get("status")
+
+            output_path, error_path = download_batch_results(
+                batch,
+                client=client,
+                out_dir=work_dir / "results",
+            )
+
+            unpacked = unpack_batch_results(
+                items=batch_input.items,
+                endpoint=batch_input.endpoint,
+                output_path=output_path,
+                error_path=error_path,
+                cache=cache,
+            )
+            record["unpacked"] = True
+            save_job_records(records_path, records)
+
+            summary.stored += unpacked.stored
+            summary.failed.update(unpacked.failed)
+
+    return summary
+
+
+# -------------------------------------------------
+# Stage adapters
+# -------------------------------------------------
+
+def _load_json(path: Path) -> Dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _file_tag(*paths: Path) -> str:
+    h = hashlib.sha256()
+    for p in paths:
+        h.update(p.read_bytes())
+    return h.hexdigest()[:12]
+
+
+def collect_items(stage: str, in_path: Path, extra_path: Path | None = None) -> List[BatchItem]:
+    if stage == "stage2_6":
+        from src.stage2_6.runner import collect_batch_items
+        return collect_batch_items(_load_json(in_path))
+
+    if stage == "review":
+        from src.stage2_review_suggestions.run_stage2_review import collect_batch_items
+        return collect_batch_items(_load_json(in_path))
+
+    if stage == "stage2_8_claims":
+        from src.stage2_8.run_stage2_8 import collect_claims_batch_items
+        return collect_claims_batch_items(
+            module_json=_load_json(in_path),
+            sentence_annotations=_load_json(extra_path) if extra_path else None,
+        )
+
+    raise ValueError(f"Unknown batch stage: {stage}")
+
+
+def apply_stage(stage: str, in_path: Path, out_path: Path | None) -> None:
+    """
+    Run the normal stage over the seeded cache (batched calls are hits).
+    """
+    if stage == "stage2_6":
+        from src.stage2_6.runner import main as stage2_6_main
+        stage2_6_main(["stage2_6", str(in_path), str(out_path)])
+
+    elif stage == "review":
+        from src.stage2_review_suggestions.run_stage2_review import run_review
+        run_review(in_path, out_path)
+        print(f"✅ Review suggestions written to: {out_path}")
+
+    elif stage == "stage2_8_claims":
+        # Only Pass 1 is batched; the rest of Stage 2.8 runs via stage2_8_main.
+        print("✅ Stage 2.8 Pass 1 results cached — run src.stage2_8.stage2_8_main next")
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Run a stage's LLM calls through the OpenAI Batch API (50% cheaper, async)"
+    )
+    parser.add_argument("stage", choices=STAGES)
+    parser.add_argument("input", type=Path, help="Stage input module JSON")
+    parser.add_argument(
+        "output",
+        type=Path,
+        nargs="?",
+        help="Stage output (stage2_6 / review) or Stage 2.6 annotations (stage2_8_claims)",
+    )
+    parser.add_argument("--no-apply", action="store_true", help="Only fill the cache; do not run the stage")
+    args = parser.parse_args(argv)
+
+    if args.stage in ("stage2_6", "review") and args.output is None:
+        parser.error(f"{args.stage} needs an output path")
+
+    if not args.input.exists():
+        print(f"❌ Input not found: {args.input}")
+        return 2
+
+    extra = args.output if args.stage == "stage2_8_claims" else None
+    items = collect_items(args.stage, args.input, extra)
+
+    tag_paths = [args.input] + ([extra] if extra else [])
+    summary = run_batch(items, name=f"{args.stage}_{_file_tag(*tag_paths)}")
+
+    print(
+        f"✅ Batch {args.stage}: {len(items)} requests, {summary.submitted} submitted, "
+        f"{summary.stored} results cached, {len(summary.failed)} left for realtime"
+    )
+
+    if not args.no_apply:
+        apply_stage(args.stage, args.input, args.output)
+
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(main(sys.argv[1:]))
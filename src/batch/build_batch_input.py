@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from src.utils.llm_cache import get_llm_cache, is_cacheable
+from src.utils.llm_client_batch import BatchItem
+from src.utils.llm_gateway import openai_request_body, request_cache_key
+
+logger = logging.getLogger("batch")
+
+DEFAULT_MAX_REQUESTS_PER_FILE = 50000
+
+
+@dataclass
+class BatchInput:
+    """One JSONL input file = one Batch API job (single endpoint)."""
+    path: Path
+    endpoint: str
+    items: Dict[str, BatchItem] = field(default_factory=dict)   # custom_id -> item
+
+    @property
+    def sha256(self) -> str:
+        return hashlib.sha256(self.path.read_bytes()).hexdigest()
+
+
+def item_cache_key(item: BatchItem) -> str:
+    return request_cache_key(
+        item.request,
+        required_keys=set(item.required_keys) if item.required_keys else None,
+    )
+
+
+def build_batch_input(
+    items: Iterable[BatchItem],
+    *,
+    out_dir: Path,
+    name: str,
+    max_requests_per_file: int = DEFAULT_MAX_REQUESTS_PER_FILE,
+    skip_cached: bool = True,
+) -> List[BatchInput]:
+    """
+    Write Batch API JSONL input files for the given items.
+
+    - requests already answered by the LLM cache are skipped
+    - identical requests (same cache key) are sent once
+    - non-OpenAI or non-deterministic requests are left to the realtime path
+    - one file per endpoint, split at max_requests_per_file
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cache = get_llm_cache()
+
+    seen_ids: set[str] = set()
+    seen_keys: set[str] = set()
+    by_endpoint: Dict[str, List[tuple[BatchItem, dict]]] = {}
+    skipped_cached = 0
+
+    for item in items:
+        if item.custom_id in seen_ids:
+            raise ValueError(f"Duplicate batch custom_id: {item.custom_id}")
+        seen_ids.add(item.custom_id)
+
+        if item.request.provider != "openai":
+            logger.warning(f"[BATCH] {item.custom_id}: provider {item.request.provider} not batched")
+            continue
+
+        if not is_cacheable(item.request.temperature):
+            logger.warning(f"[BATCH] {item.custom_id}: temperature above cache limit — not batched")
+            continue
+
+        key = item_cache_key(item)
+        if key in seen_keys:
+            continue
+        seen_keys.add(key)
+
+        if skip_cached and cache.get(key) is not None:
+            skipped_cached += 1
+            continue
+
+        endpoint, body = openai_request_body(item.request)
+        by_endpoint.setdefault(endpoint, []).append((item, body))
+
+    inputs: List[BatchInput] = []
+
+    for endpoint, entries in sorted(by_endpoint.items()):
+        slug = endpoint.strip("/").replace("/", "_")
+        for n, start in enumerate(range(0, len(entries), max_requests_per_file)):
+            chunk = entries[start : start + max_requests_per_file]
+            path = out_dir / f"{name}__{slug}__{n:03d}.jsonl"
+
+            with path.open("w", encoding="utf-8") as f:
+                for item, body in chunk:
+                    f.write(json.dumps(
+                        {
+                            "custom_id": item.custom_id,
+                            "method": "POST",
+                            "url": endpoint,
+                            "body": body,
+                        },
+                        ensure_ascii=False,
+                        sort_keys=True,
+                    ) + "\n")
+
+            inputs.append(BatchInput(
+                path=path,
+                endpoint=endpoint,
+                items={item.custom_id: item for item, _ in chunk},
+            ))
+
+    logger.info(
+        f"[BATCH] {name}: {sum(len(i.items) for i in inputs)} requests in "
+        f"{len(inputs)} file(s), {skipped_cached} already cached"
+    )
+    return inputs
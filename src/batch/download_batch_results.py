@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from src.utils.llm_client_batch import LLMClientBatch
+
+logger = logging.getLogger("batch")
+
+
+def download_batch_results(
+    batch: Dict[str, Any],
+    *,
+    client: LLMClientBatch,
+    out_dir: Path,
+) -> Tuple[Optional[Path], Optional[Path]]:
+    """
+    Download a finished batch's output and error files.
+
+    Expired / cancelled batches may still carry partial output;
+    whatever exists is downloaded. Returns (output_path, error_path).
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    batch_id = batch["id"]
+
+    paths = []
+    for field, suffix in (("output_file_id", "output"), ("error_file_id", "errors")):
+        file_id = batch.get(field)
+        if not file_id:
+            paths.append(None)
+            continue
+
+        path = out_dir / f"{batch_id}_{suffix}.jsonl"
+        path.write_text(client.download_file(file_id), encoding="utf-8")
+        logger.info(f"[BATCH] downloaded {suffix} for {batch_id} → {path}")
+        paths.append(path)
+
+    return paths[0], paths[1]
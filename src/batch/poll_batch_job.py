@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Callable, Dict
+
+from src.utils.llm_client_batch import LLMClientBatch
+
+logger = logging.getLogger("batch")
+
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def poll_batch_job(
+    batch_id: str,
+    *,
+    client: LLMClientBatch,
+    poll_interval_s: float = 30.0,
+    max_poll_interval_s: float = 600.0,
+    backoff: float = 1.5,
+    max_wait_s: float | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Dict[str, Any]:
+    """
+    Poll a batch until it reaches a terminal status.
+
+    The interval grows by `backoff` each poll (capped at
+    max_poll_interval_s); batches take minutes to hours, so there is no
+    point polling a 24h job every 30 seconds.
+    Raises TimeoutError once max_wait_s has elapsed.
+    """
+    started = time.monotonic()
+    interval = poll_interval_s
+
+    while True:
+        batch = client.retrieve_batch(batch_id)
+        status = batch.get("status")
+        counts = batch.get("request_counts") or {}
+
+        logger.info(
+            f"[BATCH] {batch_id}: status={status} "
+            f"completed={counts.get('completed', 0)} failed={counts.get('failed', 0)} "
+            f"total={counts.get('total', 0)}"
+        )
+
+        if status in TERMINAL_STATUSES:
+            return batch
+
+        if max_wait_s is not None and time.monotonic() - started > max_wait_s:
+            raise TimeoutError(f"Batch {batch_id} not finished after {max_wait_s:.0f}s (status={status})")
+
+        sleep(interval)
+        interval = min(max_poll_interval_s, interval * backoff)
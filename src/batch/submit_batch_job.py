@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict
+
+from src.utils.llm_client_batch import LLMClientBatch
+
+from .build_batch_input import BatchInput
+
+logger = logging.getLogger("batch")
+
+
+def submit_batch_job(
+    batch_input: BatchInput,
+    *,
+    client: LLMClientBatch,
+    metadata: Dict[str, str] | None = None,
+) -> Dict[str, Any]:
+    """
+    Upload one JSONL input file and create its batch.
+    Returns the job record persisted by the pipeline for resuming.
+    """
+    input_file_id = client.upload_input(batch_input.path)
+    batch = client.create_batch(
+        input_file_id=input_file_id,
+        endpoint=batch_input.endpoint,
+        metadata=metadata,
+    )
+
+    logger.info(
+        f"[BATCH] submitted {batch_input.path.name} → batch_id={batch['id']} "
+        f"({len(batch_input.items)} requests)"
+    )
+
+    return {
+        "input_path": str(batch_input.path),
+        "input_sha256": batch_input.sha256,
+        "endpoint": batch_input.endpoint,
+        "input_file_id": input_file_id,
+        "batch_id": batch["id"],
+        "status": batch.get("status"),
+        "unpacked": False,
+    }
+
+
+# -------------------------------------------------
+# Job records (resume a pipeline after a restart)
+# -------------------------------------------------
+
+def load_job_records(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Records keyed by input_sha256."""
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_job_records(path: Path, records: Dict[str, Dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(records, indent=2), encoding="utf-8")
+    tmp.replace(path)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from src.utils.llm_cache import LLMResponseCache
+from src.utils.llm_client_batch import BatchItem, response_text_from_body, usage_from_body
+from src.utils.llm_gateway import parse_json_output
+from src.utils.token_logger import log_usage
+
+from .build_batch_input import item_cache_key
+
+logger = logging.getLogger("batch")
+
+
+@dataclass
+class UnpackSummary:
+    stored: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)   # custom_id -> reason
+
+
+def _iter_lines(path: Optional[Path]) -> Iterable[dict]:
+    if path is None or not path.exists():
+        return
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def unpack_batch_results(
+    *,
+    items: Dict[str, BatchItem],
+    endpoint: str,
+    output_path: Optional[Path],
+    error_path: Optional[Path],
+    cache: LLMResponseCache,
+) -> UnpackSummary:
+    """
+    Map batch results back to their requests by custom_id.
+
+    Each result goes through the same JSON policy as a realtime call
+    (extraction, required keys, validate hook). Accepted results are
+    stored under the realtime cache key, so the stage runner picks them
+    up as cache hits. Rejected or missing results are reported and left
+    for the realtime path.
+    """
+    summary = UnpackSummary()
+    answered: set[str] = set()
+
+    for row in _iter_lines(output_path):
+        custom_id = row.get("custom_id")
+        item = items.get(custom_id)
+        if item is None:
+            logger.warning(f"[BATCH] unknown custom_id in output: {custom_id}")
+            continue
+        answered.add(custom_id)
+
+        response = row.get("response") or {}
+        if row.get("error") or response.get("status_code") != 200:
+            summary.failed[custom_id] = f"status={response.get('status_code')} error={row.get('error')}"
+            continue
+
+        body = response.get("body") or {}
+        prompt_tokens, completion_tokens = usage_from_body(endpoint, body)
+        log_usage(
+            model=item.request.model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            provider=item.request.provider,
+            stage_tag=item.request.stage_tag,
+        )
+
+        try:
+            data = parse_json_output(
+                response_text_from_body(endpoint, body),
+                required_keys=set(item.required_keys) if item.required_keys else None,
+                validate=item.validate,
+                schema=item.request.response_schema,
+            )
+        except (ValueError, AssertionError) as e:
+            summary.failed[custom_id] = f"rejected: {e}"
+            continue
+
+        cache.put(
+            item_cache_key(item),
+            data,
+            provider=item.request.provider,
+            model=item.request.model,
+        )
+        summary.stored += 1
+
+    for row in _iter_lines(error_path):
+        custom_id = row.get("custom_id")
+        if custom_id in items and custom_id not in answered:
+            answered.add(custom_id)
+            summary.failed[custom_id] = f"error={row.get('error') or (row.get('response') or {}).get('body')}"
+
+    for custom_id in items:
+        if custom_id not in answered:
+            summary.failed[custom_id] = "no result"
+
+    if summary.failed:
+        logger.warning(
+            f"[BATCH] {len(summary.failed)} request(s) without usable result — "
+            "they will run in realtime: " + ", ".join(sorted(summary.failed)[:10])
+        )
+
+    return summary
@@ -0,0 +1,176 @@
+"""
+Run the stage graph, re-running only stages whose inputs, code, prompts or
+model changed since their outputs were written (see stage_graph.py).
+
+    python -m src.pipeline.run_dag                    # everything that is stale
+    python -m src.pipeline.run_dag stage3B            # stage3B and what it needs
+    python -m src.pipeline.run_dag --dry-run          # show the plan only
+    python -m src.pipeline.run_dag --force stage2_9   # re-run even if fresh
+
+Stages are checked again right before they run, so when a re-run upstream
+stage writes byte-identical outputs its consumers are skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+from .stage_graph import (
+    STAGES,
+    StageNode,
+    check_stage,
+    current_fingerprint,
+    topo_order,
+    upstream_of,
+    write_manifests,
+)
+from ..utils.config_loader import load_settings
+
+
+@dataclass
+class StageRun:
+    name: str
+    status: str  # fresh | ran | failed | blocked | stale (dry run)
+    reasons: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+def run_command(root: Path, node: StageNode) -> None:
+    """Run the stage CLI from the project root; raises on a non-zero exit."""
+    subprocess.run([sys.executable, "-m", node.module, *node.args], cwd=root, check=True)
+
+
+def run_graph(
+    root: Path,
+    *,
+    stages: Sequence[StageNode] = STAGES,
+    targets: Optional[Sequence[str]] = None,
+    force: Sequence[str] = (),
+    dry_run: bool = False,
+    runner: Callable[[Path, StageNode], None] = run_command,
+) -> List[StageRun]:
+    """
+    Bring `targets` (default: every stage) up to date, in dependency order.
+    A failed stage blocks everything downstream of it; independent branches
+    still run.
+    """
+    settings = load_settings()
+    selected = set(upstream_of(stages, targets)) if targets else {n.name for n in stages}
+    upstream_of(stages, force)  # validates names
+
+    producer = {out: node.name for node in stages for out in node.outputs}
+    runs: List[StageRun] = []
+    not_done: set = set()  # failed / blocked / would-run-in-dry-run
+
+    for node in topo_order(stages):
+        if node.name not in selected:
+            continue
+
+        deps = {producer[i] for i in node.inputs if i in producer}
+        if deps & not_done and not dry_run:
+            runs.append(StageRun(node.name, "blocked", [f"upstream: {', '.join(sorted(deps & not_done))}"]))
+            not_done.add(node.name)
+            print(f"⏭  {node.name}: blocked by {', '.join(sorted(deps & not_done))}")
+            continue
+
+        fingerprint = current_fingerprint(root, node, settings=settings)
+        missing = [rel for rel, sha in fingerprint["inputs"].items() if sha is None and rel not in producer]
+        if not fingerprint["inputs"]:
+            missing = list(node.inputs)
+
+        status = check_stage(root, node, fingerprint)
+        reasons = status.reasons
+        if node.name in force:
+            reasons = ["forced"] + reasons
+        if deps & not_done:  # dry run: upstream will run first
+            reasons = [f"after upstream: {', '.join(sorted(deps & not_done))}"] + reasons
+
+        if not reasons:
+            runs.append(StageRun(node.name, "fresh"))
+            print(f"✅ {node.name}: up to date")
+            continue
+
+        if dry_run:
+            runs.append(StageRun(node.name, "stale", reasons))
+            not_done.add(node.name)
+            print(f"▶ {node.name}: would run ({'; '.join(reasons)})")
+            continue
+
+        if missing:
+            runs.append(StageRun(node.name, "failed", [f"missing input: {', '.join(missing)}"]))
+            not_done.add(node.name)
+            print(f"❌ {node.name}: missing input {', '.join(missing)}")
+            continue
+
+        print(f"▶ {node.name}: running ({'; '.join(reasons)})")
+        started = time.perf_counter()
+        try:
+            runner(root, node)
+            absent = [out for out in node.outputs if not (root / out).exists()]
+            if absent:
+                raise RuntimeError(f"stage did not write {', '.join(absent)}")
+        except Exception as exc:
+            runs.append(StageRun(node.name, "failed", [f"{type(exc).__name__}: {exc}"],
+                                 time.perf_counter() - started))
+            not_done.add(node.name)
+            print(f"❌ {node.name} failed: {exc}")
+            continue
+
+        # Inputs are hashed again: the manifest records what was actually read.
+        write_manifests(root, node, current_fingerprint(root, node, settings=settings))
+        runs.append(StageRun(node.name, "ran", reasons, time.perf_counter() - started))
+        print(f"✅ {node.name}: done ({runs[-1].seconds:.1f}s)")
+
+    return runs
+
+
+def print_summary(runs: List[StageRun]) -> None:
+    width = max([len("Stage")] + [len(r.name) for r in runs])
+    print(f"\n{'Stage':<{width}}  {'Status':<7}  {'Time':>7}  Why")
+    for r in runs:
+        print(f"{r.name:<{width}}  {r.status:<7}  {r.seconds:>6.1f}s  {'; '.join(r.reasons)}")
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run stale pipeline stages (content-hash manifests)")
+    parser.add_argument("targets", nargs="*", help="Stages to bring up to date (default: all)")
+    parser.add_argument("--force", action="append", default=[], metavar="STAGE",
+                        help="Re-run this stage even if it is up to date (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="Print the plan without running anything")
+    parser.add_argument("--list", action="store_true", help="List the stage graph and exit")
+    parser.add_argument("--root", type=Path, default=Path("."), help="Project root (default: cwd)")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for node in topo_order(STAGES):
+            llm = " [LLM]" if node.uses_llm else ""
+            print(f"{node.name}{llm}: {', '.join(node.inputs)} → {', '.join(node.outputs)}")
+        return 0
+
+    try:
+        runs = run_graph(
+            args.root.resolve(),
+            targets=args.targets or None,
+            force=args.force,
+            dry_run=args.dry_run,
+        )
+    except ValueError as exc:
+        print(f"❌ {exc}")
+        return 2
+
+    print_summary(runs)
+    return 1 if any(r.status in {"failed", "blocked"} for r in runs) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
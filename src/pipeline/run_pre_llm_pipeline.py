@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+import os
 import sys
 import json
+import time
+import argparse
+import contextlib
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Dict, List, Optional
 
 # -----------------------------
 # Stage imports (existing code)
 # -----------------------------
 
 # Stage 1
+from ..stage1.parsed_docx import ParsedDocx
 from ..stage1.stage1_extract_v3 import extract_tables_v3
 
 # Stage 1.1 (Word → Stage 1 fidelity)
@@ -42,6 +51,7 @@ def resolve_single_docx() -> Path:
         raise SystemExit(
             "❌ Multiple .docx files found in data/raw:\n"
             + "\n".join(f"  - {d.name}" for d in docs)
+            + "\n(use --all to run them all)"
         )
     return docs[0]
 
@@ -55,51 +65,81 @@ def save_json(path: Path, data: dict) -> None:
 
 
 # -----------------------------
-# Pipeline
+# Pipeline (one module)
 # -----------------------------
 
-def main() -> None:
-    print("▶ Pre-LLM structural pipeline starting")
+@dataclass
+class ModuleResult:
+    name: str
+    out_dir: str
+    status: str = "ok"  # ok | failed
+    stage: str = ""  # last stage started (the failing one when status == failed)
+    error: Optional[str] = None
+    slides: int = 0
+    seconds: float = 0.0
+
+
+def run_module(
+    docx_path: Path,
+    out_dir: Path,
+    *,
+    persist_parsed: bool = False,
+    result: Optional[ModuleResult] = None,
+) -> ModuleResult:
+    """
+    Stage 1 → 1.1 → 2 → 2.1 for one Word document, writing to out_dir.
+    Raises on the first failed stage; `result.stage` names it.
+    """
+    result = result or ModuleResult(name=docx_path.name, out_dir=str(out_dir))
 
     # -------------------------
-    # Resolve input
+    # Parse Word once (shared by Stage 1 and the audits)
     # -------------------------
-    docx_path = resolve_single_docx()
-    print(f"📄 Input Word document: {docx_path.name}")
+    result.stage = "Parse"
+    document = ParsedDocx.load_or_parse(
+        docx_path,
+        cache_dir=out_dir if persist_parsed else None,
+    )
 
     # -------------------------
     # Stage 1
     # -------------------------
+    result.stage = "Stage 1"
     print("▶ Stage 1: Word → Stage 1 JSON")
-    stage1_module = extract_tables_v3(docx_path)
+    stage1_module = extract_tables_v3(docx_path, document=document)
+    result.slides = len(stage1_module.get("slides", []))
 
-    stage1_out = DATA_PROCESSED / "module_v3.json"
+    stage1_out = out_dir / "module_v3.json"
     save_json(stage1_out, stage1_module)
     print(f"✅ Stage 1 output written: {stage1_out}")
 
     # -------------------------
     # Stage 1.1 — HARD GATE
     # -------------------------
+    result.stage = "Stage 1.1"
     print("▶ Stage 1.1: Fidelity audit (Word → Stage 1)")
     run_stage1_fidelity_audit(
         docx_path=docx_path,
         stage1_module=stage1_module,
+        document=document,
     )
     print("✅ Stage 1.1 passed (no text loss)")
 
     # -------------------------
     # Stage 2
     # -------------------------
+    result.stage = "Stage 2"
     print("▶ Stage 2: Stage 1 → Stage 2 JSON")
     stage2_module = transform_module_v3_to_stage2(stage1_module)
 
-    stage2_out = DATA_PROCESSED / "module_stage2.json"
+    stage2_out = out_dir / "module_stage2.json"
     save_json(stage2_out, stage2_module)
     print(f"✅ Stage 2 output written: {stage2_out}")
 
     # -------------------------
     # Stage 2.1 — HARD GATE
     # -------------------------
+    result.stage = "Stage 2.1"
     print("▶ Stage 2.1: Preservation audit (Stage 1 → Stage 2)")
     run_stage2_preservation_audit(
         stage1_module=stage1_module,
@@ -107,13 +147,141 @@ def main() -> None:
     )
     print("✅ Stage 2.1 passed (no text loss)")
 
+    return result
+
+
+# -----------------------------
+# Batch mode (many modules)
+# -----------------------------
+
+def _run_module_isolated(docx_path: Path, out_dir: Path, persist_parsed: bool) -> ModuleResult:
+    """
+    Process-pool entry point. Never raises: the failure is recorded in the
+    result and the full log (stdout, stderr, traceback) goes to
+    <out_dir>/pipeline.log.
+    """
+    result = ModuleResult(name=docx_path.name, out_dir=str(out_dir))
+    out_dir.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+
+    with open(out_dir / "pipeline.log", "w", encoding="utf-8") as log, \
+            contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        try:
+            run_module(docx_path, out_dir, persist_parsed=persist_parsed, result=result)
+        except Exception as exc:
+            result.status = "failed"
+            result.error = f"{type(exc).__name__}: {str(exc).splitlines()[0] if str(exc) else ''}"
+            traceback.print_exc()
+
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def run_batch(
+    docs: List[Path],
+    out_root: Path,
+    *,
+    workers: Optional[int] = None,
+    persist_parsed: bool = False,
+) -> List[ModuleResult]:
+    """
+    Run every document in a process pool, each into out_root/<docx stem>/.
+    One module failing (audit or crash) does not stop the others.
+    Results come back in the order of `docs`.
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(docs) or 1))
+    results: Dict[Path, ModuleResult] = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_run_module_isolated, doc, out_root / doc.stem, persist_parsed): doc
+            for doc in docs
+        }
+        for future in as_completed(futures):
+            doc = futures[future]
+            try:
+                results[doc] = future.result()
+            except Exception as exc:  # worker died (BrokenProcessPool, pickling, ...)
+                results[doc] = ModuleResult(
+                    name=doc.name,
+                    out_dir=str(out_root / doc.stem),
+                    status="failed",
+                    stage="worker",
+                    error=f"{type(exc).__name__}: {exc}",
+                )
+            r = results[doc]
+            print(f"{'✅' if r.status == 'ok' else '❌'} {r.name} ({r.seconds:.1f}s)")
+
+    return [results[doc] for doc in docs]
+
+
+def print_summary(results: List[ModuleResult]) -> None:
+    width = max([len("Module")] + [len(r.name) for r in results])
+    print(f"\n{'Module':<{width}}  {'Status':<6}  {'Stage':<9}  {'Slides':>6}  {'Time':>7}  Error")
+    for r in results:
+        print(
+            f"{r.name:<{width}}  {r.status:<6}  {(r.stage if r.status != 'ok' else '-'):<9}  "
+            f"{r.slides:>6}  {r.seconds:>6.1f}s  {r.error or ''}"
+        )
+
+    failed = sum(1 for r in results if r.status != "ok")
+    if failed:
+        print(f"\n❌ {failed}/{len(results)} module(s) failed (see <module>/pipeline.log)")
+    else:
+        print(f"\n✅ All {len(results)} module(s) passed")
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-LLM structural pipeline (Stage 1 → 2.1)")
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Run every .docx in data/raw in a process pool, each into data/processed/<name>/",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (--all)")
+    parser.add_argument(
+        "--persist-parsed",
+        action="store_true",
+        help="Save / reuse the parsed Word document next to the outputs (keyed by .docx SHA-256)",
+    )
+    args = parser.parse_args(argv)
+
+    print("▶ Pre-LLM structural pipeline starting")
+
+    if args.all:
+        docs = sorted(DATA_RAW.glob("*.docx"))
+        if not docs:
+            raise SystemExit("❌ No .docx files found in data/raw")
+        print(f"📄 {len(docs)} Word document(s)")
+        results = run_batch(
+            docs,
+            DATA_PROCESSED,
+            workers=args.workers,
+            persist_parsed=args.persist_parsed,
+        )
+        print_summary(results)
+        return 0 if all(r.status == "ok" for r in results) else 1
+
+    # -------------------------
+    # Resolve input
+    # -------------------------
+    docx_path = resolve_single_docx()
+    print(f"📄 Input Word document: {docx_path.name}")
+
+    run_module(docx_path, DATA_PROCESSED, persist_parsed=args.persist_parsed)
+
     print("🎉 Pre-LLM structural pipeline completed successfully")
     print("➡ Safe to proceed to Stage 2.7+ (LLM inference)")
+    return 0
 
 
 if __name__ == "__main__":
     try:
-        main()
+        sys.exit(main())
     except Exception as exc:
         print("\n❌ PIPELINE FAILED")
         print(str(exc), file=sys.stderr)
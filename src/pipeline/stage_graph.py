@@ -0,0 +1,365 @@
+"""
+Declarative stage graph, Stage 1 → Stage 3A / 3B / editorial review.
+
+Every stage CLI reads and writes fixed paths under data/. A StageNode names
+those paths, the command that produces them and the source that decides
+their content (code, prompts, model). After a stage runs, each output gets
+a sidecar manifest (<output>.manifest.json) recording:
+
+  - sha256 of every input file
+  - code_version    hash of the stage's non-prompt source files
+  - prompt_versions hash per prompt module + settings cache.prompt_version
+  - model           provider/model the stage calls (LLM stages only)
+  - sha256 of every output
+
+A stage is stale when any of that differs from what is on disk now; the
+runner (src/pipeline/run_dag.py) re-runs only stale stages.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from graphlib import TopologicalSorter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..stage1.parsed_docx import file_sha256
+from ..utils.config_loader import load_settings
+
+MANIFEST_SUFFIX = ".manifest.json"
+MANIFEST_VERSION = 1
+
+
+# -----------------------------
+# Graph
+# -----------------------------
+
+@dataclass(frozen=True)
+class StageNode:
+    name: str
+    module: str  # run as `python -m <module> <*args>`
+    inputs: Tuple[str, ...]  # paths or globs, relative to the project root
+    outputs: Tuple[str, ...]
+    code: Tuple[str, ...]  # packages / files whose source decides the output
+    args: Tuple[str, ...] = ()
+    uses_llm: bool = False
+    model: Optional[str] = None  # "provider/model" a stage hard-codes; None = settings llm.*
+
+
+P = "data/processed"
+
+# Shared src/utils modules that shape stage output: sentence segmentation,
+# the preservation checks behind the validators, and request / response
+# shaping. Infrastructure (tracing, token logging, checkpoints) is left out
+# so editing it never forces a paid re-run.
+U = "src/utils"
+SEGMENTATION = (f"{U}/sentences.py",)
+PRESERVATION = (f"{U}/text_preservation.py",)
+LLM_REQUEST = (f"{U}/llm_gateway.py", f"{U}/output_schema.py")
+LLM_BATCH = (f"{U}/llm_client_batch.py",)
+
+STAGES: Tuple[StageNode, ...] = (
+    StageNode(
+        name="pre_llm",
+        module="src.pipeline.run_pre_llm_pipeline",
+        inputs=("data/raw/*.docx",),
+        outputs=(f"{P}/module_v3.json", f"{P}/module_stage2.json"),
+        code=("src/stage1", "src/stage1_1", "src/stage2", "src/stage2_1",
+              "src/pipeline/run_pre_llm_pipeline.py", *PRESERVATION),
+    ),
+    StageNode(
+        name="stage2_7",
+        module="src.stage2_7.run_stage2_7",
+        args=("--in-json", f"{P}/module_stage2.json",
+              "--out-json", f"{P}/module_stage2_after_2_7.json", "--use-llm"),
+        inputs=(f"{P}/module_stage2.json",),
+        outputs=(f"{P}/module_stage2_after_2_7.json",),
+        code=("src/stage2_7", *SEGMENTATION, *PRESERVATION, *LLM_REQUEST),
+        uses_llm=True,
+        model="openai/gpt-4o",
+    ),
+    StageNode(
+        name="stage2_5",
+        module="src.stage2_5.run_stage2_5",
+        args=(f"{P}/module_stage2_after_2_7.json",
+              f"{P}/module_stage2_5_suggestions.json",
+              f"{P}/module_stage2_after_2_5.json"),
+        inputs=(f"{P}/module_stage2_after_2_7.json",),
+        outputs=(f"{P}/module_stage2_5_suggestions.json", f"{P}/module_stage2_after_2_5.json"),
+        code=("src/stage2_5", "src/stage2_6/prompts_for_2_6.py", *SEGMENTATION, *LLM_REQUEST),
+        uses_llm=True,
+        model="openai/gpt-4o",
+    ),
+    StageNode(
+        name="stage2_6",
+        module="src.stage2_6.runner",
+        args=(f"{P}/module_stage2_after_2_5.json", f"{P}/module_stage2_6.json"),
+        inputs=(f"{P}/module_stage2_after_2_5.json",),
+        outputs=(f"{P}/module_stage2_6.json",),
+        code=("src/stage2_6", "src/stage2_5/run_stage2_5.py", "src/stage2_5/llm_client.py",
+              *SEGMENTATION, *PRESERVATION, *LLM_REQUEST, *LLM_BATCH),
+        uses_llm=True,
+        model="openai/gpt-4o",
+    ),
+    StageNode(
+        name="stage2_8",
+        module="src.stage2_8.stage2_8_main",
+        inputs=(f"{P}/module_stage2_after_2_5.json", f"{P}/module_stage2_6.json"),
+        outputs=(f"{P}/module_stage2_8.json",),
+        code=("src/stage2_8", *LLM_REQUEST, *LLM_BATCH),
+        uses_llm=True,
+        model="openai/gpt-5.2-2025-12-11",
+    ),
+    StageNode(
+        name="stage2_9",
+        module="src.stage2_9.stage2_9_main",
+        inputs=(f"{P}/module_stage2_8.json",),
+        outputs=(f"{P}/module_stage2_9.json",),
+        code=("src/stage2_9",),
+    ),
+    StageNode(
+        name="stage2_9_2",
+        module="src.stage2_9_2.stage2_9_2_main",
+        inputs=(f"{P}/module_stage2_9.json",),
+        outputs=(f"{P}/quiz_flattened_stage2_9_2.json",),
+        code=("src/stage2_9_2",),
+    ),
+    StageNode(
+        name="stage3A",
+        module="src.stage3A.export_quiz_docx",
+        inputs=(f"{P}/quiz_flattened_stage2_9_2.json",),
+        outputs=("data/exports/quiz_questions.docx",),
+        code=("src/stage3A",),
+    ),
+    StageNode(
+        name="stage3B",
+        module="src.stage3B.export_module_docx",
+        inputs=(f"{P}/module_stage2_9.json",),
+        outputs=("data/exports/module_stage3B.docx",),
+        code=("src/stage3B",),
+    ),
+    StageNode(
+        name="review",
+        module="src.stage2_review_suggestions.run_stage2_review",
+        inputs=(f"{P}/module_stage2.json",),
+        outputs=("data/review/module_review_suggestions.json",),
+        code=("src/stage2_review_suggestions", f"{U}/llm_client_realtime.py",
+              *LLM_REQUEST, *LLM_BATCH),
+        uses_llm=True,
+    ),
+    StageNode(
+        name="review_docx",
+        module="src.stage3_review_docx.export_review_docx",
+        inputs=("data/review/module_review_suggestions.json",),
+        outputs=("data/exports/module_editorial_review.docx",),
+        code=("src/stage3_review_docx",),
+    ),
+)
+
+
+def topo_order(stages: Sequence[StageNode]) -> List[StageNode]:
+    """
+    Stages ordered so every producer runs before its consumers.
+    Raises ValueError on duplicate names / outputs or a cycle.
+    """
+    by_name: Dict[str, StageNode] = {}
+    producer: Dict[str, str] = {}
+    for node in stages:
+        if node.name in by_name:
+            raise ValueError(f"Duplicate stage name: {node.name}")
+        by_name[node.name] = node
+        for out in node.outputs:
+            if out in producer:
+                raise ValueError(f"Output {out} produced by both {producer[out]} and {node.name}")
+            producer[out] = node.name
+
+    sorter: TopologicalSorter = TopologicalSorter()
+    for node in stages:
+        sorter.add(node.name, *(producer[i] for i in node.inputs if i in producer))
+    # static_order raises graphlib.CycleError (a ValueError) on cycles
+    return [by_name[name] for name in sorter.static_order()]
+
+
+def upstream_of(stages: Sequence[StageNode], names: Sequence[str]) -> List[str]:
+    """`names` plus every stage they (transitively) depend on."""
+    producer = {out: node for node in stages for out in node.outputs}
+    by_name = {node.name: node for node in stages}
+
+    unknown = [n for n in names if n not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)}")
+
+    seen: List[str] = []
+    todo = list(names)
+    while todo:
+        name = todo.pop()
+        if name in seen:
+            continue
+        seen.append(name)
+        todo.extend(producer[i].name for i in by_name[name].inputs if i in producer)
+    return seen
+
+
+# -----------------------------
+# Fingerprints
+# -----------------------------
+
+def _is_prompt_file(path: Path) -> bool:
+    return "prompt" in path.name
+
+
+def _source_files(root: Path, code: Sequence[str]) -> List[Path]:
+    files: List[Path] = []
+    for entry in code:
+        path = root / entry
+        if path.is_dir():
+            files.extend(
+                p for p in path.rglob("*")
+                if p.is_file()
+                and p.suffix in {".py", ".txt", ".yaml", ".json"}
+                and "__pycache__" not in p.parts
+                and not p.name.startswith("test_")
+            )
+        elif path.is_file():
+            files.append(path)
+    return sorted(set(files))
+
+
+def _hash_files(root: Path, files: Sequence[Path]) -> str:
+    digest = hashlib.sha256()
+    for path in files:
+        digest.update(path.relative_to(root).as_posix().encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(file_sha256(path).encode("ascii"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def resolve_inputs(root: Path, node: StageNode) -> List[str]:
+    """Input paths relative to root, with globs expanded (sorted)."""
+    resolved: List[str] = []
+    for pattern in node.inputs:
+        if any(ch in pattern for ch in "*?["):
+            resolved.extend(sorted(p.relative_to(root).as_posix() for p in root.glob(pattern)))
+        else:
+            resolved.append(pattern)
+    return resolved
+
+
+def current_fingerprint(
+    root: Path,
+    node: StageNode,
+    *,
+    settings: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    What the stage's outputs would be built from right now.
+    Missing inputs hash to None.
+    """
+    settings = load_settings() if settings is None else settings
+    files = _source_files(root, node.code)
+    prompt_files = [f for f in files if _is_prompt_file(f)]
+    code_files = [f for f in files if not _is_prompt_file(f)]
+
+    inputs: Dict[str, Optional[str]] = {}
+    for rel in resolve_inputs(root, node):
+        path = root / rel
+        inputs[rel] = file_sha256(path) if path.is_file() else None
+
+    prompt_versions: Dict[str, str] = {
+        f.relative_to(root).as_posix(): file_sha256(f)[:16] for f in prompt_files
+    }
+    model: Optional[str] = None
+    if node.uses_llm:
+        llm = settings.get("llm", {})
+        prompt_versions["cache.prompt_version"] = str(settings.get("cache", {}).get("prompt_version", "v1"))
+        model = node.model or f"{llm.get('provider', 'openai')}/{llm.get('model')}"
+
+    return {
+        "inputs": inputs,
+        "code_version": _hash_files(root, code_files)[:16],
+        "prompt_versions": prompt_versions,
+        "model": model,
+    }
+
+
+# -----------------------------
+# Manifests
+# -----------------------------
+
+def manifest_path(output: Path) -> Path:
+    return output.with_name(output.name + MANIFEST_SUFFIX)
+
+
+def read_manifest(output: Path) -> Optional[Dict[str, Any]]:
+    path = manifest_path(output)
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data if data.get("version") == MANIFEST_VERSION else None
+
+
+def write_manifests(root: Path, node: StageNode, fingerprint: Dict[str, Any]) -> None:
+    """One manifest per output, all recording the whole stage run."""
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "stage": node.name,
+        "written_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        **fingerprint,
+        "outputs": {out: file_sha256(root / out) for out in node.outputs},
+    }
+    text = json.dumps(manifest, indent=2, ensure_ascii=False)
+    for out in node.outputs:
+        path = manifest_path(root / out)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        tmp.replace(path)
+
+
+@dataclass
+class Staleness:
+    stale: bool
+    reasons: List[str] = field(default_factory=list)
+
+
+def check_stage(
+    root: Path,
+    node: StageNode,
+    fingerprint: Dict[str, Any],
+) -> Staleness:
+    """Compare the outputs' manifests with the current fingerprint."""
+    reasons: List[str] = []
+
+    for out in node.outputs:
+        path = root / out
+        if not path.exists():
+            reasons.append(f"missing output {out}")
+            continue
+        manifest = read_manifest(path)
+        if manifest is None:
+            reasons.append(f"no manifest for {out}")
+            continue
+        if manifest.get("outputs", {}).get(out) != file_sha256(path):
+            reasons.append(f"{out} modified since it was written")
+
+        recorded_inputs = manifest.get("inputs", {})
+        for rel, sha in fingerprint["inputs"].items():
+            if recorded_inputs.get(rel) != sha:
+                reasons.append(f"input changed: {rel}")
+        for rel in recorded_inputs.keys() - fingerprint["inputs"].keys():
+            reasons.append(f"input removed: {rel}")
+        if manifest.get("code_version") != fingerprint["code_version"]:
+            reasons.append("code changed")
+        if manifest.get("prompt_versions") != fingerprint["prompt_versions"]:
+            reasons.append("prompts changed")
+        if manifest.get("model") != fingerprint["model"]:
+            reasons.append(f"model changed ({manifest.get('model')} → {fingerprint['model']})")
+
+    # same reason from several outputs: report once
+    return Staleness(stale=bool(reasons), reasons=list(dict.fromkeys(reasons)))
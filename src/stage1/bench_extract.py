@@ -0,0 +1,224 @@
+"""
+Benchmark: streaming Stage 1 extractor vs the python-docx reference.
+
+Builds synthetic modules (panels with prose + Word bullets, Engage 1 and
+Engage 2 slides, merged cells, nested tables, line breaks, hyperlinks),
+runs each extractor in its own subprocess (so peak RSS is per extractor),
+and checks the two module_v3.json outputs are byte-identical.
+
+    python -m src.stage1.bench_extract --slides 300 1500
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+COLUMNS = ["Image", "English Text", "Notes and Instructions"]
+
+_WORDS = (
+    "patient clinician dose symptom screening referral follow-up counselling "
+    "infection nutrition growth vaccine assessment history examination "
+    "caregiver danger sign fever cough breathing"
+).split()
+
+
+# -------------------------------
+# Synthetic documents
+# -------------------------------
+
+def _sentence(rng: random.Random, n: int) -> str:
+    words = [rng.choice(_WORDS) for _ in range(n)]
+    return " ".join(words).capitalize() + "."
+
+
+def _mark_list(paragraph) -> None:
+    from docx.oxml import parse_xml
+    from docx.oxml.ns import nsdecls
+
+    pPr = paragraph._p.get_or_add_pPr()
+    pPr.append(parse_xml(
+        f'<w:numPr {nsdecls("w")}><w:ilvl w:val="0"/><w:numId w:val="1"/></w:numPr>'
+    ))
+
+
+def _fill(cell, rng: random.Random, *, paragraphs: int, bullets: int = 0) -> None:
+    cell.paragraphs[0].text = _sentence(rng, rng.randint(8, 30))
+    for _ in range(paragraphs - 1):
+        p = cell.add_paragraph()
+        run = p.add_run(_sentence(rng, rng.randint(8, 30)) + " – ")
+        run.add_break()
+        run.add_text("see also")
+        run.add_tab()
+        p.add_run(_sentence(rng, 4))
+    for _ in range(bullets):
+        _mark_list(cell.add_paragraph(_sentence(rng, rng.randint(3, 10))))
+
+
+def _add_slide_rows(table, rng: random.Random, index: int) -> None:
+    from docx.oxml import parse_xml
+    from docx.oxml.ns import nsdecls
+
+    kind = ("panel", "panel", "engage1", "engage2")[index % 4]
+
+    header = table.add_row()
+    header.cells[0].text = f"Header: Slide {index} — {rng.choice(_WORDS)}"
+    header.cells[0].merge(header.cells[2])
+
+    labels = table.add_row()
+    for cell, label in zip(labels.cells, COLUMNS):
+        cell.text = label
+
+    if kind == "panel":
+        rows = [table.add_row() for _ in range(rng.randint(1, 3))]
+        for row in rows:
+            _fill(row.cells[1], rng, paragraphs=rng.randint(1, 4), bullets=rng.randint(0, 4))
+        rows[0].cells[0].text = f"img_{index}.png"
+        rows[0].cells[2].text = f"Slide Type = Panel [[QUIZ:{index}]]" if index % 7 == 0 else ""
+        if len(rows) > 1:
+            rows[0].cells[0].merge(rows[-1].cells[0])
+            hyperlink = parse_xml(
+                f'<w:hyperlink {nsdecls("w")} w:anchor="ref{index}">'
+                f'<w:r><w:t>linked reference {index}</w:t></w:r></w:hyperlink>'
+            )
+            rows[-1].cells[1].paragraphs[0]._p.append(hyperlink)
+        rows[-1].cells[2].add_table(rows=1, cols=1).cell(0, 0).text = "nested note"
+        return
+
+    if kind == "engage1":
+        intro = table.add_row()
+        intro.cells[0].text = f"intro_{index}.png"
+        _fill(intro.cells[1], rng, paragraphs=2)
+        intro.cells[2].text = "Slide Type = Engage 1"
+        items = rng.randint(2, 4)
+        for i in range(items):
+            item = table.add_row()
+            item.cells[0].text = f"item_{index}_{i}.png"
+            _fill(item.cells[1], rng, paragraphs=rng.randint(1, 2), bullets=rng.randint(0, 3))
+        buttons = table.add_row()
+        buttons.cells[0].text = "Button Labels"
+        buttons.cells[1].text = " | ".join(rng.choice(_WORDS) for _ in range(items))
+        return
+
+    body = table.add_row()
+    _fill(body.cells[1], rng, paragraphs=3, bullets=2)
+    body.cells[2].text = "Slide Type = Engage 2\n[[LOCKED]]"
+    buttons = table.add_row()
+    buttons.cells[0].text = "Button Labels"
+    buttons.cells[1].text = "Learn more"
+
+
+def build_synthetic_docx(path: Path, *, slides: int, seed: int = 0) -> Path:
+    """A Stage 1 style module with `slides` slides, 1–3 slides per table."""
+    from docx import Document
+
+    rng = random.Random(seed)
+    doc = Document()
+    doc.add_paragraph("Synthetic module for Stage 1 benchmarking")
+
+    short = doc.add_table(rows=2, cols=3)
+    short.cell(0, 0).text = "Header: not a slide table (fewer than 3 rows)"
+
+    index = 0
+    while index < slides:
+        table = doc.add_table(rows=0, cols=3)
+        for _ in range(min(rng.randint(1, 3), slides - index)):
+            index += 1
+            _add_slide_rows(table, rng, index)
+        doc.add_paragraph(_sentence(rng, 6))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc.save(str(path))
+    return path
+
+
+# -------------------------------
+# Runs
+# -------------------------------
+
+def _extractor(name: str) -> Callable[[Path], Dict[str, Any]]:
+    if name == "stream":
+        from .stage1_extract_v3 import extract_tables_v3
+        return extract_tables_v3
+    from .stage1_extract_v3_docx import extract_tables_v3_docx
+    return extract_tables_v3_docx
+
+
+def _child(name: str, docx_path: Path, out_path: Path, repeat: int) -> None:
+    extract = _extractor(name)
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            module = extract(docx_path)
+        best = min(best, time.perf_counter() - started)
+
+    out_path.write_text(json.dumps(module, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(json.dumps({"seconds": best, "max_rss_mb": _peak_rss_mb()}))
+
+
+def _peak_rss_mb() -> float:
+    # VmHWM resets on exec; ru_maxrss can carry over the forking parent's peak.
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def _run(name: str, docx_path: Path, out_path: Path, repeat: int) -> Dict[str, float]:
+    proc = subprocess.run(
+        [sys.executable, "-m", "src.stage1.bench_extract", "--child", name,
+         str(docx_path), str(out_path), "--repeat", str(repeat)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Stage 1 extraction (stream vs python-docx)")
+    parser.add_argument("--slides", type=int, nargs="+", default=[300, 1500])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--child", nargs=3, metavar=("IMPL", "DOCX", "OUT"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        name, docx_path, out_path = args.child
+        _child(name, Path(docx_path), Path(out_path), args.repeat)
+        return 0
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        print(f"{'slides':>7} {'docx MB':>8} {'python-docx s':>14} {'stream s':>9} "
+              f"{'speedup':>8} {'python-docx MB':>15} {'stream MB':>10}  identical")
+        for slides in args.slides:
+            docx_path = build_synthetic_docx(tmp_dir / f"synthetic_{slides}.docx", slides=slides)
+            ref = _run("docx", docx_path, tmp_dir / f"ref_{slides}.json", args.repeat)
+            new = _run("stream", docx_path, tmp_dir / f"new_{slides}.json", args.repeat)
+            same = (tmp_dir / f"ref_{slides}.json").read_bytes() == (tmp_dir / f"new_{slides}.json").read_bytes()
+            ok = ok and same
+            print(
+                f"{slides:>7} {docx_path.stat().st_size / 1e6:>8.2f} {ref['seconds']:>14.3f} "
+                f"{new['seconds']:>9.3f} {ref['seconds'] / new['seconds']:>7.1f}x "
+                f"{ref['max_rss_mb']:>15.1f} {new['max_rss_mb']:>10.1f}  {'✅' if same else '❌'}"
+            )
+
+    print("✅ Outputs byte-identical" if ok else "❌ Outputs differ")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
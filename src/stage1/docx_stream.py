@@ -0,0 +1,296 @@
+"""
+Streaming reader for the top-level tables of a .docx (Stage 1 input).
+
+Walks word/document.xml once with lxml.iterparse and yields one DocxRow per
+<w:tr>, clearing each row's XML as soon as it has been read, so memory stays
+flat however large the document is.
+
+The row / cell / paragraph view matches python-docx exactly, because Stage 1
+output must not change:
+
+- only <w:tbl> elements that are direct children of <w:body> are tables
+  (python-docx Document.tables); nested tables are ignored
+- row cells follow _Row.cells: a gridSpan cell appears once per spanned
+  column, a vMerge="continue" cell is the cell above it, gridBefore
+  positions are skipped
+- a cell's paragraphs are its direct <w:p> children
+- paragraph text follows Paragraph.text (runs + hyperlink runs; w:tab and
+  w:ptab -> tab, w:br (line) and w:cr -> newline, w:noBreakHyphen -> "-")
+- a paragraph is a list item when its w:pPr has a direct w:numPr
+"""
+
+from __future__ import annotations
+
+import hashlib
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from lxml import etree
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_OFFICE_DOCUMENT_REL = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+)
+
+
+def _w(tag: str) -> str:
+    return f"{{{W_NS}}}{tag}"
+
+
+W_BODY = _w("body")
+W_TBL = _w("tbl")
+W_TR = _w("tr")
+W_TC = _w("tc")
+W_P = _w("p")
+W_R = _w("r")
+W_HYPERLINK = _w("hyperlink")
+W_VAL = _w("val")
+
+_RUN_TEXT = {
+    _w("tab"): "\t",
+    _w("ptab"): "\t",
+    _w("cr"): "\n",
+    _w("noBreakHyphen"): "-",
+}
+
+
+def normalize(text: str) -> str:
+    if not text:
+        return ""
+
+    # Normalize hyphen-like characters to ASCII hyphen
+    text = (
+        text.replace("\u2011", "-")  # non-breaking hyphen
+            .replace("\u2013", "-")  # en dash
+            .replace("\u2014", "-")  # em dash
+            .replace("\u00AD", "")   # soft hyphen
+            .replace("\u00A0", " ")  # non-breaking space
+    )
+
+    return " ".join(text.split()).strip()
+
+
+# -------------------------------
+# Row model
+# -------------------------------
+
+@dataclass(frozen=True, slots=True)
+class DocxParagraph:
+    raw: str  # python-docx Paragraph.text
+    text: str  # normalize(raw)
+    is_list: bool
+    fingerprint: str = ""  # sha256 of the <w:p> XML, when requested
+
+
+@dataclass(frozen=True, slots=True)
+class DocxCell:
+    paragraphs: Tuple[DocxParagraph, ...]
+
+    @property
+    def text(self) -> str:
+        """
+        Normalized cell text. Equal to normalize(python-docx cell.text):
+        joining paragraphs with "\\n" and normalizing collapses to the same
+        single-spaced string as joining the normalized paragraphs.
+        """
+        return " ".join(p.text for p in self.paragraphs if p.text)
+
+
+@dataclass(frozen=True, slots=True)
+class DocxRow:
+    table_index: int
+    row_index: int
+    _cells: Tuple[DocxCell, ...]
+    _error: Optional[Exception] = None
+
+    @property
+    def cells(self) -> Tuple[DocxCell, ...]:
+        # python-docx resolves merged cells lazily and raises on access;
+        # keep that, so malformed rows only fail when they are used.
+        if self._error is not None:
+            raise self._error
+        return self._cells
+
+
+# grid offset -> (cell, columns it yields) or the error resolving it
+_GridMap = Dict[int, Union[Tuple[DocxCell, int], Exception]]
+
+
+# -------------------------------
+# XML helpers
+# -------------------------------
+
+def _int_val(parent: Optional[etree._Element], tag: str, default: int) -> int:
+    if parent is None:
+        return default
+    el = parent.find(_w(tag))
+    if el is None or el.get(W_VAL) is None:
+        return default
+    return int(el.get(W_VAL))
+
+
+def _run_text(r: etree._Element) -> str:
+    parts = []
+    for child in r:
+        tag = child.tag
+        if tag == _w("t"):
+            parts.append(child.text or "")
+        elif tag == _w("br"):
+            if child.get(_w("type"), "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag in _RUN_TEXT:
+            parts.append(_RUN_TEXT[tag])
+    return "".join(parts)
+
+
+def _paragraph(p: etree._Element, *, fingerprint: bool) -> DocxParagraph:
+    parts = []
+    for child in p:
+        if child.tag == W_R:
+            parts.append(_run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(_run_text(r) for r in child.iterchildren(W_R))
+
+    raw = "".join(parts)
+    pPr = p.find(_w("pPr"))
+    return DocxParagraph(
+        raw=raw,
+        text=normalize(raw),
+        is_list=pPr is not None and pPr.find(_w("numPr")) is not None,
+        fingerprint=(
+            hashlib.sha256(etree.tostring(p, with_tail=False)).hexdigest() if fingerprint else ""
+        ),
+    )
+
+
+def _vmerge(tc: etree._Element) -> Optional[str]:
+    tcPr = tc.find(_w("tcPr"))
+    vMerge = tcPr.find(_w("vMerge")) if tcPr is not None else None
+    if vMerge is None:
+        return None
+    return vMerge.get(W_VAL, "continue")
+
+
+def _read_row(
+    tr: etree._Element,
+    *,
+    table_index: int,
+    row_index: int,
+    above: Optional[_GridMap],
+    fingerprint: bool = False,
+) -> Tuple[DocxRow, _GridMap]:
+    """One <w:tr> -> DocxRow, plus its grid map for the row below."""
+    cells: List[DocxCell] = []
+    grid: _GridMap = {}
+    error: Optional[Exception] = None
+    offset = _int_val(tr.find(_w("trPr")), "gridBefore", 0)
+
+    for tc in tr.iterchildren(W_TC):
+        tcPr = tc.find(_w("tcPr"))
+        span = _int_val(tcPr, "gridSpan", 1)
+
+        entry: Union[Tuple[DocxCell, int], Exception]
+        if _vmerge(tc) == "continue":
+            if above is None:
+                entry = ValueError("no tr above topmost tr in w:tbl")
+            else:
+                entry = above.get(offset) or ValueError(f"no `tc` element at grid_offset={offset}")
+        else:
+            cell = DocxCell(tuple(
+                _paragraph(p, fingerprint=fingerprint) for p in tc.iterchildren(W_P)
+            ))
+            entry = (cell, span)
+
+        grid[offset] = entry
+        if isinstance(entry, Exception):
+            error = error or entry
+        else:
+            cells.extend([entry[0]] * entry[1])
+        offset += span
+
+    row = DocxRow(table_index, row_index, tuple(cells), error)
+    return row, grid
+
+
+def _main_part_name(zf: zipfile.ZipFile) -> str:
+    try:
+        rels = etree.fromstring(zf.read("_rels/.rels"))
+    except KeyError:
+        return "word/document.xml"
+    for rel in rels.iter(f"{{{_REL_NS}}}Relationship"):
+        if rel.get("Type") == _OFFICE_DOCUMENT_REL:
+            return rel.get("Target", "word/document.xml").lstrip("/")
+    return "word/document.xml"
+
+
+# -------------------------------
+# Reader
+# -------------------------------
+
+class DocxTableReader:
+    """
+    Single pass over the top-level tables of a .docx.
+
+    rows() yields every row of every top-level table in document order;
+    table_count is final once rows() is exhausted. fingerprints=True also
+    hashes each paragraph's XML (slower; the extractor does not need it).
+    """
+
+    def __init__(self, docx_path: Path, *, fingerprints: bool = False):
+        self.docx_path = Path(docx_path)
+        self.fingerprints = fingerprints
+        self.table_count = 0
+
+    def rows(self) -> Iterator[DocxRow]:
+        with zipfile.ZipFile(self.docx_path) as zf, zf.open(_main_part_name(zf)) as f:
+            # Same blank-text handling as python-docx's parser.
+            events = etree.iterparse(
+                f,
+                events=("start", "end"),
+                remove_blank_text=True,
+                resolve_entities=False,
+            )
+
+            body: Optional[etree._Element] = None
+            table: Optional[etree._Element] = None
+            row_index = 0
+            above: Optional[_GridMap] = None
+
+            for event, el in events:
+                if event == "start":
+                    if el.tag == W_BODY:
+                        body = el
+                    elif el.tag == W_TBL and table is None and el.getparent() is body:
+                        table = el
+                        row_index, above = 0, None
+                        self.table_count += 1
+                    continue
+
+                if el.tag == W_TR and table is not None and el.getparent() is table:
+                    row, above = _read_row(
+                        el,
+                        table_index=self.table_count - 1,
+                        row_index=row_index,
+                        above=above,
+                        fingerprint=self.fingerprints,
+                    )
+                    row_index += 1
+                    _release(el)
+                    yield row
+                elif el is table:
+                    table = None
+                    _release(el)
+                elif body is not None and el.getparent() is body:
+                    _release(el)
+
+
+def _release(el: etree._Element) -> None:
+    """Drop a processed element and its already-processed siblings."""
+    el.clear()
+    parent = el.getparent()
+    if parent is not None:
+        while el.getprevious() is not None:
+            del parent[0]
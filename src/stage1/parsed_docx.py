@@ -0,0 +1,146 @@
+"""
+Parsed Word document shared by Stage 1, Stage 1.1 and Stage 2.1.
+
+The pre-LLM pipeline used to open the same .docx once per consumer. A
+ParsedDocx is built once per run (tables -> rows -> cells -> paragraphs,
+with raw + normalized text, list flags and XML fingerprints) and handed to
+the extractor and both fidelity audits. It can be persisted next to the
+outputs, keyed by the SHA-256 of the .docx, so a re-run skips parsing.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .docx_stream import DocxCell, DocxParagraph, DocxRow, DocxTableReader, normalize
+
+FORMAT_VERSION = 1
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class ParsedDocx:
+    source_name: str
+    sha256: str
+    tables: List[List[DocxRow]]
+
+    # -------------------------------
+    # Building
+    # -------------------------------
+
+    @classmethod
+    def parse(cls, docx_path: Path) -> "ParsedDocx":
+        docx_path = Path(docx_path)
+        reader = DocxTableReader(docx_path, fingerprints=True)
+
+        tables: List[List[DocxRow]] = []
+        for row in reader.rows():
+            while len(tables) <= row.table_index:
+                tables.append([])
+            tables[row.table_index].append(row)
+        # Tables without rows still count (python-docx Document.tables).
+        tables.extend([] for _ in range(reader.table_count - len(tables)))
+
+        return cls(source_name=docx_path.name, sha256=file_sha256(docx_path), tables=tables)
+
+    @classmethod
+    def load_or_parse(cls, docx_path: Path, *, cache_dir: Optional[Path] = None) -> "ParsedDocx":
+        """
+        Parse `docx_path`, reusing <cache_dir>/parsed_docx_<sha256>.json when
+        it exists and writing it when it does not. No cache_dir: parse only.
+        """
+        if cache_dir is None:
+            return cls.parse(docx_path)
+
+        cache_path = Path(cache_dir) / f"parsed_docx_{file_sha256(docx_path)}.json"
+        if cache_path.exists():
+            try:
+                return cls.load(cache_path)
+            except (ValueError, KeyError, TypeError):
+                pass  # stale format or truncated write: parse again
+
+        document = cls.parse(docx_path)
+        document.save(cache_path)
+        return document
+
+    # -------------------------------
+    # Access
+    # -------------------------------
+
+    @property
+    def table_count(self) -> int:
+        return len(self.tables)
+
+    def rows(self) -> Iterator[DocxRow]:
+        for table in self.tables:
+            yield from table
+
+    # -------------------------------
+    # Persistence
+    # -------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": FORMAT_VERSION,
+            "source_name": self.source_name,
+            "sha256": self.sha256,
+            "tables": [[_row_to_dict(row) for row in table] for table in self.tables],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ParsedDocx":
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported parsed docx version: {data.get('version')}")
+        return cls(
+            source_name=data["source_name"],
+            sha256=data["sha256"],
+            tables=[
+                [_row_from_dict(ti, ri, row) for ri, row in enumerate(table)]
+                for ti, table in enumerate(data["tables"])
+            ],
+        )
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.to_dict(), ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "ParsedDocx":
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+def _row_to_dict(row: DocxRow) -> Dict[str, Any]:
+    return {
+        "cells": [
+            [[p.raw, p.is_list, p.fingerprint] for p in cell.paragraphs]
+            for cell in row._cells
+        ],
+        # Only merged-cell resolution errors are deferred (always ValueError).
+        "error": str(row._error) if row._error is not None else None,
+    }
+
+
+def _row_from_dict(table_index: int, row_index: int, data: Dict[str, Any]) -> DocxRow:
+    cells = tuple(
+        DocxCell(tuple(
+            DocxParagraph(raw=raw, text=normalize(raw), is_list=is_list, fingerprint=fingerprint)
+            for raw, is_list, fingerprint in cell
+        ))
+        for cell in data["cells"]
+    )
+    error = ValueError(data["error"]) if data["error"] is not None else None
+    return DocxRow(table_index, row_index, cells, error)
@@ -14,43 +14,16 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Optional
 
-from docx import Document
-from docx.oxml.ns import qn
+from .docx_stream import DocxRow, DocxTableReader, normalize
+from .parsed_docx import ParsedDocx
 
 
 # -------------------------------
 # Utilities
 # -------------------------------
 
-def normalize(text: str) -> str:
-    if not text:
-        return ""
-
-    # Normalize hyphen-like characters to ASCII hyphen
-    text = (
-        text.replace("\u2011", "-")  # non-breaking hyphen
-            .replace("\u2013", "-")  # en dash
-            .replace("\u2014", "-")  # em dash
-            .replace("\u00AD", "")   # soft hyphen
-            .replace("\u00A0", " ")  # non-breaking space
-    )
-
-    return " ".join(text.split()).strip()
-
-
-def is_list_paragraph(p) -> bool:
-    """
-    True if the paragraph is explicitly a Word list item (bullet or numbered).
-    This is STRUCTURAL detection, not inference.
-    """
-    pPr = p._p.pPr
-    if pPr is None:
-        return False
-    return pPr.find(qn("w:numPr")) is not None
-
-
 def canonical_col_label(raw: str) -> str:
     t = normalize(raw).lower()
     if "/" in t:
@@ -78,14 +51,38 @@ def is_slide_header(text: str) -> bool:
     )
 
 
+def _rows_of_slide_tables(rows: Iterable[DocxRow], min_rows: int = 3) -> Iterator[DocxRow]:
+    """
+    Drop tables with fewer than min_rows rows. Holds at most min_rows - 1
+    rows of a table until it is known to be long enough.
+    """
+    held: List[DocxRow] = []
+    passing = -1  # table_index whose rows are passed straight through
+
+    for row in rows:
+        if row.table_index == passing:
+            yield row
+            continue
+        if held and held[0].table_index != row.table_index:
+            held = []
+        held.append(row)
+        if len(held) == min_rows:
+            passing = row.table_index
+            yield from held
+            held = []
+
+
 # -------------------------------
 # Extractor
 # -------------------------------
 
-def extract_tables_v3(docx_path: Path) -> Dict[str, Any]:
-    doc = Document(str(docx_path))
-
-    print("Total tables:", len(doc.tables))
+def extract_tables_v3(docx_path: Path, *, document: Optional[ParsedDocx] = None) -> Dict[str, Any]:
+    """
+    Stream the Word tables into Stage 1 JSON (one pass over document.xml),
+    or walk an already parsed `document` of the same file.
+    Output is identical to the python-docx walk in stage1_extract_v3_docx.
+    """
+    reader = document if document is not None else DocxTableReader(docx_path)
 
     module: Dict[str, Any] = {"module_title": docx_path.stem, "slides": []}
     slide_index = 0
@@ -184,7 +181,7 @@ def extract_tables_v3(docx_path: Path) -> Dict[str, Any]:
             cur_slide.setdefault("content", {})
             cur_slide["content"].setdefault("button_labels", [])
 
-    def start_new_slide(header_text: str, tbl, header_row_idx: int) -> None:
+    def start_new_slide(header_text: str, label_row: DocxRow) -> None:
         nonlocal slide, columns, col_labels, slide_index
 
         if slide is not None:
@@ -203,167 +200,178 @@ def extract_tables_v3(docx_path: Path) -> Dict[str, Any]:
 
         reset_engage_state()
 
-        label_row = tbl.rows[header_row_idx + 1]
         col_labels = [canonical_col_label(c.text) for c in label_row.cells]
         columns = {label: [] for label in col_labels if label}
 
     # -------------------------------
-    # Main table walk
+    # Row handling
     # -------------------------------
 
-    for tbl in doc.tables:
-        if len(tbl.rows) < 3:
-            continue
+    def walk_row(row: DocxRow) -> None:
+        nonlocal engage1_mode, engage1_intro_row_pending, collecting_button_labels
+        nonlocal engage2_mode, engage_intro_image
 
-        row_idx = 0
+        if slide is None:
+            return
 
-        while row_idx < len(tbl.rows):
-            row = tbl.rows[row_idx]
-            first_cell = normalize(row.cells[0].text)
+        # -------------------------------
+        # Row-level extraction
+        # -------------------------------
+        row_texts: Dict[str, List[str]] = {}
 
-            if is_slide_header(first_cell):
-                start_new_slide(first_cell, tbl, row_idx)
-                row_idx += 2
+        for idx, cell in enumerate(row.cells):
+            
+            if idx >= len(col_labels):
                 continue
-
-            if slide is None:
-                row_idx += 1
+            label = col_labels[idx]
+            if not label:
                 continue
 
-            # -------------------------------
-            # Row-level extraction
-            # -------------------------------
-            row_texts: Dict[str, List[str]] = {}
+            texts = [p.text for p in cell.paragraphs if p.text]
+            if texts:
+                row_texts[label] = texts
+                columns.setdefault(label, []).extend(texts)
+
+        img_texts = row_texts.get("image", [])
+        eng_texts = row_texts.get("english text", [])
+        notes_texts = row_texts.get("notes and instructions", [])
+
+        # Engage detection
+        if notes_texts:
+            blob = " ".join(t.lower() for t in notes_texts)
+            if "slide type = engage 1" in blob:
+                engage1_mode = True
+                engage2_mode = False
+                engage1_intro_row_pending = True
+                collecting_button_labels = False
+            elif "slide type = engage 2" in blob:
+                engage2_mode = True
+                engage1_mode = False
 
-            for idx, cell in enumerate(row.cells):
-                
-                if idx >= len(col_labels):
-                    continue
-                label = col_labels[idx]
-                if not label:
-                    continue
+        # -------------------------------
+        # ENGAGE 1 parsing
+        # -------------------------------
+        if engage1_mode:
+            if img_texts and img_texts[0].strip().lower() == "button labels":
+                collecting_button_labels = True
+                if eng_texts:
+                    columns.setdefault("button labels", []).extend(eng_texts)
+                return
 
-                texts = [normalize(p.text) for p in cell.paragraphs if normalize(p.text)]
-                if texts:
-                    row_texts[label] = texts
-                    columns.setdefault(label, []).extend(texts)
-
-            img_texts = row_texts.get("image", [])
-            eng_texts = row_texts.get("english text", [])
-            notes_texts = row_texts.get("notes and instructions", [])
-
-            # Engage detection
-            if notes_texts:
-                blob = " ".join(t.lower() for t in notes_texts)
-                if "slide type = engage 1" in blob:
-                    engage1_mode = True
-                    engage2_mode = False
-                    engage1_intro_row_pending = True
-                    collecting_button_labels = False
-                elif "slide type = engage 2" in blob:
-                    engage2_mode = True
-                    engage1_mode = False
-
-            # -------------------------------
-            # ENGAGE 1 parsing
-            # -------------------------------
-            if engage1_mode:
-                if img_texts and img_texts[0].strip().lower() == "button labels":
-                    collecting_button_labels = True
-                    if eng_texts:
-                        columns.setdefault("button labels", []).extend(eng_texts)
-                    row_idx += 1
-                    continue
+            if collecting_button_labels:
+                if eng_texts:
+                    columns.setdefault("button labels", []).extend(eng_texts)
+                return
 
-                if collecting_button_labels:
-                    if eng_texts:
-                        columns.setdefault("button labels", []).extend(eng_texts)
-                    row_idx += 1
-                    continue
+            if engage1_intro_row_pending:
+                if img_texts:
+                    engage_intro_image = " ".join(img_texts).strip()
+                if eng_texts:
+                    engage_intro_parts.extend(eng_texts)
+                if notes_texts:
+                    engage_intro_notes.extend(notes_texts)
+                engage1_intro_row_pending = False
+                return
 
-                if engage1_intro_row_pending:
-                    if img_texts:
-                        engage_intro_image = " ".join(img_texts).strip()
-                    if eng_texts:
-                        engage_intro_parts.extend(eng_texts)
-                    if notes_texts:
-                        engage_intro_notes.extend(notes_texts)
-                    engage1_intro_row_pending = False
-                    row_idx += 1
-                    continue
+            if eng_texts:
+                eng_blocks: List[Dict[str, Any]] = []
+                eng_col_idx = col_labels.index("english text")
+                eng_cell = row.cells[eng_col_idx]
+
+                paras = [p for p in eng_cell.paragraphs if p.text]
+                list_items: List[str] = []
+
+                for p in paras:
+                    txt = p.text
+                    if p.is_list:
+                        list_items.append(txt)
+                    else:
+                        if list_items:
+                            eng_blocks.append({"type": "bullets", "items": list_items})
+                            list_items = []
+                        eng_blocks.append({"type": "paragraph", "text": txt})
+
+                if list_items:
+                    eng_blocks.append({"type": "bullets", "items": list_items})
+
+                engage_items.append({
+                    "button_label": None,
+                    "image": " ".join(img_texts).strip() if img_texts else None,
+                    "body": eng_blocks,
+                    "notes": "\n".join(notes_texts).strip() if notes_texts else None,
+                })
 
+                return
+
+            # FIX 3 — engage rows NEVER fall through
+            return
+
+        # -------------------------------
+        # ENGAGE 2 button label row
+        # -------------------------------
+        if engage2_mode:
+            if img_texts and img_texts[0].strip().lower() == "button labels":
+                # STRUCTURAL: button labels live in their own column
                 if eng_texts:
-                    eng_blocks: List[Dict[str, Any]] = []
-                    eng_col_idx = col_labels.index("english text")
-                    eng_cell = row.cells[eng_col_idx]
-
-                    paras = [p for p in eng_cell.paragraphs if normalize(p.text)]
-                    list_items: List[str] = []
-
-                    for p in paras:
-                        txt = normalize(p.text)
-                        if is_list_paragraph(p):
-                            list_items.append(txt)
-                        else:
-                            if list_items:
-                                eng_blocks.append({"type": "bullets", "items": list_items})
-                                list_items = []
-                            eng_blocks.append({"type": "paragraph", "text": txt})
-
-                    if list_items:
-                        eng_blocks.append({"type": "bullets", "items": list_items})
-
-                    engage_items.append({
-                        "button_label": None,
-                        "image": " ".join(img_texts).strip() if img_texts else None,
-                        "body": eng_blocks,
-                        "notes": "\n".join(notes_texts).strip() if notes_texts else None,
-                    })
-
-                    row_idx += 1
-                    continue
+                    slide.setdefault("content", {})
+                    slide["content"].setdefault("button_labels", [])
+                    slide["content"]["button_labels"].extend(eng_texts)
 
-                # FIX 3 — engage rows NEVER fall through
-                row_idx += 1
-                continue
+                return
+
+        # -------------------------------
+        # PANEL parsing (single-pass)
+        # -------------------------------
+        blocks = slide["content"]["blocks"]
 
-            # -------------------------------
-            # ENGAGE 2 button label row
-            # -------------------------------
-            if engage2_mode:
-                if img_texts and img_texts[0].strip().lower() == "button labels":
-                    # STRUCTURAL: button labels live in their own column
-                    if eng_texts:
-                        slide.setdefault("content", {})
-                        slide["content"].setdefault("button_labels", [])
-                        slide["content"]["button_labels"].extend(eng_texts)
-
-                    row_idx += 1
+        if eng_texts:
+            eng_col_idx = col_labels.index("english text")
+            eng_cell = row.cells[eng_col_idx]
+
+            for p in eng_cell.paragraphs:
+                txt = p.text
+                if not txt:
                     continue
 
-            # -------------------------------
-            # PANEL parsing (single-pass)
-            # -------------------------------
-            blocks = slide["content"]["blocks"]
+                if p.is_list:
+                    if blocks and blocks[-1]["type"] == "bullets":
+                        blocks[-1]["items"].append(txt)
+                    else:
+                        blocks.append({"type": "bullets", "items": [txt]})
+                else:
+                    blocks.append({"type": "paragraph", "text": txt})
 
-            if eng_texts:
-                eng_col_idx = col_labels.index("english text")
-                eng_cell = row.cells[eng_col_idx]
+    # -------------------------------
+    # Main table walk (streamed)
+    #
+    # A slide header row takes the next row of its table as the column
+    # label row; a header in a table's last row has none (IndexError,
+    # as with tbl.rows[header_row_idx + 1]).
+    # -------------------------------
 
-                for p in eng_cell.paragraphs:
-                    txt = normalize(p.text)
-                    if not txt:
-                        continue
+    pending_header: Optional[str] = None
+    pending_table = -1
 
-                    if is_list_paragraph(p):
-                        if blocks and blocks[-1]["type"] == "bullets":
-                            blocks[-1]["items"].append(txt)
-                        else:
-                            blocks.append({"type": "bullets", "items": [txt]})
-                    else:
-                        blocks.append({"type": "paragraph", "text": txt})
+    for row in _rows_of_slide_tables(reader.rows()):
+        if pending_header is not None:
+            if row.table_index != pending_table:
+                raise IndexError("slide header row has no column label row")
+            start_new_slide(pending_header, row)
+            pending_header = None
+            continue
+
+        first_cell = row.cells[0].text
+
+        if is_slide_header(first_cell):
+            pending_header, pending_table = first_cell, row.table_index
+            continue
+
+        walk_row(row)
+
+    if pending_header is not None:
+        raise IndexError("slide header row has no column label row")
 
-            row_idx += 1
+    print("Total tables:", reader.table_count)
 
     if slide is not None:
         finalize_slide(slide, columns)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, List, Optional
 
+from ..stage1.parsed_docx import ParsedDocx
+from ..utils.text_preservation import check_preserved, normalize_ws
 from .word_xml_extractors import extract_word_slide_text_fragments
 
 def _extend_with_split_paragraphs(fragments: List[str], text: Any) -> None:
@@ -18,8 +20,7 @@ def _extend_with_split_paragraphs(fragments: List[str], text: Any) -> None:
 
     # Split on newlines (preserve paragraph granularity)
     for part in text.splitlines():
-        s = part.replace("\u00A0", " ")
-        s = " ".join(s.split()).strip()
+        s = normalize_ws(part)
         if s:
             fragments.append(s)
 
@@ -126,10 +127,7 @@ def extract_stage1_text_fragments(stage1_module: Dict[str, Any]) -> List[str]:
     # Normalize whitespace here (simple + deterministic)
     out: List[str] = []
     for t in fragments:
-        if not t:
-            continue
-        s = t.replace("\u00A0", " ")
-        s = " ".join(s.split()).strip()
+        s = normalize_ws(t)
         if s:
             out.append(s)
 
@@ -144,6 +142,7 @@ def run_stage1_fidelity_audit(
     *,
     docx_path: Path,
     stage1_module: Dict[str, Any],
+    document: Optional[ParsedDocx] = None,
 ) -> None:
     """
     HARD GATE.
@@ -152,52 +151,52 @@ def run_stage1_fidelity_audit(
     exists somewhere in Stage 1 output.
 
     Raises RuntimeError on failure.
+    Pass the run's ParsedDocx as `document` to reuse it.
     """
 
-    word_fragments = extract_word_slide_text_fragments(docx_path)
+    word_fragments = extract_word_slide_text_fragments(docx_path, document=document)
     stage1_fragments = extract_stage1_text_fragments(stage1_module)
 
-    word_set: Set[str] = set(word_fragments)
-    stage1_set: Set[str] = set(stage1_fragments)
-
-    missing = []
-
-    # stage1_blob = " ".join(stage1_set)
+    # Split composite Word paragraphs into semantic parts; every part
+    # must equal some Stage 1 fragment.
+    parts: List[str] = []
+    owners: List[str] = []
 
-    for frag in word_set:
-        f = frag.replace("\u00A0", " ")
-        f = " ".join(f.split()).strip()
+    for frag in dict.fromkeys(word_fragments):
+        f = normalize_ws(frag)
 
         if not f:
             continue
 
-        # Split composite Word paragraphs into semantic parts
-        parts: list[str] = []
-
         # Case A: marker at START ( [[QUIZ]]Text )
         if f.startswith("[[") and "]]" in f:
             marker, rest = f.split("]]", 1)
-            parts.append(marker + "]]")
+            frag_parts = [marker + "]]"]
             if rest.strip():
-                parts.append(rest.strip())
+                frag_parts.append(rest.strip())
 
         # Case B: marker at END ( Text[[QUIZ]] )
         elif "[[" in f and f.endswith("]]"):
             text, marker = f.split("[[", 1)
-            if text.strip():
-                parts.append(text.strip())
-            parts.append("[[" + marker)
+            frag_parts = [text.strip()] if text.strip() else []
+            frag_parts.append("[[" + marker)
 
         # Case C: atomic paragraph
         else:
-            parts.append(f)
+            frag_parts = [f]
+
+        parts.extend(frag_parts)
+        owners.extend([f] * len(frag_parts))
 
+    report = check_preserved(parts, stage1_fragments, whole_fragments=True)
 
-        # Check that ALL parts exist somewhere in Stage 1 output
-        for part in parts:
-            if part not in stage1_set:
-                missing.append(f)
-                break
+    # One entry per Word paragraph, showing its first missing part.
+    missing: List[str] = []
+    reported = set()
+    for i in report.missing:
+        if owners[i] not in reported:
+            reported.add(owners[i])
+            missing.append(report.describe(i))
 
     if missing:
         preview = "\n".join(f"- {m}" for m in missing[:10])
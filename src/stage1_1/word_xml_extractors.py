@@ -3,10 +3,11 @@ from __future__ import annotations
 import zipfile
 import hashlib
 from pathlib import Path
-from typing import List, Set
+from typing import List, Optional, Set
 
 from lxml import etree
-from docx import Document
+
+from ..stage1.parsed_docx import ParsedDocx
 
 def is_column_header_text(text: str) -> bool:
     return text.lower() in {
@@ -85,30 +86,36 @@ def xml_fingerprint(elem: etree._Element) -> str:
 # Core extractor
 # -------------------------------------------------
 
-def extract_word_slide_text_fragments(docx_path: Path) -> List[str]:
-    doc = Document(docx_path)
+def extract_word_slide_text_fragments(
+    docx_path: Path,
+    *,
+    document: Optional[ParsedDocx] = None,
+) -> List[str]:
+    """
+    Normalized text of every paragraph in slide tables (tables with a slide
+    header somewhere). Pass the run's ParsedDocx to avoid parsing again.
+    """
+    document = document or ParsedDocx.parse(docx_path)
 
     fragments = []
 
-    for table in doc.tables:
+    for table in document.tables:
         is_slide_table = False
 
-        for row in table.rows:
+        for row in table:
             for cell in row.cells:
                 for p in cell.paragraphs:
-                    txt = normalize_text(p.text)
-                    if txt and is_slide_header_text(txt):
+                    if p.text and is_slide_header_text(p.text):
                         is_slide_table = True
                         break
 
         if not is_slide_table:
             continue
 
-        for row in table.rows:
+        for row in table:
             for cell in row.cells:
                 for p in cell.paragraphs:
-                    txt = normalize_text(p.text)
-                    if txt and not is_column_header_text(txt):
-                        fragments.append(txt)
+                    if p.text and not is_column_header_text(p.text):
+                        fragments.append(p.text)
 
     return fragments
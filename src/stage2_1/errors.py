@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional
 
 
 class FidelityAuditError(RuntimeError):
@@ -11,10 +11,16 @@ class FidelityAuditError(RuntimeError):
     This is a HARD FAILURE.
     """
 
-    def __init__(self, *, missing_fragments: List[str]):
+    def __init__(
+        self,
+        *,
+        missing_fragments: List[str],
+        details: Optional[List[str]] = None,
+    ):
+        # `details` (located descriptions) replace the bare text in the preview
         self.missing_fragments = missing_fragments
 
-        preview = "\n".join(f"- {frag}" for frag in missing_fragments[:5])
+        preview = "\n".join(f"- {line}" for line in (details or missing_fragments)[:5])
         message = (
             f"Stage 2.1 Fidelity Audit FAILED — "
             f"{len(missing_fragments)} text fragment(s) missing.\n"
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, List, Optional
 
+from ..stage1.parsed_docx import ParsedDocx
+from ..utils.text_preservation import check_preserved
 from .text_extractors import (
     extract_word_text_fragments,
     extract_stage2_text_fragments,
@@ -26,6 +28,7 @@ def run_fidelity_audit(
     *,
     docx_path: Path,
     stage2_module: Dict[str, Any],
+    document: Optional[ParsedDocx] = None,
 ) -> None:
     """
     Run Stage 2.1 fidelity audit.
@@ -34,22 +37,20 @@ def run_fidelity_audit(
     Word document appears somewhere in the Stage 2 output.
 
     Raises FidelityAuditError on failure.
+    Pass the run's ParsedDocx as `document` to reuse it.
     """
 
-    word_fragments: List[str] = extract_word_text_fragments(docx_path)
+    word_fragments: List[str] = extract_word_text_fragments(docx_path, document=document)
     stage2_fragments: List[str] = extract_stage2_text_fragments(stage2_module)
 
-    # Use set for fast coverage checks
-    stage2_set: Set[str] = set(stage2_fragments)
+    # Each Word fragment must equal some Stage 2 fragment (one linear scan)
+    report = check_preserved(word_fragments, stage2_fragments, whole_fragments=True)
 
-    missing: List[str] = []
-
-    for frag in word_fragments:
-        if frag not in stage2_set:
-            missing.append(frag)
-
-    if missing:
-        raise FidelityAuditError(missing_fragments=missing)
+    if not report.ok:
+        raise FidelityAuditError(
+            missing_fragments=[word_fragments[i] for i in report.missing],
+            details=[report.describe(i) for i in report.missing[:5]],
+        )
 
 def run_stage2_preservation_audit(
     *,
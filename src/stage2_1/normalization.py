@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Iterable, List
 
+from ..utils.text_preservation import normalize_ws
+
 
 # -----------------------------------------
 # Normalization configuration (tunable)
@@ -37,9 +39,7 @@ def normalize_text(text: str) -> str:
         text = str(text)
 
     # Normalize NBSP and whitespace
-    s = text.replace("\u00A0", " ")
-    s = " ".join(s.split())
-    s = s.strip()
+    s = normalize_ws(text)
 
     if LOWERCASE:
         s = s.lower()
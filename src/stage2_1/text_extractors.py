@@ -1,10 +1,9 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
-
-from docx import Document
+from typing import Any, Dict, Iterable, List, Optional
 
+from ..stage1.parsed_docx import ParsedDocx
 from .normalization import normalize_and_filter
 
 def _is_column_header_row(cells: list[str]) -> bool:
@@ -29,24 +28,29 @@ def _is_column_header_row(cells: list[str]) -> bool:
 # WORD DOCUMENT TEXT EXTRACTION
 # -------------------------------------------------
 
-def extract_word_text_fragments(docx_path: Path) -> List[str]:
+def extract_word_text_fragments(
+    docx_path: Path,
+    *,
+    document: Optional[ParsedDocx] = None,
+) -> List[str]:
     """
     Extract all meaningful text fragments from Word slide tables ONLY.
 
     Stage 2.1 audits text that Stage 1 is structurally responsible for.
     Free-floating paragraphs outside slide tables are intentionally ignored.
+    Pass the run's ParsedDocx as `document` to avoid parsing again.
     """
 
-    doc = Document(str(docx_path))
+    document = document or ParsedDocx.parse(docx_path)
     raw_fragments: List[str] = []
 
-    for tbl in doc.tables:
-        for row in tbl.rows:
+    for table in document.tables:
+        for row in table:
             cell_texts = []
 
             for cell in row.cells:
                 for p in cell.paragraphs:
-                    txt = p.text.strip()
+                    txt = p.raw.strip()
                     if txt:
                         cell_texts.append(txt)
 
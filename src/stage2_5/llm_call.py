@@ -1,25 +1,11 @@
 # src/stage2_5/llm_call.py
 
 from __future__ import annotations
-import json
-import time
-import logging
-import os
 from typing import Dict, Any
 
-from dotenv import load_dotenv
-from openai import OpenAI
+from src.utils.llm_gateway import LLMRequest, get_gateway
+from src.utils.retry_policy import RetryPolicy
 
-# -------------------------------------------------
-# Load environment variables (.env)
-# -------------------------------------------------
-load_dotenv()
-
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    raise RuntimeError("OPENAI_API_KEY not found in .env")
-
-client = OpenAI(api_key=OPENAI_API_KEY)
 
 # -------------------------------------------------
 # Public helper: call LLM and return JSON
@@ -29,41 +15,20 @@ def call_llm_json(
     model: str = "gpt-5.2-2025-12-11",
     temperature: float = 0.0,
     max_tokens: int = 800,
-    max_retries: int = 3,
+    policy: RetryPolicy | None = None,
 ) -> Dict[str, Any]:
     """
     Call OpenAI with a prompt and return parsed JSON.
-    Retries on API or JSON errors.
+    Retries on API or JSON errors (via the shared LLM gateway).
+    Successful results are served from the persistent LLM cache on reruns.
     """
-
-    last_error: Exception | None = None
-
-    for attempt in range(1, max_retries + 1):
-        try:
-            response = client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=temperature,
-                max_completion_tokens=max_tokens,
-            )
-
-            text = response.choices[0].message.content
-            return json.loads(text)
-
-        except json.JSONDecodeError as e:
-            last_error = e
-            logging.warning(
-                f"[Stage 2.5] JSON decode failed (attempt {attempt}/{max_retries})"
-            )
-            time.sleep(1.0)
-
-        except Exception as e:
-            last_error = e
-            logging.error(
-                f"[Stage 2.5] LLM call failed (attempt {attempt}/{max_retries}): {e}"
-            )
-            time.sleep(2 ** attempt)
-
-    raise RuntimeError(
-        "Stage 2.5 LLM failed after retries"
-    ) from last_error
+    return get_gateway().complete_json(
+        LLMRequest(
+            messages=[{"role": "user", "content": prompt}],
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stage_tag="Stage 2.5",
+        ),
+        policy=policy,
+    )
@@ -1,17 +1,45 @@
 # src/stage2_5/llm_client.py
 from __future__ import annotations
 
+import inspect
 import json
-from typing import Callable, Any, Dict
+from typing import Callable, Any, Dict, Optional
+
+
+Validator = Callable[[Dict[str, Any]], Any]
+
+
+def _accepts_validate(call_fn: Callable[..., Any]) -> bool:
+    try:
+        params = inspect.signature(call_fn).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(p.name == "validate" or p.kind is p.VAR_KEYWORD for p in params)
 
 
 class LLMClient:
     def __init__(self, call_fn: Callable[[str], str]):
         self.call_fn = call_fn
+        self._forwards_validate = _accepts_validate(call_fn)
+
+    def call(self, prompt: str, *, validate: Optional[Validator] = None) -> Dict[str, Any]:
+        """
+        `validate` raises on output the caller will reject. A call_fn that
+        accepts it (llm_dispatch) runs it inside the gateway, so rejected
+        output is retried and never cached; otherwise it runs here.
+        """
+        if validate is not None and self._forwards_validate:
+            raw = self.call_fn(prompt, validate=validate)
+        else:
+            raw = self.call_fn(prompt)
 
-    def call(self, prompt: str) -> Dict[str, Any]:
-        raw = self.call_fn(prompt)
+        data = self._parse(raw)
+        if validate is not None and not self._forwards_validate:
+            validate(data)
+        return data
 
+    @staticmethod
+    def _parse(raw: Any) -> Dict[str, Any]:
         # If already dict (like your fake llm), accept it
         if isinstance(raw, dict):
             return raw
@@ -30,4 +58,4 @@ class LLMClient:
                     "removes_information": False,
                     "medical_facts_changed": False,
                 },
-            }
\ No newline at end of file
+            }
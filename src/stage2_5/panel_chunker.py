@@ -0,0 +1,100 @@
+# src/stage2_5/panel_chunker.py
+
+from typing import List, Optional
+
+from src.utils.sentences import split_sentences
+
+from .validators import word_count
+
+# Panel length rules (words)
+MIN_WORDS = 30
+MAX_WORDS = 70
+HARD_MAX_WORDS = 80
+TARGET_WORDS = 50
+
+# Cost weights: every panel pays (words - TARGET)^2; these scale the
+# extra penalty for the 70–80 band and, when not strict, for rule breaks.
+OVER_MAX_WEIGHT = 4
+RULE_BREAK_WEIGHT = 100
+
+
+def _chunk_cost(words: int, *, strict: bool) -> Optional[int]:
+    """Cost of one panel of `words` words; None = not allowed."""
+    cost = (words - TARGET_WORDS) ** 2
+    if words > MAX_WORDS:
+        cost += OVER_MAX_WEIGHT * (words - MAX_WORDS) ** 2
+
+    if words < MIN_WORDS or words > HARD_MAX_WORDS:
+        if strict:
+            return None
+        shortfall = MIN_WORDS - words if words < MIN_WORDS else words - HARD_MAX_WORDS
+        cost += RULE_BREAK_WEIGHT * shortfall ** 2
+
+    return cost
+
+
+def plan_breaks(word_counts: List[int], *, strict: bool = True) -> Optional[List[int]]:
+    """
+    Globally cheapest panel break points over sentences with the given
+    word counts (prefix-sum DP). Returns the sentence index where each
+    panel after the first starts.
+
+    strict=True: every panel is 30–80 words, else None.
+    strict=False: always returns; a panel only exceeds 80 words when it
+    is a single sentence, and short panels are penalized, not forbidden.
+    """
+    n = len(word_counts)
+    prefix = [0]
+    for w in word_counts:
+        prefix.append(prefix[-1] + w)
+
+    best: List[Optional[int]] = [None] * (n + 1)
+    back = [0] * (n + 1)
+    best[0] = 0
+
+    for j in range(1, n + 1):
+        # Panels are sentences i..j-1; widen leftwards until too long.
+        for i in range(j - 1, -1, -1):
+            words = prefix[j] - prefix[i]
+            if words > HARD_MAX_WORDS and (strict or i < j - 1):
+                break
+            if best[i] is None:
+                continue
+            cost = _chunk_cost(words, strict=strict)
+            if cost is None:
+                continue
+            if best[j] is None or best[i] + cost < best[j]:
+                best[j] = best[i] + cost
+                back[j] = i
+
+    if best[n] is None:
+        return None
+
+    breaks: List[int] = []
+    j = n
+    while j > 0:
+        j = back[j]
+        if j > 0:
+            breaks.append(j)
+    return sorted(breaks)
+
+
+def chunk_sentences(sentences: List[str], *, strict: bool = True) -> Optional[List[str]]:
+    """Join sentences into panels at plan_breaks() break points."""
+    if not sentences:
+        return None
+
+    breaks = plan_breaks([word_count(s) for s in sentences], strict=strict)
+    if breaks is None:
+        return None
+
+    bounds = [0] + breaks + [len(sentences)]
+    return [" ".join(sentences[a:b]).strip() for a, b in zip(bounds, bounds[1:])]
+
+
+def chunk_panel_text(text: str) -> Optional[List[str]]:
+    """
+    Deterministic split of one text group into 30–80 word panels,
+    or None when its sentences admit no such split (LLM path).
+    """
+    return chunk_sentences(split_sentences(text), strict=True)
@@ -53,45 +53,6 @@ SOURCE TEXT (DO NOT MODIFY):
 """.strip()
 
 
-def strict_sentence_reflow_prompt(text: str) -> str:
-    return f"""
-You are performing STRICT sentence boundary detection.
-
-ABSOLUTE RULES:
-- You MUST NOT rewrite, paraphrase, summarize, or edit any text.
-- You MUST NOT output any words from the text.
-- You MUST NOT add or remove content.
-- You MAY ONLY return character indexes.
-
-TASK:
-Identify sentence boundaries in the text below.
-Return a list of starting character indexes for each sentence.
-
-The first index MUST be 0.
-Indexes MUST be sorted.
-Indexes MUST reconstruct the text EXACTLY when sliced.
-
-RETURN ONLY VALID JSON in this exact format:
-
-{{
-  "sentence_reflow": {{
-    "action": "reflow",
-    "indexes": [0, 123, 456]
-  }},
-  "safety": {{
-    "adds_new_information": false,
-    "removes_information": false,
-    "medical_facts_changed": false,
-    "policy_violation": false
-  }}
-}}
-
-TEXT (DO NOT COPY WORDS FROM HERE):
-{text}
-""".strip()
-
-
-
 def engage1_item_review_prompt(items: list[str]) -> str:
     joined = "\n".join(f"{i}. {t}" for i, t in enumerate(items))
     return f"""
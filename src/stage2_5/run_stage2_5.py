@@ -5,23 +5,18 @@ from __future__ import annotations
 import json
 import sys
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
 
-from dotenv import load_dotenv
-from openai import OpenAI
+from src.stage2_6.prompts_for_2_6 import SENTENCE_SHAPING_BATCH_OUTPUT, SENTENCE_SHAPING_OUTPUT
+from src.utils.checkpoint import open_journal
+from src.utils.llm_gateway import LLMRequest, get_gateway
 
 from .runner import run_stage2_5
 from .llm_client import LLMClient
 from .apply_splits import apply_stage2_5_splits
+from .schemas import PANEL_SPLIT_OUTPUT
 
 
-# -------------------------------------------------
-# Load .env so OPENAI_API_KEY is available
-# -------------------------------------------------
-load_dotenv()
-
-client = OpenAI()
-
 def assert_stage2_5_invariants(
     *,
     module_stage2: Dict[str, Any],
@@ -70,22 +65,46 @@ def assert_stage2_5_invariants(
         )
 
 
-def llm_dispatch(prompt: str) -> Any:
-    if (
-        "sentence_reflow" in prompt
-        or "THIS TASK IS PANEL SPLITTING ONLY" in prompt
-        or "THIS TASK IS SENTENCE SHAPING ONLY" in prompt
-    ):
-        resp = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "Return ONLY valid JSON. No markdown."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.0,
-            max_completion_tokens=900,
-        )
-        return json.loads(resp.choices[0].message.content)
+# Completion budget for packed Stage 2.6 requests (stage2_6.pack_token_budget
+# of source text comes back as JSON, plus per-panel overhead)
+PACKED_MAX_TOKENS = 4096
+
+
+def dispatch_request(prompt: str) -> Optional[LLMRequest]:
+    """
+    The gateway request llm_dispatch sends for a prompt,
+    or None when the task does not use the LLM.
+    """
+    max_tokens = 900
+
+    if "THIS TASK IS SENTENCE SHAPING ONLY" in prompt:
+        schema = SENTENCE_SHAPING_OUTPUT
+    elif "THIS TASK IS SENTENCE SHAPING FOR MULTIPLE PANELS" in prompt:
+        # The response echoes every packed panel's text
+        schema = SENTENCE_SHAPING_BATCH_OUTPUT
+        max_tokens = PACKED_MAX_TOKENS
+    elif "THIS TASK IS PANEL SPLITTING ONLY" in prompt:
+        schema = PANEL_SPLIT_OUTPUT
+    else:
+        return None
+
+    return LLMRequest(
+        messages=[
+            {"role": "system", "content": "Return ONLY valid JSON. No markdown."},
+            {"role": "user", "content": prompt},
+        ],
+        model="gpt-4o",
+        temperature=0.0,
+        max_tokens=max_tokens,
+        stage_tag="Stage 2.5 Dispatch",
+        response_schema=schema,
+    )
+
+
+def llm_dispatch(prompt: str, *, validate: Optional[Callable[[Dict[str, Any]], Any]] = None) -> Any:
+    request = dispatch_request(prompt)
+    if request is not None:
+        return get_gateway().complete_json(request, validate=validate)
 
     return {"rejected": True, "reason": "LLM disabled for this task"}
 
@@ -103,13 +122,16 @@ def write_json(path: Path, obj: Dict[str, Any]) -> None:
 
 
 def main(argv: list[str]) -> int:
+    resume = "--resume" in argv
+    argv = [a for a in argv if a != "--resume"]
+
     if len(argv) != 4:
         print(
             "Usage:\n"
             "  python -m src.stage2_5.run_stage2_5 "
             "<in_module_stage2.json> "
             "<out_stage2_5_suggestions.json> "
-            "<out_module_stage2_after_2_5.json>\n"
+            "<out_module_stage2_after_2_5.json> [--resume]\n"
         )
         return 2
 
@@ -129,8 +151,10 @@ def main(argv: list[str]) -> int:
     # ----------------------------------
     # Run Stage 2.5 (decision + execution)
     # ----------------------------------
+    # --resume replays slides journaled by an interrupted run
     llm = LLMClient(llm_dispatch)
-    suggestions = run_stage2_5(module_stage2, llm)
+    journal = open_journal(suggestions_path, resume=resume)
+    suggestions = run_stage2_5(module_stage2, llm, journal=journal)
 
     # 🚨 HARD FAIL if Stage 2.5 invariants are violated
     assert_stage2_5_invariants(
@@ -139,6 +163,7 @@ def main(argv: list[str]) -> int:
     )
 
     write_json(suggestions_path, suggestions)
+    journal.discard()
     print(f"✅ Stage 2.5 suggestions written to: {suggestions_path}")
 
     # ----------------------------------
@@ -1,7 +1,17 @@
 # src/stage2_5/runner.py
 
+import sys
+from functools import lru_cache
 from typing import Dict, Any
 
+from src.utils import sentences as _segmentation
+from src.utils.checkpoint import CheckpointJournal
+from src.utils.concurrency import run_bounded, slide_max_workers
+from src.utils.retry_policy import with_stage_deadline
+from src.utils.slide_memo import memoized_slide, source_version
+from src.utils.token_logger import with_usage_summary
+from src.utils.tracing import span, traced
+
 from .validators import (
     engage_item_exceeds_soft_limit,
     button_label_invalid,
@@ -11,7 +21,6 @@ from .prompts import (
     engage1_item_review_prompt,
     button_label_prompt,
     panel_semantic_slides_prompt,
-    strict_sentence_reflow_prompt,
 )
 from .llm_client import LLMClient
 from .validate_llm_output import (
@@ -20,77 +29,26 @@ from .validate_llm_output import (
 )
 from .routing import classify_panel, PanelRouting
 from .block_split import split_panel_blocks
+from .panel_chunker import chunk_panel_text, chunk_sentences, split_sentences
+from . import panel_chunker, prompts, validators
 
-def _sentences_from_reflow(text: str, indexes: list[int]) -> list[str]:
-    # indexes are sentence start positions; last sentence ends at len(text)
-    cuts = sorted(set(i for i in indexes if isinstance(i, int)))
-    if not cuts or cuts[0] != 0:
-        cuts = [0] + cuts
-    cuts = [i for i in cuts if 0 <= i <= len(text)]
-    cuts = sorted(set(cuts))
-    cuts.append(len(text))
-
-    sentences = []
-    for i in range(len(cuts) - 1):
-        s = text[cuts[i]:cuts[i + 1]].strip()
-        if s:
-            sentences.append(s)
-    return sentences
-
-
-def _chunk_sentences_30_70(sentences: list[str]) -> list[str]:
-    # Greedy pack sentences into chunks 30–70 words
-    chunks: list[str] = []
-    current: list[str] = []
-
-    def wc(s: str) -> int:
-        return word_count(s)
-
-    for sent in sentences:
-        candidate = (" ".join(current + [sent])).strip()
-        if not current:
-            current = [sent]
-            continue
-
-        # If adding stays <= 70, keep packing
-        if wc(candidate) <= 80:
-            current.append(sent)
-            continue
-
-        # Otherwise, close current chunk
-        chunk_text = " ".join(current).strip()
-        if chunk_text:
-            chunks.append(chunk_text)
-        current = [sent]
-
-    # flush
-    if current:
-        chunks.append(" ".join(current).strip())
-
-    # Enforce minimum 30 by merging small chunks with neighbor
-    merged: list[str] = []
-    for ch in chunks:
-        if not merged:
-            merged.append(ch)
-            continue
-        if word_count(ch) < 30:
-            merged[-1] = (merged[-1] + " " + ch).strip()
-        else:
-            merged.append(ch)
-
-    # If last chunk is still <30 and we have >1 chunk, merge backward
-    if len(merged) > 1 and word_count(merged[-1]) < 30:
-        merged[-2] = (merged[-2] + " " + merged[-1]).strip()
-        merged.pop()
-
-    return merged
+def _as_panels(header: str, chunks: list[str]) -> list[dict]:
+    return [
+        {
+            "header": header if i == 0 else f"{header} (continued)",
+            "content": ch,
+            "word_count": word_count(ch),
+        }
+        for i, ch in enumerate(chunks)
+    ]
 
 
 def _split_text_strict_30_70(llm: LLMClient, header: str, text: str) -> list[dict]:
     """
     Split a SINGLE text group into 30–70 word panels.
-    1) Try LLM panel split
-    2) If invalid, do sentence_reflow -> deterministic chunking
+    1) Deterministic DP chunking of the group's sentences (no LLM)
+    2) If no valid split exists, try LLM panel split
+    3) If invalid, relaxed DP chunking (panels may then break 30–80)
     Returns list of {header, content, word_count}
     """
     text = text.strip()
@@ -102,7 +60,12 @@ def _split_text_strict_30_70(llm: LLMClient, header: str, text: str) -> list[dic
     if wc <= 80:
         return [{"header": header, "content": text, "word_count": wc}]
 
-    # --- Try LLM split first ---
+    # --- Deterministic split first ---
+    chunks = chunk_panel_text(text)
+    if chunks is not None:
+        return _as_panels(header, chunks)
+
+    # --- LLM split ---
     prompt = panel_semantic_slides_prompt(header=header, source_text=text)
     raw = llm.call(prompt)
     result = raw if isinstance(raw, dict) else {}
@@ -125,170 +88,208 @@ def _split_text_strict_30_70(llm: LLMClient, header: str, text: str) -> list[dic
     if ok and len(finalized) >= 2:
         return finalized
 
-    # --- Fallback: sentence reflow indexes + deterministic chunking ---
-    reflow_prompt = strict_sentence_reflow_prompt(text)
-    reflow_raw = llm.call(reflow_prompt)
-    reflow = (reflow_raw or {}).get("sentence_reflow", {})
-    indexes = reflow.get("indexes", [])
-
-    sentences = _sentences_from_reflow(text, indexes if isinstance(indexes, list) else [])
+    # --- Fallback: relaxed deterministic chunking ---
+    sentences = split_sentences(text)
     if not sentences:
         # final fallback: keep unsplit rather than lose text
         return [{"header": header, "content": text, "word_count": wc}]
 
-    chunks = _chunk_sentences_30_70(sentences)
-
-    out = []
-    for i, ch in enumerate(chunks):
-        out.append({
-            "header": header if i == 0 else f"{header} (continued)",
-            "content": ch,
-            "word_count": word_count(ch),
-        })
-    return out
+    return _as_panels(header, chunk_sentences(sentences, strict=False))
 
 def _as_paragraph_blocks(text: str) -> list[dict]:
     text = (text or "").strip()
     return [{"type": "paragraph", "text": text}] if text else []
 
-def run_stage2_5(module_stage2: Dict[str, Any], llm: LLMClient) -> Dict[str, Any]:
-    suggestions = {"module_id": module_stage2.get("module_title"), "slides": {}}
 
-    for slide in module_stage2.get("slides", []):
-        slide_id = slide.get("id") or slide.get("uuid")
-        slide_type = slide.get("type", slide.get("slide_type"))
+@lru_cache(maxsize=None)
+def _memo_version() -> str:
+    return source_version(sys.modules[__name__], prompts, validators, panel_chunker, _segmentation)
 
-        slide_suggestions: Dict[str, Any] = {}
 
-        # ✅ HARD LOCK: locked means absolutely no action / no LLM
-        notes_lower = (slide.get("notes") or "").lower()
-        if "[[locked]]" in notes_lower:
-            slide_suggestions["meta"] = {
-                "id": slide_id,
-                "header": slide.get("header"),
-                "type": slide_type,
-            }
-            slide_suggestions["final"] = {
-                "action": "keep",
-                "reason": "[[LOCKED]]",
-            }
-            suggestions["slides"][slide_id] = slide_suggestions
-            continue
-
-        # ✅ Stage 2.5 is PANEL-ONLY (decisions-only)
-        if slide_type not in ("panel",):
-            slide_suggestions["meta"] = {
-                "id": slide_id,
-                "header": slide.get("header"),
-                "type": slide_type,
-            }
-            slide_suggestions["final"] = {
-                "action": "keep",
-                "reason": "Non-panel slides are not processed in Stage 2.5",
+def _semantic_split(llm: LLMClient, routing: PanelRouting, header: str, groups: list[str]) -> list[dict]:
+    """
+    LLM-guided split of each text group, as paragraph-block slides.
+    Memoized per slide: unchanged header + text reuses the stored split.
+    """
+    def compute() -> list[dict]:
+        built_slides: list[dict] = []
+        for gi, gtext in enumerate(groups):
+            base_header = header if gi == 0 else f"{header} (continued)"
+            built_slides.extend(_split_text_strict_30_70(llm, base_header, gtext))
+
+        # ✅ Normalize to blocks
+        return [
+            {
+                "header": s["header"],
+                "content": _as_paragraph_blocks(s.get("content", "")),
             }
-            suggestions["slides"][slide_id] = slide_suggestions
-            continue
-
-        # --------------------------------------
-        # META
-        # --------------------------------------
-        content = slide.get("content", {})
-        blocks = content.get("blocks", []) if isinstance(content, dict) else []
+            for s in built_slides
+        ]
+
+    return memoized_slide(
+        "stage2_5",
+        {"routing": routing.value, "header": header, "groups": groups},
+        compute,
+        version=_memo_version(),
+    )
+
+def _suggest_for_slide(slide: Dict[str, Any], llm: LLMClient) -> Dict[str, Any]:
+    """One slide's Stage 2.5 decision (independent of every other slide)."""
+    slide_id = slide.get("id") or slide.get("uuid")
+    slide_type = slide.get("type", slide.get("slide_type"))
+
+    slide_suggestions: Dict[str, Any] = {}
+
+    # ✅ HARD LOCK: locked means absolutely no action / no LLM
+    notes_lower = (slide.get("notes") or "").lower()
+    if "[[locked]]" in notes_lower:
+        slide_suggestions["meta"] = {
+            "id": slide_id,
+            "header": slide.get("header"),
+            "type": slide_type,
+        }
+        slide_suggestions["final"] = {
+            "action": "keep",
+            "reason": "[[LOCKED]]",
+        }
+        return slide_suggestions
 
+    # ✅ Stage 2.5 is PANEL-ONLY (decisions-only)
+    if slide_type not in ("panel",):
         slide_suggestions["meta"] = {
             "id": slide_id,
             "header": slide.get("header"),
             "type": slide_type,
-            "content_preview": [
-                block.get("text") if block.get("type") == "paragraph"
-                else f"[bullets: {len(block.get('items', []))}]"
-                for block in blocks[:2]
-                if isinstance(block, dict)
+        }
+        slide_suggestions["final"] = {
+            "action": "keep",
+            "reason": "Non-panel slides are not processed in Stage 2.5",
+        }
+        return slide_suggestions
+
+    # --------------------------------------
+    # META
+    # --------------------------------------
+    content = slide.get("content", {})
+    blocks = content.get("blocks", []) if isinstance(content, dict) else []
+
+    slide_suggestions["meta"] = {
+        "id": slide_id,
+        "header": slide.get("header"),
+        "type": slide_type,
+        "content_preview": [
+            block.get("text") if block.get("type") == "paragraph"
+            else f"[bullets: {len(block.get('items', []))}]"
+            for block in blocks[:2]
+            if isinstance(block, dict)
+        ],
+    }
+
+    paragraph_blocks = [b for b in blocks if isinstance(b, dict) and b.get("type") == "paragraph"]
+    panel_text = " ".join((b.get("text") or "") for b in paragraph_blocks).strip()
+    panel_wc = word_count(panel_text) if panel_text else 0
+
+    routing = classify_panel(slide)
+
+    # -------------------------------
+    # NO ACTION → keep panel as-is
+    # -------------------------------
+    if routing == PanelRouting.NO_ACTION:
+        slide_suggestions["panel_final"] = {
+            "action": "keep",
+            "source_word_count": panel_wc,
+            "slides": [{"header": slide.get("header"), "content": blocks}],
+        }
+
+    # -------------------------------
+    # STRUCTURAL SPLIT (deterministic)
+    # -------------------------------
+    elif routing == PanelRouting.BLOCK_SPLIT:
+        split_blocks = split_panel_blocks(blocks)
+        slide_suggestions["panel_final"] = {
+            "action": "split",
+            "source_word_count": panel_wc,
+            "slides": [
+                {
+                    "header": slide.get("header") if i == 0 else f"{slide.get('header')} (continued)",
+                    "content": group,
+                }
+                for i, group in enumerate(split_blocks)
             ],
         }
 
-        paragraph_blocks = [b for b in blocks if isinstance(b, dict) and b.get("type") == "paragraph"]
-        panel_text = " ".join((b.get("text") or "") for b in paragraph_blocks).strip()
-        panel_wc = word_count(panel_text) if panel_text else 0
+    # -------------------------------
+    # SEMANTIC INDEX (LLM-guided split)
+    # -------------------------------
+    elif routing == PanelRouting.SEMANTIC_INDEX:
+        paragraph_texts = [b.get("text", "").strip() for b in paragraph_blocks if b.get("text", "").strip()]
 
-        routing = classify_panel(slide)
+        groups: list[str] = []
+        if paragraph_texts:
+            groups.append(paragraph_texts[0])
+        if len(paragraph_texts) > 1:
+            groups.append(" ".join(paragraph_texts[1:]).strip())
 
-        # -------------------------------
-        # NO ACTION → keep panel as-is
-        # -------------------------------
-        if routing == PanelRouting.NO_ACTION:
-            slide_suggestions["panel_final"] = {
-                "action": "keep",
-                "source_word_count": panel_wc,
-                "slides": [{"header": slide.get("header"), "content": blocks}],
-            }
+        slides_out = _semantic_split(llm, routing, slide.get("header"), groups)
 
-        # -------------------------------
-        # STRUCTURAL SPLIT (deterministic)
-        # -------------------------------
-        elif routing == PanelRouting.BLOCK_SPLIT:
-            split_blocks = split_panel_blocks(blocks)
-            slide_suggestions["panel_final"] = {
-                "action": "split",
-                "source_word_count": panel_wc,
-                "slides": [
-                    {
-                        "header": slide.get("header") if i == 0 else f"{slide.get('header')} (continued)",
-                        "content": group,
-                    }
-                    for i, group in enumerate(split_blocks)
-                ],
-            }
+        slide_suggestions["panel_final"] = {
+            "action": "split" if len(slides_out) > 1 else "keep",
+            "source_word_count": panel_wc,
+            "slides": slides_out if slides_out else [{"header": slide.get("header"), "content": blocks}],
+        }
 
-        # -------------------------------
-        # SEMANTIC INDEX (LLM-guided split)
-        # -------------------------------
-        elif routing == PanelRouting.SEMANTIC_INDEX:
-            paragraph_texts = [b.get("text", "").strip() for b in paragraph_blocks if b.get("text", "").strip()]
-
-            groups: list[str] = []
-            if paragraph_texts:
-                groups.append(paragraph_texts[0])
-            if len(paragraph_texts) > 1:
-                groups.append(" ".join(paragraph_texts[1:]).strip())
-
-            built_slides: list[dict] = []
-            for gi, gtext in enumerate(groups):
-                base_header = slide.get("header") if gi == 0 else f"{slide.get('header')} (continued)"
-                split_parts = _split_text_strict_30_70(llm, base_header, gtext)
-                built_slides.extend(split_parts)
-
-            # ✅ Normalize to blocks
-            slides_out = []
-            for s in built_slides:
-                slides_out.append({
-                    "header": s["header"],
-                    "content": _as_paragraph_blocks(s.get("content", "")),
-                })
-
-            slide_suggestions["panel_final"] = {
-                "action": "split" if len(slides_out) > 1 else "keep",
-                "source_word_count": panel_wc,
-                "slides": slides_out if slides_out else [{"header": slide.get("header"), "content": blocks}],
-            }
+    # -------------------------------
+    # SEMANTIC SPLIT (single long paragraph)
+    # -------------------------------
+    elif routing == PanelRouting.SEMANTIC_SPLIT:
+        slides_out = _semantic_split(llm, routing, slide.get("header"), [panel_text])
 
-        # -------------------------------
-        # SEMANTIC SPLIT (single long paragraph)
-        # -------------------------------
-        elif routing == PanelRouting.SEMANTIC_SPLIT:
-            split_parts = _split_text_strict_30_70(llm, slide.get("header"), panel_text)
+        slide_suggestions["panel_final"] = {
+            "action": "split" if len(slides_out) > 1 else "keep",
+            "source_word_count": panel_wc,
+            "slides": slides_out if slides_out else [{"header": slide.get("header"), "content": blocks}],
+        }
 
-            slides_out = [{
-                "header": s["header"],
-                "content": _as_paragraph_blocks(s.get("content", "")),
-            } for s in split_parts]
+    return slide_suggestions
 
-            slide_suggestions["panel_final"] = {
-                "action": "split" if len(slides_out) > 1 else "keep",
-                "source_word_count": panel_wc,
-                "slides": slides_out if slides_out else [{"header": slide.get("header"), "content": blocks}],
-            }
 
-        suggestions["slides"][slide_id] = slide_suggestions
+@traced("stage2_5")
+@with_usage_summary("stage2_5")
+@with_stage_deadline("stage2_5")
+def run_stage2_5(
+    module_stage2: Dict[str, Any],
+    llm: LLMClient,
+    *,
+    max_workers: int | None = None,
+    journal: CheckpointJournal | None = None,
+) -> Dict[str, Any]:
+    """
+    Stage 2.5 decisions for every slide. Slides run concurrently
+    (max_workers, default stage2_5.slide_max_workers); the result keeps
+    the module's slide order. With a journal, each slide's decision is
+    journaled as it completes and journaled slides are replayed.
+    """
+    suggestions = {"module_id": module_stage2.get("module_title"), "slides": {}}
 
-    return suggestions
\ No newline at end of file
+    slides = module_stage2.get("slides", [])
+    if max_workers is None:
+        max_workers = slide_max_workers("stage2_5")
+
+    def _run(slide: Dict[str, Any]) -> Dict[str, Any]:
+        slide_id = slide.get("id") or slide.get("uuid")
+        with span("slide", kind="slide", slide_id=slide_id):
+            if journal is None or slide_id is None:
+                return _suggest_for_slide(slide, llm)
+            return journal.run(slide_id, slide, lambda: _suggest_for_slide(slide, llm))
+
+    results = run_bounded(
+        _run,
+        slides,
+        max_workers=max_workers,
+        thread_name_prefix="stage2_5-slide",
+    )
+
+    for slide, slide_suggestions in zip(slides, results):
+        suggestions["slides"][slide.get("id") or slide.get("uuid")] = slide_suggestions
+
+    return suggestions
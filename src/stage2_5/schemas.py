@@ -1,5 +1,7 @@
 # src/stage2_5/schemas.py
 
+from src.utils.output_schema import OutputSchema, array, obj, string
+
 # Stage 2.5 outputs only these panel actions
 PANEL_FINAL_ACTIONS = {"keep", "split"}
 
@@ -15,4 +17,16 @@ REQUIRED_SAFETY_KEYS = {
     "adds_new_information",
     "removes_information",
     "medical_facts_changed",
-}
\ No newline at end of file
+}
+
+
+# -------------------------------------------------
+# LLM output schemas (provider-native structured output)
+# -------------------------------------------------
+
+PANEL_SPLIT_OUTPUT = OutputSchema(
+    name="panel_split",
+    schema=obj({
+        "slides": array(obj({"header": string(), "content": string()})),
+    }),
+)
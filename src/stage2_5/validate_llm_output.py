@@ -87,65 +87,3 @@ def validate_button_label_suggestions(obj: Any) -> Tuple[bool, Dict[str, Any]]:
         return ok, safety
 
     return _ok(obj)
-
-def validate_strict_sentence_boundaries(
-    obj: Any,
-    *,
-    original_text: str
-) -> Tuple[bool, Dict[str, Any]]:
-    """
-    STRICT validator:
-    - LLM may ONLY return character indexes
-    - Text must reconstruct IDENTICALLY
-    - No wording changes allowed
-    """
-
-    if not isinstance(obj, dict):
-        return _fail("strict_sentence_boundaries must be an object")
-
-    reflow = obj.get("sentence_reflow")
-    if not isinstance(reflow, dict):
-        return _fail("missing sentence_reflow object")
-
-    if reflow.get("action") != "reflow":
-        return _fail("sentence_reflow.action must be 'reflow'")
-
-    indexes = reflow.get("indexes")
-    if not isinstance(indexes, list) or not indexes:
-        return _fail("indexes must be a non-empty list")
-
-    if not all(isinstance(i, int) for i in indexes):
-        return _fail("indexes must be integers")
-
-    if indexes != sorted(indexes):
-        return _fail("indexes must be sorted")
-
-    if indexes[0] != 0:
-        return _fail("first index must be 0")
-
-    text_len = len(original_text)
-    if any(i < 0 or i >= text_len for i in indexes):
-        return _fail("index out of bounds")
-
-    # ------------------------------------
-    # STRICT RECONSTRUCTION CHECK
-    # ------------------------------------
-    chunks = []
-    for i, start in enumerate(indexes):
-        end = indexes[i + 1] if i + 1 < len(indexes) else text_len
-        chunks.append(original_text[start:end])
-
-    reconstructed = "".join(chunks)
-    if reconstructed != original_text:
-        return _fail("STRICT MODE VIOLATION: text mismatch")
-
-    # ------------------------------------
-    # SAFETY
-    # ------------------------------------
-    ok, safety = validate_safety(obj.get("safety"))
-    if not ok:
-        return ok, safety
-
-    return _ok(obj)
-
-
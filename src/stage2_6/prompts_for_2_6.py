@@ -1,3 +1,16 @@
+from src.utils.output_schema import OutputSchema, array, obj, string
+
+
+SENTENCE_SHAPING_OUTPUT = OutputSchema(
+    name="sentence_shaping",
+    schema=obj({
+        "sentence_shaping": obj({
+            "groups": array(obj({"sentences": array(string())})),
+        }),
+    }),
+)
+
+
 def sentence_shaping_prompt(panel_text: str) -> str:
     return f"""
 THIS TASK IS SENTENCE SHAPING ONLY.
@@ -35,10 +48,9 @@ RETURN JSON ONLY in this EXACT format:
 
 {{
   "sentence_shaping": {{
-    "sentence_blocks": [
+    "groups": [
       {{
-        "header": "same header as input panel",
-        "content": "Exact sentence text here."
+        "sentences": ["Exact sentence text here.", "Exact sentence text here."]
       }}
     ]
   }}
@@ -49,3 +61,76 @@ SOURCE PANEL TEXT (DO NOT MODIFY):
 """.strip()
 
 
+
+
+# ---------------------------------------------------------
+# Packed mode: many paragraphs per request
+# ---------------------------------------------------------
+SENTENCE_SHAPING_BATCH_OUTPUT = OutputSchema(
+    name="sentence_shaping_batch",
+    schema=obj({
+        "panels": array(obj({
+            "block_id": string(),
+            "sentence_shaping": obj({
+                "groups": array(obj({"sentences": array(string())})),
+            }),
+        })),
+    }),
+)
+
+
+def sentence_shaping_batch_prompt(blocks: list[tuple[str, str]]) -> str:
+    """`blocks` = (block_id, panel_text) pairs, shaped independently."""
+    panels = "\n\n".join(
+        f"[BLOCK {block_id}]\n{text}" for block_id, text in blocks
+    )
+    return f"""
+THIS TASK IS SENTENCE SHAPING FOR MULTIPLE PANELS.
+
+You are working on {len(blocks)} medical panels that are already finalized.
+Each panel is marked [BLOCK <block_id>] and must be handled ON ITS OWN.
+
+ABSOLUTE RULES (NO EXCEPTIONS):
+- DO NOT add, remove, paraphrase, summarize, or rewrite ANY words.
+- DO NOT change sentence wording.
+- DO NOT change sentence order.
+- DO NOT move content between panels.
+- DO NOT invent content.
+- DO NOT create new slides or panels.
+
+TASK:
+For EACH panel, group its existing sentences into sentence display blocks.
+
+IMPORTANT:
+- Return exactly ONE entry per panel, with its block_id copied exactly.
+- Each entry MUST contain at least ONE group.
+- If no splitting is required, return a SINGLE group containing the full panel text.
+
+GROUPING RULES (per panel):
+- If the panel contains EXACTLY 2 sentences:
+  → Output TWO separate blocks, one sentence per block.
+- If the panel contains EXACTLY 3 sentences:
+  → Output TWO blocks that group the sentences in a pedagogically coherent way.
+- If the panel contains MORE than 3 sentences:
+  → Each block may contain a MAXIMUM of 2 sentences.
+
+RETURN JSON ONLY in this EXACT format:
+
+{{
+  "panels": [
+    {{
+      "block_id": "<block_id>",
+      "sentence_shaping": {{
+        "groups": [
+          {{
+            "sentences": ["Exact sentence text here.", "Exact sentence text here."]
+          }}
+        ]
+      }}
+    }}
+  ]
+}}
+
+SOURCE PANELS (DO NOT MODIFY):
+{panels}
+""".strip()
@@ -2,12 +2,23 @@ from __future__ import annotations
 
 import json
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
-from .prompts_for_2_6 import sentence_shaping_prompt
+from . import prompts_for_2_6, validate_sentence_shaping as _validation
+from .prompts_for_2_6 import sentence_shaping_batch_prompt, sentence_shaping_prompt
 from .validate_sentence_shaping import validate_sentence_shaping
 from src.stage2_5.llm_client import LLMClient
+from src.utils import sentences as _segmentation, text_preservation as _preservation
+from src.utils.checkpoint import CheckpointJournal, open_journal
+from src.utils.concurrency import run_bounded, slide_max_workers
+from src.utils.config_loader import load_settings
+from src.utils.llm_client_batch import BatchItem
+from src.utils.retry_policy import with_stage_deadline
+from src.utils.slide_memo import lookup_slide, memoized_slide, source_version, store_slide
+from src.utils.token_logger import with_usage_summary
+from src.utils.tracing import span, traced
 
 
 # ---------------------------------------------------------
@@ -27,12 +38,266 @@ def write_json(path: Path, obj: Dict[str, Any]) -> None:
     )
 
 
+# ---------------------------------------------------------
+# Slide selection
+# ---------------------------------------------------------
+def _slide_id(slide: Dict[str, Any]) -> str:
+    slide_id = slide.get("id") or slide.get("uuid")
+    if not slide_id:
+        raise ValueError("Stage 2.6 invariant failed: slide missing id")
+    return slide_id
+
+
+def _is_shaping_target(slide: Dict[str, Any]) -> bool:
+    """
+    Only unlocked panel slides are shaped.
+    """
+    notes_lower = (slide.get("notes") or "").lower()
+    if "[[locked]]" in notes_lower:
+        return False
+
+    slide_type = slide.get("slide_type") or slide.get("type")
+    return slide_type == "panel"
+
+
+def _source_texts(slide: Dict[str, Any]) -> List[str]:
+    blocks = (slide.get("content") or {}).get("blocks", [])
+    if not isinstance(blocks, list):
+        return []
+    return [
+        (block.get("text") or "").strip()
+        for block in blocks
+        if block.get("type") == "paragraph" and (block.get("text") or "").strip()
+    ]
+
+
+# ---------------------------------------------------------
+# Sentence shaping (memoized per slide)
+# ---------------------------------------------------------
+@lru_cache(maxsize=None)
+def _memo_version() -> str:
+    return source_version(prompts_for_2_6, _validation, _segmentation, _preservation)
+
+
+def _sentence_blocks(validated: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"sentences": sb["sentences"], "word_count": sb["word_count"]}
+        for sb in validated.get("sentence_blocks", [])
+    ]
+
+
+def _shape_one(llm: LLMClient, source_text: str) -> List[Dict[str, Any]]:
+    # Validated inside the gateway: rejected shaping is retried, never cached.
+    raw = llm.call(
+        sentence_shaping_prompt(source_text),
+        validate=lambda data: validate_sentence_shaping(data, source_text),
+    )
+    return _sentence_blocks(validate_sentence_shaping(raw, source_text))
+
+
+def _shape_paragraphs(llm: LLMClient, source_texts: List[str]) -> List[List[Dict[str, Any]]]:
+    """
+    Validated sentence_blocks for each paragraph of one slide. A slide
+    whose paragraphs are unchanged reuses its stored shaping.
+    """
+    def compute() -> List[List[Dict[str, Any]]]:
+        return [_shape_one(llm, source_text) for source_text in source_texts]
+
+    if not source_texts:
+        return []
+    return memoized_slide("stage2_6", {"paragraphs": source_texts}, compute, version=_memo_version())
+
+
+# ---------------------------------------------------------
+# Packed mode: many paragraphs per request
+# ---------------------------------------------------------
+DEFAULT_PACK_TOKEN_BUDGET = 0
+
+# Packed rounds for blocks that failed validation before they fall back
+# to one request each.
+PACK_RETRIES = 1
+
+
+def _pack_token_budget() -> int:
+    """
+    Source-text tokens per packed request from settings.yaml
+    (stage2_6.pack_token_budget). 0 = one request per paragraph.
+    """
+    stage_settings = load_settings().get("stage2_6", {}) or {}
+    return max(0, int(stage_settings.get("pack_token_budget", DEFAULT_PACK_TOKEN_BUDGET)))
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def _pack(paragraphs: List[Tuple[str, str]], budget: int) -> List[List[Tuple[str, str]]]:
+    """Consecutive (block_id, text) pairs, up to `budget` tokens per pack."""
+    packs: List[List[Tuple[str, str]]] = []
+    current: List[Tuple[str, str]] = []
+    used = 0
+
+    for block_id, text in paragraphs:
+        tokens = _estimate_tokens(text)
+        if current and used + tokens > budget:
+            packs.append(current)
+            current, used = [], 0
+        current.append((block_id, text))
+        used += tokens
+
+    if current:
+        packs.append(current)
+    return packs
+
+
+def _shape_packed(
+    llm: LLMClient,
+    paragraphs: List[Tuple[str, str]],
+    *,
+    budget: int,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Shape (block_id, text) pairs with packed prompts. Each block is
+    validated on its own; only blocks that fail are re-sent. A pack that
+    failed as a whole would be re-sent byte-identical (a cache hit), so
+    its blocks go straight to the single-paragraph prompt.
+    """
+    shaped: Dict[str, List[Dict[str, Any]]] = {}
+    pending = list(paragraphs)
+    single: List[Tuple[str, str]] = []
+
+    for _ in range(1 + PACK_RETRIES):
+        if not pending:
+            break
+
+        failed: List[Tuple[str, str]] = []
+        for pack in _pack(pending, budget):
+            pack_failed: List[Tuple[str, str]] = []
+            with span("pack", kind="llm_pack", blocks=len(pack)):
+                raw = llm.call(sentence_shaping_batch_prompt(pack))
+
+            panels = raw.get("panels") if isinstance(raw, dict) else None
+            by_id = {
+                entry.get("block_id"): entry
+                for entry in (panels if isinstance(panels, list) else [])
+                if isinstance(entry, dict)
+            }
+
+            for block_id, text in pack:
+                entry = by_id.get(block_id) or {}
+                try:
+                    validated = validate_sentence_shaping(
+                        {"sentence_shaping": entry.get("sentence_shaping")}, text
+                    )
+                except ValueError:
+                    pack_failed.append((block_id, text))
+                    continue
+                shaped[block_id] = _sentence_blocks(validated)
+
+            if len(pack_failed) == len(pack):
+                single.extend(pack_failed)
+            else:
+                failed.extend(pack_failed)
+
+        pending = failed
+
+    # Still invalid: the single-paragraph prompt (its error propagates)
+    leftover = {block_id for block_id, _ in single + pending}
+    for block_id, text in paragraphs:
+        if block_id in leftover:
+            shaped[block_id] = _shape_one(llm, text)
+
+    return shaped
+
+
+def _shape_slides_packed(
+    llm: LLMClient,
+    texts_by_slide: Dict[str, List[str]],
+    *,
+    budget: int,
+) -> Dict[str, List[List[Dict[str, Any]]]]:
+    """
+    _shape_paragraphs for many slides at once: slides without a stored
+    result have their paragraphs packed together across slides.
+    """
+    version = _memo_version()
+    results: Dict[str, List[List[Dict[str, Any]]]] = {}
+    paragraphs: List[Tuple[str, str]] = []
+
+    for slide_id, texts in texts_by_slide.items():
+        stored = lookup_slide("stage2_6", {"paragraphs": texts}, version=version) if texts else []
+        if stored is not None:
+            results[slide_id] = stored
+            continue
+        paragraphs.extend((f"{slide_id}__p{i:02d}", text) for i, text in enumerate(texts, start=1))
+
+    shaped = _shape_packed(llm, paragraphs, budget=budget)
+
+    for slide_id, texts in texts_by_slide.items():
+        if slide_id in results:
+            continue
+        results[slide_id] = [shaped[f"{slide_id}__p{i:02d}"] for i in range(1, len(texts) + 1)]
+        store_slide("stage2_6", {"paragraphs": texts}, results[slide_id], version=version)
+
+    return results
+
+
 # ---------------------------------------------------------
 # Stage 2.6 — Sentence Structuring (MODULE MUTATION)
 # ---------------------------------------------------------
+def _apply_shaping(
+    slide: Dict[str, Any],
+    slide_id: str,
+    llm: LLMClient,
+    shaped_paragraphs: Optional[List[List[Dict[str, Any]]]],
+) -> None:
+    """Replace one slide's paragraph blocks with sentence_blocks."""
+    content = slide.get("content", {})
+    blocks = content.get("blocks", [])
+
+    if not isinstance(blocks, list):
+        return
+
+    if shaped_paragraphs is None:
+        shaped_paragraphs = _shape_paragraphs(llm, _source_texts(slide))
+    shaped = iter(shaped_paragraphs)
+
+    new_blocks: List[Dict[str, Any]] = []
+    sb_index = 0
+
+    for block in blocks:
+        if block.get("type") != "paragraph":
+            # Preserve bullets / other blocks verbatim
+            new_blocks.append(block)
+            continue
+
+        source_text = (block.get("text") or "").strip()
+        if not source_text:
+            continue
+
+        for sb in next(shaped):
+            sb_index += 1
+            new_blocks.append({
+                "type": "sentence_block",
+                "block_id": f"{slide_id}__sb{sb_index:02d}",
+                "sentences": sb["sentences"],
+                "word_count": sb["word_count"],
+                "source_text": source_text,
+            })
+
+    slide["content"]["blocks"] = new_blocks
+
+
+@traced("stage2_6")
+@with_usage_summary("stage2_6")
+@with_stage_deadline("stage2_6")
 def run_stage2_6(
     module: Dict[str, Any],
     llm: LLMClient,
+    *,
+    pack_token_budget: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    journal: Optional[CheckpointJournal] = None,
 ) -> Dict[str, Any]:
     """
     Stage 2.6 MUTATES the module in-place.
@@ -41,75 +306,109 @@ def run_stage2_6(
     - Preserves slide order, IDs, notes, quiz markers
     - NEVER changes engage slides
     - NEVER drops bullets
+
+    pack_token_budget > 0 (default: settings) packs paragraphs from many
+    slides into each request. Otherwise slides are shaped concurrently
+    (max_workers, default stage2_6.slide_max_workers).
+
+    With a journal, each shaped slide is journaled as it completes and
+    journaled slides are replayed (and left out of packing).
     """
 
     slides = module.get("slides", [])
     if not isinstance(slides, list):
         raise ValueError("Stage 2.6 invariant failed: slides must be a list")
 
-    for slide in slides:
-        slide_id = slide.get("id") or slide.get("uuid")
-        if not slide_id:
-            raise ValueError("Stage 2.6 invariant failed: slide missing id")
+    if pack_token_budget is None:
+        pack_token_budget = _pack_token_budget()
 
-        slide_type = slide.get("slide_type") or slide.get("type")
+    targets = [s for s in slides if _is_shaping_target(s)]
+    if journal is not None:
+        targets = [s for s in targets if not journal.has(_slide_id(s), s)]
 
-        notes_lower = (slide.get("notes") or "").lower()
-        if "[[locked]]" in notes_lower:
-            continue
+    packed: Dict[str, List[List[Dict[str, Any]]]] = {}
+    if pack_token_budget > 0:
+        packed = _shape_slides_packed(
+            llm,
+            {_slide_id(s): _source_texts(s) for s in targets},
+            budget=pack_token_budget,
+        )
 
-        # Only mutate panels
-        if slide_type != "panel":
-            continue
+    if max_workers is None:
+        max_workers = slide_max_workers("stage2_6")
+
+    def _run(slide: Dict[str, Any]) -> None:
+        slide_id = _slide_id(slide)
+        with span("slide", kind="slide", slide_id=slide_id):
+            if not _is_shaping_target(slide):
+                return
+            if journal is None:
+                _apply_shaping(slide, slide_id, llm, packed.get(slide_id))
+                return
+            journal.run_in_place(
+                slide_id,
+                slide,
+                lambda: _apply_shaping(slide, slide_id, llm, packed.get(slide_id)),
+            )
+
+    # Each worker mutates only its own slide, so order is untouched.
+    run_bounded(_run, slides, max_workers=max_workers, thread_name_prefix="stage2_6-slide")
 
-        content = slide.get("content", {})
-        blocks = content.get("blocks", [])
+    return module
 
-        if not isinstance(blocks, list):
+
+# ---------------------------------------------------------
+# Batch API input
+# ---------------------------------------------------------
+def collect_batch_items(module: Dict[str, Any]) -> List[BatchItem]:
+    """
+    One sentence-shaping request per paragraph block that run_stage2_6
+    would send, identical to the realtime request (see llm_dispatch).
+    """
+    from src.stage2_5.run_stage2_5 import dispatch_request
+
+    items: List[BatchItem] = []
+
+    for slide in module.get("slides", []) or []:
+        slide_id = _slide_id(slide)
+        if not _is_shaping_target(slide):
             continue
 
-        new_blocks: List[Dict[str, Any]] = []
-        sb_index = 0
+        blocks = (slide.get("content") or {}).get("blocks", [])
+        if not isinstance(blocks, list):
+            continue
 
-        for block in blocks:
+        for idx, block in enumerate(blocks):
             if block.get("type") != "paragraph":
-                # Preserve bullets / other blocks verbatim
-                new_blocks.append(block)
                 continue
 
             source_text = (block.get("text") or "").strip()
             if not source_text:
                 continue
 
-            prompt = sentence_shaping_prompt(source_text)
-            raw = llm.call(prompt)
-            validated = validate_sentence_shaping(raw, source_text)
-
-            for sb in validated.get("sentence_blocks", []):
-                sb_index += 1
-                new_blocks.append({
-                    "type": "sentence_block",
-                    "block_id": f"{slide_id}__sb{sb_index:02d}",
-                    "sentences": sb["sentences"],
-                    "word_count": sb["word_count"],
-                    "source_text": source_text,
-                })
+            items.append(BatchItem(
+                custom_id=f"stage2_6:{slide_id}:block_{idx}",
+                request=dispatch_request(sentence_shaping_prompt(source_text)),
+                # Same acceptance as _shape_one: rejected shaping is never cached.
+                validate=lambda data, text=source_text: validate_sentence_shaping(data, text),
+            ))
 
-        slide["content"]["blocks"] = new_blocks
-
-    return module
+    return items
 
 
 # ---------------------------------------------------------
 # CLI entry
 # ---------------------------------------------------------
 def main(argv: list[str]) -> int:
+    resume = "--resume" in argv
+    argv = [a for a in argv if a != "--resume"]
+
     if len(argv) != 3:
         print(
             "Usage:\n"
             "  python -m src.stage2_6.runner "
             "<module_stage2_after_2_5.json> "
-            "<out_module_stage2_after_2_6.json>"
+            "<out_module_stage2_after_2_6.json> [--resume]"
         )
         return 2
 
@@ -121,8 +420,11 @@ def main(argv: list[str]) -> int:
     from src.stage2_5.run_stage2_5 import llm_dispatch
     llm = LLMClient(llm_dispatch)
 
-    result = run_stage2_6(module, llm)
+    # --resume replays slides journaled by an interrupted run
+    journal = open_journal(out_path, resume=resume)
+    result = run_stage2_6(module, llm, journal=journal)
     write_json(out_path, result)
+    journal.discard()
 
     print(f"✅ Stage 2.6 complete → {out_path}")
     return 0
@@ -1,6 +1,9 @@
 from typing import Dict, Any, List
 import re
 
+from src.utils.sentences import split_sentences
+from src.utils.text_preservation import check_preserved
+
 WORD_RE = re.compile(r"\b\w+\b", re.UNICODE)
 
 def _word_count(text: str) -> int:
@@ -23,11 +26,7 @@ def validate_sentence_shaping(
 
     # ✅ NO-OP CASE
     if not isinstance(groups, list) or len(groups) == 0:
-        sentences = [
-            s.strip()
-            for s in re.split(r'(?<=[.!?])\s+', normalized_source)
-            if s.strip()
-        ]
+        sentences = split_sentences(normalized_source)
         return {
             "sentence_blocks": [
                 {
@@ -37,8 +36,7 @@ def validate_sentence_shaping(
             ]
         }
 
-    used_text_parts: List[str] = []
-    sentence_blocks: List[Dict[str, Any]] = []
+    cleaned_groups: List[List[str]] = []
 
     for i, group in enumerate(groups, start=1):
         sentences = group.get("sentences")
@@ -52,12 +50,21 @@ def validate_sentence_shaping(
         for s in sentences:
             if not isinstance(s, str) or not s.strip():
                 raise ValueError(f"Invalid sentence in group {i}.")
-            s_clean = " ".join(s.split())
-            if s_clean not in normalized_source:
-                raise ValueError(f"Sentence not found verbatim in source text:\n{s}")
-            cleaned.append(s_clean)
-            used_text_parts.append(s_clean)
+            cleaned.append(" ".join(s.split()))
+        cleaned_groups.append(cleaned)
+
+    # One linear pass over the source for every sentence of every group.
+    used_text_parts = [s for cleaned in cleaned_groups for s in cleaned]
+    preservation = check_preserved(used_text_parts, normalized_source)
+    if not preservation.ok:
+        raise ValueError(
+            f"Sentence not found verbatim in source text:\n"
+            f"{preservation.describe(preservation.missing[0])}"
+        )
+
+    sentence_blocks: List[Dict[str, Any]] = []
 
+    for i, cleaned in enumerate(cleaned_groups, start=1):
         wc = _word_count(" ".join(cleaned))
         if wc < 5:
             raise ValueError(f"Group {i} is implausibly short ({wc} words).")
@@ -1,4 +1,7 @@
-import json
+from typing import Callable, Optional
+
+from src.utils.llm_gateway import LLMGateway, LLMRequest
+from src.utils.output_schema import OutputSchema, array, enum, null, obj, string
 
 MODEL_NAME = "gpt-4o"
 SYSTEM_PROMPT = (
@@ -80,27 +83,56 @@ SOURCE_TEXT:
 """
 
 
-def _strip_code_fences(text: str) -> str:
-    """
-    Remove ``` or ```json fences from LLM output if present.
-    """
-    text = text.strip()
-
-    # Remove opening fence
-    if text.startswith("```"):
-        text = text.split("\n", 1)[1]
-
-    # Remove closing fence
-    if text.endswith("```"):
-        text = text.rsplit("\n", 1)[0]
-
-    return text.strip()
-
-
-def synthesize_engage(source_text: str, engage_type: str, client) -> dict:
+ENGAGE_OUTPUT_SCHEMAS = {
+    "engage": OutputSchema(
+        name="engage1",
+        schema=obj({
+            "type": enum("engage"),
+            "intro": obj({"text": string()}),
+            "items": array(obj({
+                "button_label": string(),
+                "text": string(),
+                "image": null(),
+            })),
+        }),
+    ),
+    "engage2": OutputSchema(
+        name="engage2",
+        schema=obj({
+            "type": enum("engage2"),
+            "intro": obj({"text": string()}),
+            "steps": array(obj({"text": string()})),
+            "button_label": string(),
+        }),
+    ),
+}
+
+
+def _validate_engage_structure(engage_type: str) -> Callable[[dict], None]:
+    def _validate(data: dict) -> None:
+        # Lightweight structural assertions
+        if engage_type == "engage":
+            assert "intro" in data and "items" in data, "Invalid Engage 1 structure"
+        elif engage_type == "engage2":
+            assert "intro" in data and "steps" in data, "Invalid Engage 2 structure"
+
+    return _validate
+
+
+def synthesize_engage(
+    source_text: str,
+    engage_type: str,
+    client: LLMGateway,
+    *,
+    validate: Optional[Callable[[dict], None]] = None,
+) -> dict:
     """
     Call LLM to synthesize an Engage 1 or Engage 2 block.
     Text-frozen: no paraphrasing allowed.
+
+    `client` is the shared LLM gateway (None means LLM disabled).
+    `validate` (raises on rejection) runs after the structural check inside
+    the gateway, so rejected output is retried and never cached.
     """
 
     if client is None:
@@ -113,28 +145,28 @@ def synthesize_engage(source_text: str, engage_type: str, client) -> dict:
     else:
         raise ValueError(f"Unknown engage_type: {engage_type}")
 
-    response = client.chat.completions.create(
-        model=MODEL_NAME,
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0
+    return client.complete_json(
+        LLMRequest(
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            model=MODEL_NAME,
+            temperature=0,
+            stage_tag=f"Stage 2.7 Engage ({engage_type})",
+            response_schema=ENGAGE_OUTPUT_SCHEMAS[engage_type],
+        ),
+        validate=_with_check(_validate_engage_structure(engage_type), validate),
     )
 
-    content = response.choices[0].message.content
-
-    print("\n--- RAW LLM OUTPUT ---")
-    print(content)
-    print("--- END RAW LLM OUTPUT ---\n")
 
-    clean = _strip_code_fences(content)
-    data = json.loads(clean)
-
-    # Lightweight structural assertions
-    if engage_type == "engage":
-        assert "intro" in data and "items" in data, "Invalid Engage 1 structure"
-    elif engage_type == "engage2":
-        assert "intro" in data and "steps" in data, "Invalid Engage 2 structure"
+def _with_check(
+    structure: Callable[[dict], None],
+    check: Optional[Callable[[dict], None]],
+) -> Callable[[dict], None]:
+    def _validate(data: dict) -> None:
+        structure(data)
+        if check is not None:
+            check(data)
 
-    return data
+    return _validate
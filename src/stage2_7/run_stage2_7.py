@@ -1,8 +1,6 @@
 from pathlib import Path
-import os
-from dotenv import load_dotenv
 
-from openai import OpenAI
+from src.utils.llm_gateway import get_gateway
 
 from .runner import run_stage2_7
 
@@ -21,21 +19,25 @@ def main():
         help="Enable OpenAI-based engage synthesis (requires OPENAI_API_KEY).",
     )
 
+    p.add_argument(
+        "--resume",
+        action="store_true",
+        help="Replay slides journaled by an interrupted run; synthesize only the rest.",
+    )
+
     args = p.parse_args()
 
     client = None
 
     if args.use_llm:
-        load_dotenv()
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise RuntimeError("OPENAI_API_KEY not found in .env (required when --use-llm is set)")
-        client = OpenAI(api_key=api_key)
+        client = get_gateway()
+        client.client("openai")  # fail fast if OPENAI_API_KEY is missing
 
     run_stage2_7(
         in_path=args.in_json,
         out_path=args.out_json,
         client=client,  # may be None
+        resume=args.resume,
     )
 
 
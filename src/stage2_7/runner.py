@@ -1,8 +1,20 @@
 import json
-import re
+import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any
 
+from src.utils import sentences as _segmentation, text_preservation as _preservation
+from src.utils.checkpoint import open_journal
+from src.utils.concurrency import run_bounded, slide_max_workers
+from src.utils.retry_policy import with_stage_deadline
+from src.utils.sentences import split_sentences
+from src.utils.slide_memo import memoized_slide, source_version
+from src.utils.text_preservation import PreservationReport, check_preserved
+from src.utils.token_logger import with_usage_summary
+from src.utils.tracing import span, traced
+
+from . import llm_engage
 from .llm_engage import synthesize_engage
 
 
@@ -54,9 +66,10 @@ def _norm(s: str) -> str:
 
 def _sentences(text: str) -> list[str]:
     text = _norm(text)
-    return [_norm(s) for s in re.split(r'(?<=[.!?])\s+', text) if _norm(s)]
+    return [_norm(s) for s in split_sentences(text) if _norm(s)]
 
-def _all_sentences_preserved(source: str, engage_block: dict) -> bool:
+def _sentence_preservation(source: str, engage_block: dict) -> PreservationReport:
+    """How often and where each source sentence occurs in the engage block's text."""
     source_sents = _sentences(source)
     output_texts = []
 
@@ -81,7 +94,19 @@ def _all_sentences_preserved(source: str, engage_block: dict) -> bool:
             output_texts.append(step.get("text", ""))
 
     combined = _norm(" ".join(output_texts))
-    return all(_norm(sent) in combined for sent in source_sents)
+    return check_preserved(source_sents, combined, count_all=True)
+
+def _duplicated_sentences(preservation: PreservationReport) -> list[int]:
+    """
+    Source sentences the engage block repeats: occurring more often than
+    in the source itself (a sentence the source repeats may repeat).
+    """
+    repeated = preservation.repeated
+    if not repeated:
+        return []
+    source = " ".join(preservation.fragments)
+    expected = check_preserved(preservation.fragments, source, count_all=True).counts
+    return [i for i in repeated if preservation.counts[i] > expected[i]]
 
 def _is_intro_framing_sentence(
     sentence: str,
@@ -168,130 +193,220 @@ def _normalize_engage1_shape(engage_block: Dict[str, Any]) -> Dict[str, Any]:
         "items": items
     }
 
-def run_stage2_7(in_path: Path, out_path: Path, client) -> None:
-    """
-    Stage 2.7 runner (SIGNAL-DRIVEN):
 
-    - Applies engage synthesis ONLY when explicitly instructed
-    - Honors [[LOCKED]]
-    - NEVER infers pedagogy
-    """
+@lru_cache(maxsize=None)
+def _memo_version() -> str:
+    return source_version(sys.modules[__name__], llm_engage, _segmentation, _preservation)
 
-    module: Dict[str, Any] = json.loads(in_path.read_text(encoding="utf-8"))
 
-    slides = module.get("slides", [])
-    if not isinstance(slides, list):
-        raise ValueError("module.slides must be a list")
+def _checked_engage_block(
+    raw: Dict[str, Any],
+    *,
+    source_text: str,
+    engage_type: str,
+    slide_id: str,
+) -> Dict[str, Any]:
+    """
+    Normalized engage block for raw LLM output. ValueError on sentence
+    loss or a repeated sentence (the gateway retries it on the parse budget
+    and never caches it).
+    """
+    # ----------------------------------
+    # 7️⃣ Normalize Engage 1 shape
+    # ----------------------------------
+    engage_block = _normalize_engage1_shape(raw) if engage_type == "engage" else raw
+
+    # ----------------------------------
+    # 8️⃣ HARD GUARANTEE: every sentence exactly once
+    # ----------------------------------
+    preservation = _sentence_preservation(source_text, engage_block)
+    if not preservation.ok:
+        raise ValueError(
+            f"Stage 2.7 ERROR: Sentence loss detected in slide {slide_id}\n"
+            f"{preservation.describe_missing()}"
+        )
+    duplicated = _duplicated_sentences(preservation)
+    if duplicated:
+        raise ValueError(
+            f"Stage 2.7 ERROR: Repeated sentences in slide {slide_id}\n"
+            + "\n".join(f"- {preservation.fragments[i]} (x{preservation.counts[i]})" for i in duplicated)
+        )
+    return engage_block
 
-    for slide in slides:
-        slide_id = slide.get("uuid") or slide.get("id")
-        if not slide_id:
-            raise ValueError("Stage 2.7 invariant failed: slide missing uuid/id")
-        print(f"\n--- SLIDE {slide_id} ---")
 
+def _synthesize_checked(*, source_text: str, engage_type: str, client, slide_id: str) -> Dict[str, Any]:
+    """
+    Engage synthesis for one slide. Unchanged source text + engage type
+    reuses the stored (already verified) engage block.
+    """
+    def check(raw: Dict[str, Any]) -> Dict[str, Any]:
+        return _checked_engage_block(
+            raw, source_text=source_text, engage_type=engage_type, slide_id=slide_id,
+        )
+
+    def compute() -> Dict[str, Any]:
         # ----------------------------------
-        # 1️⃣ Read notes + normalize
+        # 6️⃣ Call LLM (checks 7️⃣–8️⃣ run inside the gateway)
         # ----------------------------------
-        notes_sources = [
-            slide.get("notes", ""),
-            slide.get("intro", {}).get("notes", "")
-        ]
-        notes_lower = " ".join(n for n in notes_sources if isinstance(n, str)).lower()
+        raw = synthesize_engage(
+            source_text=source_text,
+            engage_type=engage_type,
+            client=client,
+            validate=check,
+        )
 
+        print("LLM RETURNED:", raw.keys())
+        return check(raw)
 
-        # ----------------------------------
-        # 2️⃣ HARD STOP: LOCKED slides
-        # ----------------------------------
-        if "[[locked]]" in notes_lower:
-            print("SKIPPED — LOCKED")
-            continue
+    return memoized_slide(
+        "stage2_7",
+        {"engage_type": engage_type, "source_text": source_text},
+        compute,
+        version=_memo_version(),
+    )
 
-        # ----------------------------------
-        # 3️⃣ Explicit engage creation signals
-        # ----------------------------------
-        if "[[create:engage1]]" in notes_lower:
-            engage_type = "engage"
-        elif "[[create:engage2]]" in notes_lower:
-            engage_type = "engage2"
-        else:
-            print("NO ENGAGE SIGNAL — PASS THROUGH")
-            continue  # 🚫 No signal → no synthesis
 
-        print(f"ENGAGE SYNTHESIS REQUESTED: {engage_type}")
+def _process_slide(slide: Dict[str, Any], client) -> None:
+    """Synthesize one signalled slide in place (independent of every other slide)."""
+    slide_id = slide.get("uuid") or slide.get("id")
+    if not slide_id:
+        raise ValueError("Stage 2.7 invariant failed: slide missing uuid/id")
+    print(f"\n--- SLIDE {slide_id} ---")
+
+    # ----------------------------------
+    # 1️⃣ Read notes + normalize
+    # ----------------------------------
+    notes_sources = [
+        slide.get("notes", ""),
+        slide.get("intro", {}).get("notes", "")
+    ]
+    notes_lower = " ".join(n for n in notes_sources if isinstance(n, str)).lower()
+
+
+    # ----------------------------------
+    # 2️⃣ HARD STOP: LOCKED slides
+    # ----------------------------------
+    if "[[locked]]" in notes_lower:
+        print(f"[{slide_id}] SKIPPED — LOCKED")
+        return
+
+    # ----------------------------------
+    # 3️⃣ Explicit engage creation signals
+    # ----------------------------------
+    if "[[create:engage1]]" in notes_lower:
+        engage_type = "engage"
+    elif "[[create:engage2]]" in notes_lower:
+        engage_type = "engage2"
+    else:
+        print(f"[{slide_id}] NO ENGAGE SIGNAL — PASS THROUGH")
+        return  # 🚫 No signal → no synthesis
+
+    print(f"[{slide_id}] ENGAGE SYNTHESIS REQUESTED: {engage_type}")
+
+    # ----------------------------------
+    # 4️⃣ Fail fast if LLM unavailable
+    # ----------------------------------
+    if client is None:
+        raise RuntimeError(
+            f"Stage 2.7 requires LLM client for slide {slide_id}"
+        )
 
-        # ----------------------------------
-        # 4️⃣ Fail fast if LLM unavailable
-        # ----------------------------------
-        if client is None:
-            raise RuntimeError(
-                f"Stage 2.7 requires LLM client for slide {slide_id}"
-            )
+    # ----------------------------------
+    # 5️⃣ Extract source text
+    # ----------------------------------
+    source_text = _extract_source_text(slide)
+    print(f"[{slide_id}] SOURCE TEXT LENGTH: {len(source_text)}")
+
+    if not source_text:
+        print(f"[{slide_id}] NO SOURCE TEXT — SKIPPING")
+        return
+
+    # ----------------------------------
+    # 6️⃣–8️⃣ Call LLM, normalize, check (memoized per slide)
+    # ----------------------------------
+    engage_block = _synthesize_checked(
+        source_text=source_text,
+        engage_type=engage_type,
+        client=client,
+        slide_id=slide_id,
+    )
 
-        # ----------------------------------
-        # 5️⃣ Extract source text
-        # ----------------------------------
-        source_text = _extract_source_text(slide)
-        print("SOURCE TEXT LENGTH:", len(source_text))
+    # ----------------------------------
+    # 9️⃣ Replace slide structure (by type)
+    # ----------------------------------
+    slide["type"] = engage_type
+    slide["intro"] = engage_block.get("intro")
+
+    if engage_type == "engage":
+        slide["items"] = engage_block.get("items", [])
+
+    elif engage_type == "engage2":
+        slide["steps"] = engage_block.get("steps", [])
+        slide["button_label"] = engage_block.get("button_label", "Next")
+
+    # Optional: strip create signal after use
+    notes = slide.get("notes", "") if isinstance(slide.get("notes"), str) else ""
+    slide["notes"] = (
+        notes.replace("[[create:engage1]]", "")
+            .replace("[[create:engage2]]", "")
+            .strip()
+    )
 
-        if not source_text:
-            print("NO SOURCE TEXT — SKIPPING")
-            continue
+    # ----------------------------------
+    # 🔧 Clean incompatible legacy fields
+    # ----------------------------------
+    for k in ("content", "pages", "english_text", "english_text_raw"):
+        slide.pop(k, None)
+
+
+@traced("stage2_7")
+@with_usage_summary("stage2_7")
+@with_stage_deadline("stage2_7")
+def run_stage2_7(
+    in_path: Path,
+    out_path: Path,
+    client,
+    *,
+    max_workers: int | None = None,
+    resume: bool = False,
+) -> None:
+    """
+    Stage 2.7 runner (SIGNAL-DRIVEN):
 
-        # ----------------------------------
-        # 6️⃣ Call LLM
-        # ----------------------------------
-        engage_block = synthesize_engage(
-            source_text=source_text,
-            engage_type=engage_type,
-            client=client
-        )
+    - Applies engage synthesis ONLY when explicitly instructed
+    - Honors [[LOCKED]]
+    - NEVER infers pedagogy
+    - Slides run concurrently (max_workers, default stage2_7.slide_max_workers)
+    - Finished slides are journaled next to out_path; resume=True replays
+      them after an interrupted run
+    """
 
-        print("LLM RETURNED:", engage_block.keys())
+    module: Dict[str, Any] = json.loads(in_path.read_text(encoding="utf-8"))
 
-        # ----------------------------------
-        # 7️⃣ Normalize Engage 1 shape
-        # ----------------------------------
-        if engage_type == "engage":
-            engage_block = _normalize_engage1_shape(engage_block)
+    slides = module.get("slides", [])
+    if not isinstance(slides, list):
+        raise ValueError("module.slides must be a list")
 
-        # ----------------------------------
-        # 8️⃣ HARD GUARANTEE: no sentence loss
-        # ----------------------------------
-        if not _all_sentences_preserved(source_text, engage_block):
-            raise RuntimeError(
-                f"Stage 2.7 ERROR: Sentence loss detected in slide {slide_id}"
-            )
+    if max_workers is None:
+        max_workers = slide_max_workers("stage2_7")
 
-        # ----------------------------------
-        # 9️⃣ Replace slide structure (by type)
-        # ----------------------------------
-        slide["type"] = engage_type
-        slide["intro"] = engage_block.get("intro")
-
-        if engage_type == "engage":
-            slide["items"] = engage_block.get("items", [])
-
-        elif engage_type == "engage2":
-            slide["steps"] = engage_block.get("steps", [])
-            slide["button_label"] = engage_block.get("button_label", "Next")
-
-        # Optional: strip create signal after use
-        notes = slide.get("notes", "") if isinstance(slide.get("notes"), str) else ""
-        slide["notes"] = (
-            notes.replace("[[create:engage1]]", "")
-                .replace("[[create:engage2]]", "")
-                .strip()
-        )
+    journal = open_journal(out_path, resume=resume)
 
-        # ----------------------------------
-        # 🔧 Clean incompatible legacy fields
-        # ----------------------------------
-        for k in ("content", "pages", "english_text", "english_text_raw"):
-            slide.pop(k, None)
+    def _run(slide: Dict[str, Any]) -> None:
+        slide_id = slide.get("uuid") or slide.get("id")
+        with span("slide", kind="slide", slide_id=slide_id):
+            if not slide_id:
+                _process_slide(slide, client)  # raises: missing uuid/id
+                return
+            journal.run_in_place(slide_id, slide, lambda: _process_slide(slide, client))
+
+    # Each worker mutates only its own slide, so order is untouched.
+    run_bounded(_run, slides, max_workers=max_workers, thread_name_prefix="stage2_7-slide")
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
     out_path.write_text(
         json.dumps(module, indent=2, ensure_ascii=False),
         encoding="utf-8"
     )
+    journal.discard()
 
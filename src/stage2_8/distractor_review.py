@@ -3,7 +3,10 @@ from __future__ import annotations
 import json
 from typing import Any, Dict, List
 
-from .distractor_review_prompts import DISTRACTOR_REVIEW_SYSTEM_PROMPT
+from .distractor_review_prompts import (
+    DISTRACTOR_REVIEW_OUTPUT,
+    DISTRACTOR_REVIEW_SYSTEM_PROMPT,
+)
 from .llm_call import call_llm_json
 from .logger import logger
 
@@ -54,18 +57,14 @@ def distractor_review(
         "quiz": filtered_payload
     }
 
-    prompt = (
-        DISTRACTOR_REVIEW_SYSTEM_PROMPT
-        + "\n\n"
-        + json.dumps(user_prompt, ensure_ascii=False, indent=2)
-    )
-
     # -------------------------------------------------
-    # Call LLM reviewer
+    # Call LLM reviewer (fixed instructions first: cacheable prefix)
     # -------------------------------------------------
     result = call_llm_json(
-        prompt=prompt,
+        prompt=json.dumps(user_prompt, ensure_ascii=False, indent=2),
+        shared_prefix=DISTRACTOR_REVIEW_SYSTEM_PROMPT,
         stage_tag="Stage 2.8 Distractor Reviewer",
+        response_schema=DISTRACTOR_REVIEW_OUTPUT,
     )
 
     status = result.get("status", "UNKNOWN")
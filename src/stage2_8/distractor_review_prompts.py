@@ -1,3 +1,5 @@
+from .review_prompts import review_output_schema
+
 DISTRACTOR_REVIEW_SYSTEM_PROMPT = """
 You are an expert reviewer of multiple-choice exam questions.
 
@@ -142,4 +144,6 @@ If all questions are acceptable:
   "status": "PASS",
   "issues": []
 }
-"""
\ No newline at end of file
+"""
+
+DISTRACTOR_REVIEW_OUTPUT = review_output_schema("distractor_review")
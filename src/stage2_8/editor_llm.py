@@ -3,8 +3,11 @@ from __future__ import annotations
 import json
 from typing import Dict, Any
 
+from src.utils.output_schema import OutputSchema, obj
+
 from .llm_call import call_llm_json
 from .logger import logger
+from .prompts_author_single import QUESTION_FIELDS
 
 
 SINGLE_QUESTION_EDITOR_PROMPT = """You are an expert medical educator and assessment editor.
@@ -48,6 +51,13 @@ Return ONLY valid JSON.
 """
 
 
+EDITOR_SINGLE_OUTPUT = OutputSchema(
+    name="edited_question",
+    schema=obj(QUESTION_FIELDS, optional=("options",)),
+    optional_keys=("options",),
+)
+
+
 def run_editor_llm_single_question(
     *,
     question: Dict[str, Any],
@@ -68,8 +78,10 @@ def run_editor_llm_single_question(
     }
 
     edited = call_llm_json(
-        prompt=SINGLE_QUESTION_EDITOR_PROMPT + "\n\n" + json.dumps(payload, ensure_ascii=False),
+        prompt=json.dumps(payload, ensure_ascii=False),
+        shared_prefix=SINGLE_QUESTION_EDITOR_PROMPT,
         stage_tag="Stage 2.8 Editor (single-question)",
+        response_schema=EDITOR_SINGLE_OUTPUT,
     )
 
     # -------------------------------------------------
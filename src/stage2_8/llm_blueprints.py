@@ -1,11 +1,12 @@
 # src/stage2_8/llm_blueprints.py
 from __future__ import annotations
 
+import copy
 from typing import Any, Dict, List, Optional
 
 from .logger import logger
 from .llm_call import call_llm_json
-from .prompts_blueprints import PASS2_SYSTEM_PROMPT, build_pass2_user_prompt
+from .prompts_blueprints import PASS2_OUTPUT, PASS2_SYSTEM_PROMPT, build_pass2_user_prompt
 from .validate_blueprints_roles import validate_pass2_blueprints
 
 
@@ -158,70 +159,17 @@ def _rebalance_blueprint_roles(
 
     return changed
 
-def generate_question_blueprints(
+
+def _checked_blueprints(
+    parsed: Dict[str, Any],
     *,
     quiz_id: int,
-    source_claims_payload: Dict[str, Any],
-    # ✅ NEW (preferred): derived from the Word marker [[QUIZ:...:QUESTIONS=a,b]]
-    inline_direct_questions: Optional[int] = None,
-    final_direct_questions: Optional[int] = None,
-    module_application_questions: int = 1,
-    # ✅ Legacy support (avoid breaking callers immediately)
-    total_questions: Optional[int] = None,
+    expected: Dict[str, int],
 ) -> Dict[str, Any]:
     """
-    Pass 2: Produce assessment blueprints only (no final wording).
-
-    Updated behavior:
-      - No hardcoded counts.
-      - Prefer passing inline_direct_questions and final_direct_questions from the
-        parsed marker [[QUIZ:...:QUESTIONS=a,b]].
-      - Always expects module_application_questions (default 1).
-      - Validates role counts + role constraints via validate_pass2_blueprints().
+    Pass 2 output after the role checks and the deterministic role
+    rebalance (in place). ValueError when strict role counts still fail.
     """
-
-    expected = _extract_role_expectations(
-        inline_direct_questions=inline_direct_questions,
-        final_direct_questions=final_direct_questions,
-        module_application_questions=module_application_questions,
-        total_questions=total_questions,
-    )
-
-    # If caller still passes total_questions while also passing split counts, we ignore total_questions.
-    if expected["strict_role_counts"] and total_questions is not None:
-        logger.warning(
-            f"[Pass2] quiz_id={quiz_id} received total_questions={total_questions} "
-            f"but using split counts inline={inline_direct_questions}, final={final_direct_questions} "
-            f"+ module_application={module_application_questions} => expected_total={expected['expected_total']}"
-        )
-
-    resolved_total_questions = expected["expected_total"]
-
-    logger.warning(
-        f"[Pass2] generate_question_blueprints CALLED — "
-        f"quiz_id={quiz_id}, total_questions={resolved_total_questions}, "
-        f"inline_direct={inline_direct_questions}, final_direct={final_direct_questions}, "
-        f"module_application={module_application_questions}, "
-        f"claims={len(source_claims_payload.get('source_claims', []))}"
-    )
-
-    user_prompt = build_pass2_user_prompt(
-        quiz_id=quiz_id,
-        total_questions=resolved_total_questions,
-        pass1_claims=source_claims_payload,
-    )
-
-    prompt = PASS2_SYSTEM_PROMPT + "\n\n" + user_prompt
-
-    logger.info(
-        f"[Pass2] Blueprint LLM invoked — quiz_id={quiz_id}, total_questions={resolved_total_questions}"
-    )
-
-    parsed = call_llm_json(
-        prompt=prompt,
-        stage_tag="Stage 2.8 Blueprint",
-    )
-
     if not isinstance(parsed, dict):
         raise ValueError("Blueprint output is not a JSON object")
 
@@ -292,6 +240,84 @@ def generate_question_blueprints(
                 f"Top errors: {top_errors}"
             )
 
+    return parsed
+
+
+def generate_question_blueprints(
+    *,
+    quiz_id: int,
+    source_claims_payload: Dict[str, Any],
+    # ✅ NEW (preferred): derived from the Word marker [[QUIZ:...:QUESTIONS=a,b]]
+    inline_direct_questions: Optional[int] = None,
+    final_direct_questions: Optional[int] = None,
+    module_application_questions: int = 1,
+    # ✅ Legacy support (avoid breaking callers immediately)
+    total_questions: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Pass 2: Produce assessment blueprints only (no final wording).
+
+    Updated behavior:
+      - No hardcoded counts.
+      - Prefer passing inline_direct_questions and final_direct_questions from the
+        parsed marker [[QUIZ:...:QUESTIONS=a,b]].
+      - Always expects module_application_questions (default 1).
+      - Validates role counts + role constraints via validate_pass2_blueprints().
+    """
+
+    expected = _extract_role_expectations(
+        inline_direct_questions=inline_direct_questions,
+        final_direct_questions=final_direct_questions,
+        module_application_questions=module_application_questions,
+        total_questions=total_questions,
+    )
+
+    # If caller still passes total_questions while also passing split counts, we ignore total_questions.
+    if expected["strict_role_counts"] and total_questions is not None:
+        logger.warning(
+            f"[Pass2] quiz_id={quiz_id} received total_questions={total_questions} "
+            f"but using split counts inline={inline_direct_questions}, final={final_direct_questions} "
+            f"+ module_application={module_application_questions} => expected_total={expected['expected_total']}"
+        )
+
+    resolved_total_questions = expected["expected_total"]
+
+    logger.warning(
+        f"[Pass2] generate_question_blueprints CALLED — "
+        f"quiz_id={quiz_id}, total_questions={resolved_total_questions}, "
+        f"inline_direct={inline_direct_questions}, final_direct={final_direct_questions}, "
+        f"module_application={module_application_questions}, "
+        f"claims={len(source_claims_payload.get('source_claims', []))}"
+    )
+
+    user_prompt = build_pass2_user_prompt(
+        quiz_id=quiz_id,
+        total_questions=resolved_total_questions,
+        pass1_claims=source_claims_payload,
+    )
+
+    prompt = PASS2_SYSTEM_PROMPT + "\n\n" + user_prompt
+
+    logger.info(
+        f"[Pass2] Blueprint LLM invoked — quiz_id={quiz_id}, total_questions={resolved_total_questions}"
+    )
+
+    # Checked (and role-repaired) inside the gateway, so a rejected answer
+    # is retried on the parse budget and never cached.
+    accepted: Dict[str, Any] = {}
+
+    def _validate(data: Dict[str, Any]) -> None:
+        accepted["parsed"] = _checked_blueprints(copy.deepcopy(data), quiz_id=quiz_id, expected=expected)
+
+    parsed = call_llm_json(
+        prompt=prompt,
+        stage_tag="Stage 2.8 Blueprint",
+        response_schema=PASS2_OUTPUT,
+        validate=_validate,
+    )
+    # Cache hits skip the hook; their (raw) answer is repaired the same way.
+    parsed = accepted.get("parsed") or _checked_blueprints(parsed, quiz_id=quiz_id, expected=expected)
+
     # Ensure quiz_id is set (and authoritative)
     parsed["quiz_id"] = quiz_id
     return parsed
@@ -1,40 +1,51 @@
 from __future__ import annotations
 
-import json
-import time
-import logging
-import os
-from typing import Dict, Any
+import contextvars
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
 
-from dotenv import load_dotenv
-from openai import OpenAI
+from src.utils.llm_gateway import LLMRequest, get_gateway
+from src.utils.output_schema import OutputSchema
+from src.utils.retry_policy import RetryPolicy
 
-# -------------------------------------------------
-# Load environment variables (.env)
-# -------------------------------------------------
-load_dotenv()
+JSON_OUTPUT_RULES = (
+    "\n\nIMPORTANT:\n"
+    "- Return ONLY a single valid JSON object.\n"
+    "- No markdown.\n"
+    "- No extra text.\n"
+    "- First character must be '{'.\n"
+    "- Last character must be '}'."
+)
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    raise RuntimeError("OPENAI_API_KEY not found in .env")
+_regeneration: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "stage2_8_regeneration", default=""
+)
 
-client = OpenAI(api_key=OPENAI_API_KEY)
 
-def _extract_json_block(text: str) -> str | None:
+# -------------------------------------------------
+# Regeneration (bypass the LLM response cache)
+# -------------------------------------------------
+@contextmanager
+def regenerating(nonce: str | None = None) -> Iterator[str]:
     """
-    Extract the outermost JSON object from text.
-    Returns None if no valid JSON block is found.
+    Within the block, every Stage 2.8 request carries a fresh cache
+    variant, so the LLM cache (temperature 0) cannot replay the answers
+    that produced the quiz being regenerated. Worker threads started via
+    run_bounded inherit it. Yields the nonce.
     """
-    if not text:
-        return None
+    nonce = nonce or uuid.uuid4().hex
+    token = _regeneration.set(nonce)
+    try:
+        yield nonce
+    finally:
+        _regeneration.reset(token)
 
-    start = text.find("{")
-    end = text.rfind("}")
 
-    if start == -1 or end == -1 or end <= start:
-        return None
+def regeneration_nonce() -> str:
+    """The active regeneration nonce ("" outside regenerating())."""
+    return _regeneration.get()
 
-    return text[start : end + 1]
 
 # -------------------------------------------------
 # Public helper: call LLM and return JSON
@@ -45,87 +56,71 @@ def call_llm_json(
     model: str = "gpt-5.2-2025-12-11",
     temperature: float = 0.0,
     max_tokens: int = 4500,
-    max_retries: int = 3,
     stage_tag: str = "Stage 2.8",
+    validate: Optional[Callable[[Dict[str, Any]], None]] = None,
+    policy: RetryPolicy | None = None,
+    response_schema: OutputSchema | None = None,
+    shared_prefix: str | None = None,
 ) -> Dict[str, Any]:
+    """
+    Call the LLM and return one parsed JSON object.
+
+    Goes through the shared LLM gateway (pooled client, global in-flight
+    cap, retry policy, cache). `validate` should raise on a semantically
+    bad answer; the call is then re-asked on the gateway's parse budget,
+    so callers need no retry loop of their own.
 
-    last_error: Exception | None = None
-
-    for attempt in range(1, max_retries + 1):
-        try:
-            response = client.responses.create(
-                model=model,
-                input=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "input_text",  # ✅ FIXED
-                                "text": (
-                                    prompt
-                                    + "\n\nIMPORTANT:\n"
-                                    "- Return ONLY a single valid JSON object.\n"
-                                    "- No markdown.\n"
-                                    "- No extra text.\n"
-                                    "- First character must be '{'.\n"
-                                    "- Last character must be '}'."
-                                ),
-                            }
-                        ],
-                    }
-                ],
-                temperature=temperature,
-                max_output_tokens=max_tokens,
-            )
-
-            output = response.output_text
-
-            if not output or not output.strip():
-                raise ValueError("LLM returned empty response")
-
-            try:
-                return json.loads(output)
-
-            except json.JSONDecodeError:
-                # --- Attempt safe recovery: trim to outer JSON ---
-                repaired = _extract_json_block(output)
-
-                if repaired:
-                    try:
-                        return json.loads(repaired)
-                    except json.JSONDecodeError:
-                        pass  # fall through to debug + retry
-
-                # 🔍 DEBUG: capture raw output once per failure
-                debug_path = f"debug_pass1_{stage_tag.replace(' ', '_')}.txt"
-
-                with open(debug_path, "w", encoding="utf-8") as f:
-                    f.write("===== RAW MODEL OUTPUT =====\n")
-                    f.write(output)
-                    f.write("\n\n===== END =====\n")
-
-                logging.error(
-                    f"[{stage_tag}] JSON parse failed even after repair. "
-                    f"Raw output written to {debug_path}"
-                )
-                raise
-
-        except json.JSONDecodeError as e:
-            last_error = e
-            logging.warning(
-                f"[{stage_tag}] JSON decode failed "
-                f"(attempt {attempt}/{max_retries})"
-            )
-            time.sleep(1.0)
-
-        except Exception as e:
-            last_error = e
-            logging.error(
-                f"[{stage_tag}] LLM call failed "
-                f"(attempt {attempt}/{max_retries}): {e}"
-            )
-            time.sleep(2 ** attempt)
-
-    raise RuntimeError(
-        f"{stage_tag} LLM failed after retries"
-    ) from last_error
+    `response_schema` switches the call to the provider's strict
+    JSON-schema output, so the prose JSON rules are not appended.
+
+    `shared_prefix` is the byte-stable head of the prompt that many calls
+    share (instructions, source, claims); it is sent first and marked for
+    provider prompt caching, `prompt` follows it.
+    """
+    return get_gateway().complete_json(
+        build_llm_request(
+            prompt=prompt,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stage_tag=stage_tag,
+            response_schema=response_schema,
+            shared_prefix=shared_prefix,
+        ),
+        validate=validate,
+        policy=policy,
+    )
+
+
+def build_llm_request(
+    *,
+    prompt: str,
+    model: str = "gpt-5.2-2025-12-11",
+    temperature: float = 0.0,
+    max_tokens: int = 4500,
+    stage_tag: str = "Stage 2.8",
+    response_schema: OutputSchema | None = None,
+    shared_prefix: str | None = None,
+) -> LLMRequest:
+    """
+    The gateway request call_llm_json sends (also used for Batch API input).
+    """
+    if response_schema is None:
+        prompt = prompt + JSON_OUTPUT_RULES
+
+    nonce = regeneration_nonce()
+    messages = [{"role": "user", "content": prompt}]
+    if shared_prefix:
+        messages.insert(0, {"role": "user", "content": shared_prefix})
+
+    return LLMRequest(
+        messages=messages,
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        api="responses",
+        stage_tag=stage_tag,
+        cache_variant=f"{stage_tag} regen:{nonce}" if nonce else stage_tag,
+        response_schema=response_schema,
+        shared_prefix_messages=1 if shared_prefix else 0,
+    )
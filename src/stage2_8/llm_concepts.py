@@ -4,8 +4,59 @@ from __future__ import annotations
 from typing import Any, Dict, List
 
 from .logger import logger
-from .llm_call import call_llm_json
-from .prompts_concepts import PASS1_SYSTEM_PROMPT, build_pass1_user_prompt
+from src.utils.llm_gateway import LLMRequest
+
+from .llm_call import call_llm_json, build_llm_request
+from .prompts_concepts import PASS1_OUTPUT, PASS1_SYSTEM_PROMPT, build_pass1_user_prompt
+
+PASS1_STAGE_TAG = "Stage 2.8 Pass1 (Concepts)"
+PASS1_MAX_TOKENS = 3500
+
+
+def pass1_concept_count(total_questions: int) -> int:
+    """Claims requested from Pass 1 for a quiz of total_questions."""
+    return max(6, total_questions + 2)
+
+
+def _pass1_prompt(
+    *,
+    quiz_id: int,
+    source_paragraphs: List[str],
+    concept_count: int,
+) -> str:
+    user_prompt = build_pass1_user_prompt(
+        quiz_id=quiz_id,
+        source_paragraphs=source_paragraphs,
+        concept_count=concept_count,
+    )
+    return PASS1_SYSTEM_PROMPT + "\n\n" + user_prompt
+
+
+def validate_pass1_output(parsed: Dict[str, Any]) -> None:
+    if "source_claims" not in parsed or not isinstance(parsed["source_claims"], list):
+        raise ValueError("Pass 1 output missing required 'source_claims' list")
+
+
+def build_source_claims_request(
+    *,
+    quiz_id: int,
+    source_paragraphs: List[str],
+    concept_count: int,
+) -> LLMRequest:
+    """
+    The exact Pass 1 request generate_source_claims sends (used for Batch API input).
+    """
+    return build_llm_request(
+        prompt=_pass1_prompt(
+            quiz_id=quiz_id,
+            source_paragraphs=source_paragraphs,
+            concept_count=concept_count,
+        ),
+        stage_tag=PASS1_STAGE_TAG,
+        max_tokens=PASS1_MAX_TOKENS,
+        response_schema=PASS1_OUTPUT,
+    )
+
 
 def generate_source_claims(
     *,
@@ -31,26 +82,24 @@ def generate_source_claims(
         f"quiz_id={quiz_id}, paragraphs={paragraph_count}"
     )
 
-    user_prompt = build_pass1_user_prompt(
+    prompt = _pass1_prompt(
         quiz_id=quiz_id,
         source_paragraphs=source_paragraphs,
         concept_count=concept_count,
     )
 
-    prompt = PASS1_SYSTEM_PROMPT + "\n\n" + user_prompt
-
     logger.info(
         f"[V2] Pass 1 Concept LLM invoked — quiz_id={quiz_id}, concept_count={concept_count}"
     )
 
     parsed = call_llm_json(
         prompt=prompt,
-        stage_tag="Stage 2.8 Pass1 (Concepts)",
-        max_tokens=3500,
+        stage_tag=PASS1_STAGE_TAG,
+        max_tokens=PASS1_MAX_TOKENS,
+        response_schema=PASS1_OUTPUT,
+        # Inside the gateway: rejected output is retried, never cached
+        validate=validate_pass1_output,
     )
 
-    if "source_claims" not in parsed or not isinstance(parsed["source_claims"], list):
-        raise ValueError("Pass 1 output missing required 'source_claims' list")
-
     parsed["quiz_id"] = quiz_id
     return parsed
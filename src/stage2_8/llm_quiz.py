@@ -1,16 +1,21 @@
 # src/stage2_8/llm_quiz.py
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.concurrency import run_bounded
+from src.utils.config_loader import load_settings
 
 from .logger import logger
 from .llm_call import call_llm_json
 
-from .llm_concepts import generate_source_claims
+from .llm_concepts import generate_source_claims, pass1_concept_count
 from .llm_blueprints import generate_question_blueprints
 
 from .prompts_author_single import (
-    AUTHOR_SINGLE_SYSTEM_PROMPT,
+    AUTHOR_SINGLE_OUTPUT,
+    build_author_shared_prefix,
     build_author_single_user_prompt,
 )
 from .validate_quiz_post_assembly import validate_quiz_post_assembly
@@ -119,45 +124,129 @@ def validate_single_question(
 # HARD INVARIANT: SINGLE-QUESTION AUTHORING ONLY
 # --------------------------------------------------
 
-def generate_quiz_questions(
+DEFAULT_AUTHOR_MAX_WORKERS = 4
+
+
+def _author_max_workers() -> int:
+    """
+    Worker limit for Pass 3 from settings.yaml (stage2_8.author_max_workers).
+    1 = legacy sequential authoring.
+    """
+    stage_settings = load_settings().get("stage2_8", {}) or {}
+    return max(1, int(stage_settings.get("author_max_workers", DEFAULT_AUTHOR_MAX_WORKERS)))
+
+
+def _author_single_question(
+    *,
+    quiz_id: int,
+    question_id: str,
+    source_paragraphs: List[str],
+    source_claims: List[Dict[str, Any]],
+    blueprint: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Author ONE question from ONE blueprint.
+    Independent of every other question, so safe to run concurrently.
+    """
+    # Instructions + source + claims are identical for every question of
+    # the quiz and go first; only the blueprint tail differs per call.
+    shared_prefix = build_author_shared_prefix(
+        quiz_id=quiz_id,
+        source_paragraphs=source_paragraphs,
+        source_claims=source_claims,
+    )
+    prompt = build_author_single_user_prompt(
+        question_id=question_id,
+        blueprint=blueprint,
+    )
+
+    logger.info(
+        f"[V2] Author single-question invoked — quiz_id={quiz_id}, question={question_id}"
+    )
+
+    def _with_blueprint(parsed: Dict[str, Any]) -> Dict[str, Any]:
+        question = dict(parsed)
+        question["question_id"] = question_id
+        # ✅ Preserve blueprint metadata for downstream routing/assembly
+        question["quiz_role"] = blueprint.get("quiz_role")
+        question["question_style"] = blueprint.get("question_style")
+        question["cognitive_level"] = blueprint.get("cognitive_level")
+        question["claim_ids"] = blueprint.get("claim_ids")
+        return question
+
+    def _validate(parsed: Dict[str, Any]) -> None:
+        validate_single_question(
+            question=_with_blueprint(parsed),
+            question_id=question_id,
+            quiz_id=quiz_id,
+        )
+
+    # An invalid question is re-asked on the gateway's parse budget
+    # (no second retry loop here).
+    try:
+        parsed_question = call_llm_json(
+            prompt=prompt,
+            shared_prefix=shared_prefix,
+            stage_tag="Stage 2.8 Author Single",
+            validate=_validate,
+            response_schema=AUTHOR_SINGLE_OUTPUT,
+        )
+    except RuntimeError as e:
+        raise RuntimeError(
+            f"[V2] Author failed — quiz_id={quiz_id}, question={question_id}"
+        ) from e
+
+    logger.info(
+        f"[V2] Author completed — quiz_id={quiz_id}, question={question_id}"
+    )
+    return _with_blueprint(parsed_question)
+
+
+@dataclass
+class QuizPlan:
+    """
+    Passes 1–2 of a quiz: source claims + one blueprint per question
+    (blueprint i becomes question q{i}).
+    """
+    claims_payload: Dict[str, Any]
+    blueprints: List[Dict[str, Any]]
+
+    @property
+    def source_claims(self) -> List[Dict[str, Any]]:
+        return self.claims_payload.get("source_claims", [])
+
+
+def generate_quiz_plan(
     *,
     quiz_id: int,
     source_paragraphs: List[str],
     inline_direct_questions: int,
     final_direct_questions: int,
     module_application_questions: int,
-) -> Dict[str, Any]:
+    claims_payload: Optional[Dict[str, Any]] = None,
+    used_claim_ids: Optional[set] = None,
+) -> QuizPlan:
     """
-    Gold-standard 3-pass quiz generation (V2, SAFE):
+    Pass 1 (unless claims_payload is given) + Pass 2.
 
-      Pass 1: Source claims (source-locked)
-      Pass 2: Question blueprints (role-aware)
-      Pass 3: Author writes ONE question per request
-              (Python assembles final quiz JSON)
+    With existing claims (adding questions to a stored quiz), claims no
+    blueprint uses yet (`used_claim_ids`) are offered to Pass 2 first.
     """
-
     total_questions = (
         inline_direct_questions
         + final_direct_questions
         + module_application_questions
     )
 
-    logger.info(
-        f"[V2] 3-pass quiz generation starting — quiz_id={quiz_id}, "
-        f"inline_direct={inline_direct_questions}, "
-        f"final_direct={final_direct_questions}, "
-        f"module_application={module_application_questions}, "
-        f"total_questions={total_questions}"
-    )
-
     # ----------------------------
     # PASS 1 — SOURCE CLAIMS
     # ----------------------------
-    claims_payload = generate_source_claims(
-        quiz_id=quiz_id,
-        source_paragraphs=source_paragraphs,
-        concept_count=max(6, total_questions + 2),
-    )
+    if claims_payload is None:
+        claims_payload = generate_source_claims(
+            quiz_id=quiz_id,
+            source_paragraphs=source_paragraphs,
+            concept_count=pass1_concept_count(total_questions),
+        )
 
     source_claims = claims_payload.get("source_claims", [])
     if not source_claims:
@@ -170,8 +259,14 @@ def generate_quiz_questions(
     # ----------------------------
     # PASS 2 — BLUEPRINTS
     # ----------------------------
+    if used_claim_ids:
+        source_claims = sorted(
+            source_claims,
+            key=lambda c: c.get("claim_id") in used_claim_ids,
+        )
+
     trimmed_claims = dict(claims_payload)
-    trimmed_claims["source_claims"] = trimmed_claims["source_claims"][: total_questions + 2]
+    trimmed_claims["source_claims"] = source_claims[: total_questions + 2]
 
     blueprints_payload = generate_question_blueprints(
         quiz_id=quiz_id,
@@ -192,69 +287,84 @@ def generate_quiz_questions(
         f"[V2] Pass 2 complete — quiz_id={quiz_id}, blueprints={len(blueprints)}"
     )
 
-    # ----------------------------
-    # PASS 3 — AUTHOR (SINGLE QUESTION)
-    # ----------------------------
-    questions: List[Dict[str, Any]] = []
+    return QuizPlan(claims_payload=claims_payload, blueprints=blueprints)
 
-    for idx, blueprint in enumerate(blueprints, start=1):
-        question_id = f"q{idx}"
 
-        user_prompt = build_author_single_user_prompt(
-            quiz_id=quiz_id,
-            question_id=question_id,
-            source_paragraphs=source_paragraphs,
-            source_claims=source_claims,
-            blueprint=blueprint,
-        )
+def generate_quiz_questions(
+    *,
+    quiz_id: int,
+    source_paragraphs: List[str],
+    inline_direct_questions: int,
+    final_direct_questions: int,
+    module_application_questions: int,
+    max_workers: int | None = None,
+    plan: QuizPlan | None = None,
+) -> Dict[str, Any]:
+    """
+    Gold-standard 3-pass quiz generation (V2, SAFE):
 
-        prompt = AUTHOR_SINGLE_SYSTEM_PROMPT + "\n\n" + user_prompt
+      Pass 1: Source claims (source-locked)
+      Pass 2: Question blueprints (role-aware)
+      Pass 3: Author writes ONE question per request
+              (requests run concurrently, bounded by max_workers;
+               Python assembles final quiz JSON in q1..qN order)
 
-        logger.info(
-            f"[V2] Author single-question invoked — quiz_id={quiz_id}, question={question_id}"
-        )
+    Pass a precomputed `plan` to skip Passes 1–2.
+    """
+
+    total_questions = (
+        inline_direct_questions
+        + final_direct_questions
+        + module_application_questions
+    )
 
-        MAX_ATTEMPTS = 2
-        last_error: Exception | None = None
+    logger.info(
+        f"[V2] 3-pass quiz generation starting — quiz_id={quiz_id}, "
+        f"inline_direct={inline_direct_questions}, "
+        f"final_direct={final_direct_questions}, "
+        f"module_application={module_application_questions}, "
+        f"total_questions={total_questions}"
+    )
 
-        for attempt in range(1, MAX_ATTEMPTS + 1):
-            try:
-                parsed_question = call_llm_json(
-                    prompt=prompt,
-                    stage_tag=f"Stage 2.8 Author Single (attempt {attempt})",
-                )
+    if plan is None:
+        plan = generate_quiz_plan(
+            quiz_id=quiz_id,
+            source_paragraphs=source_paragraphs,
+            inline_direct_questions=inline_direct_questions,
+            final_direct_questions=final_direct_questions,
+            module_application_questions=module_application_questions,
+        )
 
-                parsed_question["question_id"] = question_id
-                # ✅ Preserve blueprint metadata for downstream routing/assembly
-                parsed_question["quiz_role"] = blueprint.get("quiz_role")
-                parsed_question["question_style"] = blueprint.get("question_style")
-                parsed_question["cognitive_level"] = blueprint.get("cognitive_level")
-                parsed_question["claim_ids"] = blueprint.get("claim_ids")
-
-                validate_single_question(
-                    question=parsed_question,
-                    question_id=question_id,
-                    quiz_id=quiz_id,
-                )
+    source_claims = plan.source_claims
+    blueprints = plan.blueprints
 
-                questions.append(parsed_question)
+    # ----------------------------
+    # PASS 3 — AUTHOR (SINGLE QUESTION, BOUNDED CONCURRENCY)
+    # ----------------------------
+    if max_workers is None:
+        max_workers = _author_max_workers()
 
-                logger.info(
-                    f"[V2] Author completed — quiz_id={quiz_id}, question={question_id}, attempt={attempt}"
-                )
-                break
+    logger.info(
+        f"[V2] Pass 3 author fan-out — quiz_id={quiz_id}, "
+        f"questions={len(blueprints)}, max_workers={max_workers}"
+    )
 
-            except Exception as e:
-                last_error = e
-                logger.warning(
-                    f"[V2] Author failed — quiz_id={quiz_id}, question={question_id}, attempt={attempt}"
-                )
+    def _author(indexed: Tuple[int, Dict[str, Any]]) -> Dict[str, Any]:
+        idx, blueprint = indexed
+        return _author_single_question(
+            quiz_id=quiz_id,
+            question_id=f"q{idx}",
+            source_paragraphs=source_paragraphs,
+            source_claims=source_claims,
+            blueprint=blueprint,
+        )
 
-        else:
-            raise RuntimeError(
-                f"[V2] Author failed after {MAX_ATTEMPTS} attempts — "
-                f"quiz_id={quiz_id}, question={question_id}"
-            ) from last_error
+    questions: List[Dict[str, Any]] = run_bounded(
+        _author,
+        list(enumerate(blueprints, start=1)),
+        max_workers=max_workers,
+        thread_name_prefix=f"quiz{quiz_id}-author",
+    )
 
     # ----------------------------
     # ORDERING + ASSEMBLY
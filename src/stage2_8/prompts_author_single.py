@@ -4,6 +4,8 @@ from __future__ import annotations
 import json
 from typing import Any, Dict, List
 
+from src.utils.output_schema import OutputSchema, any_of, boolean, enum, obj, string
+
 AUTHOR_SINGLE_SYSTEM_PROMPT = """You are an expert medical educator and professional assessment writer.
 
 You are writing EXACTLY ONE quiz question.
@@ -163,26 +165,56 @@ SCHEMA:
 }
 """
 
-def build_author_single_user_prompt(
+# Shape of one question; shared with the single-question editor.
+# `options` is MCQ-only: nullable in the schema, dropped when null.
+QUESTION_FIELDS = {
+    "type": enum("mcq", "true_false"),
+    "prompt": string(),
+    "options": obj({"A": string(), "B": string(), "C": string(), "D": string()}),
+    "correct_answer": any_of(enum("A", "B", "C", "D"), boolean()),
+    "rationale": string(),
+}
+
+AUTHOR_SINGLE_OUTPUT = OutputSchema(
+    name="authored_question",
+    schema=obj({"question_id": string(), **QUESTION_FIELDS}, optional=("options",)),
+    optional_keys=("options",),
+)
+
+
+def build_author_shared_prefix(
     *,
     quiz_id: int,
-    question_id: str,
     source_paragraphs: List[str],
     source_claims: Dict[str, Any],
-    blueprint: Dict[str, Any],
 ) -> str:
+    """
+    Everything every author call of one quiz has in common, in a fixed
+    order (instructions, source, claims) so providers can cache it.
+    """
     joined_source = "\n\n".join(
         f"- {p.strip()}" for p in source_paragraphs if p and p.strip()
     )
 
-    return f"""Quiz ID: {quiz_id}
-Question ID: {question_id}
+    return f"""{AUTHOR_SINGLE_SYSTEM_PROMPT}
+
+Quiz ID: {quiz_id}
 
 SOURCE TEXT (context only):
 {joined_source}
 
 SOURCE CLAIMS (correct answer MUST be supported by these):
 {json.dumps(source_claims, ensure_ascii=False, indent=2)}
+"""
+
+
+def build_author_single_user_prompt(
+    *,
+    question_id: str,
+    blueprint: Dict[str, Any],
+) -> str:
+    """The per-question tail that follows build_author_shared_prefix."""
+    return f"""Question ID: {question_id}
 
 QUESTION BLUEPRINT (follow EXACTLY — including quiz_role, question_style, and cognitive_level):
 {json.dumps(blueprint, ensure_ascii=False, indent=2)}
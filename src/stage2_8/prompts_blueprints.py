@@ -4,6 +4,8 @@ from __future__ import annotations
 import json
 from typing import Any, Dict
 
+from src.utils.output_schema import OutputSchema, array, enum, integer, obj, string
+
 PASS2_SYSTEM_PROMPT = """You are a professional medical assessment blueprint writer.
 
 You are designing QUESTION BLUEPRINTS only.
@@ -145,6 +147,26 @@ FAILURE CONDITION
 """
 
 
+PASS2_OUTPUT = OutputSchema(
+    name="question_blueprints",
+    schema=obj({
+        "quiz_id": integer(),
+        "blueprints": array(obj({
+            "question_id": string(),
+            "type": enum("mcq", "true_false"),
+            "quiz_role": enum("inline_direct", "final_direct", "module_application"),
+            "question_style": enum("scenario", "direct"),
+            "claim_ids": array(string()),
+            "cognitive_level": enum("recall", "interpret", "apply"),
+            "target_skill": string(),
+            "correct_answer_idea": string(),
+            "distractor_themes": array(string()),
+            "avoid": array(string()),
+        })),
+    }),
+)
+
+
 def build_pass2_user_prompt(
     *,
     quiz_id: int,
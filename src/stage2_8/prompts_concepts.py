@@ -3,6 +3,8 @@ from __future__ import annotations
 
 from typing import List
 
+from src.utils.output_schema import OutputSchema, array, integer, obj, string
+
 PASS1_SYSTEM_PROMPT = """You are a medical content analyst and assessment designer.
 
 Your job is to extract SOURCE-SUPPORTED claims and learning points from the provided text.
@@ -58,6 +60,22 @@ STOP RULE (CRITICAL)
 - NEVER truncate JSON output.
 """
 
+PASS1_OUTPUT = OutputSchema(
+    name="source_claims",
+    schema=obj({
+        "quiz_id": integer(),
+        "source_claims": array(obj({
+            "claim_id": string(),
+            "claim_text": string(),
+            "evidence": array(string()),
+            "allowable_inferences": array(string()),
+            "common_misconceptions": array(string()),
+        })),
+        "high_value_learning_points": array(string()),
+    }),
+)
+
+
 def build_pass1_user_prompt(
     *,
     quiz_id: int,
@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 from typing import Any, Dict, List
 
-from .review_prompts import REVIEW_SYSTEM_PROMPT
+from .review_prompts import REVIEW_OUTPUT, REVIEW_SYSTEM_PROMPT
 from .logger import logger
 from .llm_call import call_llm_json
 
@@ -25,20 +25,19 @@ def review_quiz_quality(
         f"Reviewer LLM invoked — quiz_id={quiz_id}"
     )
 
-    user_prompt = {
-        "quiz": quiz_payload,
-        "source_text": source_paragraphs,
-    }
-
-    prompt = (
+    # Source first (identical on every review round of this quiz),
+    # the quiz under review last, so the source prefix is cacheable.
+    shared_prefix = (
         REVIEW_SYSTEM_PROMPT
         + "\n\n"
-        + json.dumps(user_prompt, ensure_ascii=False, indent=2)
+        + json.dumps({"source_text": source_paragraphs}, ensure_ascii=False, indent=2)
     )
 
     result = call_llm_json(
-        prompt=prompt,
+        prompt=json.dumps({"quiz": quiz_payload}, ensure_ascii=False, indent=2),
+        shared_prefix=shared_prefix,
         stage_tag="Stage 2.8 Reviewer",
+        response_schema=REVIEW_OUTPUT,
     )
 
     status = result.get("status", "UNKNOWN")
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from src.utils.output_schema import OutputSchema, array, enum, obj, open_map, string
+
 REVIEW_SYSTEM_PROMPT = """You are a medical assessment quality reviewer.
 
 Your job is to EVALUATE quiz questions for professional undergraduate-level quality.
@@ -135,3 +137,29 @@ DO NOT include explanations outside JSON.
 DO NOT include markdown.
 DO NOT rewrite the full quiz.
 """
+
+
+def review_output_schema(name: str) -> OutputSchema:
+    """
+    PASS / FAIL + issues. suggested_fixes is a free-form patch
+    ({"<field>": value}), so this schema cannot be strict.
+    """
+    return OutputSchema(
+        name=name,
+        schema=obj({
+            "status": enum("PASS", "FAIL"),
+            "issues": array({
+                "type": "object",
+                "properties": {
+                    "question_id": string(),
+                    "problem": string(),
+                    "suggested_fixes": open_map({}),
+                },
+                "required": ["question_id", "problem", "suggested_fixes"],
+            }),
+        }),
+        strict=False,
+    )
+
+
+REVIEW_OUTPUT = review_output_schema("quiz_review")
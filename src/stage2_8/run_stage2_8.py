@@ -1,23 +1,404 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import contextlib
+import sys
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.utils.checkpoint import CheckpointJournal
+from src.utils.concurrency import run_bounded
+from src.utils.config_loader import load_settings
+from src.utils.llm_client_batch import BatchItem
+from src.utils.retry_policy import DeadlineExceeded, with_stage_deadline
+from src.utils.slide_memo import get_slide_memo, memo_enabled, slide_key, source_version
+from src.utils.token_logger import with_usage_summary
+from src.utils.tracing import span, traced
 
 from .logger import logger
 from .quiz_detect import detect_quizzes, QuizState
 from .quiz_extract import extract_quiz_source
-from .runner import run_quiz_pipeline
+from .llm_concepts import build_source_claims_request, pass1_concept_count, validate_pass1_output
+from .llm_call import regenerating, regeneration_nonce
+from .llm_quiz import generate_quiz_plan
+from .runner import QuizReviewFailed, check_question_capacity, run_quiz_pipeline
+from .validate_quiz_output import validate_quiz_payload
+from . import (
+    apply_reviewer_fixes,
+    distractor_review,
+    distractor_review_prompts,
+    editor_llm,
+    llm_blueprints,
+    llm_concepts,
+    llm_quiz,
+    prompts_author_single,
+    prompts_blueprints,
+    prompts_concepts,
+    quiz_quality_review,
+    review_prompts,
+    runner,
+    validate_blueprints_roles,
+)
+
+
+DEFAULT_MAX_CONCURRENT_QUIZZES = 3
+
+QUIZ_ROLES = ("inline_direct", "final_direct", "module_application")
+QUIZ_MEMO_STAGE = "stage2_8_quiz"
+
+
+@dataclass
+class QuizJob:
+    quiz_id: int
+    state: QuizState
+    source_paragraphs: List[str]
+
+    @property
+    def total_questions(self) -> int:
+        return (
+            (self.state.immediate_count or 0)
+            + (self.state.deferred_count or 0)
+            + (self.state.application_count or 0)
+        )
+
+    @property
+    def role_counts(self) -> Dict[str, int]:
+        return {
+            "inline_direct": self.state.immediate_count or 0,
+            "final_direct": self.state.deferred_count or 0,
+            "module_application": self.state.application_count or 0,
+        }
+
+    @property
+    def expected_cost(self) -> int:
+        """
+        Scheduling weight: question count × source size (characters).
+        Author/reviewer prompts carry the full source once per question.
+        """
+        source_chars = sum(len(p) for p in self.source_paragraphs)
+        return max(1, self.total_questions) * max(1, source_chars)
+
+
+# -------------------------------------------------
+# Incremental regeneration (stored quizzes)
+# -------------------------------------------------
+
+@lru_cache(maxsize=None)
+def _memo_version() -> str:
+    return source_version(
+        sys.modules[__name__], runner, llm_quiz, llm_concepts, llm_blueprints,
+        editor_llm, quiz_quality_review, distractor_review, apply_reviewer_fixes,
+        validate_blueprints_roles, prompts_concepts, prompts_blueprints,
+        prompts_author_single, review_prompts, distractor_review_prompts,
+    )
+
+
+def _pipeline(job: QuizJob, counts: Dict[str, int], **kwargs: Any) -> Dict[str, Any]:
+    return run_quiz_pipeline(
+        quiz_id=job.quiz_id,
+        inline_direct_questions=counts["inline_direct"],
+        final_direct_questions=counts["final_direct"],
+        module_application_questions=counts["module_application"],
+        source_paragraphs=job.source_paragraphs,
+        **kwargs,
+    )
+
+
+def _renumbered(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{**item, "question_id": f"q{i}"} for i, item in enumerate(items, start=1)]
+
+
+def _extend_stored_quiz(job: QuizJob, stored: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Same source, new QUESTIONS= counts: keep the first questions of each
+    role that are still wanted, then author + review only the additional
+    ones against the stored claims. Returns (payload, blueprints).
+    """
+    counts = job.role_counts
+    kept_questions: List[Dict[str, Any]] = []
+    kept_blueprints: List[Dict[str, Any]] = []
+    seen = {role: 0 for role in QUIZ_ROLES}
+
+    # Blueprint i produced question q{i}; both lists stay aligned.
+    for question, blueprint in zip(stored["payload"]["questions"], stored["blueprints"]):
+        role = question["quiz_role"]
+        if seen[role] < counts[role]:
+            seen[role] += 1
+            kept_questions.append(question)
+            kept_blueprints.append(blueprint)
+
+    extra = {role: counts[role] - seen[role] for role in QUIZ_ROLES}
+    new_questions: List[Dict[str, Any]] = []
+    new_blueprints: List[Dict[str, Any]] = []
+
+    if any(extra.values()):
+        logger.info(
+            f"Stage 2.8: quiz_id={job.quiz_id} source unchanged — "
+            f"authoring {sum(extra.values())} additional question(s) {extra}"
+        )
+        plan = generate_quiz_plan(
+            quiz_id=job.quiz_id,
+            source_paragraphs=job.source_paragraphs,
+            inline_direct_questions=extra["inline_direct"],
+            final_direct_questions=extra["final_direct"],
+            module_application_questions=extra["module_application"],
+            claims_payload=stored["claims_payload"],
+            used_claim_ids={cid for bp in kept_blueprints for cid in bp.get("claim_ids") or []},
+        )
+        new_questions = _pipeline(job, extra, plan=plan)["questions"]
+        new_blueprints = plan.blueprints
+    else:
+        logger.info(f"Stage 2.8: quiz_id={job.quiz_id} source unchanged — dropping surplus questions")
+
+    payload = {
+        "quiz_id": job.quiz_id,
+        "questions": _renumbered(kept_questions + new_questions),
+    }
+    validate_quiz_payload(payload=payload, quiz_id=job.quiz_id, expected_count=job.total_questions)
+    return payload, _renumbered(kept_blueprints + new_blueprints)
+
+
+def run_quiz_job(job: QuizJob) -> Dict[str, Any]:
+    """
+    One quiz's payload, reusing the stored result when the extracted
+    source paragraphs are unchanged (see _extend_stored_quiz for count
+    changes). Quiz ids are not part of the key: renumbered markers over
+    the same source still hit. While regenerating (see llm_call.regenerating)
+    the stored result is ignored, and replaced on success.
+    """
+    if not memo_enabled():
+        return _pipeline(job, job.role_counts)
+
+    memo = get_slide_memo()
+    key = slide_key({"source_paragraphs": job.source_paragraphs}, version=_memo_version())
+    stored = None if regeneration_nonce() else memo.get(QUIZ_MEMO_STAGE, key)
+
+    if stored is not None and stored["counts"] == job.role_counts:
+        logger.info(f"Stage 2.8: quiz_id={job.quiz_id} unchanged — reusing stored payload")
+        memo.count(QUIZ_MEMO_STAGE, "reused")
+        return {**stored["payload"], "quiz_id": job.quiz_id}
+
+    check_question_capacity(
+        quiz_id=job.quiz_id,
+        total_questions=job.total_questions,
+        source_paragraphs=job.source_paragraphs,
+    )
+
+    if stored is not None:
+        payload, blueprints = _extend_stored_quiz(job, stored)
+        claims_payload = stored["claims_payload"]
+    else:
+        plan = generate_quiz_plan(
+            quiz_id=job.quiz_id,
+            source_paragraphs=job.source_paragraphs,
+            inline_direct_questions=job.role_counts["inline_direct"],
+            final_direct_questions=job.role_counts["final_direct"],
+            module_application_questions=job.role_counts["module_application"],
+        )
+        payload = _pipeline(job, job.role_counts, plan=plan)
+        blueprints, claims_payload = plan.blueprints, plan.claims_payload
+
+    memo.put(QUIZ_MEMO_STAGE, key, {
+        "counts": job.role_counts,
+        "claims_payload": claims_payload,
+        "blueprints": blueprints,
+        "payload": payload,
+    })
+    memo.count(QUIZ_MEMO_STAGE, "computed")
+    return payload
+
+
+# -------------------------------------------------
+# Scheduling
+# -------------------------------------------------
+
+def _max_concurrent_quizzes() -> int:
+    stage_settings = load_settings().get("stage2_8", {}) or {}
+    return max(
+        1,
+        int(stage_settings.get("max_concurrent_quizzes", DEFAULT_MAX_CONCURRENT_QUIZZES)),
+    )
+
+
+def failure_record(quiz_id: int, exc: BaseException) -> Dict[str, Any]:
+    """One failures-report entry: the error, the last payload and reviewer issues."""
+    review_failed = isinstance(exc, QuizReviewFailed)
+    return {
+        "quiz_id": quiz_id,
+        "error": f"{type(exc).__name__}: {exc}",
+        "last_payload": exc.payload if review_failed else None,
+        "reviewer_issues": exc.issues if review_failed else [],
+    }
+
+
+def schedule_quiz_jobs(
+    jobs: List[QuizJob],
+    *,
+    max_concurrent_quizzes: int | None = None,
+    journal: CheckpointJournal | None = None,
+    failures: Dict[int, Dict[str, Any]] | None = None,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Run run_quiz_pipeline for every job, largest expected cost first.
+
+    Longest-processing-time-first ordering keeps the big quizzes from
+    starting last and dominating the makespan. The number of LLM calls
+    actually in flight is capped globally by the LLM gateway.
+
+    With a journal, each finished quiz is journaled (keyed by quiz id and
+    its counts + source) and journaled quizzes are replayed.
+
+    With a `failures` dict, a failing quiz is recorded there (see
+    failure_record) and the other quizzes carry on; without one, the
+    first failure aborts the stage. A stage deadline always aborts.
+
+    Returns payloads keyed by quiz_id (successful quizzes only).
+    """
+    if max_concurrent_quizzes is None:
+        max_concurrent_quizzes = _max_concurrent_quizzes()
+
+    ordered = sorted(jobs, key=lambda j: (-j.expected_cost, j.quiz_id))
+
+    logger.info(
+        "Stage 2.8: quiz schedule (longest first) — "
+        + ", ".join(f"quiz_id={j.quiz_id} cost={j.expected_cost}" for j in ordered)
+        + f" | max_concurrent_quizzes={max_concurrent_quizzes}"
+    )
+
+    failures_lock = threading.Lock()
 
+    def _generate(job: QuizJob) -> Dict[str, Any]:
+        if journal is None:
+            return run_quiz_job(job)
+        return journal.run(
+            f"quiz_{job.quiz_id}",
+            {"counts": job.role_counts, "source_paragraphs": job.source_paragraphs},
+            lambda: run_quiz_job(job),
+        )
+
+    def _run(job: QuizJob) -> Optional[Dict[str, Any]]:
+        logger.info(f"Stage 2.8: processing quiz_id={job.quiz_id}")
+        with span("quiz", kind="quiz", quiz_id=job.quiz_id, expected_cost=job.expected_cost):
+            try:
+                return _generate(job)
+            except DeadlineExceeded:
+                raise
+            except Exception as exc:
+                if failures is None:
+                    raise
+                logger.error(f"Stage 2.8: quiz_id={job.quiz_id} failed — {exc}")
+                with failures_lock:
+                    failures[job.quiz_id] = failure_record(job.quiz_id, exc)
+                return None
+
+    results = run_bounded(
+        _run,
+        ordered,
+        max_workers=max_concurrent_quizzes,
+        thread_name_prefix="stage2_8-quiz",
+    )
+
+    return {
+        job.quiz_id: payload
+        for job, payload in zip(ordered, results)
+        if payload is not None
+    }
+
+
+def prepare_quiz_jobs(
+    *,
+    slides: List[Dict[str, Any]],
+    quiz_states: Dict[int, QuizState],
+    sentence_annotations: Dict[str, Any] | None,
+) -> List[QuizJob]:
+    """
+    Extract each detected quiz's source paragraphs (detection order).
+    """
+    jobs: List[QuizJob] = []
+
+    for quiz_id, state in quiz_states.items():
+        logger.info(f"Stage 2.8: preparing quiz_id={quiz_id}")
+
+        source_paragraphs = extract_quiz_source(
+            slides=slides,
+            quiz_state=state,
+            sentence_annotations=sentence_annotations,  # ✅ NEW
+        )
+
+        logger.info(
+            f"[Stage 2.8] QUIZ:{quiz_id} parsed counts — "
+            f"inline={state.immediate_count}, "
+            f"final={state.deferred_count}, "
+            f"application={state.application_count}"
+        )
+
+        jobs.append(QuizJob(quiz_id=quiz_id, state=state, source_paragraphs=source_paragraphs))
+
+    return jobs
+
+
+def collect_claims_batch_items(
+    *,
+    module_json: Dict[str, Any],
+    sentence_annotations: Dict[str, Any] | None = None,
+) -> List[BatchItem]:
+    """
+    Pass 1 (source claims) requests for every quiz, for the Batch API.
+    They are byte-identical to what run_stage2_8 sends, so batched
+    results are served from the LLM cache on the realtime run.
+    """
+    slides: List[Dict[str, Any]] = module_json.get("slides", [])
+    if not slides:
+        return []
+
+    jobs = prepare_quiz_jobs(
+        slides=slides,
+        quiz_states=detect_quizzes(slides),
+        sentence_annotations=sentence_annotations,
+    )
 
+    return [
+        BatchItem(
+            custom_id=f"stage2_8_pass1:quiz_{job.quiz_id}",
+            request=build_source_claims_request(
+                quiz_id=job.quiz_id,
+                source_paragraphs=job.source_paragraphs,
+                concept_count=pass1_concept_count(job.total_questions),
+            ),
+            validate=validate_pass1_output,
+        )
+        for job in jobs
+    ]
+
+
+@traced("stage2_8")
+@with_usage_summary("stage2_8")
+@with_stage_deadline("stage2_8")
 def run_stage2_8(
     *,
     module_json: Dict[str, Any],
     sentence_annotations: Dict[str, Any] | None = None,
+    max_concurrent_quizzes: int | None = None,
+    journal: CheckpointJournal | None = None,
+    quiz_ids: Set[int] | None = None,
+    previous_payloads: Dict[int, Dict[str, Any]] | None = None,
 ) -> Dict[str, Any]:
     """
     Stage 2.8 orchestration layer.
 
     Produces quiz payloads ONLY.
     Does not insert slides.
+
+    Quizzes are independent units of work and run concurrently
+    (see schedule_quiz_jobs); outputs are assembled in detection order.
+    A quiz that fails is left out of the outputs and reported under
+    "failed_quizzes" instead of failing the stage.
+
+    quiz_ids: regenerate only these quizzes; every other quiz reuses its
+    payload from previous_payloads (quizzes with none are left out). The
+    selected quizzes bypass the stored quiz results and the LLM response
+    cache, so they get fresh LLM answers.
     """
 
     slides: List[Dict[str, Any]] = module_json.get("slides", [])
@@ -27,6 +408,7 @@ def run_stage2_8(
             "inline_quizzes": {},
             "module_application_quizzes": {},
             "final_quizzes": {},
+            "failed_quizzes": {},
         }
 
     logger.info("Stage 2.8: detecting quizzes")
@@ -36,36 +418,65 @@ def run_stage2_8(
     final_quizzes: Dict[int, Dict[str, Any]] = {}
     module_application_quizzes: Dict[int, Dict[str, Any]] = {}
 
+    failed_quizzes: Dict[int, Dict[str, Any]] = {}
+
     if sentence_annotations is not None and not isinstance(sentence_annotations, dict):
             raise TypeError(
                 f"sentence_annotations must be dict or None, got {type(sentence_annotations)}"
             )
 
-    for quiz_id, state in quiz_states.items():
-        logger.info(f"Stage 2.8: processing quiz_id={quiz_id}")
+    # -------------------------------------------------
+    # Extract sources up-front (cheap, deterministic)
+    # -------------------------------------------------
+    jobs = prepare_quiz_jobs(
+        slides=slides,
+        quiz_states=quiz_states,
+        sentence_annotations=sentence_annotations,
+    )
 
-        source_paragraphs = extract_quiz_source(
-            slides=slides,
-            quiz_state=state,
-            sentence_annotations=sentence_annotations,  # ✅ NEW
-        )
+    # -------------------------------------------------
+    # Select quizzes to (re)generate
+    # -------------------------------------------------
+    payloads: Dict[int, Dict[str, Any]] = {}
+    to_run = jobs
 
-        logger.info(
-            f"[Stage 2.8] QUIZ:{quiz_id} parsed counts — "
-            f"inline={state.immediate_count}, "
-            f"final={state.deferred_count}, "
-            f"application={state.application_count}"
-        )
-        
-        quiz_payload = run_quiz_pipeline(
-            quiz_id=quiz_id,
-            inline_direct_questions=state.immediate_count,
-            final_direct_questions=state.deferred_count,
-            module_application_questions=state.application_count,
-            source_paragraphs=source_paragraphs,
-        )
+    if quiz_ids is not None:
+        unknown = sorted(set(quiz_ids) - {job.quiz_id for job in jobs})
+        if unknown:
+            raise ValueError(f"Stage 2.8: unknown quiz id(s) {unknown}")
 
-        questions = quiz_payload["questions"]
+        to_run = [job for job in jobs if job.quiz_id in quiz_ids]
+        for job in jobs:
+            if job.quiz_id in quiz_ids:
+                continue
+            previous = (previous_payloads or {}).get(job.quiz_id)
+            if previous is None:
+                logger.warning(
+                    f"Stage 2.8: quiz_id={job.quiz_id} not selected and has no previous payload — left out"
+                )
+            else:
+                payloads[job.quiz_id] = previous
+
+    # -------------------------------------------------
+    # Run quiz pipelines (longest-first, bounded)
+    # -------------------------------------------------
+    # Selected quizzes must not replay the cached answers they failed with.
+    with regenerating() if quiz_ids is not None else contextlib.nullcontext():
+        payloads.update(schedule_quiz_jobs(
+            to_run,
+            max_concurrent_quizzes=max_concurrent_quizzes,
+            journal=journal,
+            failures=failed_quizzes,
+        ))
+
+    # Assemble in detection order so outputs are deterministic
+    # regardless of completion order.
+    for job in jobs:
+        quiz_id = job.quiz_id
+        state = job.state
+        if quiz_id not in payloads:
+            continue
+        questions = payloads[quiz_id]["questions"]
 
         inline_questions = [
             q for q in questions if q["quiz_role"] == "inline_direct"
@@ -97,11 +508,17 @@ def run_stage2_8(
                 "questions": application_questions,
             }
 
+    if failed_quizzes:
+        logger.error(
+            f"Stage 2.8: {len(failed_quizzes)} quiz(zes) failed — "
+            f"quiz_ids={sorted(failed_quizzes)}"
+        )
     logger.info("Stage 2.8: orchestration complete")
 
     return {
         "inline_quizzes": inline_quizzes,
         "module_application_quizzes": module_application_quizzes,
         "final_quizzes": final_quizzes,
+        "failed_quizzes": {quiz_id: failed_quizzes[quiz_id] for quiz_id in sorted(failed_quizzes)},
     }
 
@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import Dict, List, Any, Set
 
 from .logger import logger
-from .llm_quiz import generate_quiz_questions
+from .llm_quiz import QuizPlan, generate_quiz_questions
 from .validate_quiz_output import validate_quiz_payload
 from .quiz_quality_review import review_quiz_quality
 from .apply_reviewer_fixes import apply_reviewer_fixes
@@ -12,6 +12,19 @@ from .distractor_review import distractor_review
 from .duplicate_correct_guard import detect_duplicate_correct_answers
 
 
+class QuizReviewFailed(RuntimeError):
+    """
+    A quiz still failed review after the editor and self-heal.
+    Carries the last payload and the reviewer's remaining issues.
+    """
+
+    def __init__(self, quiz_id: int, *, payload: Dict[str, Any], issues: List[Any]) -> None:
+        super().__init__(f"Quiz {quiz_id} failed quality review after editor")
+        self.quiz_id = quiz_id
+        self.payload = payload
+        self.issues = issues
+
+
 REVIEWERS = [
     ("clinical_review", review_quiz_quality),
     ("distractor_review", distractor_review),
@@ -33,6 +46,20 @@ REQUIRED_QUESTION_KEYS: Set[str] = {
 }
 
 
+def check_question_capacity(
+    *,
+    quiz_id: int,
+    total_questions: int,
+    source_paragraphs: List[str],
+) -> None:
+    max_allowed = max(1, len(source_paragraphs) * 2)
+    if total_questions > max_allowed:
+        raise ValueError(
+            f"Requested quiz questions exceed content capacity — "
+            f"quiz_id={quiz_id}, requested={total_questions}, allowed={max_allowed}"
+        )
+
+
 def run_quiz_pipeline(
     *,
     quiz_id: int,
@@ -40,10 +67,13 @@ def run_quiz_pipeline(
     final_direct_questions: int,
     module_application_questions: int,
     source_paragraphs: List[str],
+    plan: QuizPlan | None = None,
 ) -> Dict[str, Any]:
     """
     Runs Stage 2.8 quiz generation with:
     Author → Reviewer → Deterministic Fixer → Single-question Editor (one pass) → Re-review → Hard stop
+
+    `plan` (claims + blueprints) skips the author's Passes 1–2.
     """
 
     logger.info(f"Stage 2.8 quiz pipeline started — quiz_id={quiz_id}")
@@ -57,12 +87,11 @@ def run_quiz_pipeline(
         + module_application_questions
     )
 
-    max_allowed = max(1, len(source_paragraphs) * 2)
-    if total_questions > max_allowed:
-        raise ValueError(
-            f"Requested quiz questions exceed content capacity — "
-            f"quiz_id={quiz_id}, requested={total_questions}, allowed={max_allowed}"
-        )
+    check_question_capacity(
+        quiz_id=quiz_id,
+        total_questions=total_questions,
+        source_paragraphs=source_paragraphs,
+    )
 
     # -------------------------------------------------
     # 1) AUTHOR
@@ -73,6 +102,7 @@ def run_quiz_pipeline(
         inline_direct_questions=inline_direct_questions,
         final_direct_questions=final_direct_questions,
         module_application_questions=module_application_questions,
+        plan=plan,
     )
 
     # -------------------------------------------------
@@ -309,6 +339,7 @@ def run_quiz_pipeline(
         quiz_payload=fixed_quiz,
         review_result=final_review,
     )
+    last_quiz, last_review = fixed_quiz, final_review
 
     if healed_applied > 0:
         validate_quiz_payload(
@@ -328,11 +359,17 @@ def run_quiz_pipeline(
             )
             return healed_quiz
 
+        last_quiz, last_review = healed_quiz, healed_review
+
     # -------------------------------------------------
     # 5) HARD STOP (NO MORE RETRIES)
     # -------------------------------------------------
     logger.error(f"Quiz failed after editor + self-heal — quiz_id={quiz_id}")
-    logger.warning(f"Reviewer issues — {final_review.get('issues')}")
+    logger.warning(f"Reviewer issues — {last_review.get('issues')}")
 
-    raise RuntimeError(f"Quiz {quiz_id} failed quality review after editor")
+    raise QuizReviewFailed(
+        quiz_id,
+        payload=last_quiz,
+        issues=last_review.get("issues", []) or [],
+    )
 
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import argparse
 import json
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
+
+from src.utils.checkpoint import open_journal
 
 from .logger import logger
 from .run_stage2_8 import run_stage2_8
@@ -15,6 +18,7 @@ BASE_DIR = Path("data/processed")
 STAGE2_5_APPLIED_PATH = BASE_DIR / "module_stage2_after_2_5.json"
 STAGE2_6_PATH = BASE_DIR / "module_stage2_6.json"
 OUTPUT_PATH  = BASE_DIR / "module_stage2_8.json"
+FAILURES_PATH = BASE_DIR / "module_stage2_8_failures.json"
 
 
 def load_json(path: Path) -> Dict[str, Any]:
@@ -30,6 +34,56 @@ def write_json(path: Path, data: Dict[str, Any]) -> None:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
 
+def _parse_quiz_ids(value: str) -> List[int]:
+    try:
+        return sorted({int(part) for part in value.split(",") if part.strip()})
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated quiz ids, got {value!r}")
+
+
+def quiz_payloads_from_output(module: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
+    """
+    Quiz payloads recovered from a written module_stage2_8.json: the
+    questions of every quiz slide (inline, application, final) per quiz.
+    """
+    payloads: Dict[int, Dict[str, Any]] = {}
+    for slide in module.get("slides", []):
+        if slide.get("slide_type") != "quiz":
+            continue
+        quiz_id = int(slide["quiz_id"])
+        payload = payloads.setdefault(quiz_id, {"quiz_id": quiz_id, "questions": []})
+        payload["questions"].extend(slide.get("questions", []))
+    return payloads
+
+
+def write_failures_report(
+    failed_quizzes: Dict[int, Dict[str, Any]],
+    *,
+    regenerated: Optional[List[int]] = None,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Write (or clear) the failures report and return what it holds.
+    With `regenerated`, earlier failures of quizzes that were not
+    regenerated are kept.
+    """
+    failures = dict(failed_quizzes)
+
+    if regenerated is not None and FAILURES_PATH.exists():
+        for entry in load_json(FAILURES_PATH).get("failed_quizzes", []):
+            quiz_id = int(entry["quiz_id"])
+            if quiz_id not in regenerated:
+                failures.setdefault(quiz_id, entry)
+
+    if not failures:
+        FAILURES_PATH.unlink(missing_ok=True)
+        return failures
+
+    write_json(FAILURES_PATH, {
+        "failed_quizzes": [failures[quiz_id] for quiz_id in sorted(failures)],
+    })
+    return failures
+
+
 def _insert_application_slides_before_final(
     *,
     slides: list,
@@ -73,7 +127,22 @@ def _insert_application_slides_before_final(
     return slides
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stage 2.8 — quiz generation and insertion")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Replay quizzes journaled by an interrupted run; generate only the rest",
+    )
+    parser.add_argument(
+        "--quizzes",
+        type=_parse_quiz_ids,
+        default=None,
+        metavar="3,7",
+        help="Regenerate only these quiz ids; other quizzes keep their questions from the existing output",
+    )
+    args = parser.parse_args(argv)
+
     logger.info("Stage 2.8 MAIN starting")
 
     logger.info(f"Loading Stage 2.5 canonical (post-split): {STAGE2_5_APPLIED_PATH}")
@@ -95,9 +164,21 @@ def main() -> None:
     # ----------------------------
     # Run Stage 2.8 orchestration
     # ----------------------------
+    previous_payloads = None
+    if args.quizzes is not None:
+        if not OUTPUT_PATH.exists():
+            print(f"❌ --quizzes needs an existing {OUTPUT_PATH} to merge into")
+            return 2
+        previous_payloads = quiz_payloads_from_output(load_json(OUTPUT_PATH))
+        logger.info(f"Regenerating quiz_ids={args.quizzes}; merging into {OUTPUT_PATH}")
+
+    journal = open_journal(OUTPUT_PATH, resume=args.resume)
     result = run_stage2_8(
         module_json=module_stage2,
         sentence_annotations=stage2_6,
+        journal=journal,
+        quiz_ids=set(args.quizzes) if args.quizzes is not None else None,
+        previous_payloads=previous_payloads,
     )
 
     inline_quizzes = result.get("inline_quizzes", {})
@@ -171,10 +252,24 @@ def main() -> None:
     output_module["slides"] = new_slides
 
     write_json(OUTPUT_PATH, output_module)
+    journal.discard()
+
+    failed_quizzes = write_failures_report(
+        result.get("failed_quizzes", {}),
+        regenerated=args.quizzes,
+    )
 
     logger.info(f"Stage 2.8 MAIN complete — wrote {OUTPUT_PATH}")
 
+    if failed_quizzes:
+        ids = ",".join(str(quiz_id) for quiz_id in sorted(failed_quizzes))
+        print(f"❌ {len(failed_quizzes)} quiz(zes) failed — see {FAILURES_PATH}; retry with --quizzes {ids}")
+        return 1
+
+    print(f"✅ Stage 2.8 complete → {OUTPUT_PATH}")
+    return 0
+
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
 
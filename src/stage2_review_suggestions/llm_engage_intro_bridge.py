@@ -5,6 +5,8 @@ from typing import Dict, Optional, List
 
 from .logger import logger
 from src.utils.llm_client_realtime import LLMClientRealtime
+from src.utils.llm_gateway import LLMRequest
+from src.utils.output_schema import OutputSchema, nullable, obj, string
 
 
 SYSTEM_PROMPT = """
@@ -43,6 +45,36 @@ Return JSON:
 """
 
 
+BRIDGE_REQUIRED_KEYS = frozenset({"bridge", "rationale"})
+BRIDGE_OUTPUT = OutputSchema(
+    name="engage_intro_bridge",
+    schema=obj({"bridge": nullable(string()), "rationale": nullable(string())}),
+)
+
+
+def build_bridge_request(
+    *,
+    slide_id: str,
+    intro_text: str,
+    engage_items: List[str],
+    llm: LLMClientRealtime | None = None,
+) -> LLMRequest:
+    items_text = "\n".join(f"- {item}" for item in engage_items)
+
+    prompt = USER_PROMPT_TEMPLATE.format(
+        slide_id=slide_id,
+        intro_text=intro_text.strip(),
+        items=items_text,
+    )
+
+    return (llm or LLMClientRealtime()).build_request(
+        system_prompt=SYSTEM_PROMPT,
+        user_prompt=prompt,
+        stage_tag="Stage 2 Review Intro Bridge",
+        response_schema=BRIDGE_OUTPUT,
+    )
+
+
 def propose_engage_intro_bridge(
     *,
     slide_id: str,
@@ -60,22 +92,18 @@ def propose_engage_intro_bridge(
     if not intro_text or not engage_items:
         return {"bridge": None, "rationale": None}
 
-    items_text = "\n".join(f"- {item}" for item in engage_items)
-
-    prompt = USER_PROMPT_TEMPLATE.format(
-        slide_id=slide_id,
-        intro_text=intro_text.strip(),
-        items=items_text,
-    )
-
     logger.info(f"[INTRO-BRIDGE] Evaluating engage intro bridge — slide={slide_id}")
 
     llm = LLMClientRealtime()
 
-    response = llm.call_json_structured(
-        system_prompt=SYSTEM_PROMPT,
-        user_prompt=prompt,
-        required_keys={"bridge", "rationale"},
+    response = llm.complete(
+        build_bridge_request(
+            slide_id=slide_id,
+            intro_text=intro_text,
+            engage_items=engage_items,
+            llm=llm,
+        ),
+        required_keys=set(BRIDGE_REQUIRED_KEYS),
     )
 
     bridge = response.get("bridge")
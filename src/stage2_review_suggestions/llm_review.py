@@ -1,35 +1,79 @@
 from __future__ import annotations
-from typing import Dict, Any, Optional
+from typing import Dict, Any
 
-from .prompts import SYSTEM_PROMPT, USER_PROMPT_TEMPLATE
+from .prompts import (
+    REVIEW_ANALYSIS_SYSTEM_PROMPT,
+    REVIEW_ANALYSIS_USER_PROMPT_TEMPLATE,
+)
 from .logger import logger
 
 from src.utils.llm_client_realtime import LLMClientRealtime
+from src.utils.llm_gateway import LLMRequest
+from src.utils.output_schema import OutputSchema, array, nullable, obj, string
 
 _client = LLMClientRealtime()
 
 
-def review_text_unit(
+# -------------------------------------------------
+# Combined review + analysis (one call per unit)
+# -------------------------------------------------
+REVIEW_ANALYSIS_REQUIRED_KEYS = frozenset({"suggested", "notes", "flags", "analysis_notes"})
+REVIEW_ANALYSIS_OUTPUT = OutputSchema(
+    name="review_with_analysis",
+    schema=obj({
+        "suggested": nullable(string()),
+        "notes": nullable(string()),
+        "flags": array(string()),
+        "analysis_notes": nullable(string()),
+    }),
+)
+
+
+def build_review_analysis_request(
     *,
     unit_type: str,
     slide_id: str,
     content: str,
-) -> Dict[str, Optional[str]]:
-
-    user_prompt = USER_PROMPT_TEMPLATE.format(
+) -> LLMRequest:
+    user_prompt = REVIEW_ANALYSIS_USER_PROMPT_TEMPLATE.format(
         unit_type=unit_type,
         slide_id=slide_id,
         content=content,
     )
 
-    response = _client.call_json_structured(
-        system_prompt=SYSTEM_PROMPT,
+    return _client.build_request(
+        system_prompt=REVIEW_ANALYSIS_SYSTEM_PROMPT,
         user_prompt=user_prompt,
-        required_keys={"suggested", "notes"},
+        stage_tag="Stage 2 Review",
+        response_schema=REVIEW_ANALYSIS_OUTPUT,
+    )
+
+
+def review_and_analyze_text_unit(
+    *,
+    unit_type: str,
+    slide_id: str,
+    content: str,
+) -> Dict[str, Any]:
+    """
+    Editorial suggestion + clinical / pedagogical analysis in one call:
+    {"suggested", "notes", "analysis": {"flags", "notes"}}
+    """
+    response = _client.complete(
+        build_review_analysis_request(
+            unit_type=unit_type,
+            slide_id=slide_id,
+            content=content,
+        ),
+        required_keys=set(REVIEW_ANALYSIS_REQUIRED_KEYS),
     )
 
+    flags = response.get("flags") or []
+    if not isinstance(flags, list):
+        flags = []
+
     return {
         "suggested": response.get("suggested"),
         "notes": response.get("notes"),
+        "analysis": {"flags": flags, "notes": response.get("analysis_notes")},
     }
-
@@ -38,6 +38,34 @@ Return JSON with:
 - notes: short explanation OR null
 """
 
+# -------------------------------------------------
+# Combined review + analysis (one call per unit)
+# -------------------------------------------------
+REVIEW_ANALYSIS_SYSTEM_PROMPT = SYSTEM_PROMPT + """
+SECOND TASK — ANALYSIS (of the ORIGINAL content, not your suggestion):
+- Flag potential issues, ambiguities, or concerns. DO NOT rewrite anything here.
+- DO NOT add new medical facts or infer intent beyond the text.
+- Focus on clinical accuracy, scope appropriateness (e.g., CHW vs clinician roles),
+  pedagogical clarity, and ambiguous or potentially misleading phrasing.
+- If no issues are found, return empty flags and analysis_notes = null.
+"""
+
+REVIEW_ANALYSIS_USER_PROMPT_TEMPLATE = """
+Review and analyze the following content unit.
+
+Unit type: {unit_type}
+Slide ID: {slide_id}
+
+Content:
+{content}
+
+Return JSON with:
+- suggested: string OR null
+- notes: short explanation of the suggestion OR null
+- flags: list of short issue statements (empty if none)
+- analysis_notes: brief explanation of the flags OR null
+"""
+
 ENGAGE_INTRO_BRIDGE_SYSTEM_PROMPT = """
 You are reviewing licensed medical education content.
 
@@ -1,18 +1,40 @@
 from __future__ import annotations
 
 import json
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List
-
-from .llm_review import review_text_unit
-from .llm_review_analysis import analyze_text_unit
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.utils.checkpoint import open_journal
+from src.utils.concurrency import run_bounded, slide_max_workers
+from src.utils.config_loader import load_settings
+from src.utils.llm_client_batch import BatchItem
+from src.utils.retry_policy import with_stage_deadline
+from src.utils.slide_memo import memoized_slide, source_version
+from src.utils.token_logger import with_usage_summary
+from src.utils.tracing import span, traced
+
+from .llm_review import (
+    review_and_analyze_text_unit,
+    build_review_analysis_request,
+    REVIEW_ANALYSIS_REQUIRED_KEYS,
+)
+from . import llm_engage_intro_bridge, llm_review, prompts
 from .schema import ReviewPayload
 from .logger import logger
-from .llm_engage_intro_bridge import propose_engage_intro_bridge
+from .llm_engage_intro_bridge import (
+    propose_engage_intro_bridge,
+    build_bridge_request,
+    BRIDGE_REQUIRED_KEYS,
+)
 
 DEFAULT_INPUT = Path("data/processed/module_stage2.json")
 DEFAULT_OUTPUT = Path("data/review/module_review_suggestions.json")
 
+DEFAULT_UNIT_MAX_WORKERS = 4
+
 # -------------------------------------------------
 # Canonical unit types for review prompts
 # -------------------------------------------------
@@ -29,217 +51,347 @@ def load_json(path: Path) -> Dict[str, Any]:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def run_review(input_path: Path, output_path: Path) -> None:
-    module = load_json(input_path)
-
-    review: ReviewPayload = {
-        "review_version": "v1",
-        "source_stage": "pre_llm_pipeline",
-        "slides": [],
-    }
+@dataclass(frozen=True)
+class ReviewUnit:
+    """
+    One reviewable piece of a slide, in output order.
+
+    kind "text":   reviewed + analyzed in one call (original is the text)
+    kind "bridge": optional engage intro → items bridge (original is the intro)
+    """
+    slide_id: str
+    block_id: str
+    block_type: Optional[str]
+    unit_type: str
+    original: str
+    kind: str = "text"
+    items: Tuple[str, ...] = ()
+
+
+def review_units(slide: Dict[str, Any]) -> List[ReviewUnit]:
+    """
+    Enumerate the review units of one slide (same order as the output blocks).
+    """
+    slide_id = slide.get("uuid")
+    slide_type = slide.get("type")
+    content = slide.get("content", {})
+
+    units: List[ReviewUnit] = []
+
+    # -------------------------------------------------
+    # PANEL SLIDES
+    # -------------------------------------------------
+    if slide_type == "panel":
+        for idx, block in enumerate(content.get("blocks", [])):
+            block_type = block.get("type")
+
+            if block_type == "paragraph":
+                original = block.get("text", "").strip()
+                if not original:
+                    continue
 
-    for slide in module.get("slides", []):
-        slide_id = slide.get("uuid")
-        slide_type = slide.get("type")
-        content = slide.get("content", {})
-
-        blocks: List[Dict[str, Any]] = []
-
-        # -------------------------------------------------
-        # PANEL SLIDES
-        # -------------------------------------------------
-        if slide_type == "panel":
-            for idx, block in enumerate(content.get("blocks", [])):
-                block_type = block.get("type")
-
-                if block_type == "paragraph":
-                    original = block.get("text", "").strip()
-                    if not original:
-                        continue
-
-                    result = review_text_unit(
-                        unit_type=UNIT_TYPES["PANEL_PARAGRAPH"],
-                        slide_id=slide_id,
-                        content=original,
-                    )
-
-                    analysis = analyze_text_unit(
-                        unit_type=UNIT_TYPES["PANEL_PARAGRAPH"],
-                        slide_id=slide_id,
-                        content=original,
-                    )
-
-                    blocks.append({
-                        "block_id": f"{slide_id}_panel_paragraph_{idx}",
-                        "type": "paragraph",
-                        "original": original,
-                        "suggested": result["suggested"],
-                        "notes": result["notes"],
-                        "analysis": analysis if analysis["flags"] else None,
-                    })
-
-                elif block_type == "bullets":
-                    items = block.get("items", [])
-                    if not items:
-                        continue
-
-                    original = "\n".join(f"• {item}" for item in items)
-
-                    result = review_text_unit(
-                        unit_type=UNIT_TYPES["PANEL_BULLETS"],
-                        slide_id=slide_id,
-                        content=original,
-                    )
-
-                    analysis = analyze_text_unit(
-                        unit_type=UNIT_TYPES["PANEL_BULLETS"],
-                        slide_id=slide_id,
-                        content=original,
-                    )
-
-                    blocks.append({
-                        "block_id": f"{slide_id}_panel_bullets_{idx}",
-                        "type": "bullets",
-                        "original": original,
-                        "suggested": result["suggested"],
-                        "notes": result["notes"],
-                        "analysis": analysis if analysis["flags"] else None,
-                    })
-
-        # -------------------------------------------------
-        # ENGAGE 1 SLIDES
-        # -------------------------------------------------
-        elif slide_type == "engage":
-            if "items" not in slide:
-                logger.warning(
-                    f"[REVIEW] Engage slide {slide_id} has no 'items' key — nothing to review"
-                )
-
-            # ---- Intro text
-            intro = slide.get("intro", {})
-            intro_text = intro.get("text", "").strip()
-            if intro_text:
-                result = review_text_unit(
-                    unit_type=UNIT_TYPES["ENGAGE_INTRO"],
+                units.append(ReviewUnit(
                     slide_id=slide_id,
-                    content=intro_text,
-                )
+                    block_id=f"{slide_id}_panel_paragraph_{idx}",
+                    block_type="paragraph",
+                    unit_type=UNIT_TYPES["PANEL_PARAGRAPH"],
+                    original=original,
+                ))
+
+            elif block_type == "bullets":
+                items = block.get("items", [])
+                if not items:
+                    continue
 
-                analysis = analyze_text_unit(
-                    unit_type=UNIT_TYPES["ENGAGE_INTRO"],
+                units.append(ReviewUnit(
                     slide_id=slide_id,
-                    content=intro_text,
-                )
-
-                blocks.append({
-                    "block_id": f"{slide_id}_engage1_intro",
-                    "type": "paragraph",
-                    "original": intro_text,
-                    "suggested": result["suggested"],
-                    "notes": result["notes"],
-                    "analysis": analysis if analysis["flags"] else None,
-                })
+                    block_id=f"{slide_id}_panel_bullets_{idx}",
+                    block_type="bullets",
+                    unit_type=UNIT_TYPES["PANEL_BULLETS"],
+                    original="\n".join(f"• {item}" for item in items),
+                ))
+
+    # -------------------------------------------------
+    # ENGAGE 1 SLIDES
+    # -------------------------------------------------
+    elif slide_type == "engage":
+        if "items" not in slide:
+            logger.warning(
+                f"[REVIEW] Engage slide {slide_id} has no 'items' key — nothing to review"
+            )
+
+        # ---- Intro text
+        intro = slide.get("intro", {})
+        intro_text = intro.get("text", "").strip()
+        if intro_text:
+            units.append(ReviewUnit(
+                slide_id=slide_id,
+                block_id=f"{slide_id}_engage1_intro",
+                block_type="paragraph",
+                unit_type=UNIT_TYPES["ENGAGE_INTRO"],
+                original=intro_text,
+            ))
 
             # ---- OPTIONAL: Intro → Items bridge suggestion (review-only)
-            if intro_text:
-                item_texts: List[str] = []
-                for item in slide.get("items", []):
-                    for body in item.get("body", []):
-                        txt = body.get("text", "").strip()
-                        if txt:
-                            item_texts.append(txt)
-
-                if item_texts:
-                    bridge = propose_engage_intro_bridge(
-                        slide_id=slide_id,
-                        intro_text=intro_text,
-                        engage_items=item_texts,
-                    )
-
-                    if bridge["bridge"]:
-                        blocks.append({
-                            "block_id": f"{slide_id}_engage1_intro_bridge",
-                            "type": "intro_bridge",
-                            "original": None,
-                            "suggested": bridge["bridge"],
-                            "notes": bridge["rationale"]
-                                or "Optional bridging sentence to connect intro to engage items.",
-                            "analysis": None,
-                        })
-
-            # ---- Engage items
-            for item_idx, item in enumerate(slide.get("items", [])):
-                for body_idx, body in enumerate(item.get("body", [])):
-                    original = body.get("text", "").strip()
-                    if not original:
-                        continue
-
-                    result = review_text_unit(
-                        unit_type=UNIT_TYPES["ENGAGE_ITEM"],
-                        slide_id=slide_id,
-                        content=original,
-                    )
-
-                    analysis = analyze_text_unit(
-                        unit_type=UNIT_TYPES["ENGAGE_ITEM"],
-                        slide_id=slide_id,
-                        content=original,
-                    )
-
-                    blocks.append({
-                        "block_id": f"{slide_id}_engage1_item_{item_idx}_{body_idx}",
-                        "type": body.get("type"),
-                        "original": original,
-                        "suggested": result["suggested"],
-                        "notes": result["notes"],
-                        "analysis": analysis if analysis["flags"] else None,
-                    })
-
-        # -------------------------------------------------
-        # ENGAGE 2 SLIDES
-        # -------------------------------------------------
-        elif slide_type == "engage2":
-            for idx, block in enumerate(content.get("blocks", [])):
-                original = block.get("text", "").strip()
+            item_texts: List[str] = []
+            for item in slide.get("items", []):
+                for body in item.get("body", []):
+                    txt = body.get("text", "").strip()
+                    if txt:
+                        item_texts.append(txt)
+
+            if item_texts:
+                units.append(ReviewUnit(
+                    slide_id=slide_id,
+                    block_id=f"{slide_id}_engage1_intro_bridge",
+                    block_type="intro_bridge",
+                    unit_type=UNIT_TYPES["ENGAGE_INTRO"],
+                    original=intro_text,
+                    kind="bridge",
+                    items=tuple(item_texts),
+                ))
+
+        # ---- Engage items
+        for item_idx, item in enumerate(slide.get("items", [])):
+            for body_idx, body in enumerate(item.get("body", [])):
+                original = body.get("text", "").strip()
                 if not original:
                     continue
 
-                result = review_text_unit(
-                    unit_type=UNIT_TYPES["ENGAGE2"],
+                units.append(ReviewUnit(
                     slide_id=slide_id,
-                    content=original,
-                )
+                    block_id=f"{slide_id}_engage1_item_{item_idx}_{body_idx}",
+                    block_type=body.get("type"),
+                    unit_type=UNIT_TYPES["ENGAGE_ITEM"],
+                    original=original,
+                ))
+
+    # -------------------------------------------------
+    # ENGAGE 2 SLIDES
+    # -------------------------------------------------
+    elif slide_type == "engage2":
+        for idx, block in enumerate(content.get("blocks", [])):
+            original = block.get("text", "").strip()
+            if not original:
+                continue
+
+            units.append(ReviewUnit(
+                slide_id=slide_id,
+                block_id=f"{slide_id}_engage2_{idx}",
+                block_type=block.get("type"),
+                unit_type=UNIT_TYPES["ENGAGE2"],
+                original=original,
+            ))
+
+    return units
+
+
+def review_unit(unit: ReviewUnit) -> Optional[Dict[str, Any]]:
+    """
+    Run the LLM call for one unit and build its review block
+    (None when an optional bridge is not needed).
+    """
+    if unit.kind == "bridge":
+        bridge = propose_engage_intro_bridge(
+            slide_id=unit.slide_id,
+            intro_text=unit.original,
+            engage_items=list(unit.items),
+        )
+
+        if not bridge["bridge"]:
+            return None
+
+        return {
+            "block_id": unit.block_id,
+            "type": "intro_bridge",
+            "original": None,
+            "suggested": bridge["bridge"],
+            "notes": bridge["rationale"]
+                or "Optional bridging sentence to connect intro to engage items.",
+            "analysis": None,
+        }
+
+    result = review_and_analyze_text_unit(
+        unit_type=unit.unit_type,
+        slide_id=unit.slide_id,
+        content=unit.original,
+    )
+    analysis = result["analysis"]
+
+    return {
+        "block_id": unit.block_id,
+        "type": unit.block_type,
+        "original": unit.original,
+        "suggested": result["suggested"],
+        "notes": result["notes"],
+        "analysis": analysis if analysis["flags"] else None,
+    }
+
+
+@lru_cache(maxsize=None)
+def _memo_version() -> str:
+    return source_version(
+        sys.modules[__name__], llm_review, llm_engage_intro_bridge, prompts,
+    )
+
+
+def _unit_max_workers() -> int:
+    """
+    Units of one slide reviewed at once, from settings.yaml
+    (review.unit_max_workers). 1 = sequential.
+    """
+    stage_settings = load_settings().get("review", {}) or {}
+    return max(1, int(stage_settings.get("unit_max_workers", DEFAULT_UNIT_MAX_WORKERS)))
+
+
+def review_slide(units: List[ReviewUnit]) -> List[Dict[str, Any]]:
+    """
+    Review blocks for one slide's units. Units run concurrently
+    (review.unit_max_workers); blocks keep unit order. A slide whose units
+    are unchanged reuses its stored blocks (block ids are re-derived, so a
+    slide keeps its results when slides before it are added or removed).
+    """
+    if not units:
+        return []
+
+    def _review(unit: ReviewUnit) -> Optional[Dict[str, Any]]:
+        block = review_unit(unit)
+        if block is not None:
+            block = {k: v for k, v in block.items() if k != "block_id"}
+        return block
+
+    def compute() -> List[Optional[Dict[str, Any]]]:
+        return run_bounded(
+            _review,
+            units,
+            max_workers=_unit_max_workers(),
+            thread_name_prefix="review-unit",
+        )
+
+    material = [
+        [u.kind, u.block_type, u.unit_type, u.original, list(u.items)]
+        for u in units
+    ]
+    results = memoized_slide("review", material, compute, version=_memo_version())
+
+    return [
+        {"block_id": unit.block_id, **block}
+        for unit, block in zip(units, results)
+        if block is not None
+    ]
+
+
+@traced("review")
+@with_usage_summary("review")
+@with_stage_deadline("review")
+def run_review(
+    input_path: Path,
+    output_path: Path,
+    *,
+    max_workers: Optional[int] = None,
+    resume: bool = False,
+) -> None:
+    """
+    Review every slide. Slides run concurrently (max_workers, default
+    review.slide_max_workers), and so do the units inside each slide
+    (review.unit_max_workers); each finished slide is journaled next to
+    output_path at once, so a crash keeps completed work and resume=True
+    reviews only the remaining slides.
+    """
+    module = load_json(input_path)
+    slides = module.get("slides", [])
+
+    if max_workers is None:
+        max_workers = slide_max_workers("review")
+
+    review: ReviewPayload = {
+        "review_version": "v1",
+        "source_stage": "pre_llm_pipeline",
+        "slides": [],
+    }
+
+    journal = open_journal(output_path, resume=resume)
+
+    def _run(indexed: Tuple[int, Dict[str, Any]]) -> Dict[str, Any]:
+        index, slide = indexed
+        slide_id = slide.get("uuid")
+        with span("slide", kind="slide", slide_id=slide_id):
+            blocks = journal.run(
+                slide_id or f"index_{index}",
+                slide,
+                lambda: review_slide(review_units(slide)),
+            )
+
+        return {
+            "slide_id": slide_id,
+            "slide_type": slide.get("type"),
+            "blocks": blocks,
+        }
+
+    records = run_bounded(
+        _run,
+        list(enumerate(slides)),
+        max_workers=max_workers,
+        thread_name_prefix="review-slide",
+    )
+
+    # -------------------------------------------------
+    # SAVE SLIDE REVIEWS (module order)
+    # -------------------------------------------------
+    review["slides"] = [record for record in records if record["blocks"]]
 
-                analysis = analyze_text_unit(
-                    unit_type=UNIT_TYPES["ENGAGE2"],
-                    slide_id=slide_id,
-                    content=original,
-                )
-
-                blocks.append({
-                    "block_id": f"{slide_id}_engage2_{idx}",
-                    "type": block.get("type"),
-                    "original": original,
-                    "suggested": result["suggested"],
-                    "notes": result["notes"],
-                    "analysis": analysis if analysis["flags"] else None,
-                })
-
-        # -------------------------------------------------
-        # SAVE SLIDE REVIEW
-        # -------------------------------------------------
-        if blocks:
-            review["slides"].append({
-                "slide_id": slide_id,
-                "slide_type": slide_type,
-                "blocks": blocks,
-            })
-
-    output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text(json.dumps(review, indent=2), encoding="utf-8")
+    journal.discard()
 
     logger.info(f"Review suggestions written to {output_path}")
 
 
+# -------------------------------------------------
+# Batch API input
+# -------------------------------------------------
+def collect_batch_items(module: Dict[str, Any]) -> List[BatchItem]:
+    """
+    Every review+analysis / bridge request run_review would send,
+    identical to the realtime requests.
+    """
+    items: List[BatchItem] = []
+
+    for slide in module.get("slides", []):
+        for unit in review_units(slide):
+            if unit.kind == "bridge":
+                items.append(BatchItem(
+                    custom_id=f"review_bridge:{unit.block_id}",
+                    request=build_bridge_request(
+                        slide_id=unit.slide_id,
+                        intro_text=unit.original,
+                        engage_items=list(unit.items),
+                    ),
+                    required_keys=BRIDGE_REQUIRED_KEYS,
+                ))
+                continue
+
+            items.append(BatchItem(
+                custom_id=f"review:{unit.block_id}",
+                request=build_review_analysis_request(
+                    unit_type=unit.unit_type,
+                    slide_id=unit.slide_id,
+                    content=unit.original,
+                ),
+                required_keys=REVIEW_ANALYSIS_REQUIRED_KEYS,
+            ))
+
+    return items
+
+
 if __name__ == "__main__":
-    run_review(DEFAULT_INPUT, DEFAULT_OUTPUT)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stage 2 editorial review suggestions")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Replay slides journaled by an interrupted run; review only the rest",
+    )
+    args = parser.parse_args()
+
+    run_review(DEFAULT_INPUT, DEFAULT_OUTPUT, resume=args.resume)
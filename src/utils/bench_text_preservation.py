@@ -0,0 +1,134 @@
+"""
+Benchmark: check_preserved strategies vs the Aho-Corasick automaton.
+
+Three workloads, each checked for identical results:
+- whole:    fidelity audit (every Word fragment equals a Stage fragment) —
+            hash lookups vs the automaton
+- contains: sentence-shaping validator (a few sentences inside a paragraph) —
+            str.find vs the automaton
+- counts:   occurrence count of every sentence of a module in its full
+            text — the automaton (one pass) vs an overlapping str.find loop
+            per fragment (one pass each: quadratic, so the automaton wins
+            once the module reaches a few thousand sentences)
+
+    python -m src.utils.bench_text_preservation --scale 1 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .text_preservation import FRAGMENT_SEPARATOR, FragmentAutomaton, PreservationReport, check_preserved
+
+_WORDS = (
+    "patient clinician dose symptom screening referral follow-up counselling "
+    "infection nutrition growth vaccine assessment history examination "
+    "caregiver danger sign fever cough breathing"
+).split()
+
+
+# -------------------------------
+# Workloads
+# -------------------------------
+
+def _sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(n)).capitalize() + "."
+
+
+def _whole(rng: random.Random, scale: int) -> Tuple[List[str], List[str]]:
+    haystack = [_sentence(rng, rng.randint(6, 30)) for _ in range(2000 * scale)]
+    return haystack[::2], haystack
+
+
+def _contains(rng: random.Random, scale: int) -> Tuple[List[str], str]:
+    sentences = [_sentence(rng, rng.randint(6, 20)) for _ in range(4)]
+    return sentences, " ".join(sentences)
+
+
+def _counts(rng: random.Random, scale: int) -> Tuple[List[str], str]:
+    # Exactly-once rule over a whole module: every sentence, counted in the full text.
+    sentences = [_sentence(rng, rng.randint(6, 20)) for _ in range(2000 * scale)]
+    text = " ".join(sentences)
+    rng.shuffle(sentences)
+    return sentences, text
+
+
+def _naive_counts(fragments: Sequence[str], text: str) -> List[int]:
+    counts = []
+    for fragment in fragments:
+        n, at = 0, text.find(fragment)
+        while at >= 0:
+            n += 1
+            at = text.find(fragment, at + 1)
+        counts.append(n)
+    return counts
+
+
+def _automaton(fragments: Sequence[str], haystack, *, whole: bool = False) -> PreservationReport:
+    sep = FRAGMENT_SEPARATOR
+    if isinstance(haystack, str):
+        return FragmentAutomaton(fragments).scan(haystack)
+    text = sep + sep.join(haystack) + sep
+    if whole:
+        return FragmentAutomaton(f"{sep}{f}{sep}" for f in fragments).scan(text)
+    return FragmentAutomaton(fragments).scan(text)
+
+
+# -------------------------------
+# Runs
+# -------------------------------
+
+def _best(fn: Callable[[], object], repeat: int) -> Tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark check_preserved strategies")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--contains-calls", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    ok = True
+    print(f"{'workload':>9} {'scale':>6} {'baseline':>10} {'s':>9} {'chosen':>10} {'s':>9} {'speedup':>8}  same")
+
+    def row(name: str, scale: int, base: Tuple[str, float], chosen: Tuple[str, float], same: bool) -> None:
+        nonlocal ok
+        ok = ok and same
+        print(
+            f"{name:>9} {scale:>6} {base[0]:>10} {base[1]:>9.4f} {chosen[0]:>10} {chosen[1]:>9.4f} "
+            f"{base[1] / chosen[1]:>7.1f}x  {'✅' if same else '❌'}"
+        )
+
+    for scale in args.scale:
+        rng = random.Random(scale)
+
+        fragments, haystack = _whole(rng, scale)
+        t_auto, auto = _best(lambda: _automaton(fragments, haystack, whole=True), args.repeat)
+        t_set, fast = _best(lambda: check_preserved(fragments, haystack, whole_fragments=True), args.repeat)
+        row("whole", scale, ("automaton", t_auto), ("set", t_set), auto.counts == fast.counts)
+
+        cases = [_contains(rng, scale) for _ in range(args.contains_calls)]
+        t_auto, auto = _best(lambda: [_automaton(f, t).missing for f, t in cases], args.repeat)
+        t_find, fast = _best(lambda: [check_preserved(f, t).missing for f, t in cases], args.repeat)
+        row("contains", scale, ("automaton", t_auto), ("find", t_find), auto == fast)
+
+        fragments, text = _counts(rng, scale)
+        t_naive, naive = _best(lambda: _naive_counts(fragments, text), args.repeat)
+        t_auto, auto = _best(lambda: check_preserved(fragments, text, count_all=True), args.repeat)
+        row("counts", scale, ("find loop", t_naive), ("automaton", t_auto), naive == auto.counts)
+
+    print("✅ Results identical" if ok else "❌ Results differ")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+logger = logging.getLogger("checkpoint")
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+
+
+# -------------------------------------------------
+# Keys
+# -------------------------------------------------
+
+def journal_path(output_path: Path) -> Path:
+    """The journal sits next to the stage output: <output>.journal.jsonl"""
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.name + JOURNAL_SUFFIX)
+
+
+def input_hash(material: Any) -> str:
+    """
+    Hash of one work unit's input. Only the data is hashed (not code or
+    prompts), so units finished before a crash are replayed after the
+    crash is fixed.
+    """
+    blob = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+# -------------------------------------------------
+# Journal
+# -------------------------------------------------
+
+class CheckpointJournal:
+    """
+    Append-only JSONL journal of completed work units (slides, quizzes)
+    for one stage run: one {"unit", "input_hash", "result"} line per unit,
+    written as soon as the unit finishes. Safe to share between threads.
+
+    resume=True replays the units already on disk whose input hash still
+    matches; otherwise the journal starts empty. Call discard() once the
+    stage output has been written.
+    """
+
+    def __init__(self, path: Path, *, resume: bool = False) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.replayed = 0
+        self.recorded = 0
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[str, Any]] = {}
+
+        if resume and self.path.exists():
+            self._load()
+            logger.warning(f"[CHECKPOINT] {self.path}: {len(self._entries)} unit(s) to replay")
+        else:
+            self.path.write_text("", encoding="utf-8")
+
+    def _load(self) -> None:
+        with self.path.open("r", encoding="utf-8") as f:
+            for lineno, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    # Later lines win: a unit re-run on new input supersedes the old one.
+                    self._entries[str(entry["unit"])] = (entry["input_hash"], entry["result"])
+                except (ValueError, KeyError, TypeError):
+                    # A crash mid-write leaves at most a torn last line.
+                    logger.warning(f"[CHECKPOINT] {self.path}:{lineno} unreadable — ignored")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def has(self, unit: str, material: Any) -> bool:
+        with self._lock:
+            entry = self._entries.get(str(unit))
+        return entry is not None and entry[0] == input_hash(material)
+
+    def record(self, unit: str, digest: str, result: Any) -> None:
+        line = json.dumps(
+            {"unit": str(unit), "input_hash": digest, "result": result},
+            ensure_ascii=False,
+        )
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self._entries[str(unit)] = (digest, result)
+            self.recorded += 1
+
+    def run(self, unit: str, material: Any, compute: Callable[[], Any]) -> Any:
+        """
+        The journaled result for this unit and input, or compute()
+        (journaled on success). compute() must return a JSON-serialisable
+        value; exceptions propagate and nothing is journaled.
+        """
+        digest = input_hash(material)
+        with self._lock:
+            entry = self._entries.get(str(unit))
+            if entry is not None and entry[0] == digest:
+                self.replayed += 1
+                return entry[1]
+
+        result = compute()
+        self.record(unit, digest, result)
+        return result
+
+    def run_in_place(self, unit: str, record: Dict[str, Any], apply: Callable[[], None]) -> None:
+        """
+        run() for stages that mutate a slide dict: the mutated dict is
+        journaled, and replaying restores it.
+        """
+        def compute() -> Dict[str, Any]:
+            apply()
+            return record
+
+        done = self.run(unit, record, compute)
+        if done is not record:
+            record.clear()
+            record.update(done)
+
+    def discard(self) -> None:
+        """The stage output is written; nothing is left to resume."""
+        if self.replayed:
+            logger.warning(f"[CHECKPOINT] {self.path.name}: replayed {self.replayed} unit(s)")
+        self.path.unlink(missing_ok=True)
+
+
+def open_journal(output_path: Path, *, resume: bool = False) -> CheckpointJournal:
+    return CheckpointJournal(journal_path(output_path), resume=resume)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Iterable, List, TypeVar
+
+from .config_loader import load_settings
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_SLIDE_MAX_WORKERS = 4
+
+
+def run_bounded(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    max_workers: int,
+    thread_name_prefix: str = "llm",
+) -> List[R]:
+    """
+    Run fn over items with at most `max_workers` in flight.
+
+    - Results are returned in INPUT order (never completion order).
+    - Each task runs in a copy of the caller's contextvars.
+    - max_workers <= 1 runs sequentially in the calling thread.
+    - The first failure (in input order) is re-raised; tasks that
+      have not started yet are cancelled.
+    """
+    work = list(items)
+
+    if max_workers <= 1 or len(work) <= 1:
+        return [fn(item) for item in work]
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(work)),
+        thread_name_prefix=thread_name_prefix,
+    ) as pool:
+        futures: List[Future] = [
+            pool.submit(contextvars.copy_context().run, fn, item)
+            for item in work
+        ]
+
+        results: List[R] = []
+        try:
+            for fut in futures:
+                results.append(fut.result())
+        except BaseException:
+            for fut in futures:
+                fut.cancel()
+            raise
+
+    return results
+
+
+def slide_max_workers(stage: str) -> int:
+    """
+    Slides a per-slide stage runner processes at once, from settings.yaml
+    (<stage>.slide_max_workers). 1 = sequential.
+    """
+    stage_settings = load_settings().get(stage, {}) or {}
+    return max(1, int(stage_settings.get("slide_max_workers", DEFAULT_SLIDE_MAX_WORKERS)))
@@ -1,5 +1,7 @@
 from __future__ import annotations
+import copy
 import pathlib
+import threading
 import yaml
 
 # Root = project root (where src/ and data/ live)
@@ -10,11 +12,32 @@ def get_config_dir() -> pathlib.Path:
     return _ROOT / "config"
 
 
+_settings: dict | None = None
+_settings_lock = threading.Lock()
+
+
 def load_settings() -> dict:
-    """Load YAML settings once per process."""
-    settings_path = get_config_dir() / "settings.yaml"
-    with open(settings_path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    """
+    Load YAML settings once per process.
+
+    Parsed on first use and memoized; each caller gets its own deep copy,
+    so mutating the result never leaks into other callers.
+    """
+    global _settings
+    with _settings_lock:
+        if _settings is None:
+            settings_path = get_config_dir() / "settings.yaml"
+            with open(settings_path, "r", encoding="utf-8") as f:
+                _settings = yaml.safe_load(f) or {}
+        return copy.deepcopy(_settings)
+
+
+def reload_settings() -> dict:
+    """Drop the memoized settings and re-read settings.yaml."""
+    global _settings
+    with _settings_lock:
+        _settings = None
+    return load_settings()
 
 
 def load_prompt(filename: str) -> str:
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import pathlib
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+DEFAULT_MAX_BATCH_RECORDS = 200
+
+
+class BufferedJsonlWriter:
+    """
+    Append JSON records to .jsonl files from any thread without blocking.
+
+    write() only enqueues. One background thread appends queued lines in
+    batches (every flush_interval_s, or sooner once max_batch lines are
+    waiting), so concurrent producers never interleave partial lines.
+    """
+
+    def __init__(
+        self,
+        *,
+        flush_interval_s: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        max_batch: int = DEFAULT_MAX_BATCH_RECORDS,
+        name: str = "jsonl-writer",
+    ) -> None:
+        self.flush_interval_s = flush_interval_s
+        self.max_batch = max(1, max_batch)
+        self.name = name
+
+        # None is a flush marker: write what is buffered right away.
+        self._queue: "queue.Queue[Optional[Tuple[pathlib.Path, str]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self, path: pathlib.Path, record: Dict[str, Any]) -> None:
+        self._ensure_thread()
+        self._queue.put((pathlib.Path(path), json.dumps(record, ensure_ascii=False)))
+
+    def flush(self) -> None:
+        """Block until every queued record is on disk."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._queue.join()
+
+    # ---------------- background thread ----------------
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch: List[Optional[Tuple[pathlib.Path, str]]] = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval_s
+            while batch[-1] is not None and len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                _append([item for item in batch if item is not None])
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+def _append(batch: List[Tuple[pathlib.Path, str]]) -> None:
+    by_path: Dict[pathlib.Path, List[str]] = {}
+    for path, line in batch:
+        by_path.setdefault(path, []).append(line)
+
+    for path, lines in by_path.items():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
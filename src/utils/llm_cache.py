@@ -0,0 +1,442 @@
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .config_loader import load_settings
+
+logger = logging.getLogger("llm_cache")
+
+DEFAULT_CACHE_PATH = "data/cache/llm_responses.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key          TEXT PRIMARY KEY,
+    provider     TEXT NOT NULL,
+    model        TEXT NOT NULL,
+    created_at   REAL NOT NULL,
+    last_access  REAL NOT NULL,
+    size_bytes   INTEGER NOT NULL,
+    value        TEXT NOT NULL
+)
+"""
+
+
+# -------------------------------------------------
+# Cache key
+# -------------------------------------------------
+
+def make_cache_key(
+    *,
+    provider: str,
+    model: str,
+    temperature: float,
+    max_tokens: int | None,
+    prompt: Any,
+    prompt_version: str = "v1",
+    variant: str = "",
+) -> str:
+    """
+    Content-addressed key for one LLM request.
+
+    `prompt` may be a plain string or any JSON-serialisable structure
+    (e.g. a messages list). Any change to the prompt text, model or
+    sampling parameters produces a different key. `variant` separates
+    deliberate re-asks of the same prompt (e.g. retry attempt 2 after a
+    validation failure) so they are not answered from attempt 1's entry.
+    """
+    prompt_blob = prompt if isinstance(prompt, str) else json.dumps(
+        prompt, sort_keys=True, ensure_ascii=False
+    )
+    prompt_hash = hashlib.sha256(prompt_blob.encode("utf-8")).hexdigest()
+
+    material = {
+        "provider": provider,
+        "model": model,
+        "temperature": float(temperature),
+        "max_tokens": max_tokens,
+        "prompt_version": prompt_version,
+        "variant": variant,
+        "prompt_sha256": prompt_hash,
+    }
+    return hashlib.sha256(
+        json.dumps(material, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+# -------------------------------------------------
+# Counters
+# -------------------------------------------------
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    inflight_waits: int = 0
+    stores: int = 0
+    evictions: int = 0
+    bypassed: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def incr(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + n)
+
+    def as_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "inflight_waits": self.inflight_waits,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "bypassed": self.bypassed,
+            }
+
+
+class _InFlight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.ok = False
+
+
+# -------------------------------------------------
+# SQLite-backed cache
+# -------------------------------------------------
+
+class LLMResponseCache:
+    """
+    Persistent, content-addressed store of parsed LLM responses.
+
+    - SQLite file, safe to share between threads of one process
+    - TTL expiry and size (entries / bytes) eviction, least-recently-used first
+    - In-flight de-duplication: concurrent identical requests make ONE call
+    - Hit / miss counters (see stats)
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        ttl_seconds: float | None = None,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+        self._inflight: Dict[str, _InFlight] = {}
+        self._inflight_lock = threading.Lock()
+
+    # ---------------- storage ----------------
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            value, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.stats.incr("evictions")
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+
+        return json.loads(value)
+
+    def put(self, key: str, value: Any, *, provider: str, model: str) -> None:
+        blob = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, provider, model, created_at, last_access, size_bytes, value) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, provider, model, now, now, len(blob.encode("utf-8")), blob),
+            )
+            self._conn.commit()
+        self.stats.incr("stores")
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Drop expired entries, then least-recently-used entries until the
+        entry and byte limits hold. Returns the number of rows removed.
+        """
+        removed = 0
+        with self._db_lock:
+            if self.ttl_seconds is not None:
+                cur = self._conn.execute(
+                    "DELETE FROM responses WHERE created_at < ?",
+                    (time.time() - self.ttl_seconds,),
+                )
+                removed += cur.rowcount
+
+            if self.max_entries is not None:
+                (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+                excess = count - self.max_entries
+                if excess > 0:
+                    cur = self._conn.execute(
+                        "DELETE FROM responses WHERE key IN ("
+                        "SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                        (excess,),
+                    )
+                    removed += cur.rowcount
+
+            if self.max_bytes is not None:
+                (total,) = self._conn.execute(
+                    "SELECT COALESCE(SUM(size_bytes), 0) FROM responses"
+                ).fetchone()
+                while total > self.max_bytes:
+                    row = self._conn.execute(
+                        "SELECT key, size_bytes FROM responses ORDER BY last_access ASC LIMIT 1"
+                    ).fetchone()
+                    if row is None:
+                        break
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+                    total -= row[1]
+                    removed += 1
+
+            self._conn.commit()
+
+        if removed:
+            self.stats.incr("evictions", removed)
+        return removed
+
+    def close(self) -> None:
+        with self._db_lock:
+            self._conn.close()
+
+    # ---------------- read-through ----------------
+
+    def get_or_call(
+        self,
+        key: str,
+        call: Callable[[], Any],
+        *,
+        provider: str,
+        model: str,
+    ) -> Any:
+        """
+        Return the cached value for key, or run call() exactly once across
+        all concurrent callers asking for the same key and store its result.
+
+        Failures are never cached; waiters whose leader failed retry the
+        call themselves.
+        """
+        while True:
+            cached = self.get(key)
+            if cached is not None:
+                self.stats.incr("hits")
+                return cached
+
+            with self._inflight_lock:
+                pending = self._inflight.get(key)
+                leader = pending is None
+                if leader:
+                    pending = _InFlight()
+                    self._inflight[key] = pending
+
+            if not leader:
+                self.stats.incr("inflight_waits")
+                pending.done.wait()
+                if pending.ok:
+                    self.stats.incr("hits")
+                    return pending.value
+                continue
+
+            self.stats.incr("misses")
+            try:
+                value = call()
+                self.put(key, value, provider=provider, model=model)
+                pending.value = value
+                pending.ok = True
+                return value
+            finally:
+                with self._inflight_lock:
+                    self._inflight.pop(key, None)
+                pending.done.set()
+
+
+# -------------------------------------------------
+# Process-wide instance
+# -------------------------------------------------
+
+_cache: LLMResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def _cache_settings() -> Dict[str, Any]:
+    return load_settings().get("cache", {}) or {}
+
+
+def cache_enabled() -> bool:
+    if os.getenv("LLM_CACHE_DISABLE", "").strip() in ("1", "true", "yes"):
+        return False
+    return bool(_cache_settings().get("enabled", True))
+
+
+def get_llm_cache() -> LLMResponseCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            cfg = _cache_settings()
+            max_mb = cfg.get("max_size_mb")
+            ttl_days = cfg.get("ttl_days")
+            _cache = LLMResponseCache(
+                Path(cfg.get("path", DEFAULT_CACHE_PATH)),
+                ttl_seconds=float(ttl_days) * 86400 if ttl_days is not None else None,
+                max_entries=cfg.get("max_entries"),
+                max_bytes=int(float(max_mb) * 1024 * 1024) if max_mb is not None else None,
+            )
+            atexit.register(log_cache_stats)
+        return _cache
+
+
+def log_cache_stats() -> None:
+    if _cache is None:
+        return
+    stats = _cache.stats.as_dict()
+    if stats["hits"] or stats["misses"] or stats["bypassed"]:
+        logger.warning(
+            "[LLM CACHE] hits=%(hits)d misses=%(misses)d inflight_waits=%(inflight_waits)d "
+            "stores=%(stores)d evictions=%(evictions)d bypassed=%(bypassed)d" % stats
+        )
+
+
+def cached_llm_call(
+    *,
+    provider: str,
+    model: str,
+    temperature: float,
+    max_tokens: int | None,
+    prompt: Any,
+    call: Callable[[], Any],
+    prompt_version: str | None = None,
+    variant: str = "",
+) -> Any:
+    """
+    Read-through wrapper used by every LLM entry point.
+
+    Only deterministic requests (temperature <= cache.max_temperature,
+    default 0.0) are cached; everything else calls straight through.
+    `call` must return the final, validated, JSON-serialisable result.
+    """
+    if not cache_enabled():
+        return call()
+
+    cache = get_llm_cache()
+
+    if not is_cacheable(temperature):
+        cache.stats.incr("bypassed")
+        return call()
+
+    key = resolve_cache_key(
+        provider=provider,
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        prompt=prompt,
+        prompt_version=prompt_version,
+        variant=variant,
+    )
+    return cache.get_or_call(key, call, provider=provider, model=model)
+
+
+def is_cacheable(temperature: float) -> bool:
+    return float(temperature) <= float(_cache_settings().get("max_temperature", 0.0))
+
+
+def resolve_cache_key(
+    *,
+    provider: str,
+    model: str,
+    temperature: float,
+    max_tokens: int | None,
+    prompt: Any,
+    prompt_version: str | None = None,
+    variant: str = "",
+) -> str:
+    """
+    make_cache_key with the configured default prompt_version applied.
+    """
+    return make_cache_key(
+        provider=provider,
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        prompt=prompt,
+        prompt_version=prompt_version or str(_cache_settings().get("prompt_version", "v1")),
+        variant=variant,
+    )
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or prune the persistent LLM response cache")
+    parser.add_argument("--clear", action="store_true", help="Delete every cached response")
+    parser.add_argument("--evict", action="store_true", help="Apply TTL / size eviction now")
+    args = parser.parse_args()
+
+    cache = get_llm_cache()
+
+    if args.clear:
+        with cache._db_lock:
+            cache._conn.execute("DELETE FROM responses")
+            cache._conn.commit()
+        print(f"✅ Cleared {cache.path}")
+
+    if args.evict:
+        print(f"✅ Evicted {cache.evict()} entries")
+
+    with cache._db_lock:
+        count, total = cache._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM responses"
+        ).fetchone()
+        per_model = cache._conn.execute(
+            "SELECT provider, model, COUNT(*) FROM responses GROUP BY provider, model"
+        ).fetchall()
+
+    print(f"Cache: {cache.path}")
+    print(f"Entries: {count} ({total / 1024:.1f} KiB)")
+    for provider, model, n in per_model:
+        print(f"  {provider}/{model}: {n}")
+
+
+if __name__ == "__main__":
+    main()
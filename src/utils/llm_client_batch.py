@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Optional
+
+from .llm_gateway import LLMGateway, LLMRequest, RESPONSES_ENDPOINT, get_gateway
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    """
+    One deferred LLM call.
+
+    custom_id:     stable id, derived from the unit it belongs to (slide/block/quiz)
+    request:       the SAME gateway request the realtime path would send
+    required_keys: the SAME required_keys the realtime path passes
+    validate:      optional extra check before a result is accepted
+    """
+    custom_id: str
+    request: LLMRequest
+    required_keys: Optional[FrozenSet[str]] = None
+    validate: Optional[Callable[[Dict[str, Any]], None]] = None
+
+
+def response_text_from_body(endpoint: str, body: Dict[str, Any]) -> str:
+    """
+    Extract the model text from a raw OpenAI response body
+    (chat.completions or responses), as found in Batch API output files.
+    """
+    if endpoint == RESPONSES_ENDPOINT:
+        parts = []
+        for item in body.get("output", []) or []:
+            if item.get("type") != "message":
+                continue
+            for content in item.get("content", []) or []:
+                if content.get("type") == "output_text":
+                    parts.append(content.get("text", ""))
+        return "".join(parts)
+
+    choices = body.get("choices") or []
+    if not choices:
+        return ""
+    return (choices[0].get("message") or {}).get("content") or ""
+
+
+def usage_from_body(endpoint: str, body: Dict[str, Any]) -> tuple[int, int]:
+    usage = body.get("usage") or {}
+    if endpoint == RESPONSES_ENDPOINT:
+        return int(usage.get("input_tokens", 0) or 0), int(usage.get("output_tokens", 0) or 0)
+    return int(usage.get("prompt_tokens", 0) or 0), int(usage.get("completion_tokens", 0) or 0)
+
+
+class LLMClientBatch:
+    """
+    Thin wrapper over the OpenAI Files + Batches endpoints.
+
+    Uses the gateway's pooled OpenAI client, so credentials, base URL
+    (OPENAI_BASE_URL) and timeouts match the realtime path.
+    """
+
+    def __init__(self, gateway: LLMGateway | None = None):
+        self._gateway = gateway or get_gateway()
+
+    @property
+    def _client(self) -> Any:
+        return self._gateway.client("openai")
+
+    def upload_input(self, path) -> str:
+        with open(path, "rb") as f:
+            uploaded = self._client.files.create(file=f, purpose="batch")
+        return uploaded.id
+
+    def create_batch(self, *, input_file_id: str, endpoint: str, metadata: Dict[str, str] | None = None) -> Dict[str, Any]:
+        batch = self._client.batches.create(
+            input_file_id=input_file_id,
+            endpoint=endpoint,
+            completion_window="24h",
+            metadata=metadata,
+        )
+        return _as_dict(batch)
+
+    def retrieve_batch(self, batch_id: str) -> Dict[str, Any]:
+        return _as_dict(self._client.batches.retrieve(batch_id))
+
+    def download_file(self, file_id: str) -> str:
+        return self._client.files.content(file_id).text
+
+
+def _as_dict(obj: Any) -> Dict[str, Any]:
+    if isinstance(obj, dict):
+        return obj
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    return json.loads(json.dumps(obj, default=lambda o: o.__dict__))
@@ -0,0 +1,822 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+from .config_loader import load_settings
+from .llm_cache import cached_llm_call, resolve_cache_key
+from .output_schema import OutputSchema
+from .rate_limit import (
+    ModelRateLimiter,
+    build_rate_limiter,
+    estimate_tokens,
+    throttle_headers,
+)
+from .retry_policy import (
+    DeadlineExceeded,
+    RetryPolicy,
+    check_deadline,
+    remaining_time,
+    sleep_within_deadline,
+)
+from .token_logger import log_usage, _get_logs_dir
+from .tracing import current_span, span
+
+# Load environment variables immediately
+load_dotenv()
+
+logger = logging.getLogger("llm_gateway")
+
+DEFAULT_REQUEST_TIMEOUT_SECONDS = 120.0
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+
+
+# ============================================================
+# REQUEST / METRICS
+# ============================================================
+
+@dataclass(frozen=True)
+class LLMRequest:
+    """
+    One provider-agnostic LLM request.
+
+    messages: [{"role": "system" | "user", "content": str}, ...]
+    api:      "chat" (OpenAI chat.completions / Anthropic messages)
+              or "responses" (OpenAI Responses API)
+    response_schema: declared output; sent as the provider's native
+              structured-output format (JSON schema / forced tool)
+    shared_prefix_messages: how many leading messages are a byte-stable
+              prefix shared across calls (prompt caching: Anthropic
+              cache_control breakpoint, OpenAI prompt_cache_key routing)
+    """
+    messages: List[Dict[str, str]]
+    model: str
+    provider: str = "openai"
+    temperature: float = 0.0
+    max_tokens: Optional[int] = None
+    api: str = "chat"
+    stage_tag: str = "LLM"
+    cache_variant: str = ""
+    prompt_version: Optional[str] = None
+    response_schema: Optional[OutputSchema] = None
+    shared_prefix_messages: int = 0
+
+    def prompt_cache_key(self) -> Optional[str]:
+        """Stable id of the shared prefix (None when there is none)."""
+        if self.shared_prefix_messages <= 0:
+            return None
+        prefix = json.dumps(self.messages[: self.shared_prefix_messages], sort_keys=True)
+        return hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:32]
+
+    def cache_material(self) -> Dict[str, Any]:
+        material: Dict[str, Any] = {"api": self.api, "messages": self.messages}
+        if self.response_schema is not None:
+            material["response_schema"] = self.response_schema.cache_material()
+        return material
+
+
+@dataclass
+class CallMetrics:
+    stage_tag: str
+    provider: str
+    model: str
+    attempt: int
+    status: str                  # "ok" | "throttled" | "transport_error" | "parse_error"
+    latency_s: float
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class LLMResponse:
+    text: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0          # prompt tokens served from the provider's prompt cache
+    raw: Any = field(default=None, repr=False)
+    headers: Dict[str, str] = field(default_factory=dict, repr=False)
+
+
+class LLMThrottled(RuntimeError):
+    """Provider rejected the call with 429 / 529; callers were paused retry_after_s."""
+
+    def __init__(self, message: str, *, retry_after_s: float):
+        super().__init__(message)
+        self.retry_after_s = retry_after_s
+
+
+class LLMJSONError(ValueError):
+    """Model output could not be turned into the expected JSON object."""
+
+
+# ============================================================
+# JSON EXTRACTION POLICY (single source of truth)
+# ============================================================
+
+def strip_code_fences(text: str) -> str:
+    """
+    Remove ``` or ```json fences from LLM output if present.
+    """
+    text = text.strip()
+
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+
+    if text.endswith("```"):
+        text = text.rsplit("```", 1)[0]
+
+    return text.strip()
+
+
+def extract_json_object(text: str | None) -> Dict[str, Any]:
+    """
+    Parse model output into ONE JSON object.
+
+    1) strip markdown fences
+    2) json.loads
+    3) fall back to the outermost {...} block
+    Raises LLMJSONError if no object can be recovered.
+    """
+    if not text or not text.strip():
+        raise LLMJSONError("LLM returned empty response")
+
+    clean = strip_code_fences(text)
+
+    try:
+        data = json.loads(clean)
+    except json.JSONDecodeError:
+        start = clean.find("{")
+        end = clean.rfind("}")
+        if start == -1 or end <= start:
+            raise LLMJSONError("No JSON object found in LLM output")
+        try:
+            data = json.loads(clean[start : end + 1])
+        except json.JSONDecodeError as e:
+            raise LLMJSONError(f"JSON parse failed even after repair: {e}") from e
+
+    if not isinstance(data, dict):
+        raise LLMJSONError(f"Expected a JSON object, got {type(data).__name__}")
+
+    return data
+
+
+def parse_json_output(
+    text: str | None,
+    *,
+    required_keys: Optional[Set[str]] = None,
+    validate: Optional[Callable[[Dict[str, Any]], None]] = None,
+    schema: Optional[OutputSchema] = None,
+) -> Dict[str, Any]:
+    """
+    Apply the full output policy: extraction, schema normalization,
+    required keys, validate hook.
+    Raises LLMJSONError / ValueError / AssertionError on rejection.
+    """
+    data = extract_json_object(text)
+
+    if schema is not None:
+        data = schema.normalize(data)
+
+    if required_keys:
+        missing = required_keys - data.keys()
+        if missing:
+            raise LLMJSONError(f"Missing required keys in LLM response: {missing}")
+
+    if validate is not None:
+        validate(data)
+
+    return data
+
+
+# ============================================================
+# OPENAI REQUEST BODIES (shared by realtime and batch)
+# ============================================================
+
+CHAT_ENDPOINT = "/v1/chat/completions"
+RESPONSES_ENDPOINT = "/v1/responses"
+
+
+def openai_request_body(request: LLMRequest) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build the exact OpenAI endpoint + JSON body for a request.
+    The Batch API replays these bodies verbatim.
+    """
+    if request.api == "responses":
+        body: Dict[str, Any] = {
+            "model": request.model,
+            "input": [
+                {
+                    "role": m["role"],
+                    "content": [{"type": "input_text", "text": m["content"]}],
+                }
+                for m in request.messages
+            ],
+            "temperature": request.temperature,
+        }
+        if request.max_tokens is not None:
+            body["max_output_tokens"] = request.max_tokens
+        if request.response_schema is not None:
+            body["text"] = request.response_schema.openai_responses_format()
+        if request.shared_prefix_messages:
+            body["prompt_cache_key"] = request.prompt_cache_key()
+        return RESPONSES_ENDPOINT, body
+
+    body = {
+        "model": request.model,
+        "messages": request.messages,
+        "temperature": request.temperature,
+    }
+    if request.max_tokens is not None:
+        body["max_completion_tokens"] = request.max_tokens
+    if request.response_schema is not None:
+        body["response_format"] = request.response_schema.openai_chat_format()
+    if request.shared_prefix_messages:
+        body["prompt_cache_key"] = request.prompt_cache_key()
+    return CHAT_ENDPOINT, body
+
+
+def anthropic_messages(request: LLMRequest) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    (system blocks, messages) for the Anthropic messages API.
+
+    Consecutive same-role messages become text blocks of one turn.
+    The last shared-prefix block carries cache_control, so everything
+    up to it is written to / read from Anthropic's prompt cache.
+    """
+    system: List[Dict[str, Any]] = []
+    turns: List[Dict[str, Any]] = []
+
+    for i, m in enumerate(request.messages):
+        block: Dict[str, Any] = {"type": "text", "text": m["content"]}
+        if i == request.shared_prefix_messages - 1:
+            block["cache_control"] = {"type": "ephemeral"}
+
+        if m["role"] == "system":
+            system.append(block)
+        elif turns and turns[-1]["role"] == m["role"]:
+            turns[-1]["content"].append(block)
+        else:
+            turns.append({"role": m["role"], "content": [block]})
+
+    return system, turns
+
+
+def _usage_tokens(usage: Any, *names: str) -> int:
+    """First present attribute path (dotted) on an SDK usage object, else 0."""
+    for name in names:
+        value = usage
+        for part in name.split("."):
+            value = getattr(value, part, None)
+        if value:
+            return int(value)
+    return 0
+
+
+def request_cache_key(
+    request: LLMRequest,
+    *,
+    required_keys: Optional[Set[str]] = None,
+) -> str:
+    """
+    Persistent-cache key complete_json uses for this request.
+    """
+    return resolve_cache_key(**_cache_params(request, required_keys))
+
+
+def _cache_params(request: LLMRequest, required_keys: Optional[Set[str]]) -> Dict[str, Any]:
+    return {
+        "provider": request.provider,
+        "model": request.model,
+        "temperature": request.temperature,
+        "max_tokens": request.max_tokens,
+        "prompt": {
+            **request.cache_material(),
+            "required_keys": sorted(required_keys or []),
+        },
+        "prompt_version": request.prompt_version,
+        "variant": request.cache_variant,
+    }
+
+
+def _anthropic_text(msg: Any) -> str:
+    """Text of a messages response; a tool_use block's input wins."""
+    blocks = getattr(msg, "content", None) or []
+    for block in blocks:
+        if getattr(block, "type", None) == "tool_use":
+            return json.dumps(block.input, ensure_ascii=False)
+    return blocks[0].text if blocks else ""
+
+
+def _create_with_headers(
+    resource: Any,
+    kwargs: Dict[str, Any],
+    timeout_s: float,
+) -> Tuple[Any, Dict[str, str]]:
+    """
+    resource.create(**kwargs, timeout=timeout_s), plus the HTTP response
+    headers when the SDK exposes them (with_raw_response); rate-limit
+    state lives there.
+    """
+    raw_api = getattr(resource, "with_raw_response", None)
+    if raw_api is None:
+        return resource.create(**kwargs, timeout=timeout_s), {}
+    raw = raw_api.create(**kwargs, timeout=timeout_s)
+    return raw.parse(), dict(raw.headers)
+
+
+# ============================================================
+# GATEWAY
+# ============================================================
+
+class LLMGateway:
+    """
+    The ONE place every stage talks to an LLM provider through.
+
+    - one pooled SDK client per provider (created lazily, reused by all threads)
+    - a shared cap on in-flight requests (llm.max_concurrent_requests)
+    - per provider/model token buckets fed by rate-limit headers, and an
+      AIMD concurrency controller that backs off on 429s
+    - provider-native structured output when the request declares a schema
+    - provider prompt caching for requests with a shared prefix
+    - one JSON-extraction policy (extract_json_object)
+    - one retry loop (RetryPolicy: separate transport / parse / throttle
+      budgets, jittered backoff, per-request timeout, stage deadline)
+    - read-through persistent cache for JSON calls
+    - per-call metrics (logged, written to token usage, and sent to listeners)
+    """
+
+    def __init__(self) -> None:
+        settings = load_settings()
+        llm_settings = settings.get("llm", {}) or {}
+
+        self.request_timeout_s = float(
+            llm_settings.get("request_timeout_seconds", DEFAULT_REQUEST_TIMEOUT_SECONDS)
+        )
+
+        self.max_concurrent_requests = max(
+            1, int(llm_settings.get("max_concurrent_requests", DEFAULT_MAX_CONCURRENT_REQUESTS))
+        )
+        self._slots = threading.BoundedSemaphore(self.max_concurrent_requests)
+
+        self._rate_limit_settings: Dict[str, Any] = settings.get("rate_limits", {}) or {}
+        self.retry_policy = RetryPolicy.from_settings()
+        self._limiters: Dict[Tuple[str, str], ModelRateLimiter] = {}
+        self._limiters_lock = threading.Lock()
+
+        self._clients: Dict[str, Any] = {}
+        self._clients_lock = threading.Lock()
+        self._listeners: List[Callable[[CallMetrics], None]] = []
+
+    # ---------------- clients ----------------
+
+    def client(self, provider: str) -> Any:
+        with self._clients_lock:
+            if provider not in self._clients:
+                self._clients[provider] = self._build_client(provider)
+            return self._clients[provider]
+
+    def _build_client(self, provider: str) -> Any:
+        # SDK-level retries are disabled: the gateway owns retry policy.
+        if provider == "openai":
+            from openai import OpenAI
+
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise RuntimeError("OPENAI_API_KEY not found in .env")
+            return OpenAI(
+                api_key=api_key,
+                base_url=os.getenv("OPENAI_BASE_URL") or None,
+                timeout=self.request_timeout_s,
+                max_retries=0,
+            )
+
+        if provider == "anthropic":
+            from anthropic import Anthropic
+
+            api_key = os.getenv("ANTHROPIC_API_KEY")
+            if not api_key:
+                raise RuntimeError("ANTHROPIC_API_KEY not found in .env")
+            return Anthropic(
+                api_key=api_key,
+                timeout=self.request_timeout_s,
+                max_retries=0,
+            )
+
+        raise ValueError(f"Unsupported provider: {provider}")
+
+    # ---------------- metrics ----------------
+
+    def add_metrics_listener(self, listener: Callable[[CallMetrics], None]) -> None:
+        self._listeners.append(listener)
+
+    def _emit(self, metrics: CallMetrics) -> None:
+        if metrics.status == "ok":
+            logger.info(
+                f"[{metrics.stage_tag}] {metrics.provider}/{metrics.model} "
+                f"attempt={metrics.attempt} latency={metrics.latency_s:.2f}s "
+                f"tokens_in={metrics.prompt_tokens} cached={metrics.cached_tokens} "
+                f"tokens_out={metrics.completion_tokens}"
+            )
+            log_usage(
+                model=metrics.model,
+                prompt_tokens=metrics.prompt_tokens,
+                completion_tokens=metrics.completion_tokens,
+                provider=metrics.provider,
+                cached_tokens=metrics.cached_tokens,
+                stage_tag=metrics.stage_tag,
+                latency_s=metrics.latency_s,
+            )
+        for listener in self._listeners:
+            try:
+                listener(metrics)
+            except Exception as e:  # listeners must never break a call
+                logger.warning(f"Metrics listener failed: {e}")
+
+    # ---------------- provider calls ----------------
+
+    def _send(self, request: LLMRequest, *, timeout_s: float) -> LLMResponse:
+        client = self.client(request.provider)
+
+        if request.provider == "anthropic":
+            system, messages = anthropic_messages(request)
+            kwargs: Dict[str, Any] = {
+                "model": request.model,
+                "max_tokens": request.max_tokens or 2048,
+                "temperature": request.temperature,
+                "messages": messages,
+            }
+            if system:
+                kwargs["system"] = system
+            schema = request.response_schema
+            if schema is not None:
+                # Structured output on Anthropic = one forced tool call.
+                kwargs["tools"] = [schema.anthropic_tool()]
+                kwargs["tool_choice"] = {"type": "tool", "name": schema.name}
+            msg, headers = _create_with_headers(client.messages, kwargs, timeout_s)
+            usage = getattr(msg, "usage", None)
+            cache_read = _usage_tokens(usage, "cache_read_input_tokens")
+            return LLMResponse(
+                text=_anthropic_text(msg),
+                # input_tokens excludes cache reads/writes; report the full prompt.
+                prompt_tokens=(
+                    _usage_tokens(usage, "input_tokens")
+                    + cache_read
+                    + _usage_tokens(usage, "cache_creation_input_tokens")
+                ),
+                completion_tokens=_usage_tokens(usage, "output_tokens"),
+                cached_tokens=cache_read,
+                raw=msg,
+                headers=headers,
+            )
+
+        endpoint, body = openai_request_body(request)
+
+        if endpoint == RESPONSES_ENDPOINT:
+            response, headers = _create_with_headers(client.responses, body, timeout_s)
+            usage = getattr(response, "usage", None)
+            return LLMResponse(
+                text=response.output_text or "",
+                prompt_tokens=_usage_tokens(usage, "input_tokens"),
+                completion_tokens=_usage_tokens(usage, "output_tokens"),
+                cached_tokens=_usage_tokens(usage, "input_tokens_details.cached_tokens"),
+                raw=response,
+                headers=headers,
+            )
+
+        response, headers = _create_with_headers(client.chat.completions, body, timeout_s)
+        usage = getattr(response, "usage", None)
+        return LLMResponse(
+            text=response.choices[0].message.content or "",
+            prompt_tokens=_usage_tokens(usage, "prompt_tokens"),
+            completion_tokens=_usage_tokens(usage, "completion_tokens"),
+            cached_tokens=_usage_tokens(usage, "prompt_tokens_details.cached_tokens"),
+            raw=response,
+            headers=headers,
+        )
+
+    # ---------------- rate limiting ----------------
+
+    @contextmanager
+    def _request_slot(self, label: str) -> Iterator[None]:
+        """One of the max_concurrent_requests slots, waiting no longer than the stage deadline."""
+        remaining = remaining_time()
+        if not self._slots.acquire(timeout=None if remaining is None else max(0.0, remaining)):
+            raise DeadlineExceeded(f"{label}: stage deadline reached waiting for a request slot")
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def rate_limiter(self, provider: str, model: str) -> ModelRateLimiter:
+        key = (provider, model)
+        with self._limiters_lock:
+            if key not in self._limiters:
+                self._limiters[key] = build_rate_limiter(
+                    provider,
+                    model,
+                    settings=self._rate_limit_settings,
+                    max_concurrency=self.max_concurrent_requests,
+                )
+            return self._limiters[key]
+
+    def complete_text(
+        self,
+        request: LLMRequest,
+        *,
+        attempt: int = 1,
+        timeout_s: Optional[float] = None,
+    ) -> LLMResponse:
+        """
+        ONE network call (no retries, no cache). Emits metrics.
+        timeout_s bounds this HTTP request (default: policy timeout,
+        clamped to the stage deadline).
+
+        Waits for the model's request/token buckets and an AIMD slot first.
+        A 429 / 529 pauses every caller of that model for retry-after and
+        is re-raised as LLMThrottled.
+        """
+        with span(
+            request.stage_tag,
+            kind="attempt",
+            stage_tag=request.stage_tag,
+            provider=request.provider,
+            model=request.model,
+            attempt=attempt,
+        ) as attempt_span:
+            waited_from = time.monotonic()
+            limiter = self.rate_limiter(request.provider, request.model)
+            limiter.acquire(estimate_tokens(request.messages, request.max_tokens))
+            check_deadline(request.stage_tag)
+
+            if timeout_s is None:
+                timeout_s = self.retry_policy.request_timeout()
+
+            started = time.monotonic()
+            try:
+                with limiter.concurrency.slot(), self._request_slot(request.stage_tag):
+                    attempt_span.set(wait_s=round(time.monotonic() - waited_from, 6))
+                    response = self._send(request, timeout_s=timeout_s)
+            except Exception as e:
+                headers = throttle_headers(e)
+                status = "throttled" if headers is not None else "transport_error"
+                attempt_span.set(call_status=status)
+                self._emit(CallMetrics(
+                    stage_tag=request.stage_tag,
+                    provider=request.provider,
+                    model=request.model,
+                    attempt=attempt,
+                    status=status,
+                    latency_s=time.monotonic() - started,
+                    error=str(e),
+                ))
+                if headers is not None:
+                    delay = limiter.on_throttle(headers, fallback_s=float(2 ** attempt))
+                    raise LLMThrottled(
+                        f"{request.provider}/{request.model} throttled: {e}",
+                        retry_after_s=delay,
+                    ) from e
+                raise
+
+            limiter.on_success(response.headers)
+            attempt_span.set(
+                call_status="ok",
+                prompt_tokens=response.prompt_tokens,
+                completion_tokens=response.completion_tokens,
+                cached_tokens=response.cached_tokens,
+            )
+
+            self._emit(CallMetrics(
+                stage_tag=request.stage_tag,
+                provider=request.provider,
+                model=request.model,
+                attempt=attempt,
+                status="ok",
+                latency_s=time.monotonic() - started,
+                prompt_tokens=response.prompt_tokens,
+                completion_tokens=response.completion_tokens,
+                cached_tokens=response.cached_tokens,
+            ))
+            return response
+
+    # ---------------- JSON calls ----------------
+
+    def complete_json(
+        self,
+        request: LLMRequest,
+        *,
+        required_keys: Optional[Set[str]] = None,
+        validate: Optional[Callable[[Dict[str, Any]], None]] = None,
+        policy: Optional[RetryPolicy] = None,
+    ) -> Dict[str, Any]:
+        """
+        Call the model and return ONE validated JSON object.
+
+        One retry loop, governed by `policy` (default: settings llm.retry):
+        - transport errors use the transport budget, full-jitter backoff
+        - unparseable output, missing required_keys or a failing
+          `validate(data)` (which should raise) use the parse budget
+        - 429 / 529 wait on the rate limiter (throttle budget)
+        - every call and pause is clamped to the stage deadline
+        Only validated results are cached.
+        Traced as one "llm" span (cache hit, attempts, retries, tokens).
+        """
+        with span(
+            request.stage_tag,
+            kind="llm",
+            stage_tag=request.stage_tag,
+            provider=request.provider,
+            model=request.model,
+            cache_hit=True,
+        ) as llm_span:
+
+            def call() -> Dict[str, Any]:
+                llm_span.set(cache_hit=False)
+                return self._complete_json_uncached(
+                    request,
+                    required_keys=required_keys,
+                    validate=validate,
+                    policy=policy or self.retry_policy,
+                )
+
+            return cached_llm_call(**_cache_params(request, required_keys), call=call)
+
+    def _complete_json_uncached(
+        self,
+        request: LLMRequest,
+        *,
+        required_keys: Optional[Set[str]],
+        validate: Optional[Callable[[Dict[str, Any]], None]],
+        policy: RetryPolicy,
+    ) -> Dict[str, Any]:
+        last_error: Exception | None = None
+        transport_failures = parse_failures = throttles = 0
+        attempt = 0
+        llm_span = current_span()
+
+        try:
+            while True:
+                check_deadline(request.stage_tag)
+                attempt += 1
+
+                try:
+                    response = self.complete_text(
+                        request,
+                        attempt=attempt,
+                        timeout_s=policy.request_timeout(),
+                    )
+                except LLMThrottled as e:
+                    # Not the request's fault: retry on the separate throttle
+                    # budget. Wait retry-after here too: the limiter can only
+                    # pause models that already have a request / token bucket.
+                    last_error = e
+                    throttles += 1
+                    if throttles > policy.throttle_retries:
+                        break
+                    sleep_within_deadline(e.retry_after_s, sleep=time.sleep)
+                    continue
+                except DeadlineExceeded:
+                    raise
+                except Exception as e:
+                    last_error = e
+                    transport_failures += 1
+                    logger.error(
+                        f"[{request.stage_tag}] LLM call failed "
+                        f"(transport {transport_failures}/{policy.transport_attempts}): {e}"
+                    )
+                    if transport_failures >= policy.transport_attempts:
+                        break
+                    sleep_within_deadline(policy.transport_backoff(transport_failures), sleep=time.sleep)
+                    continue
+
+                if llm_span is not None:
+                    llm_span.add(
+                        prompt_tokens=response.prompt_tokens,
+                        completion_tokens=response.completion_tokens,
+                        cached_tokens=response.cached_tokens,
+                    )
+
+                try:
+                    return parse_json_output(
+                        response.text,
+                        required_keys=required_keys,
+                        validate=validate,
+                        schema=request.response_schema,
+                    )
+
+                except (LLMJSONError, ValueError, AssertionError) as e:
+                    last_error = e
+                    parse_failures += 1
+                    self._dump_raw_output(request, response.text, e, attempt=attempt)
+                    logger.warning(
+                        f"[{request.stage_tag}] JSON/validation failed "
+                        f"(parse {parse_failures}/{policy.parse_attempts}): {e}"
+                    )
+                    if parse_failures >= policy.parse_attempts:
+                        break
+                    sleep_within_deadline(policy.parse_pause(), sleep=time.sleep)
+
+            raise RuntimeError(
+                f"{request.stage_tag} LLM failed after retries "
+                f"(transport={transport_failures}, parse={parse_failures}, throttled={throttles})"
+            ) from last_error
+        finally:
+            if llm_span is not None:
+                llm_span.set(
+                    attempts=attempt,
+                    retries=max(0, attempt - 1),
+                    transport_failures=transport_failures,
+                    parse_failures=parse_failures,
+                    throttles=throttles,
+                )
+
+    def _dump_raw_output(
+        self,
+        request: LLMRequest,
+        text: str,
+        error: Exception,
+        *,
+        attempt: int,
+    ) -> None:
+        """
+        One file per rejected output: <tag>_<request hash>_t<thread>_a<attempt>.txt,
+        so parallel slides / quizzes with the same stage tag never collide.
+        """
+        debug_dir = _get_logs_dir() / "llm_debug"
+        debug_dir.mkdir(parents=True, exist_ok=True)
+        safe_tag = "".join(c if c.isalnum() or c in "._-" else "_" for c in request.stage_tag)
+        request_hash = hashlib.sha256(
+            json.dumps(request.cache_material(), sort_keys=True).encode("utf-8")
+        ).hexdigest()[:12]
+        debug_path = debug_dir / (
+            f"{safe_tag}_{request_hash}_t{threading.get_ident()}_a{attempt}.txt"
+        )
+
+        with open(debug_path, "w", encoding="utf-8") as f:
+            f.write(f"===== ERROR =====\n{error}\n\n")
+            f.write("===== RAW MODEL OUTPUT =====\n")
+            f.write(text or "")
+            f.write("\n\n===== END =====\n")
+
+    # ---------------- async API ----------------
+
+    async def acomplete_text(
+        self,
+        request: LLMRequest,
+        *,
+        attempt: int = 1,
+        timeout_s: Optional[float] = None,
+    ) -> LLMResponse:
+        """
+        Async variant of complete_text. Runs on a worker thread so it shares
+        the pooled client, concurrency cap and metrics with sync callers.
+        """
+        return await asyncio.to_thread(
+            self.complete_text, request, attempt=attempt, timeout_s=timeout_s
+        )
+
+    async def acomplete_json(
+        self,
+        request: LLMRequest,
+        *,
+        required_keys: Optional[Set[str]] = None,
+        validate: Optional[Callable[[Dict[str, Any]], None]] = None,
+        policy: Optional[RetryPolicy] = None,
+    ) -> Dict[str, Any]:
+        """
+        Async variant of complete_json (same cache, retries and policy).
+        """
+        return await asyncio.to_thread(
+            self.complete_json,
+            request,
+            required_keys=required_keys,
+            validate=validate,
+            policy=policy,
+        )
+
+
+# ============================================================
+# Process-wide instance
+# ============================================================
+
+_gateway: LLMGateway | None = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> LLMGateway:
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
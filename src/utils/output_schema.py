@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+
+@dataclass(frozen=True)
+class OutputSchema:
+    """
+    Declared JSON output of one prompt family.
+
+    Sent to providers as native structured output:
+    - OpenAI: response_format / text.format json_schema (strict when `strict`)
+    - Anthropic: a forced tool whose input_schema is the schema
+
+    OpenAI strict mode needs every property listed as required, so keys
+    that may legitimately be absent (e.g. `options` on a true_false
+    question) are declared nullable and named in `optional_keys`;
+    normalize() drops them again when the model returns null, so
+    downstream validators see the same shape as before.
+
+    Free-form maps (e.g. reviewers' suggested_fixes) cannot be strict;
+    those schemas set strict=False and are still enforced as a guide.
+    """
+    name: str
+    schema: Dict[str, Any]
+    strict: bool = True
+    optional_keys: Tuple[str, ...] = ()
+
+    def normalize(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.optional_keys:
+            return data
+        return {
+            k: v for k, v in data.items()
+            if not (k in self.optional_keys and v is None)
+        }
+
+    # ---------------- provider formats ----------------
+
+    def openai_chat_format(self) -> Dict[str, Any]:
+        return {
+            "type": "json_schema",
+            "json_schema": {"name": self.name, "schema": self.schema, "strict": self.strict},
+        }
+
+    def openai_responses_format(self) -> Dict[str, Any]:
+        return {
+            "format": {
+                "type": "json_schema",
+                "name": self.name,
+                "schema": self.schema,
+                "strict": self.strict,
+            }
+        }
+
+    def anthropic_tool(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "description": "Return the result as this tool's input.",
+            "input_schema": self.schema,
+        }
+
+    def cache_material(self) -> Dict[str, Any]:
+        return {"name": self.name, "schema": self.schema, "strict": self.strict}
+
+
+# -------------------------------------------------
+# Schema builders (strict-mode friendly)
+# -------------------------------------------------
+
+def string() -> Dict[str, Any]:
+    return {"type": "string"}
+
+
+def integer() -> Dict[str, Any]:
+    return {"type": "integer"}
+
+
+def boolean() -> Dict[str, Any]:
+    return {"type": "boolean"}
+
+
+def null() -> Dict[str, Any]:
+    return {"type": "null"}
+
+
+def enum(*values: Any) -> Dict[str, Any]:
+    return {"enum": list(values)}
+
+
+def array(items: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": "array", "items": items}
+
+
+def nullable(schema: Dict[str, Any]) -> Dict[str, Any]:
+    return any_of(schema, null())
+
+
+def any_of(*schemas: Dict[str, Any]) -> Dict[str, Any]:
+    return {"anyOf": list(schemas)}
+
+
+def obj(properties: Dict[str, Dict[str, Any]], *, optional: Tuple[str, ...] = ()) -> Dict[str, Any]:
+    """
+    Closed object: every property required, no extra keys.
+    `optional` properties are made nullable (see OutputSchema.optional_keys).
+    """
+    props = {
+        name: nullable(schema) if name in optional else schema
+        for name, schema in properties.items()
+    }
+    return {
+        "type": "object",
+        "properties": props,
+        "required": list(props),
+        "additionalProperties": False,
+    }
+
+
+def open_map(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Object with arbitrary keys (non-strict schemas only)."""
+    return {"type": "object", "additionalProperties": values}
@@ -0,0 +1,427 @@
+from __future__ import annotations
+
+import email.utils
+import logging
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional
+
+from .retry_policy import DeadlineExceeded, remaining_time
+
+logger = logging.getLogger("rate_limit")
+
+THROTTLE_STATUS_CODES = {429, 529}   # 529 = Anthropic "overloaded"
+
+
+# -------------------------------------------------
+# Header parsing
+# -------------------------------------------------
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def parse_duration(value: Any) -> Optional[float]:
+    """
+    Seconds from a provider reset value:
+    "20ms", "1s", "6m0s", "1h2m3.5s", "12" or an RFC 3339 timestamp.
+    """
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+
+    parts = _DURATION_RE.findall(text)
+    if parts and "".join(n + u for n, u in parts) == text:
+        scale = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+        return sum(float(n) * scale[u] for n, u in parts)
+
+    try:
+        when = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """retry-after-ms / retry-after (seconds or HTTP date)."""
+    h = _lower(headers)
+
+    if "retry-after-ms" in h:
+        try:
+            return max(0.0, float(h["retry-after-ms"]) / 1000.0)
+        except ValueError:
+            pass
+
+    value = h.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        parsed = email.utils.parsedate_to_datetime(value) if value else None
+        if parsed is None:
+            return None
+        return max(0.0, (parsed - datetime.now(timezone.utc)).total_seconds())
+
+
+def rate_limit_state(headers: Mapping[str, str]) -> Dict[str, Dict[str, float]]:
+    """
+    Normalise OpenAI (x-ratelimit-*) and Anthropic (anthropic-ratelimit-*)
+    headers into {"requests": {...}, "tokens": {...}} with optional
+    limit / remaining / reset (seconds) fields.
+    """
+    h = _lower(headers)
+    state: Dict[str, Dict[str, float]] = {"requests": {}, "tokens": {}}
+
+    for kind in ("requests", "tokens"):
+        candidates = {
+            "limit": (f"x-ratelimit-limit-{kind}", f"anthropic-ratelimit-{kind}-limit"),
+            "remaining": (f"x-ratelimit-remaining-{kind}", f"anthropic-ratelimit-{kind}-remaining"),
+            "reset": (f"x-ratelimit-reset-{kind}", f"anthropic-ratelimit-{kind}-reset"),
+        }
+        for field, names in candidates.items():
+            for name in names:
+                if name not in h:
+                    continue
+                value = parse_duration(h[name]) if field == "reset" else _to_float(h[name])
+                if value is not None:
+                    state[kind][field] = value
+                break
+
+    return state
+
+
+def _lower(headers: Mapping[str, str] | None) -> Dict[str, str]:
+    if not headers:
+        return {}
+    return {str(k).lower(): v for k, v in headers.items()}
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def throttle_headers(error: BaseException) -> Optional[Mapping[str, str]]:
+    """
+    Headers of a provider throttling error (HTTP 429 / 529), else None.
+    Works for the OpenAI and Anthropic SDK error types without importing them.
+    """
+    status = getattr(error, "status_code", None)
+    response = getattr(error, "response", None)
+    if status is None and response is not None:
+        status = getattr(response, "status_code", None)
+    if status not in THROTTLE_STATUS_CODES:
+        return None
+    return getattr(response, "headers", None) or {}
+
+
+# -------------------------------------------------
+# Token bucket
+# -------------------------------------------------
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `per_minute / 60`.
+
+    - acquire(n) blocks until n units are available (raises
+      DeadlineExceeded when the stage deadline would pass first)
+    - sync() folds in what the provider says is left
+    - block_for() pauses every caller (retry-after); waiters wake with
+      jitter so they do not hit the API in lockstep
+    """
+
+    def __init__(
+        self,
+        per_minute: float,
+        *,
+        jitter_s: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._sleep = sleep
+        self.jitter_s = jitter_s
+        self._set_limit(per_minute)
+        self._level = self.capacity
+        self._updated = clock()
+        self._blocked_until = 0.0
+
+    def _set_limit(self, per_minute: float) -> None:
+        self.capacity = max(1.0, float(per_minute))
+        self.rate_per_s = self.capacity / 60.0
+
+    def _refill(self, now: float) -> None:
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate_per_s)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Take `amount` units; returns seconds spent waiting."""
+        amount = min(float(amount), self.capacity)
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now + random.uniform(0, self.jitter_s)
+                elif self._level >= amount:
+                    self._level -= amount
+                    return waited
+                else:
+                    wait = (amount - self._level) / self.rate_per_s
+
+            remaining = remaining_time()
+            if remaining is not None and wait > remaining:
+                raise DeadlineExceeded(
+                    f"rate limit wait of {wait:.1f}s exceeds the stage deadline"
+                )
+            self._sleep(wait)
+            waited += wait
+
+    def block_for(self, seconds: float) -> None:
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._level = 0.0
+            self._blocked_until = max(self._blocked_until, now + max(0.0, seconds))
+
+    def sync(
+        self,
+        *,
+        limit: Optional[float] = None,
+        remaining: Optional[float] = None,
+        reset_s: Optional[float] = None,
+    ) -> None:
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if limit:
+                self._set_limit(limit)
+                self._level = min(self._level, self.capacity)
+            if remaining is not None:
+                self._level = min(self._level, max(0.0, remaining))
+                if remaining <= 0 and reset_s:
+                    self._blocked_until = max(self._blocked_until, now + reset_s)
+
+    @property
+    def level(self) -> float:
+        with self._lock:
+            self._refill(self._clock())
+            return self._level
+
+
+# -------------------------------------------------
+# AIMD concurrency
+# -------------------------------------------------
+
+class AIMDConcurrency:
+    """
+    Adaptive in-flight limit: additive increase on success,
+    multiplicative decrease on throttling.
+
+    The limit grows by `increase` per window of `limit` successful calls
+    (≈ +1 slot per round trip) and is cut by `decrease_factor` on a
+    throttle, at most once per `cooldown_s` so a burst of 429s from the
+    same overload only counts once.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial: float,
+        maximum: float,
+        minimum: float = 1.0,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        cooldown_s: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.minimum = max(1.0, float(minimum))
+        self.maximum = max(self.minimum, float(maximum))
+        self.increase = float(increase)
+        self.decrease_factor = float(decrease_factor)
+        self.cooldown_s = float(cooldown_s)
+        self._clock = clock
+
+        self._limit = min(self.maximum, max(self.minimum, float(initial)))
+        self._in_flight = 0
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        with self._cond:
+            return int(self._limit)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """One in-flight slot; the wait is bounded by the stage deadline."""
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                remaining = remaining_time()
+                if remaining is not None and remaining <= 0:
+                    raise DeadlineExceeded("stage deadline reached waiting for a concurrency slot")
+                self._cond.wait(timeout=remaining)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def on_success(self) -> None:
+        with self._cond:
+            before = int(self._limit)
+            self._limit = min(self.maximum, self._limit + self.increase / max(1.0, self._limit))
+            if int(self._limit) > before:
+                self._cond.notify_all()
+
+    def on_throttle(self) -> None:
+        with self._cond:
+            now = self._clock()
+            if now - self._last_decrease < self.cooldown_s:
+                return
+            self._last_decrease = now
+            self._limit = max(self.minimum, self._limit * self.decrease_factor)
+            logger.warning(f"[RATE LIMIT] throttled — concurrency limit now {int(self._limit)}")
+
+
+# -------------------------------------------------
+# Per provider / model limiter
+# -------------------------------------------------
+
+class ModelRateLimiter:
+    """
+    Request + token buckets and an AIMD controller for one provider/model.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        requests: Optional[TokenBucket],
+        tokens: Optional[TokenBucket],
+        concurrency: AIMDConcurrency,
+    ) -> None:
+        self.name = name
+        self.requests = requests
+        self.tokens = tokens
+        self.concurrency = concurrency
+
+    def acquire(self, estimated_tokens: int) -> float:
+        waited = 0.0
+        if self.requests is not None:
+            waited += self.requests.acquire(1)
+        if self.tokens is not None:
+            waited += self.tokens.acquire(estimated_tokens)
+        return waited
+
+    def on_success(self, headers: Mapping[str, str] | None) -> None:
+        self._observe(headers)
+        self.concurrency.on_success()
+
+    def on_throttle(self, headers: Mapping[str, str] | None, *, fallback_s: float) -> float:
+        """
+        Pause every caller of this model for retry-after (or the reset
+        header, or fallback_s). Returns the pause in seconds.
+        """
+        state = rate_limit_state(headers or {})
+        delay = retry_after_seconds(headers or {})
+        if delay is None:
+            resets = [s["reset"] for s in state.values() if "reset" in s]
+            delay = max(resets) if resets else fallback_s
+
+        for bucket in (self.requests, self.tokens):
+            if bucket is not None:
+                bucket.block_for(delay)
+        self.concurrency.on_throttle()
+
+        logger.warning(f"[RATE LIMIT] {self.name}: throttled, pausing {delay:.1f}s")
+        return delay
+
+    def _observe(self, headers: Mapping[str, str] | None) -> None:
+        if not headers:
+            return
+        state = rate_limit_state(headers)
+        for kind in ("requests", "tokens"):
+            s = state[kind]
+            bucket = getattr(self, kind)
+            if bucket is None and s.get("limit"):
+                bucket = TokenBucket(s["limit"])
+                setattr(self, kind, bucket)
+            if bucket is not None and s:
+                bucket.sync(
+                    limit=s.get("limit"),
+                    remaining=s.get("remaining"),
+                    reset_s=s.get("reset"),
+                )
+
+
+def build_rate_limiter(
+    provider: str,
+    model: str,
+    *,
+    settings: Mapping[str, Any],
+    max_concurrency: int,
+) -> ModelRateLimiter:
+    """
+    Build a limiter from settings.yaml `rate_limits`:
+
+        rate_limits:
+          openai:
+            default: {rpm: 500, tpm: 200000}
+            gpt-4o:  {rpm: 5000, tpm: 800000}
+          concurrency: {initial: 4, increase: 1, decrease_factor: 0.5, cooldown_seconds: 5}
+
+    A missing rpm / tpm leaves that bucket unlimited until the provider's
+    limit headers arrive.
+    """
+    cfg = settings or {}
+    provider_cfg = cfg.get(provider, {}) or {}
+    limits = {**(provider_cfg.get("default") or {}), **(provider_cfg.get(model) or {})}
+    conc = cfg.get("concurrency", {}) or {}
+
+    rpm = limits.get("rpm")
+    tpm = limits.get("tpm")
+
+    return ModelRateLimiter(
+        name=f"{provider}/{model}",
+        requests=TokenBucket(float(rpm)) if rpm else None,
+        tokens=TokenBucket(float(tpm)) if tpm else None,
+        concurrency=AIMDConcurrency(
+            initial=float(conc.get("initial", max_concurrency)),
+            maximum=float(max_concurrency),
+            minimum=float(conc.get("minimum", 1)),
+            increase=float(conc.get("increase", 1)),
+            decrease_factor=float(conc.get("decrease_factor", 0.5)),
+            cooldown_s=float(conc.get("cooldown_seconds", 5)),
+        ),
+    )
+
+
+def estimate_tokens(messages: Any, max_tokens: Optional[int]) -> int:
+    """
+    Rough TPM charge for a request: ~4 characters per prompt token plus
+    the completion budget (providers count max_tokens against TPM).
+    """
+    chars = sum(len(m.get("content", "")) for m in messages or [])
+    return chars // 4 + int(max_tokens or 1024)
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import contextvars
+import functools
+import random
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+from .config_loader import load_settings
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+# -------------------------------------------------
+# Retry policy
+# -------------------------------------------------
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    The ONE retry budget for an LLM call.
+
+    transport_attempts: calls allowed to fail on network / 5xx / timeout
+    parse_attempts:     responses allowed to fail JSON parsing or validation
+    throttle_retries:   429 / 529 waits tolerated (paced by the rate limiter)
+    request_timeout_s:  per-HTTP-request timeout (clamped to the stage deadline)
+
+    Worst case = transport_attempts + parse_attempts - 1 + throttle_retries
+    calls (12 with the defaults), never the product of nested loops;
+    throttle_retries of those are 429 / 529 rejections.
+    """
+    transport_attempts: int = 3
+    parse_attempts: int = 2
+    throttle_retries: int = 8
+    backoff_base_s: float = 1.0
+    backoff_max_s: float = 30.0
+    parse_pause_s: float = 0.5
+    request_timeout_s: float = 120.0
+
+    @classmethod
+    def from_settings(cls) -> "RetryPolicy":
+        """settings.yaml llm.retry (+ llm.request_timeout_seconds)."""
+        llm = load_settings().get("llm", {}) or {}
+        cfg = llm.get("retry", {}) or {}
+        fields = {
+            name: type(getattr(cls, name))(cfg[name])
+            for name in (
+                "transport_attempts",
+                "parse_attempts",
+                "throttle_retries",
+                "backoff_base_s",
+                "backoff_max_s",
+                "parse_pause_s",
+            )
+            if name in cfg
+        }
+        if "request_timeout_seconds" in llm:
+            fields["request_timeout_s"] = float(llm["request_timeout_seconds"])
+        return cls(**fields)
+
+    def with_overrides(self, **changes: Any) -> "RetryPolicy":
+        return replace(self, **{k: v for k, v in changes.items() if v is not None})
+
+    def transport_backoff(self, failures: int) -> float:
+        """Full-jitter exponential backoff: uniform(0, min(max, base * 2**(n-1)))."""
+        cap = min(self.backoff_max_s, self.backoff_base_s * (2 ** max(0, failures - 1)))
+        return random.uniform(0, cap)
+
+    def parse_pause(self) -> float:
+        return random.uniform(0, self.parse_pause_s)
+
+    def request_timeout(self) -> float:
+        remaining = remaining_time()
+        if remaining is None:
+            return self.request_timeout_s
+        return max(0.001, min(self.request_timeout_s, remaining))
+
+
+# -------------------------------------------------
+# Stage deadlines
+# -------------------------------------------------
+
+class DeadlineExceeded(TimeoutError):
+    """The stage's time budget ran out before the call could complete."""
+
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "llm_stage_deadline", default=None
+)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left in the current stage deadline (None = no deadline)."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline(label: str) -> None:
+    remaining = remaining_time()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceeded(f"{label}: stage deadline exceeded")
+
+
+def sleep_within_deadline(seconds: float, *, sleep: Callable[[float], None] = time.sleep) -> None:
+    remaining = remaining_time()
+    if remaining is not None:
+        seconds = min(seconds, max(0.0, remaining))
+    if seconds > 0:
+        sleep(seconds)
+
+
+@contextmanager
+def stage_deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Bound everything LLM-related inside the block to `seconds`.
+
+    Stored in a contextvar, so worker threads started via run_bounded
+    (and asyncio.to_thread) inherit it. Nested deadlines can only
+    shorten the outer one.
+    """
+    if seconds is None:
+        yield
+        return
+
+    new_deadline = time.monotonic() + float(seconds)
+    current = _deadline.get()
+    if current is not None:
+        new_deadline = min(current, new_deadline)
+
+    token = _deadline.set(new_deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def stage_deadline_seconds(stage: str) -> Optional[float]:
+    """
+    settings.yaml llm.stage_deadlines_seconds.<stage> (or .default); null = none.
+    """
+    cfg = (load_settings().get("llm", {}) or {}).get("stage_deadlines_seconds", {}) or {}
+    value = cfg.get(stage, cfg.get("default"))
+    return float(value) if value else None
+
+
+def with_stage_deadline(stage: str) -> Callable[[F], F]:
+    """Decorator: run a stage entry point under its configured deadline."""
+    def decorate(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with stage_deadline(stage_deadline_seconds(stage)):
+                return fn(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorate
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import re
+from typing import List, Tuple
+
+# -------------------------------------------------
+# Abbreviations (lowercase, without the final ".")
+# -------------------------------------------------
+
+# Never end a sentence: always followed by more of the same sentence.
+NON_TERMINAL_ABBREVIATIONS = {
+    # English
+    "e.g", "i.e", "eg", "ie", "cf", "vs", "viz", "approx", "ca", "incl", "esp",
+    "dr", "mr", "mrs", "ms", "prof", "st", "sr", "jr", "mt",
+    # Clinical
+    "pt", "pts", "dx", "tx", "rx", "hx", "sx", "inj", "conc", "dil",
+}
+
+# May end a sentence: a boundary only when the next word is capitalised
+# ("5 mg. Repeat" ends, "No. 5" and "2 tabs. daily" do not).
+TERMINAL_ABBREVIATIONS = {
+    # English
+    "etc", "al", "no", "nos", "vol", "p", "pp", "ch", "fig", "figs",
+    # Doses and units
+    "mg", "mcg", "g", "kg", "ml", "l", "mmol", "iu",
+    "tab", "tabs", "cap", "caps", "amp", "amps", "susp", "soln",
+    "sec", "min", "hr", "hrs", "h", "wk", "wks", "mo", "mos", "yr", "yrs",
+    "max", "avg", "est", "temp", "resp", "wt", "ht",
+    "b.i.d", "t.i.d", "q.i.d", "p.o", "i.v", "i.m", "s.c", "p.r.n",
+    "a.m", "p.m", "u.s", "u.k",
+}
+
+# A run of terminators plus closing quotes/brackets, then whitespace.
+_CANDIDATE = re.compile(r"[.!?]+[\"'”’)\]]*(?=\s)")
+_OPENERS = "\"'“‘([-–•"
+
+
+def _token_before(text: str, end: int) -> Tuple[int, str]:
+    start = end
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+    return start, text[start:end].lstrip(_OPENERS).lower()
+
+
+def _is_boundary(text: str, match: re.Match, sentence_start: int) -> bool:
+    nxt = match.end()
+    while nxt < len(text) and text[nxt].isspace():
+        nxt += 1
+    if nxt == len(text):
+        return True
+    following = text[nxt]
+
+    if "." not in match.group() or match.group().startswith(("!", "?")):
+        return True  # "!" / "?" always end a sentence
+
+    # A sentence never continues with a lowercase word ("approx. five").
+    if following.islower():
+        return False
+
+    token_start, token = _token_before(text, match.start())
+
+    if token in NON_TERMINAL_ABBREVIATIONS:
+        return False
+
+    # List enumerators: "1. Check the airway."
+    if token.isdigit() and token_start == sentence_start:
+        return False
+
+    if token in TERMINAL_ABBREVIATIONS or "." in token:
+        return following.isupper()
+
+    return True
+
+
+# -------------------------------------------------
+# Public API
+# -------------------------------------------------
+
+def sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    (start, end) character offsets of each sentence in `text`, trimmed
+    of surrounding whitespace. Only whitespace falls between spans, so
+    the spans joined by single spaces reconstruct normalized text.
+    """
+    text = text or ""
+    spans: List[Tuple[int, int]] = []
+
+    start = 0
+    while start < len(text) and text[start].isspace():
+        start += 1
+
+    for match in _CANDIDATE.finditer(text):
+        if match.end() <= start or not _is_boundary(text, match, start):
+            continue
+        spans.append((start, match.end()))
+        start = match.end()
+        while start < len(text) and text[start].isspace():
+            start += 1
+
+    end = len(text)
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if end > start:
+        spans.append((start, end))
+
+    return spans
+
+
+def split_sentences(text: str) -> List[str]:
+    text = text or ""
+    return [text[a:b] for a, b in sentence_spans(text)]
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict
+
+from .config_loader import load_settings
+
+logger = logging.getLogger("slide_memo")
+
+DEFAULT_MEMO_PATH = "data/cache/slide_results.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS slide_results (
+    stage        TEXT NOT NULL,
+    key          TEXT NOT NULL,
+    created_at   REAL NOT NULL,
+    last_access  REAL NOT NULL,
+    value        TEXT NOT NULL,
+    PRIMARY KEY (stage, key)
+)
+"""
+
+
+# -------------------------------------------------
+# Keys
+# -------------------------------------------------
+
+def source_version(*modules: ModuleType) -> str:
+    """
+    Hash of the given modules' source files (prompt builders, validators,
+    the stage runner). Editing any of them invalidates stored results.
+    """
+    digest = hashlib.sha256()
+    for module in modules:
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def slide_key(material: Any, *, version: str) -> str:
+    """
+    Content-addressed key for one slide's result in one stage.
+
+    `material` is whatever the stage's output depends on (header, blocks,
+    notes directives ...) and must NOT include the slide id, so a slide
+    keeps its stored result when slides are inserted before it.
+    The configured prompt_version and model are part of every key.
+    """
+    settings = load_settings()
+    llm = settings.get("llm", {}) or {}
+    blob = json.dumps(
+        {
+            "material": material,
+            "version": version,
+            "prompt_version": str((settings.get("cache", {}) or {}).get("prompt_version", "v1")),
+            "model": f"{llm.get('provider')}/{llm.get('model')}",
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+# -------------------------------------------------
+# SQLite-backed store
+# -------------------------------------------------
+
+class SlideMemo:
+    """
+    Persistent per-slide stage results, shared across runs.
+    Safe to share between threads of one process.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.counts: Dict[str, Dict[str, int]] = {}
+
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def count(self, stage: str, name: str) -> None:
+        """Tally a reused / computed result for the exit summary."""
+        with self._db_lock:
+            per_stage = self.counts.setdefault(stage, {"reused": 0, "computed": 0})
+            per_stage[name] += 1
+
+    def get(self, stage: str, key: str) -> Any:
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT value FROM slide_results WHERE stage = ? AND key = ?", (stage, key)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE slide_results SET last_access = ? WHERE stage = ? AND key = ?",
+                (time.time(), stage, key),
+            )
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, stage: str, key: str, value: Any) -> None:
+        blob = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO slide_results "
+                "(stage, key, created_at, last_access, value) VALUES (?, ?, ?, ?, ?)",
+                (stage, key, now, now, blob),
+            )
+            self._conn.commit()
+
+    def clear(self, stage: str | None = None) -> int:
+        with self._db_lock:
+            if stage is None:
+                cur = self._conn.execute("DELETE FROM slide_results")
+            else:
+                cur = self._conn.execute("DELETE FROM slide_results WHERE stage = ?", (stage,))
+            self._conn.commit()
+        return cur.rowcount
+
+    def close(self) -> None:
+        with self._db_lock:
+            self._conn.close()
+
+
+# -------------------------------------------------
+# Process-wide instance
+# -------------------------------------------------
+
+_memo: SlideMemo | None = None
+_memo_lock = threading.Lock()
+
+
+def _memo_settings() -> Dict[str, Any]:
+    return load_settings().get("slide_memo", {}) or {}
+
+
+def memo_enabled() -> bool:
+    if os.getenv("SLIDE_MEMO_DISABLE", "").strip() in ("1", "true", "yes"):
+        return False
+    return bool(_memo_settings().get("enabled", True))
+
+
+def get_slide_memo() -> SlideMemo:
+    global _memo
+    with _memo_lock:
+        if _memo is None:
+            _memo = SlideMemo(Path(_memo_settings().get("path", DEFAULT_MEMO_PATH)))
+            atexit.register(log_memo_stats)
+        return _memo
+
+
+def log_memo_stats() -> None:
+    if _memo is None:
+        return
+    for stage, counts in sorted(_memo.counts.items()):
+        total = counts["reused"] + counts["computed"]
+        logger.warning(f"[SLIDE MEMO] {stage}: reused {counts['reused']}/{total}")
+
+
+def lookup_slide(stage: str, material: Any, *, version: str) -> Any:
+    """The stored result for this slide's material, or None (also when disabled)."""
+    if not memo_enabled():
+        return None
+
+    memo = get_slide_memo()
+    cached = memo.get(stage, slide_key(material, version=version))
+    if cached is not None:
+        memo.count(stage, "reused")
+    return cached
+
+
+def store_slide(stage: str, material: Any, value: Any, *, version: str) -> None:
+    """Store a freshly computed, JSON-serialisable result."""
+    if not memo_enabled():
+        return
+
+    memo = get_slide_memo()
+    memo.put(stage, slide_key(material, version=version), value)
+    memo.count(stage, "computed")
+
+
+def memoized_slide(
+    stage: str,
+    material: Any,
+    compute: Callable[[], Any],
+    *,
+    version: str,
+) -> Any:
+    """
+    The stored result for this slide's material, or compute() (stored on
+    success). compute() must return a JSON-serialisable value; exceptions
+    propagate and nothing is stored.
+    """
+    cached = lookup_slide(stage, material, version=version)
+    if cached is not None:
+        return cached
+
+    value = compute()
+    store_slide(stage, material, value, version=version)
+    return value
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or clear the per-slide result store")
+    parser.add_argument("--clear", action="store_true", help="Delete stored slide results")
+    parser.add_argument("--stage", default=None, help="Only this stage (with --clear)")
+    args = parser.parse_args()
+
+    memo = get_slide_memo()
+
+    if args.clear:
+        print(f"✅ Cleared {memo.clear(args.stage)} slide result(s)")
+
+    with memo._db_lock:
+        per_stage = memo._conn.execute(
+            "SELECT stage, COUNT(*), COALESCE(SUM(LENGTH(value)), 0) "
+            "FROM slide_results GROUP BY stage ORDER BY stage"
+        ).fetchall()
+
+    print(f"Slide memo: {memo.path}")
+    for stage, n, size in per_stage:
+        print(f"  {stage}: {n} slide(s) ({size / 1024:.1f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Sequence, Union
+
+# Joins a list of fragments into one haystack. Normalized text never
+# contains a newline, so no fragment can match across the boundary.
+FRAGMENT_SEPARATOR = "\n"
+
+
+# -------------------------------------------------
+# Normalization
+# -------------------------------------------------
+
+def normalize_ws(text: str) -> str:
+    """NBSP → space, collapse whitespace runs, strip."""
+    if not isinstance(text, str):
+        return ""
+    return " ".join(text.replace("\u00A0", " ").split())
+
+
+# -------------------------------------------------
+# Aho-Corasick automaton
+# -------------------------------------------------
+
+class FragmentAutomaton:
+    """
+    Aho-Corasick automaton over a fixed set of fragments.
+
+    scan() is linear in len(text) + total fragment length: it never
+    enumerates individual matches, it tallies automaton states and then
+    pushes the tallies up the failure-link tree.
+    """
+
+    def __init__(self, fragments: Iterable[str]) -> None:
+        self.fragments: List[str] = list(fragments)
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._terminal: List[int] = []
+
+        for fragment in self.fragments:
+            state = 0
+            for ch in fragment:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._goto[state][ch] = nxt
+                state = nxt
+            self._terminal.append(state)
+
+        # BFS order doubles as the bottom-up order for scan() tallies.
+        self._order: List[int] = []
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            self._order.append(state)
+            for ch, nxt in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                queue.append(nxt)
+
+    def scan(self, text: str) -> "PreservationReport":
+        n_states = len(self._goto)
+        hits = [0] * n_states
+        first_end = [-1] * n_states
+
+        goto, fail = self._goto, self._fail
+        state = 0
+        for pos, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            hits[state] += 1
+            if first_end[state] < 0:
+                first_end[state] = pos
+
+        # A state also ends every fragment on its failure chain.
+        for state in reversed(self._order):
+            parent = fail[state]
+            hits[parent] += hits[state]
+            if first_end[state] >= 0 and (first_end[parent] < 0 or first_end[state] < first_end[parent]):
+                first_end[parent] = first_end[state]
+
+        counts: List[int] = []
+        offsets: List[int] = []
+        for fragment, terminal in zip(self.fragments, self._terminal):
+            if not fragment:
+                # The empty fragment is trivially present once.
+                counts.append(1)
+                offsets.append(0)
+                continue
+            counts.append(hits[terminal])
+            end = first_end[terminal]
+            offsets.append(end - len(fragment) + 1 if end >= 0 else -1)
+
+        return PreservationReport(
+            fragments=self.fragments,
+            counts=counts,
+            offsets=offsets,
+            text=text,
+        )
+
+
+# -------------------------------------------------
+# Report
+# -------------------------------------------------
+
+@dataclass
+class PreservationReport:
+    """
+    Per-fragment occurrence counts and first offsets (-1 = missing)
+    in the scanned text. counted=False: counts are only 1 / 0 (present
+    or not), so repeated / exactly_once cannot be answered.
+    """
+    fragments: List[str]
+    counts: List[int]
+    offsets: List[int]
+    text: str = field(repr=False)
+    counted: bool = True
+
+    @property
+    def missing(self) -> List[int]:
+        return [i for i, c in enumerate(self.counts) if c == 0]
+
+    @property
+    def repeated(self) -> List[int]:
+        self._require_counts()
+        return [i for i, c in enumerate(self.counts) if c > 1]
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing
+
+    @property
+    def exactly_once(self) -> bool:
+        self._require_counts()
+        return all(c == 1 for c in self.counts)
+
+    def _require_counts(self) -> None:
+        if not self.counted:
+            raise ValueError("occurrence counts need check_preserved(..., count_all=True)")
+
+    def expected_at(self, index: int) -> int:
+        """
+        Where fragment `index` should have been: the end of the nearest
+        preceding fragment (in fragment order) that was found, else 0.
+        """
+        for prev in range(index - 1, -1, -1):
+            if self.offsets[prev] >= 0:
+                return self.offsets[prev] + len(self.fragments[prev])
+        return 0
+
+    def describe(self, index: int, *, width: int = 40) -> str:
+        at = self.expected_at(index)
+        lo = max(0, at - width)
+        before = self.text[lo:at].rsplit(FRAGMENT_SEPARATOR, 1)[-1]
+        where = f"after “…{before}”" if before else "at the start"
+        return f"{self.fragments[index]} (expected {where}, offset {at})"
+
+    def describe_missing(self, *, limit: int = 10) -> str:
+        return "\n".join(f"- {self.describe(i)}" for i in self.missing[:limit])
+
+
+# -------------------------------------------------
+# Entry point
+# -------------------------------------------------
+
+def _find_each(fragments: Sequence[str], text: str) -> PreservationReport:
+    """Presence + first offset per fragment with str.find (C-level)."""
+    fragments = list(fragments)
+    offsets = [text.find(f) for f in fragments]
+    return PreservationReport(
+        fragments=fragments,
+        counts=[1 if o >= 0 else 0 for o in offsets],
+        offsets=offsets,
+        text=text,
+        counted=False,
+    )
+
+
+def _match_whole(fragments: Sequence[str], haystack: Sequence[str], text: str) -> PreservationReport:
+    """Exact counts + first offsets for whole fragments: hash lookups only."""
+    counts = Counter(haystack)
+    first: Dict[str, int] = {}
+    pos = len(FRAGMENT_SEPARATOR)
+    for f in haystack:
+        first.setdefault(f, pos)
+        pos += len(f) + len(FRAGMENT_SEPARATOR)
+
+    fragments = list(fragments)
+    return PreservationReport(
+        fragments=fragments,
+        counts=[counts.get(f, 0) for f in fragments],
+        offsets=[first.get(f, -1) for f in fragments],
+        text=text,
+    )
+
+
+def check_preserved(
+    fragments: Sequence[str],
+    haystack: Union[str, Sequence[str]],
+    *,
+    whole_fragments: bool = False,
+    count_all: bool = False,
+) -> PreservationReport:
+    """
+    Where each fragment occurs verbatim in `haystack`.
+
+    `haystack` is a text or a list of (normalized) fragments. With
+    `whole_fragments=True` a fragment must equal one haystack fragment
+    exactly instead of appearing inside one (always counted). Containment
+    checks report presence only, unless `count_all=True` tallies every
+    (overlapping) occurrence with the automaton — one pass over the text
+    however many fragments, where per-fragment searches would each rescan
+    it; that wins from a few thousand fragments on
+    (python -m src.utils.bench_text_preservation). Callers normalize
+    both sides.
+    """
+    sep = FRAGMENT_SEPARATOR
+    if isinstance(haystack, str):
+        if whole_fragments:
+            raise ValueError("whole_fragments needs a list of haystack fragments")
+        text = haystack
+    else:
+        haystack = list(haystack)
+        text = sep + sep.join(haystack) + sep
+        if whole_fragments:
+            return _match_whole(fragments, haystack, text)
+
+    if count_all:
+        return FragmentAutomaton(fragments).scan(text)
+    return _find_each(fragments, text)
@@ -1,13 +1,27 @@
 from __future__ import annotations
-import json
-import pathlib
+import atexit
+import contextvars
 import datetime
-from typing import Optional
+import functools
+import pathlib
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar
 
 from .config_loader import load_settings
+from .jsonl_writer import (
+    DEFAULT_FLUSH_INTERVAL_SECONDS,
+    DEFAULT_MAX_BATCH_RECORDS,
+    BufferedJsonlWriter,
+)
 
 _ROOT = pathlib.Path(__file__).resolve().parents[1]
 
+F = TypeVar("F", bound=Callable[..., Any])
+
 
 def _get_logs_dir() -> pathlib.Path:
     settings = load_settings()
@@ -17,39 +31,260 @@ def _get_logs_dir() -> pathlib.Path:
     return logs_dir
 
 
+def usage_cost(
+    pricing: Dict[str, Any],
+    *,
+    prompt_tokens: int,
+    completion_tokens: int,
+    cached_tokens: int = 0,
+) -> Tuple[float, float]:
+    """
+    (input_cost, output_cost) in USD for one call.
+    cached_tokens (part of prompt_tokens) are priced at cached_input_per_1k
+    when the model defines it.
+    """
+    in_price = float(pricing.get("input_per_1k", 0.0))
+    out_price = float(pricing.get("output_per_1k", 0.0))
+    cached_price = float(pricing.get("cached_input_per_1k", in_price))
+
+    input_cost = (
+        ((prompt_tokens - cached_tokens) / 1000.0) * in_price
+        + (cached_tokens / 1000.0) * cached_price
+    )
+    output_cost = (completion_tokens / 1000.0) * out_price
+    return input_cost, output_cost
+
+
+# -------------------------------------------------
+# Aggregates
+# -------------------------------------------------
+
+@dataclass
+class UsageTotals:
+    calls: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+    latency_s: float = 0.0
+
+    def add(self, record: Dict[str, Any]) -> None:
+        self.calls += 1
+        self.prompt_tokens += record["prompt_tokens"]
+        self.cached_tokens += record["cached_tokens"]
+        self.completion_tokens += record["completion_tokens"]
+        self.cost_usd += record["total_cost_usd"]
+        self.latency_s += record.get("latency_s") or 0.0
+
+    def merge(self, other: "UsageTotals") -> None:
+        for name, value in asdict(other).items():
+            setattr(self, name, getattr(self, name) + value)
+
+
+_stage: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "usage_stage", default=None
+)
+
+
+# -------------------------------------------------
+# Sink
+# -------------------------------------------------
+
+class UsageSink:
+    """
+    Buffered, thread-safe token usage writer.
+
+    - record() only aggregates in memory and enqueues; it never touches disk
+    - lines reach disk through a BufferedJsonlWriter (batched appends)
+    - aggregates are kept per (pipeline stage, model) for this run
+    """
+
+    def __init__(
+        self,
+        logs_dir: pathlib.Path,
+        *,
+        pricing: Optional[Dict[str, Any]] = None,
+        flush_interval_s: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        max_batch: int = DEFAULT_MAX_BATCH_RECORDS,
+    ) -> None:
+        self.logs_dir = pathlib.Path(logs_dir)
+        self.usage_path = self.logs_dir / "token_usage.jsonl"
+        self.summary_path = self.logs_dir / "usage_summary.jsonl"
+        self.run_id = uuid.uuid4().hex[:12]
+        self.pricing = pricing or {}
+        self._writer = BufferedJsonlWriter(
+            flush_interval_s=flush_interval_s,
+            max_batch=max_batch,
+            name="usage-writer",
+        )
+        self._totals: Dict[Tuple[str, str], UsageTotals] = {}
+        self._lock = threading.Lock()
+
+    # ---------------- producers ----------------
+
+    def record(
+        self,
+        *,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        provider: str,
+        cached_tokens: int = 0,
+        stage_tag: Optional[str] = None,
+        latency_s: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        input_cost, output_cost = usage_cost(
+            self.pricing.get(model, {}),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached_tokens=cached_tokens,
+        )
+        stage = _stage.get() or stage_tag or "-"
+
+        record = {
+            "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
+            "run_id": self.run_id,
+            "stage": stage,
+            "stage_tag": stage_tag,
+            "provider": provider,
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "cached_tokens": cached_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "latency_s": round(latency_s, 3) if latency_s is not None else None,
+            "input_cost_usd": round(input_cost, 6),
+            "output_cost_usd": round(output_cost, 6),
+            "total_cost_usd": round(input_cost + output_cost, 6),
+        }
+
+        with self._lock:
+            self._totals.setdefault((stage, model), UsageTotals()).add(record)
+
+        self._writer.write(self.usage_path, record)
+        return record
+
+    # ---------------- aggregates ----------------
+
+    def totals(self, *, stage: Optional[str] = None) -> Dict[str, UsageTotals]:
+        """Per-model totals for one pipeline stage (or the whole run)."""
+        by_model: Dict[str, UsageTotals] = {}
+        with self._lock:
+            for (rec_stage, model), totals in self._totals.items():
+                if stage is not None and rec_stage != stage:
+                    continue
+                by_model.setdefault(model, UsageTotals()).merge(totals)
+        return by_model
+
+    def stage_summary(self, stage: str, *, wall_s: Optional[float] = None) -> Dict[str, Any]:
+        by_model = self.totals(stage=stage)
+        overall = UsageTotals()
+        for totals in by_model.values():
+            overall.merge(totals)
+
+        summary = {
+            "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
+            "run_id": self.run_id,
+            "stage": stage,
+            "wall_s": round(wall_s, 3) if wall_s is not None else None,
+            **{k: round(v, 6) if isinstance(v, float) else v for k, v in asdict(overall).items()},
+            "by_model": {model: asdict(t) for model, t in sorted(by_model.items())},
+        }
+        return summary
+
+    def write_summary(self, summary: Dict[str, Any]) -> None:
+        self._writer.write(self.summary_path, summary)
+
+    def flush(self) -> None:
+        """Block until every queued record is on disk."""
+        self._writer.flush()
+
+
+# -------------------------------------------------
+# Process-wide sink
+# -------------------------------------------------
+
+_sink: UsageSink | None = None
+_sink_lock = threading.Lock()
+
+
+def get_usage_sink() -> UsageSink:
+    global _sink
+    with _sink_lock:
+        if _sink is None:
+            settings = load_settings()
+            usage = settings.get("usage", {}) or {}
+            _sink = UsageSink(
+                _get_logs_dir(),
+                pricing=settings.get("pricing", {}) or {},
+                flush_interval_s=float(
+                    usage.get("flush_interval_seconds", DEFAULT_FLUSH_INTERVAL_SECONDS)
+                ),
+                max_batch=int(usage.get("max_batch_records", DEFAULT_MAX_BATCH_RECORDS)),
+            )
+            atexit.register(_sink.flush)
+        return _sink
+
+
 def log_usage(
     model: str,
     prompt_tokens: int,
     completion_tokens: int,
     provider: str = "openai",
+    cached_tokens: int = 0,
+    stage_tag: Optional[str] = None,
+    latency_s: Optional[float] = None,
 ) -> None:
     """
-    Append a single usage record to logs/token_usage.jsonl with
-    estimated cost using pricing from settings.yaml.
+    Record one call's usage with estimated cost (pricing from settings.yaml).
+    Buffered: lines reach logs/token_usage.jsonl via the background writer.
     """
-    settings = load_settings()
-    pricing = settings.get("pricing", {}).get(model, {})
-    in_price = float(pricing.get("input_per_1k", 0.0))
-    out_price = float(pricing.get("output_per_1k", 0.0))
+    get_usage_sink().record(
+        model=model,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        provider=provider,
+        cached_tokens=cached_tokens,
+        stage_tag=stage_tag,
+        latency_s=latency_s,
+    )
 
-    total_tokens = prompt_tokens + completion_tokens
-    input_cost = (prompt_tokens / 1000.0) * in_price
-    output_cost = (completion_tokens / 1000.0) * out_price
-    total_cost = input_cost + output_cost
-
-    record = {
-        "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
-        "provider": provider,
-        "model": model,
-        "prompt_tokens": prompt_tokens,
-        "completion_tokens": completion_tokens,
-        "total_tokens": total_tokens,
-        "input_cost_usd": round(input_cost, 6),
-        "output_cost_usd": round(output_cost, 6),
-        "total_cost_usd": round(total_cost, 6),
-    }
-
-    logs_dir = _get_logs_dir()
-    usage_file = logs_dir / "token_usage.jsonl"
-    with open(usage_file, "a", encoding="utf-8") as f:
-        f.write(json.dumps(record) + "\n")
\ No newline at end of file
+
+# -------------------------------------------------
+# Stage summaries
+# -------------------------------------------------
+
+@contextmanager
+def usage_stage(stage: str) -> Iterator[None]:
+    """
+    Attribute every LLM call inside the block to `stage` and print /
+    write (logs/usage_summary.jsonl) its cost and latency when it ends.
+    """
+    token = _stage.set(stage)
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        _stage.reset(token)
+        sink = get_usage_sink()
+        summary = sink.stage_summary(stage, wall_s=time.monotonic() - started)
+        if summary["calls"]:
+            sink.write_summary(summary)
+            print(
+                f"💰 {stage}: {summary['calls']} LLM calls, "
+                f"in={summary['prompt_tokens']} (cached {summary['cached_tokens']}) "
+                f"out={summary['completion_tokens']}, ${summary['cost_usd']:.4f}, "
+                f"llm {summary['latency_s']:.1f}s / wall {summary['wall_s']:.1f}s"
+            )
+        sink.flush()
+
+
+def with_usage_summary(stage: str) -> Callable[[F], F]:
+    """Decorator: run a stage entry point under usage_stage(stage)."""
+    def decorate(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with usage_stage(stage):
+                return fn(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorate
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import pathlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from .config_loader import load_settings
+from .token_logger import _get_logs_dir, usage_cost
+
+
+# -------------------------------------------------
+# Loading
+# -------------------------------------------------
+
+def load_spans(path: pathlib.Path) -> List[Dict[str, Any]]:
+    spans = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                spans.append(json.loads(line))
+    return spans
+
+
+def latest_trace(trace_dir: pathlib.Path) -> Optional[pathlib.Path]:
+    traces = sorted(trace_dir.glob("trace_*.jsonl"), key=lambda p: p.stat().st_mtime)
+    return traces[-1] if traces else None
+
+
+# -------------------------------------------------
+# Aggregation
+# -------------------------------------------------
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def span_cost(span: Dict[str, Any], pricing: Dict[str, Any]) -> float:
+    input_cost, output_cost = usage_cost(
+        pricing.get(span.get("model"), {}),
+        prompt_tokens=span.get("prompt_tokens", 0),
+        completion_tokens=span.get("completion_tokens", 0),
+        cached_tokens=span.get("cached_tokens", 0),
+    )
+    return input_cost + output_cost
+
+
+@dataclass
+class LatencyRow:
+    key: str
+    durations: List[float] = field(default_factory=list)
+    retries: int = 0
+    cache_hits: int = 0
+    errors: int = 0
+    cost_usd: float = 0.0
+
+    def add(self, span: Dict[str, Any], pricing: Dict[str, Any]) -> None:
+        self.durations.append(span["duration_s"])
+        self.retries += span.get("retries", 0)
+        self.cache_hits += 1 if span.get("cache_hit") else 0
+        self.errors += 1 if span.get("status") == "error" else 0
+        self.cost_usd += span_cost(span, pricing)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "key": self.key,
+            "calls": len(self.durations),
+            "p50_s": percentile(self.durations, 50),
+            "p95_s": percentile(self.durations, 95),
+            "max_s": max(self.durations, default=0.0),
+            "total_s": sum(self.durations),
+            "retries": self.retries,
+            "cache_hits": self.cache_hits,
+            "errors": self.errors,
+            "cost_usd": round(self.cost_usd, 6),
+        }
+
+
+def llm_latency_by(
+    spans: Iterable[Dict[str, Any]],
+    attr: str,
+    *,
+    pricing: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """One row per value of `attr` ("stage" or "stage_tag") over llm spans."""
+    rows: Dict[str, LatencyRow] = {}
+    for span in spans:
+        if span.get("kind") != "llm":
+            continue
+        key = str(span.get(attr) or "-")
+        rows.setdefault(key, LatencyRow(key)).add(span, pricing)
+    return sorted((r.as_dict() for r in rows.values()), key=lambda r: -r["total_s"])
+
+
+def critical_path(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    From the longest root span, repeatedly follow the child that finished
+    last: the chain of work that determined when the run ended.
+    """
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for span in spans:
+        children.setdefault(span.get("parent_id"), []).append(span)
+
+    roots = children.get(None, [])
+    if not roots:
+        return []
+
+    path = [max(roots, key=lambda s: s["duration_s"])]
+    while children.get(path[-1]["span_id"]):
+        path.append(max(children[path[-1]["span_id"]], key=lambda s: s["end"]))
+    return path
+
+
+# -------------------------------------------------
+# Output
+# -------------------------------------------------
+
+def _label(span: Dict[str, Any]) -> str:
+    parts = [f"{span['kind']}:{span['name']}"]
+    for attr in ("slide_id", "quiz_id", "attempt"):
+        if span.get(attr) is not None and span["kind"] in ("slide", "quiz", "attempt"):
+            parts.append(f"{attr}={span[attr]}")
+    return " ".join(parts)
+
+
+def _print_table(title: str, rows: List[Dict[str, Any]]) -> None:
+    print(f"\n{title}")
+    print(
+        f"  {'key':<40} {'calls':>6} {'p50 s':>8} {'p95 s':>8} {'max s':>8} "
+        f"{'retries':>8} {'cached':>7} {'errors':>7} {'cost $':>9}"
+    )
+    for r in rows:
+        print(
+            f"  {r['key'][:40]:<40} {r['calls']:>6} {r['p50_s']:>8.2f} {r['p95_s']:>8.2f} "
+            f"{r['max_s']:>8.2f} {r['retries']:>8} {r['cache_hits']:>7} {r['errors']:>7} "
+            f"{r['cost_usd']:>9.4f}"
+        )
+
+
+def print_report(spans: List[Dict[str, Any]], *, pricing: Dict[str, Any]) -> None:
+    stages = [s for s in spans if s.get("kind") == "stage"]
+    if stages:
+        print("\nStages (wall clock)")
+        for s in sorted(stages, key=lambda s: s["start"]):
+            print(f"  {s['name']:<40} {s['duration_s']:>9.2f}s  {s['status']}")
+
+    _print_table("LLM calls by stage", llm_latency_by(spans, "stage", pricing=pricing))
+    _print_table("LLM calls by stage_tag", llm_latency_by(spans, "stage_tag", pricing=pricing))
+
+    path = critical_path(spans)
+    if path:
+        print("\nCritical path")
+        for depth, s in enumerate(path):
+            print(f"  {'  ' * depth}{_label(s)}  {s['duration_s']:.2f}s")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Summarize a pipeline trace: latency percentiles, retries, cost, critical path."
+    )
+    parser.add_argument("trace", nargs="?", help="trace_*.jsonl (default: newest in logs/traces)")
+    args = parser.parse_args(argv)
+
+    settings = load_settings()
+    if args.trace:
+        path = pathlib.Path(args.trace)
+    else:
+        trace_dir = _get_logs_dir() / (settings.get("tracing", {}) or {}).get("dir", "traces")
+        path = latest_trace(trace_dir)
+        if path is None:
+            print(f"❌ No traces found in {trace_dir}")
+            return 1
+
+    if not path.exists():
+        print(f"❌ Trace not found: {path}")
+        return 1
+
+    spans = load_spans(path)
+    print(f"✅ {path} — {len(spans)} spans")
+    print_report(spans, pricing=settings.get("pricing", {}) or {})
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
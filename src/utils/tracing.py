@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import atexit
+import contextvars
+import datetime
+import functools
+import os
+import pathlib
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+from .config_loader import load_settings
+from .jsonl_writer import BufferedJsonlWriter
+from .token_logger import _get_logs_dir
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Copied from a span to every span opened inside it, so each JSONL line
+# says which stage / slide / quiz it belongs to on its own.
+INHERITED_ATTRS = ("stage", "slide_id", "quiz_id")
+
+
+# -------------------------------------------------
+# Spans
+# -------------------------------------------------
+
+@dataclass
+class Span:
+    """
+    One timed unit of work.
+
+    kind: "stage" | "slide" | "quiz" | "llm" (one logical call, incl.
+          retries and cache) | "attempt" (one HTTP request)
+    """
+    name: str
+    kind: str
+    run_id: str
+    span_id: str
+    parent_id: Optional[str]
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    start: float = field(default_factory=time.time)
+    _t0: float = field(default_factory=time.monotonic, repr=False)
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update({k: v for k, v in attrs.items() if v is not None})
+
+    def add(self, **counters: int) -> None:
+        for name, value in counters.items():
+            self.attrs[name] = self.attrs.get(name, 0) + (value or 0)
+
+    def to_record(self, *, status: str, error: Optional[str]) -> Dict[str, Any]:
+        duration = time.monotonic() - self._t0
+        return {
+            "run_id": self.run_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start": round(self.start, 6),
+            "end": round(self.start + duration, 6),
+            "duration_s": round(duration, 6),
+            "status": status,
+            "error": error,
+            **self.attrs,
+        }
+
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "trace_span", default=None
+)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+# -------------------------------------------------
+# Tracer
+# -------------------------------------------------
+
+class Tracer:
+    """
+    Writes finished spans to one JSONL file per run.
+
+    Parent/child links follow a contextvar, so spans opened on
+    run_bounded worker threads nest under the span that started them.
+    With path=None spans are still created (callers may .set() on them)
+    but nothing is written.
+    """
+
+    def __init__(self, path: Optional[pathlib.Path], *, writer: Optional[BufferedJsonlWriter] = None):
+        self.path = pathlib.Path(path) if path is not None else None
+        self.run_id = uuid.uuid4().hex[:12]
+        self._writer = writer or BufferedJsonlWriter(name="trace-writer")
+
+    @contextmanager
+    def span(self, name: str, *, kind: str, **attrs: Any) -> Iterator[Span]:
+        parent = _current.get()
+        inherited = {
+            k: parent.attrs[k] for k in INHERITED_ATTRS if parent is not None and k in parent.attrs
+        }
+        span = Span(
+            name=name,
+            kind=kind,
+            run_id=self.run_id,
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id if parent is not None else None,
+            attrs=inherited,
+        )
+        span.set(**attrs)
+
+        token = _current.set(span)
+        status, error = "ok", None
+        try:
+            yield span
+        except BaseException as e:
+            status, error = "error", f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current.reset(token)
+            if self.path is not None:
+                self._writer.write(self.path, span.to_record(status=status, error=error))
+
+    def flush(self) -> None:
+        self._writer.flush()
+
+
+_tracer: Tracer | None = None
+_tracer_lock = threading.Lock()
+
+
+def _trace_path() -> Optional[pathlib.Path]:
+    cfg = load_settings().get("tracing", {}) or {}
+    if os.getenv("TRACE_DISABLE") or not cfg.get("enabled", True):
+        return None
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    return _get_logs_dir() / cfg.get("dir", "traces") / f"trace_{stamp}_{os.getpid()}.jsonl"
+
+
+def get_tracer() -> Tracer:
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer(_trace_path())
+            atexit.register(_tracer.flush)
+        return _tracer
+
+
+def span(name: str, *, kind: str, **attrs: Any):
+    """Open a span on the process-wide tracer (context manager)."""
+    return get_tracer().span(name, kind=kind, **attrs)
+
+
+def traced(name: str, *, kind: str = "stage") -> Callable[[F], F]:
+    """Decorator: run a function inside span(name). Stage spans also set `stage`."""
+    def decorate(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            attrs = {"stage": name} if kind == "stage" else {}
+            with span(name, kind=kind, **attrs):
+                return fn(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorate
@@ -1,6 +1,38 @@
+import os
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add project root to PYTHONPATH so `src` can be imported
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT))
+
+# Tests that touch the gateway open spans; keep them out of src/logs/traces.
+os.environ.setdefault("TRACE_DISABLE", "1")
+# Stage runs must not read or fill the persistent per-slide store.
+os.environ.setdefault("SLIDE_MEMO_DISABLE", "1")
+
+from src.utils import slide_memo
+from src.utils.slide_memo import SlideMemo
+
+
+@pytest.fixture
+def memo(tmp_path, monkeypatch):
+    """A real per-slide store in tmp_path, enabled for this test only."""
+    monkeypatch.delenv("SLIDE_MEMO_DISABLE", raising=False)
+    store = SlideMemo(tmp_path / "slides.sqlite")
+    monkeypatch.setattr(slide_memo, "_memo", store)
+    yield store
+    store.close()
+
+
+def panel(uuid, *texts, notes=""):
+    """A Stage 2 panel slide with one paragraph block per text."""
+    return {
+        "uuid": uuid,
+        "type": "panel",
+        "header": f"Header {uuid}",
+        "notes": notes,
+        "content": {"blocks": [{"type": "paragraph", "text": t} for t in texts]},
+    }
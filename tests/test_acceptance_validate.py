@@ -0,0 +1,153 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.stage2_5 import run_stage2_5
+from src.stage2_5.llm_client import LLMClient
+from src.stage2_6.runner import _shape_one
+from src.stage2_7.runner import _checked_engage_block, _synthesize_checked
+from src.stage2_8 import llm_call
+from src.stage2_8.llm_blueprints import generate_question_blueprints
+from src.stage2_8.llm_concepts import generate_source_claims
+from src.utils import llm_cache, llm_gateway
+from src.utils.llm_cache import LLMResponseCache
+from src.utils.llm_gateway import LLMGateway
+
+
+SOURCE = "Wash your hands with soap and water. Dry them on a clean towel."
+
+
+@pytest.fixture
+def cached_gateway(monkeypatch, tmp_path):
+    """A real gateway behind a real (temporary) response cache."""
+    monkeypatch.delenv("LLM_CACHE_DISABLE", raising=False)
+    monkeypatch.setattr(llm_cache, "_cache", LLMResponseCache(tmp_path / "c.sqlite"))
+    monkeypatch.setattr(llm_gateway.time, "sleep", lambda s: None)
+    monkeypatch.setattr(llm_gateway, "log_usage", lambda **kwargs: None)
+    monkeypatch.setattr(llm_gateway, "_get_logs_dir", lambda: tmp_path)
+
+    gateway = LLMGateway()
+    outputs = []
+
+    def create(**kwargs):
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(outputs.pop(0))))],
+            usage=SimpleNamespace(prompt_tokens=1, completion_tokens=1),
+        )
+
+    def respond(**kwargs):
+        return SimpleNamespace(
+            output_text=json.dumps(outputs.pop(0)),
+            usage=SimpleNamespace(input_tokens=1, output_tokens=1),
+        )
+
+    gateway._clients["openai"] = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create)),
+        responses=SimpleNamespace(create=respond),
+    )
+    monkeypatch.setattr(llm_call, "get_gateway", lambda: gateway)
+    return gateway, outputs
+
+
+def test_stage2_6_rejected_shaping_is_retried_and_not_cached(cached_gateway, monkeypatch):
+    gateway, outputs = cached_gateway
+    monkeypatch.setattr(run_stage2_5, "get_gateway", lambda: gateway)
+    llm = LLMClient(run_stage2_5.llm_dispatch)
+
+    paraphrased = {"sentence_shaping": {"groups": [{"sentences": ["Wash hands well, then dry them."]}]}}
+    verbatim = {"sentence_shaping": {"groups": [
+        {"sentences": ["Wash your hands with soap and water.", "Dry them on a clean towel."]},
+    ]}}
+    outputs.extend([paraphrased, verbatim])
+
+    blocks = _shape_one(llm, SOURCE)
+    assert blocks[0]["sentences"] == verbatim["sentence_shaping"]["groups"][0]["sentences"]
+    assert outputs == []
+
+    # The rerun is served from the cache: only the accepted output was stored.
+    assert _shape_one(llm, SOURCE) == blocks
+    assert llm_cache._cache.stats.as_dict()["hits"] == 1
+
+
+def test_stage2_7_sentence_loss_is_retried_and_not_cached(cached_gateway):
+    gateway, outputs = cached_gateway
+
+    lossy = {
+        "type": "engage2",
+        "intro": {"text": "Wash your hands with soap and water."},
+        "steps": [],
+        "button_label": "Next",
+    }
+    complete = dict(lossy, steps=[{"text": "Dry them on a clean towel."}])
+    outputs.extend([lossy, complete])
+
+    def run():
+        return _synthesize_checked(source_text=SOURCE, engage_type="engage2", client=gateway, slide_id="s1")
+
+    assert run()["steps"] == complete["steps"]
+    assert outputs == []
+    assert run() == complete  # cache hit; no output left to pop
+    assert llm_cache._cache.stats.as_dict()["hits"] == 1
+
+
+def test_stage2_7_repeated_sentence_is_retried_and_not_cached(cached_gateway):
+    gateway, outputs = cached_gateway
+
+    repeated = {
+        "type": "engage2",
+        "intro": {"text": "Wash your hands with soap and water."},
+        "steps": [{"text": "Wash your hands with soap and water. Dry them on a clean towel."}],
+        "button_label": "Next",
+    }
+    once = dict(repeated, steps=[{"text": "Dry them on a clean towel."}])
+    outputs.extend([repeated, once])
+
+    def run():
+        return _synthesize_checked(source_text=SOURCE, engage_type="engage2", client=gateway, slide_id="s1")
+
+    assert run()["steps"] == once["steps"]
+    assert outputs == []
+    assert run() == once
+    assert llm_cache._cache.stats.as_dict()["hits"] == 1
+
+
+def test_stage2_7_allows_a_sentence_the_source_repeats():
+    source = "Wash your hands. Dry them. Wash your hands."
+    block = {"intro": {"text": "Wash your hands."}, "steps": [{"text": "Dry them. Wash your hands."}]}
+    assert _checked_engage_block(block, source_text=source, engage_type="engage2", slide_id="s1") == block
+
+
+def _blueprint(i, role):
+    return {
+        "question_id": f"q{i}", "type": "mcq", "quiz_role": role, "question_style": "direct",
+        "claim_ids": [f"c{i}"], "cognitive_level": "recall", "target_skill": "Recognise danger signs",
+        "correct_answer_idea": "Refer", "distractor_themes": ["wait", "home care", "antibiotics"],
+        "avoid": ["trick wording", "verbatim restatement"],
+    }
+
+
+def test_stage2_8_pass1_and_pass2_rejections_are_retried_and_not_cached(cached_gateway):
+    _, outputs = cached_gateway
+    claims = {"source_claims": [{"claim_id": "c1"}, {"claim_id": "c2"}]}
+
+    def run():
+        pass1 = generate_source_claims(quiz_id=1, source_paragraphs=[SOURCE])
+        pass2 = generate_question_blueprints(
+            quiz_id=1, source_claims_payload=claims,
+            inline_direct_questions=1, final_direct_questions=1, module_application_questions=0,
+        )
+        return pass1, pass2
+
+    one_blueprint = {"quiz_id": 1, "blueprints": [_blueprint(1, "inline_direct")]}
+    blueprints = {"quiz_id": 1, "blueprints": [_blueprint(1, "inline_direct"), _blueprint(2, "final_direct")]}
+    outputs.extend([{}, claims, one_blueprint, blueprints])
+
+    pass1, pass2 = run()
+    assert pass1["source_claims"] == claims["source_claims"]
+    assert [bp["quiz_role"] for bp in pass2["blueprints"]] == ["inline_direct", "final_direct"]
+    assert outputs == []
+
+    # Only the accepted answers were cached: a rerun makes no calls.
+    assert run() == (pass1, pass2)
+    assert llm_cache._cache.stats.as_dict()["hits"] == 2
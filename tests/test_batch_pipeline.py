@@ -0,0 +1,186 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.batch import batch_pipeline, unpack_batch_results
+from src.stage2_5.llm_client import LLMClient
+from src.stage2_5.run_stage2_5 import llm_dispatch
+from src.stage2_6.runner import collect_batch_items, run_stage2_6
+from src.utils import llm_cache, llm_gateway
+from src.utils.llm_cache import LLMResponseCache
+from src.utils.llm_client_batch import LLMClientBatch
+
+
+PARAGRAPH = "Wash hands before every visit. Dry them with a clean towel afterwards."
+
+
+def _shaping_answer(body):
+    prompt = body["messages"][-1]["content"]
+    if "FAIL-ME" in prompt:
+        return None
+    if "PARAPHRASE-ME" in prompt:
+        return {"sentence_shaping": {"groups": [{"sentences": ["Please paraphrase this text."]}]}}
+    return {
+        "sentence_shaping": {
+            "groups": [
+                {"sentences": ["Wash hands before every visit."]},
+                {"sentences": ["Dry them with a clean towel afterwards."]},
+            ]
+        }
+    }
+
+
+class StubOpenAI:
+    """Minimal Files + Batches API; answers each batched request at once."""
+
+    def __init__(self):
+        self.files = {}
+        self.batches = {}
+        self.retrievals = 0
+
+    def handle(self, method, path, headers, raw):
+        if method == "POST" and path == "/v1/files":
+            boundary = re.search(r"boundary=(\S+)", headers["Content-Type"]).group(1).encode()
+            part = next(p for p in raw.split(b"--" + boundary) if b'name="file"' in p)
+            content = part.split(b"\r\n\r\n", 1)[1].rsplit(b"\r\n", 1)[0]
+            file_id = f"file-{len(self.files)}"
+            self.files[file_id] = content.decode()
+            return {"id": file_id, "object": "file", "purpose": "batch", "bytes": len(content)}
+
+        if method == "POST" and path == "/v1/batches":
+            req = json.loads(raw)
+            batch_id = f"batch-{len(self.batches)}"
+            out_lines, err_lines = [], []
+            for line in self.files[req["input_file_id"]].splitlines():
+                item = json.loads(line)
+                answer = _shaping_answer(item["body"])
+                if answer is None:
+                    err_lines.append({"custom_id": item["custom_id"], "response": None,
+                                      "error": {"code": "server_error", "message": "boom"}})
+                    continue
+                out_lines.append({
+                    "id": f"r-{item['custom_id']}",
+                    "custom_id": item["custom_id"],
+                    "response": {"status_code": 200, "body": {
+                        "choices": [{"message": {"role": "assistant", "content": json.dumps(answer)}}],
+                        "usage": {"prompt_tokens": 10, "completion_tokens": 5},
+                    }},
+                    "error": None,
+                })
+            self.files[f"{batch_id}-out"] = "".join(json.dumps(l) + "\n" for l in out_lines)
+            self.files[f"{batch_id}-err"] = "".join(json.dumps(l) + "\n" for l in err_lines)
+            self.batches[batch_id] = {
+                "id": batch_id, "object": "batch", "endpoint": req["endpoint"],
+                "input_file_id": req["input_file_id"], "completion_window": "24h",
+                "status": "in_progress", "created_at": 0,
+            }
+            return self.batches[batch_id]
+
+        m = re.fullmatch(r"/v1/batches/([\w-]+)", path)
+        if method == "GET" and m:
+            self.retrievals += 1
+            batch = self.batches[m.group(1)]
+            if self.retrievals > 1:
+                batch.update(status="completed", output_file_id=f"{batch['id']}-out",
+                             error_file_id=f"{batch['id']}-err")
+            return batch
+
+        m = re.fullmatch(r"/v1/files/([\w-]+)/content", path)
+        if method == "GET" and m:
+            return self.files[m.group(1)]
+
+        raise AssertionError(f"unexpected {method} {path}")
+
+
+@pytest.fixture
+def stub_server():
+    stub = StubOpenAI()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _serve(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            result = stub.handle(self.command, self.path, self.headers, self.rfile.read(length))
+            payload = result.encode() if isinstance(result, str) else json.dumps(result).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = do_POST = _serve
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield stub, f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+
+
+def _module():
+    return {
+        "slides": [
+            {"id": "s1", "slide_type": "panel",
+             "content": {"blocks": [{"type": "paragraph", "text": PARAGRAPH},
+                                    {"type": "bullets", "items": ["a"]}]}},
+            {"id": "s2", "slide_type": "panel", "notes": "[[LOCKED]]",
+             "content": {"blocks": [{"type": "paragraph", "text": PARAGRAPH}]}},
+            {"id": "s3", "slide_type": "panel",
+             "content": {"blocks": [{"type": "paragraph", "text": "FAIL-ME please now."}]}},
+            {"id": "s4", "slide_type": "panel",
+             "content": {"blocks": [{"type": "paragraph", "text": "PARAPHRASE-ME this text please."}]}},
+        ]
+    }
+
+
+def test_batch_results_seed_cache_and_stage_applies_them(stub_server, tmp_path, monkeypatch):
+    stub, base_url = stub_server
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_BASE_URL", base_url)
+    monkeypatch.delenv("LLM_CACHE_DISABLE", raising=False)
+    monkeypatch.setattr(llm_cache, "_cache", LLMResponseCache(tmp_path / "cache.sqlite"))
+    monkeypatch.setattr(unpack_batch_results, "log_usage", lambda **kwargs: None)
+
+    gateway = llm_gateway.LLMGateway()
+    monkeypatch.setattr(llm_gateway, "_gateway", gateway)
+
+    module = _module()
+    items = collect_batch_items(module)
+    assert [i.custom_id for i in items] == [
+        "stage2_6:s1:block_0", "stage2_6:s3:block_0", "stage2_6:s4:block_0",
+    ]
+
+    summary = batch_pipeline.run_batch(
+        items,
+        name="t",
+        client=LLMClientBatch(gateway),
+        work_dir=tmp_path / "batch",
+        sleep=lambda s: None,
+    )
+
+    assert summary.submitted == 3
+    assert summary.stored == 1
+    assert sorted(summary.failed) == ["stage2_6:s3:block_0", "stage2_6:s4:block_0"]
+    # The paraphrase fails the realtime check too, so it is not cached.
+    assert "verbatim" in summary.failed["stage2_6:s4:block_0"]
+    assert stub.retrievals == 2
+
+    # Re-running only re-sends what is not cached yet.
+    again = batch_pipeline.run_batch(
+        items, name="t", client=LLMClientBatch(gateway),
+        work_dir=tmp_path / "batch", sleep=lambda s: None,
+    )
+    assert again.submitted == 2
+    assert sorted(again.failed) == ["stage2_6:s3:block_0", "stage2_6:s4:block_0"]
+
+    # The stage itself now runs without touching the network for s1.
+    module["slides"] = module["slides"][:2]
+    out = run_stage2_6(module, LLMClient(llm_dispatch))
+    blocks = out["slides"][0]["content"]["blocks"]
+    assert [b["type"] for b in blocks] == ["sentence_block", "sentence_block", "bullets"]
+    assert blocks[0]["sentences"] == ["Wash hands before every visit."]
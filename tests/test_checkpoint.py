@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from src.stage2_5.llm_client import LLMClient
+from src.stage2_6.runner import run_stage2_6
+from src.utils.checkpoint import CheckpointJournal, journal_path
+
+from conftest import panel
+
+
+def test_resume_replays_matching_units_and_skips_a_torn_line(tmp_path):
+    path = journal_path(tmp_path / "out.json")
+    journal = CheckpointJournal(path)
+    assert journal.run("s1", {"text": "a"}, lambda: {"done": 1}) == {"done": 1}
+    assert journal.run("s2", {"text": "b"}, lambda: [2]) == [2]
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"unit": "s3", "input_ha')  # crash mid-write
+
+    resumed = CheckpointJournal(path, resume=True)
+    assert len(resumed) == 2
+    assert resumed.run("s1", {"text": "a"}, lambda: pytest.fail("recomputed")) == {"done": 1}
+    # Edited input: the journaled result no longer applies.
+    assert resumed.run("s2", {"text": "B"}, lambda: [3]) == [3]
+    assert resumed.replayed == 1 and resumed.recorded == 1
+
+    resumed.discard()
+    assert not path.exists()
+    assert len(CheckpointJournal(path, resume=True)) == 0
+
+
+def test_stage2_6_resume_restores_shaped_slides_without_llm_calls(tmp_path):
+    def module():
+        return {"slides": [panel(f"s{i}", f"Slide {i} says wash your hands.") for i in range(3)]}
+
+    calls = []
+
+    def respond(prompt):
+        calls.append(prompt)
+        if len(calls) == 3:
+            raise RuntimeError("provider down")
+        return {"sentence_shaping": {"groups": []}}
+
+    path = journal_path(tmp_path / "module_stage2_6.json")
+    with pytest.raises(RuntimeError):
+        run_stage2_6(module(), LLMClient(respond), max_workers=1, journal=CheckpointJournal(path))
+
+    units = [json.loads(line)["unit"] for line in path.read_text(encoding="utf-8").splitlines()]
+    assert units == ["s0", "s1"]
+
+    calls.clear()
+    llm = LLMClient(lambda prompt: calls.append(prompt) or {"sentence_shaping": {"groups": []}})
+    out = run_stage2_6(module(), llm, max_workers=1, journal=CheckpointJournal(path, resume=True))
+
+    assert len(calls) == 1
+    for i, slide in enumerate(out["slides"]):
+        assert slide["content"]["blocks"][0]["block_id"] == f"s{i}__sb01"
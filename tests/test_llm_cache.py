@@ -0,0 +1,105 @@
+import threading
+import time
+
+from src.utils import llm_cache
+from src.utils.llm_cache import LLMResponseCache, make_cache_key
+
+
+def _key(prompt, **overrides):
+    params = dict(provider="openai", model="m", temperature=0.0, max_tokens=100, prompt=prompt)
+    params.update(overrides)
+    return make_cache_key(**params)
+
+
+def test_key_changes_with_every_request_parameter():
+    base = _key("hello")
+    assert base == _key("hello")
+    assert base != _key("hello!")
+    assert base != _key("hello", model="other")
+    assert base != _key("hello", temperature=0.2)
+    assert base != _key("hello", max_tokens=200)
+    assert base != _key("hello", prompt_version="v2")
+    assert base != _key("hello", variant="attempt 2")
+
+
+def test_rerun_at_temperature_zero_makes_no_calls(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "_cache", LLMResponseCache(tmp_path / "c.sqlite"))
+    calls = []
+
+    def run():
+        return llm_cache.cached_llm_call(
+            provider="openai",
+            model="m",
+            temperature=0.0,
+            max_tokens=10,
+            prompt=[{"role": "user", "content": "same"}],
+            call=lambda: calls.append(1) or {"answer": 42},
+        )
+
+    assert run() == {"answer": 42}
+    assert run() == {"answer": 42}
+    assert len(calls) == 1
+    stats = llm_cache._cache.stats.as_dict()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+
+def test_concurrent_identical_requests_share_one_call(tmp_path):
+    cache = LLMResponseCache(tmp_path / "c.sqlite")
+    calls = []
+    gate = threading.Event()
+
+    def slow_call():
+        calls.append(1)
+        gate.wait(timeout=5)
+        return {"ok": True}
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                cache.get_or_call("k", slow_call, provider="openai", model="m")
+            )
+        )
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    gate.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"ok": True}] * 4
+
+
+def test_failures_are_not_cached(tmp_path):
+    cache = LLMResponseCache(tmp_path / "c.sqlite")
+
+    def boom():
+        raise ValueError("bad json")
+
+    try:
+        cache.get_or_call("k", boom, provider="openai", model="m")
+    except ValueError:
+        pass
+
+    assert cache.get("k") is None
+
+
+def test_lru_and_ttl_eviction(tmp_path):
+    cache = LLMResponseCache(tmp_path / "c.sqlite", max_entries=2)
+    cache.put("a", {"v": 1}, provider="p", model="m")
+    cache.put("b", {"v": 2}, provider="p", model="m")
+    time.sleep(0.01)
+    cache.get("a")  # a is now more recently used than b
+    cache.put("c", {"v": 3}, provider="p", model="m")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+    assert cache.get("c") == {"v": 3}
+
+    expiring = LLMResponseCache(tmp_path / "ttl.sqlite", ttl_seconds=0.0)
+    expiring.put("x", {"v": 1}, provider="p", model="m")
+    time.sleep(0.01)
+    assert expiring.get("x") is None
@@ -0,0 +1,125 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils import llm_gateway
+from src.utils.llm_gateway import LLMGateway, LLMJSONError, LLMRequest, extract_json_object
+from src.utils.retry_policy import DeadlineExceeded, RetryPolicy, stage_deadline
+
+
+class FakeChatClient:
+    def __init__(self, outputs):
+        self.outputs = list(outputs)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.calls += 1
+        content = self.outputs.pop(0)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=11, completion_tokens=3),
+        )
+
+
+@pytest.fixture
+def gateway(monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM_CACHE_DISABLE", "1")
+    monkeypatch.setattr(llm_gateway.time, "sleep", lambda s: None)
+    monkeypatch.setattr(llm_gateway, "log_usage", lambda **kwargs: None)
+    monkeypatch.setattr(llm_gateway, "_get_logs_dir", lambda: tmp_path)
+    return LLMGateway()
+
+
+def _request():
+    return LLMRequest(
+        messages=[{"role": "user", "content": "hi"}],
+        model="m",
+        stage_tag="Test",
+    )
+
+
+def test_json_extraction_policy():
+    assert extract_json_object('```json\n{"a": 1}\n```') == {"a": 1}
+    assert extract_json_object('Sure! {"a": {"b": 2}} hope that helps') == {"a": {"b": 2}}
+    with pytest.raises(LLMJSONError):
+        extract_json_object("")
+    with pytest.raises(LLMJSONError):
+        extract_json_object("[1, 2]")
+
+
+def test_gateway_retries_parse_failures_and_emits_metrics(gateway):
+    fake = FakeChatClient(["not json", '{"suggested": null}', '{"suggested": null, "notes": "ok"}'])
+    gateway._clients["openai"] = fake
+    seen = []
+    gateway.add_metrics_listener(seen.append)
+
+    data = gateway.complete_json(
+        _request(),
+        required_keys={"suggested", "notes"},
+        policy=RetryPolicy(parse_attempts=3),
+    )
+
+    assert data == {"suggested": None, "notes": "ok"}
+    assert fake.calls == 3
+    assert [m.status for m in seen] == ["ok", "ok", "ok"]
+    assert seen[0].prompt_tokens == 11 and seen[0].stage_tag == "Test"
+
+
+def test_gateway_validate_hook_and_exhaustion(gateway, tmp_path):
+    gateway._clients["openai"] = FakeChatClient(['{"x": 1}'] * 2)
+
+    def validate(data):
+        raise ValueError("never good enough")
+
+    with pytest.raises(RuntimeError, match="Test LLM failed after retries"):
+        gateway.complete_json(_request(), validate=validate, policy=RetryPolicy(parse_attempts=2))
+
+    # Each rejected attempt keeps its own raw-output dump.
+    dumps = sorted(p.name for p in (tmp_path / "llm_debug").iterdir())
+    assert len(dumps) == 2
+    assert dumps[0].startswith("Test_") and dumps[0].endswith("_a1.txt")
+    assert dumps[1].endswith("_a2.txt")
+
+
+class FlakyClient(FakeChatClient):
+    """Fails the first `failures` calls at the transport level."""
+
+    def __init__(self, outputs, failures):
+        super().__init__(outputs)
+        self.failures = failures
+        self.timeouts = []
+
+    def _create(self, **kwargs):
+        self.timeouts.append(kwargs.get("timeout"))
+        if self.failures:
+            self.failures -= 1
+            self.calls += 1
+            raise ConnectionError("socket hung up")
+        return super()._create(**kwargs)
+
+
+def test_transport_and_parse_budgets_are_separate(gateway):
+    fake = FlakyClient(["not json", '{"ok": 1}'], failures=2)
+    gateway._clients["openai"] = fake
+
+    data = gateway.complete_json(
+        _request(),
+        policy=RetryPolicy(transport_attempts=3, parse_attempts=2, request_timeout_s=7.0),
+    )
+
+    assert data == {"ok": 1}
+    assert fake.calls == 4                     # 2 transport + 2 parse, not 3 x 2
+    assert fake.timeouts == [7.0] * 4
+
+
+def test_stage_deadline_reaches_worker_threads(gateway):
+    from src.utils.concurrency import run_bounded
+
+    gateway._clients["openai"] = FakeChatClient(['{"ok": 1}'] * 2)
+
+    with stage_deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            run_bounded(lambda _: gateway.complete_json(_request()), [1, 2], max_workers=2)
+
+    assert gateway._clients["openai"].calls == 0
@@ -0,0 +1,81 @@
+import json
+from types import SimpleNamespace
+
+from src.stage2_5.run_stage2_5 import dispatch_request
+from src.stage2_5.schemas import PANEL_SPLIT_OUTPUT
+from src.stage2_6.prompts_for_2_6 import SENTENCE_SHAPING_OUTPUT, sentence_shaping_prompt
+from src.stage2_8.llm_call import JSON_OUTPUT_RULES, build_llm_request
+from src.stage2_8.prompts_author_single import AUTHOR_SINGLE_OUTPUT
+from src.utils import llm_gateway
+from src.utils.llm_gateway import LLMGateway, LLMRequest, openai_request_body, request_cache_key
+
+
+def _walk_objects(schema):
+    if isinstance(schema, dict):
+        if schema.get("type") == "object" and "properties" in schema:
+            yield schema
+        for value in schema.values():
+            yield from _walk_objects(value)
+    elif isinstance(schema, list):
+        for value in schema:
+            yield from _walk_objects(value)
+
+
+def test_strict_schemas_close_every_object():
+    for output in (PANEL_SPLIT_OUTPUT, SENTENCE_SHAPING_OUTPUT, AUTHOR_SINGLE_OUTPUT):
+        for node in _walk_objects(output.schema):
+            assert node["additionalProperties"] is False
+            assert set(node["required"]) == set(node["properties"])
+
+
+def test_request_bodies_carry_native_schema():
+    request = dispatch_request(sentence_shaping_prompt("One sentence. Two sentences."))
+    endpoint, body = openai_request_body(request)
+    assert endpoint == "/v1/chat/completions"
+    assert body["response_format"]["type"] == "json_schema"
+    assert body["response_format"]["json_schema"]["name"] == "sentence_shaping"
+    assert body["response_format"]["json_schema"]["strict"] is True
+
+    pass1 = build_llm_request(prompt="p", stage_tag="T", response_schema=AUTHOR_SINGLE_OUTPUT)
+    endpoint, body = openai_request_body(pass1)
+    assert endpoint == "/v1/responses"
+    assert body["text"]["format"]["name"] == "authored_question"
+    assert JSON_OUTPUT_RULES not in body["input"][0]["content"][0]["text"]
+
+    # The schema is part of the cache key.
+    assert request_cache_key(pass1) != request_cache_key(build_llm_request(prompt="p", stage_tag="T"))
+
+
+def test_optional_keys_are_dropped_when_null(monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM_CACHE_DISABLE", "1")
+    monkeypatch.setattr(llm_gateway, "log_usage", lambda **kwargs: None)
+    monkeypatch.setattr(llm_gateway, "_get_logs_dir", lambda: tmp_path)
+
+    sent = {}
+    answer = {
+        "question_id": "q1", "type": "true_false", "prompt": "Is it?",
+        "options": None, "correct_answer": True, "rationale": "Because.",
+    }
+
+    def create(**kwargs):
+        sent.update(kwargs)
+        return SimpleNamespace(
+            content=[SimpleNamespace(type="tool_use", name="authored_question", input=answer)],
+            usage=SimpleNamespace(input_tokens=1, output_tokens=1),
+        )
+
+    gateway = LLMGateway()
+    gateway._clients["anthropic"] = SimpleNamespace(messages=SimpleNamespace(create=create))
+
+    data = gateway.complete_json(LLMRequest(
+        messages=[{"role": "user", "content": "x"}],
+        model="claude",
+        provider="anthropic",
+        response_schema=AUTHOR_SINGLE_OUTPUT,
+    ))
+
+    assert sent["tool_choice"] == {"type": "tool", "name": "authored_question"}
+    assert sent["tools"][0]["input_schema"] == AUTHOR_SINGLE_OUTPUT.schema
+    assert "options" not in data
+    assert data == {k: v for k, v in answer.items() if k != "options"}
+    json.dumps(data)
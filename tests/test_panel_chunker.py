@@ -0,0 +1,60 @@
+from src.stage2_5.panel_chunker import chunk_sentences, plan_breaks
+from src.stage2_5.runner import _split_text_strict_30_70
+from src.stage2_5.validators import word_count
+
+
+def _sentence(n: int, tag: str = "w") -> str:
+    return " ".join([tag.upper()] + [tag] * (n - 2) + [f"{tag}."])
+
+
+class NoLLM:
+    def __init__(self):
+        self.prompts = []
+
+    def call(self, prompt):
+        self.prompts.append(prompt)
+        return {}
+
+
+def test_dp_finds_a_valid_split_where_greedy_packing_overflows():
+    # Greedy packing to 80 words gives 80 + 25, and merging the short
+    # tail backwards produced a single 105-word panel.
+    counts = [30, 30, 20, 25]
+    breaks = plan_breaks(counts)
+    bounds = [0] + breaks + [len(counts)]
+    panels = [sum(counts[a:b]) for a, b in zip(bounds, bounds[1:])]
+
+    assert all(30 <= w <= 80 for w in panels)
+    assert sum(panels) == sum(counts)
+    assert panels == [60, 45]
+
+
+def test_infeasible_strict_plan_is_none_but_relaxed_always_splits():
+    assert plan_breaks([90, 10]) is None
+
+    sentences = [_sentence(90, "a"), _sentence(10, "b")]
+    chunks = chunk_sentences(sentences, strict=False)
+    assert " ".join(chunks) == " ".join(sentences)
+
+
+def test_split_engine_runs_before_any_llm_call():
+    text = " ".join(_sentence(n) for n in (20, 25, 30, 25))
+    llm = NoLLM()
+
+    panels = _split_text_strict_30_70(llm, "Fever", text)
+
+    assert llm.prompts == []
+    assert " ".join(p["content"] for p in panels) == text
+    assert all(30 <= word_count(p["content"]) <= 80 for p in panels)
+    assert [p["header"] for p in panels] == ["Fever", "Fever (continued)"]
+
+
+def test_unsplittable_text_still_goes_to_the_llm():
+    text = _sentence(95) + " " + _sentence(10)
+    llm = NoLLM()
+
+    panels = _split_text_strict_30_70(llm, "Fever", text)
+
+    assert len(llm.prompts) == 1  # semantic split only; no reflow round-trip
+    assert " ".join(p["content"] for p in panels) == text
+
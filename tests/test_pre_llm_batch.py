@@ -0,0 +1,40 @@
+from docx import Document
+
+from src.pipeline.run_pre_llm_pipeline import print_summary, run_batch
+from src.stage1.bench_extract import build_synthetic_docx
+
+
+def _clean_module(path):
+    doc = Document()
+    table = doc.add_table(rows=3, cols=3)
+    table.cell(0, 0).text = "Header: Clean slide"
+    for cell, label in zip(table.rows[1].cells, ["Image", "English Text", "Notes and Instructions"]):
+        cell.text = label
+    table.cell(2, 1).text = "Children with fever need a careful assessment."
+    doc.save(str(path))
+    return path
+
+
+def test_batch_isolates_failures_and_summarizes(tmp_path, capsys):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    good = _clean_module(raw / "a_good.docx")
+    audit_fail = build_synthetic_docx(raw / "b_audit.docx", slides=4)  # short table trips Stage 1.1
+    corrupt = raw / "c_corrupt.docx"
+    corrupt.write_bytes(b"not a zip")
+
+    results = run_batch([good, audit_fail, corrupt], tmp_path / "out", workers=2)
+
+    assert [(r.name, r.status) for r in results] == [
+        ("a_good.docx", "ok"),
+        ("b_audit.docx", "failed"),
+        ("c_corrupt.docx", "failed"),
+    ]
+    assert results[0].slides == 1
+    assert results[1].stage == "Stage 1.1" and results[2].stage == "Parse"
+    assert (tmp_path / "out" / "a_good" / "module_stage2.json").exists()
+    assert (tmp_path / "out" / "b_audit" / "module_v3.json").exists()
+    assert "Traceback" in (tmp_path / "out" / "c_corrupt" / "pipeline.log").read_text()
+
+    print_summary(results)
+    assert "2/3 module(s) failed" in capsys.readouterr().out
@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+from src.stage2_8 import llm_quiz
+from src.utils import llm_gateway
+from src.utils.llm_gateway import LLMGateway, LLMRequest, anthropic_messages, openai_request_body
+
+
+def test_author_calls_share_a_byte_stable_prefix(monkeypatch):
+    seen = []
+    answer = {"question_id": "x", "type": "true_false", "prompt": "p",
+              "correct_answer": True, "rationale": "r"}
+    stub = SimpleNamespace(complete_json=lambda request, **kwargs: seen.append(request) or dict(answer))
+    monkeypatch.setattr(llm_gateway, "_gateway", stub)
+
+    for qid in ("q1", "q2"):
+        llm_quiz._author_single_question(
+            quiz_id=1,
+            question_id=qid,
+            source_paragraphs=["Wash hands.", "Dry them."],
+            source_claims=[{"claim_id": "c1", "claim_text": "Wash hands."}],
+            blueprint={"question_id": qid, "quiz_role": "inline_direct", "question_style": "direct",
+                       "cognitive_level": "recall", "claim_ids": ["c1"], "type": "true_false"},
+        )
+
+    first, second = seen
+    assert first.shared_prefix_messages == 1
+    assert first.messages[0] == second.messages[0]
+    assert "Wash hands." in first.messages[0]["content"]
+    assert "q1" not in first.messages[0]["content"]
+    assert first.messages[1] != second.messages[1]
+
+    _, body = openai_request_body(first)
+    assert body["prompt_cache_key"] == first.prompt_cache_key() == second.prompt_cache_key()
+
+
+def test_anthropic_breakpoint_and_cached_tokens_are_recorded(monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM_CACHE_DISABLE", "1")
+    monkeypatch.setattr(llm_gateway, "_get_logs_dir", lambda: tmp_path)
+    usage_records = []
+    monkeypatch.setattr(llm_gateway, "log_usage", lambda **kwargs: usage_records.append(kwargs))
+
+    request = LLMRequest(
+        messages=[
+            {"role": "system", "content": "rules"},
+            {"role": "user", "content": "shared source"},
+            {"role": "user", "content": "tail"},
+        ],
+        model="claude",
+        provider="anthropic",
+        shared_prefix_messages=2,
+    )
+
+    system, messages = anthropic_messages(request)
+    assert system == [{"type": "text", "text": "rules"}]
+    assert len(messages) == 1
+    assert messages[0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in messages[0]["content"][1]
+
+    def create(**kwargs):
+        return SimpleNamespace(
+            content=[SimpleNamespace(type="text", text='{"ok": true}')],
+            usage=SimpleNamespace(input_tokens=10, cache_read_input_tokens=900,
+                                  cache_creation_input_tokens=0, output_tokens=5),
+        )
+
+    gateway = LLMGateway()
+    gateway._clients["anthropic"] = SimpleNamespace(messages=SimpleNamespace(create=create))
+    metrics = []
+    gateway.add_metrics_listener(metrics.append)
+
+    assert gateway.complete_json(request) == {"ok": True}
+    assert metrics[0].prompt_tokens == 910
+    assert metrics[0].cached_tokens == 900
+    assert usage_records[0]["cached_tokens"] == 900
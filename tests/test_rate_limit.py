@@ -0,0 +1,157 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils import llm_gateway
+from src.utils.llm_gateway import LLMGateway, LLMRequest
+from src.utils.retry_policy import DeadlineExceeded, RetryPolicy, stage_deadline
+from src.utils.rate_limit import (
+    AIMDConcurrency,
+    TokenBucket,
+    parse_duration,
+    rate_limit_state,
+    retry_after_seconds,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, s):
+        self.slept.append(s)
+        self.now += s
+
+
+def test_header_parsing():
+    assert parse_duration("6m0s") == 360.0
+    assert parse_duration("20ms") == 0.02
+    assert parse_duration("1h2m3.5s") == 3723.5
+    assert retry_after_seconds({"Retry-After": "7"}) == 7.0
+    assert retry_after_seconds({"retry-after-ms": "1500"}) == 1.5
+
+    state = rate_limit_state({
+        "x-ratelimit-limit-tokens": "30000",
+        "x-ratelimit-remaining-tokens": "12",
+        "x-ratelimit-reset-tokens": "2s",
+        "anthropic-ratelimit-requests-remaining": "3",
+    })
+    assert state["tokens"] == {"limit": 30000.0, "remaining": 12.0, "reset": 2.0}
+    assert state["requests"] == {"remaining": 3.0}
+
+
+def test_token_bucket_waits_for_refill_and_honours_server_state():
+    clock = FakeClock()
+    bucket = TokenBucket(60, jitter_s=0.0, clock=clock, sleep=clock.sleep)  # 1 unit / s
+
+    bucket.acquire(60)
+    assert bucket.acquire(3) == 3.0          # had to wait for 3 units
+
+    bucket.sync(remaining=0, reset_s=10.0)   # provider says: nothing left for 10 s
+    bucket.acquire(1)
+    assert clock.now >= 13.0
+
+
+def test_aimd_grows_on_success_and_halves_on_throttle():
+    clock = FakeClock()
+    ctl = AIMDConcurrency(initial=4, maximum=16, cooldown_s=5.0, clock=clock)
+
+    for _ in range(5):                        # about one window of `limit` calls
+        ctl.on_success()
+    assert ctl.limit == 5
+
+    ctl.on_throttle()
+    ctl.on_throttle()                         # same overload, inside cooldown
+    assert ctl.limit == 2
+
+    clock.now += 10
+    ctl.on_throttle()
+    assert ctl.limit == 1
+
+
+class ThrottleError(Exception):
+    status_code = 429
+
+    def __init__(self):
+        super().__init__("rate limited")
+        self.response = SimpleNamespace(status_code=429, headers={"retry-after": "2"})
+
+
+def _throttling_gateway(monkeypatch, tmp_path, outputs):
+    monkeypatch.setenv("LLM_CACHE_DISABLE", "1")
+    monkeypatch.setattr(llm_gateway, "log_usage", lambda **kwargs: None)
+    monkeypatch.setattr(llm_gateway, "_get_logs_dir", lambda: tmp_path)
+    gateway_sleeps = []
+    monkeypatch.setattr(llm_gateway.time, "sleep", gateway_sleeps.append)
+
+    gateway = LLMGateway()
+
+    def create(**kwargs):
+        out = outputs.pop(0)
+        if isinstance(out, Exception):
+            raise out
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=out))],
+            usage=SimpleNamespace(prompt_tokens=1, completion_tokens=1),
+        )
+
+    gateway._clients["openai"] = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return gateway, gateway_sleeps
+
+
+def test_gateway_pauses_on_429_on_its_own_budget(monkeypatch, tmp_path):
+    outputs = [ThrottleError(), ThrottleError(), '{"ok": true}']
+    gateway, _ = _throttling_gateway(monkeypatch, tmp_path, outputs)
+
+    limiter = gateway.rate_limiter("openai", "m")
+    clock = FakeClock()
+    for bucket in (limiter.requests, limiter.tokens):
+        bucket._clock, bucket._sleep, bucket.jitter_s = clock, clock.sleep, 0.0
+        bucket._updated = 0.0
+
+    data = gateway.complete_json(
+        LLMRequest(messages=[{"role": "user", "content": "x"}], model="m", max_tokens=10),
+        policy=RetryPolicy(transport_attempts=1, parse_attempts=1),
+    )
+
+    assert data == {"ok": True}
+    assert sum(clock.slept) >= 4.0            # two retry-after pauses
+    assert limiter.concurrency.limit < 4
+
+
+def test_throttle_retries_wait_even_without_rate_buckets(monkeypatch, tmp_path):
+    outputs = [ThrottleError(), ThrottleError(), '{"ok": true}']
+    gateway, gateway_sleeps = _throttling_gateway(monkeypatch, tmp_path, outputs)
+
+    limiter = gateway.rate_limiter("openai", "m")
+    limiter.requests = limiter.tokens = None   # no limits configured, no headers seen yet
+
+    data = gateway.complete_json(
+        LLMRequest(messages=[{"role": "user", "content": "x"}], model="m", max_tokens=10),
+        policy=RetryPolicy(transport_attempts=1, parse_attempts=1),
+    )
+
+    assert data == {"ok": True}
+    assert gateway_sleeps == [2.0, 2.0]        # retry-after honoured, not back-to-back
+
+
+def test_rate_limit_waits_are_bounded_by_the_stage_deadline():
+    clock = FakeClock()
+    bucket = TokenBucket(60, jitter_s=0.0, clock=clock, sleep=clock.sleep)
+    bucket.block_for(600)
+
+    with stage_deadline(5):
+        with pytest.raises(DeadlineExceeded):
+            bucket.acquire(1)
+    assert clock.slept == []
+
+    ctl = AIMDConcurrency(initial=1, maximum=1)
+    with ctl.slot():
+        with stage_deadline(0.05):
+            with pytest.raises(DeadlineExceeded):
+                with ctl.slot():
+                    pass
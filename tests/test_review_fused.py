@@ -0,0 +1,102 @@
+import json
+import threading
+import time
+
+import pytest
+
+from src.stage2_review_suggestions import run_stage2_review
+from src.utils.checkpoint import journal_path
+
+from conftest import panel
+
+
+class FakeReview:
+    """Stands in for the fused review+analysis call; tracks concurrency."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self._lock = threading.Lock()
+        self.contents = []
+        self.in_flight = 0
+        self.peak = 0
+
+    def __call__(self, *, unit_type, slide_id, content):
+        with self._lock:
+            self.contents.append(content)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(0.03)
+            if content == self.fail_on:
+                raise RuntimeError("provider down")
+            return {
+                "suggested": content.upper(),
+                "notes": "ok",
+                "analysis": {"flags": ["long"] if "flag" in content else [], "notes": None},
+            }
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _write_module(tmp_path, slides):
+    path = tmp_path / "module_stage2.json"
+    path.write_text(json.dumps({"slides": slides}), encoding="utf-8")
+    return path
+
+
+def test_one_call_per_unit_in_slide_order(tmp_path, monkeypatch):
+    fake = FakeReview()
+    monkeypatch.setattr(run_stage2_review, "review_and_analyze_text_unit", fake)
+
+    slides = [panel(f"s{i}", f"Text {i}.", f"Please flag {i}.") for i in range(5)]
+    out = tmp_path / "review.json"
+    run_stage2_review.run_review(_write_module(tmp_path, slides), out, max_workers=4)
+
+    review = json.loads(out.read_text(encoding="utf-8"))
+    assert [s["slide_id"] for s in review["slides"]] == [f"s{i}" for i in range(5)]
+    assert len(fake.contents) == 10
+    assert fake.peak > 1
+
+    first, second = review["slides"][0]["blocks"]
+    assert first["suggested"] == "TEXT 0." and first["analysis"] is None
+    assert second["analysis"] == {"flags": ["long"], "notes": None}
+    assert not journal_path(out).exists()
+
+
+def test_units_of_one_slide_run_concurrently_in_order(tmp_path, monkeypatch):
+    fake = FakeReview()
+    monkeypatch.setattr(run_stage2_review, "review_and_analyze_text_unit", fake)
+
+    texts = [f"Step {i}." for i in range(6)]
+    out = tmp_path / "review.json"
+    run_stage2_review.run_review(_write_module(tmp_path, [panel("s0", *texts)]), out, max_workers=1)
+
+    assert fake.peak > 1
+    blocks = json.loads(out.read_text(encoding="utf-8"))["slides"][0]["blocks"]
+    assert [b["original"] for b in blocks] == texts
+    assert [b["block_id"] for b in blocks] == [f"s0_panel_paragraph_{i}" for i in range(6)]
+
+
+def test_crash_journals_completed_slides_and_resume_reviews_the_rest(tmp_path, monkeypatch):
+    slides = [panel(f"s{i}", f"Text {i}.") for i in range(4)]
+    in_path = _write_module(tmp_path, slides)
+    out = tmp_path / "review.json"
+
+    crashing = FakeReview(fail_on="Text 2.")
+    monkeypatch.setattr(run_stage2_review, "review_and_analyze_text_unit", crashing)
+    with pytest.raises(RuntimeError, match="provider down"):
+        run_stage2_review.run_review(in_path, out, max_workers=1)
+
+    assert not out.exists()
+    lines = journal_path(out).read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["unit"] for line in lines] == ["s0", "s1"]
+
+    fake = FakeReview()
+    monkeypatch.setattr(run_stage2_review, "review_and_analyze_text_unit", fake)
+    run_stage2_review.run_review(in_path, out, max_workers=1, resume=True)
+
+    assert fake.contents == ["Text 2.", "Text 3."]
+    review = json.loads(out.read_text(encoding="utf-8"))
+    assert [s["blocks"][0]["suggested"] for s in review["slides"]] == [f"TEXT {i}." for i in range(4)]
+    assert not journal_path(out).exists()
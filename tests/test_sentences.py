@@ -0,0 +1,26 @@
+from src.utils.sentences import sentence_spans, split_sentences
+
+
+def test_segmenter_keeps_abbreviations_and_reports_offsets():
+    text = "Give approx. 5 ml, e.g. Calpol. Dr. Osei reviews at 2 p.m. Repeat in 6 hr. Then stop."
+
+    sentences = split_sentences(text)
+
+    assert sentences == [
+        "Give approx. 5 ml, e.g. Calpol.",
+        "Dr. Osei reviews at 2 p.m.",
+        "Repeat in 6 hr.",
+        "Then stop.",
+    ]
+    assert [text[a:b] for a, b in sentence_spans(text)] == sentences
+
+
+def test_bang_and_question_marks_always_end_and_lists_stay_whole():
+    text = "1. Check the airway. Is the child breathing? yes! 2. Count the breaths."
+
+    assert split_sentences(text) == [
+        "1. Check the airway.",
+        "Is the child breathing?",
+        "yes!",
+        "2. Count the breaths.",
+    ]
@@ -0,0 +1,87 @@
+import copy
+import importlib
+
+import pytest
+
+from src.stage2_5.llm_client import LLMClient
+from src.stage2_6.runner import run_stage2_6
+from src.stage2_review_suggestions import run_stage2_review
+
+from conftest import panel
+
+
+def _module():
+    return {"slides": [
+        panel("s1", "Wash hands. Dry them well."),
+        panel("s2", "Check for fever.", "Refer danger signs."),
+        panel("s3", "Weigh the child."),
+    ]}
+
+
+class CountingLLM(LLMClient):
+    def __init__(self):
+        super().__init__(lambda prompt: {"sentence_shaping": {"groups": []}})
+        self.calls = 0
+
+    def call(self, prompt, **kwargs):
+        self.calls += 1
+        return super().call(prompt, **kwargs)
+
+
+def test_stage2_6_rerun_only_calls_llm_for_edited_slides(memo):
+    llm = CountingLLM()
+    first = run_stage2_6(_module(), llm)
+    assert llm.calls == 4
+
+    llm.calls = 0
+    again = run_stage2_6(_module(), llm)
+    assert llm.calls == 0
+    assert again == first
+
+    edited = _module()
+    edited["slides"][1]["content"]["blocks"][1]["text"] = "Refer all danger signs."
+    run_stage2_6(edited, llm)
+    assert llm.calls == 2  # both paragraphs of the edited slide, nothing else
+    assert memo.counts["stage2_6"] == {"reused": 5, "computed": 4}
+
+
+def test_review_reuses_blocks_under_new_slide_ids(memo, monkeypatch):
+    reviewed = []
+
+    def fake_review_unit(unit):
+        reviewed.append(unit.original)
+        return {
+            "block_id": unit.block_id,
+            "type": unit.block_type,
+            "original": unit.original,
+            "suggested": unit.original.upper(),
+            "notes": "",
+            "analysis": None,
+        }
+
+    monkeypatch.setattr(run_stage2_review, "review_unit", fake_review_unit)
+
+    slide = panel("s1", "Check for fever.")
+    first = run_stage2_review.review_slide(run_stage2_review.review_units(slide))
+
+    moved = copy.deepcopy(slide)
+    moved["uuid"] = "s9"  # a slide was inserted before it
+    again = run_stage2_review.review_slide(run_stage2_review.review_units(moved))
+
+    assert reviewed == ["Check for fever."]
+    assert first[0]["block_id"] == "s1_panel_paragraph_0"
+    assert again[0]["block_id"] == "s9_panel_paragraph_0"
+    assert again[0]["suggested"] == "CHECK FOR FEVER."
+
+
+@pytest.mark.parametrize("runner, shared", [
+    ("src.stage2_5.runner", {"sentences"}),
+    ("src.stage2_6.runner", {"sentences", "text_preservation"}),
+    ("src.stage2_7.runner", {"sentences", "text_preservation"}),
+])
+def test_memo_version_covers_shared_segmentation_and_checks(runner, shared, monkeypatch):
+    module = importlib.import_module(runner)
+    hashed = []
+    monkeypatch.setattr(module, "source_version", lambda *mods: hashed.extend(mods) or "v")
+    module._memo_version.__wrapped__()
+    assert shared <= {m.__name__.rsplit(".", 1)[-1] for m in hashed}
@@ -0,0 +1,65 @@
+import threading
+import time
+
+from src.stage2_5.llm_client import LLMClient
+from src.stage2_5.runner import run_stage2_5
+from src.stage2_6.runner import run_stage2_6
+
+from conftest import panel
+
+
+class SlowLLM(LLMClient):
+    """Sleeps per call and records the peak number of calls in flight."""
+
+    def __init__(self, respond):
+        super().__init__(respond)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+
+    def call(self, prompt, **kwargs):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(0.05)
+            return super().call(prompt, **kwargs)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_stage2_5_slides_run_concurrently_in_slide_order():
+    # One 90-word sentence: no deterministic split, so each goes to the LLM.
+    long_text = "Check " + "the child " * 44 + "today."
+    slides = [panel(f"s{i}", long_text + f" Case {i}.") for i in range(6)]
+    slides.insert(2, panel("locked", long_text, notes="[[LOCKED]]"))
+    slides.insert(4, {"uuid": "e1", "type": "engage", "notes": ""})
+
+    llm = SlowLLM(lambda prompt: {"slides": []})
+    out = run_stage2_5({"module_title": "M", "slides": slides}, llm, max_workers=4)
+
+    assert list(out["slides"]) == [s["uuid"] for s in slides]
+    assert out["slides"]["locked"]["final"]["reason"] == "[[LOCKED]]"
+    assert out["slides"]["e1"]["final"]["action"] == "keep"
+    assert llm.calls == 6
+    assert llm.peak > 1
+
+
+def test_stage2_6_workers_keep_slide_order_and_skip_rules():
+    slides = [panel(f"s{i}", f"Slide {i} says wash your hands well.") for i in range(5)]
+    slides[1]["notes"] = "[[LOCKED]]"
+
+    llm = SlowLLM(lambda prompt: {"sentence_shaping": {"groups": []}})
+    out = run_stage2_6({"slides": slides}, llm, max_workers=4)
+
+    assert [s["uuid"] for s in out["slides"]] == [f"s{i}" for i in range(5)]
+    assert out["slides"][1]["content"]["blocks"][0]["type"] == "paragraph"
+    for i in (0, 2, 3, 4):
+        block = out["slides"][i]["content"]["blocks"][0]
+        assert block["block_id"] == f"s{i}__sb01"
+        assert block["sentences"] == [f"Slide {i} says wash your hands well."]
+    assert llm.calls == 4
+    assert llm.peak > 1
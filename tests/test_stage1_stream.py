@@ -0,0 +1,87 @@
+import json
+
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+from src.stage1.bench_extract import build_synthetic_docx
+from src.stage1.docx_stream import DocxTableReader, normalize
+from src.stage1.stage1_extract_v3 import extract_tables_v3
+from src.stage1.stage1_extract_v3_docx import extract_tables_v3_docx, is_list_paragraph
+
+
+def _docx_rows(path):
+    """python-docx view of every table row: [(text, is_list) per paragraph] per cell."""
+    return [
+        [[(normalize(p.text), is_list_paragraph(p)) for p in cell.paragraphs] for cell in row.cells]
+        for table in Document(str(path)).tables
+        for row in table.rows
+    ]
+
+
+def _stream_rows(path):
+    return [
+        [[(p.text, p.is_list) for p in cell.paragraphs] for cell in row.cells]
+        for row in DocxTableReader(path).rows()
+    ]
+
+
+def test_stream_output_is_byte_identical_to_python_docx(tmp_path):
+    path = build_synthetic_docx(tmp_path / "module.docx", slides=24, seed=3)
+
+    new = extract_tables_v3(path)
+    ref = extract_tables_v3_docx(path)
+
+    assert {s["slide_type"] for s in new["slides"]} == {"panel", "engage1", "engage2"}
+    assert json.dumps(new, indent=2, ensure_ascii=False) == json.dumps(ref, indent=2, ensure_ascii=False)
+
+
+def test_rows_match_python_docx_cells_for_merges_and_breaks(tmp_path):
+    doc = Document()
+    table = doc.add_table(rows=3, cols=3)
+    table.cell(0, 0).merge(table.cell(0, 1))          # gridSpan
+    table.cell(1, 2).merge(table.cell(2, 2))          # vMerge restart / continue
+    table.cell(1, 0).text = "a"
+    run = table.cell(1, 1).paragraphs[0].add_run("page")
+    run._r.append(parse_xml(f'<w:br {nsdecls("w")} w:type="page"/>'))
+    run.add_text("break and–dash")
+
+    ragged = doc.add_table(rows=3, cols=3)
+    tr = ragged.rows[1]._tr
+    tr.remove(tr.tc_lst[0])
+    tr.get_or_add_trPr().append(parse_xml(f'<w:gridBefore {nsdecls("w")} w:val="1"/>'))
+    ragged.cell(2, 0).add_table(rows=1, cols=1).cell(0, 0).text = "nested"
+
+    path = tmp_path / "edges.docx"
+    doc.save(str(path))
+
+    reader = DocxTableReader(path)
+    assert _stream_rows(path) == _docx_rows(path)
+    assert sum(1 for _ in reader.rows()) == 6 and reader.table_count == 2
+
+
+def test_parsed_docx_is_shared_by_extractor_and_audits(tmp_path, monkeypatch):
+    from src.stage1.parsed_docx import ParsedDocx
+    from src.stage1_1.word_xml_extractors import extract_word_slide_text_fragments
+    from src.stage2_1.text_extractors import extract_word_text_fragments
+
+    path = build_synthetic_docx(tmp_path / "module.docx", slides=12, seed=5)
+    document = ParsedDocx.load_or_parse(path, cache_dir=tmp_path)
+    (cached,) = tmp_path.glob("parsed_docx_*.json")
+    assert cached.name == f"parsed_docx_{document.sha256}.json"
+    slide_fragments = extract_word_slide_text_fragments(path)
+
+    def no_reparse(*args, **kwargs):
+        raise AssertionError("docx parsed twice")
+
+    monkeypatch.setattr(ParsedDocx, "parse", no_reparse)
+
+    reloaded = ParsedDocx.load_or_parse(path, cache_dir=tmp_path)
+    assert reloaded.to_dict() == document.to_dict()
+    assert all(p.fingerprint for row in reloaded.rows() for c in row.cells for p in c.paragraphs)
+
+    module = extract_tables_v3(path, document=reloaded)
+    assert module == extract_tables_v3(path)
+    assert extract_word_slide_text_fragments(path, document=reloaded) == slide_fragments
+    fragments = extract_word_text_fragments(path, document=reloaded)
+    assert "Learn more" in fragments and "English Text" not in fragments
@@ -0,0 +1,83 @@
+import re
+
+from src.stage2_5.llm_client import LLMClient
+from src.stage2_6.runner import run_stage2_6
+
+from conftest import panel
+
+BLOCK_RE = re.compile(r"\[BLOCK (\S+)\]\n(.*?)(?=\n\n\[BLOCK |\Z)", re.S)
+
+
+def _module():
+    return {"slides": [
+        panel("s1", "Wash your hands with soap. Dry them on a clean towel."),
+        panel("s2", "Check every child for fever today.", "Refer any child with danger signs."),
+        {"uuid": "s3", "type": "panel", "notes": "[[LOCKED]]",
+         "content": {"blocks": [{"type": "paragraph", "text": "Locked text stays as is."}]}},
+        panel("s4", "Weigh the child on the scale."),
+    ]}
+
+
+class PackedLLM(LLMClient):
+    """Echoes each panel as one group; can corrupt chosen packed blocks once."""
+
+    def __init__(self, corrupt=()):
+        super().__init__(self._respond)
+        self.prompts = []
+        self.corrupt = set(corrupt)
+
+    def _respond(self, prompt):
+        self.prompts.append(prompt)
+        if "THIS TASK IS SENTENCE SHAPING ONLY" in prompt:
+            text = prompt.split("SOURCE PANEL TEXT (DO NOT MODIFY):\n", 1)[1]
+            return {"sentence_shaping": {"groups": [{"sentences": [text]}]}}
+
+        panels = []
+        for block_id, text in BLOCK_RE.findall(prompt):
+            if block_id in self.corrupt:
+                self.corrupt.discard(block_id)
+                text = text.replace("child", "infant")
+            panels.append({"block_id": block_id, "sentence_shaping": {"groups": [{"sentences": [text]}]}})
+        return {"panels": panels}
+
+
+def test_packed_mode_shapes_many_slides_per_request():
+    llm = PackedLLM()
+    out = run_stage2_6(_module(), llm, pack_token_budget=1000)
+
+    assert len(llm.prompts) == 1
+    assert "Locked text" not in llm.prompts[0]
+    s2 = out["slides"][1]["content"]["blocks"]
+    assert [b["block_id"] for b in s2] == ["s2__sb01", "s2__sb02"]
+    assert s2[1]["sentences"] == ["Refer any child with danger signs."]
+    assert out["slides"][2]["content"]["blocks"][0]["type"] == "paragraph"
+
+
+def test_only_blocks_that_fail_validation_are_resent():
+    llm = PackedLLM(corrupt={"s2__p02"})
+    out = run_stage2_6(_module(), llm, pack_token_budget=1000)
+
+    assert len(llm.prompts) == 2
+    assert BLOCK_RE.findall(llm.prompts[1]) == [("s2__p02", "Refer any child with danger signs.")]
+    assert out["slides"][1]["content"]["blocks"][1]["sentences"] == ["Refer any child with danger signs."]
+
+
+def test_budget_splits_packs():
+    llm = PackedLLM()
+    run_stage2_6(_module(), llm, pack_token_budget=20)
+
+    assert [len(BLOCK_RE.findall(p)) for p in llm.prompts] == [1, 2, 1]
+
+
+def test_pack_that_fails_entirely_goes_straight_to_single_prompts():
+    llm = PackedLLM(corrupt={"s2__p01", "s2__p02"})
+    out = run_stage2_6(_module(), llm, pack_token_budget=20)
+
+    # Re-sending the whole pack would repeat the first prompt byte for byte.
+    packed = [p for p in llm.prompts if BLOCK_RE.findall(p)]
+    assert len(packed) == 3
+    assert len(llm.prompts) == 5
+    s2 = out["slides"][1]["content"]["blocks"]
+    assert [b["sentences"] for b in s2] == [
+        ["Check every child for fever today."], ["Refer any child with danger signs."],
+    ]
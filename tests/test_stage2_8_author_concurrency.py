@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from src.stage2_8 import llm_quiz
+from src.utils.concurrency import run_bounded
+
+
+def _blueprint(role):
+    return {
+        "quiz_role": role,
+        "question_style": "direct",
+        "cognitive_level": "recall",
+        "claim_ids": ["c1"],
+    }
+
+
+def test_run_bounded_preserves_input_order():
+    def slow_echo(n):
+        time.sleep(0.01 * (5 - n))
+        return n
+
+    assert run_bounded(slow_echo, range(5), max_workers=5) == [0, 1, 2, 3, 4]
+
+
+def test_author_pass_runs_concurrently_and_keeps_q_order(monkeypatch):
+    blueprints = [_blueprint("inline_direct"), _blueprint("inline_direct"), _blueprint("final_direct")]
+
+    monkeypatch.setattr(
+        llm_quiz,
+        "generate_source_claims",
+        lambda **kwargs: {"source_claims": [{"claim_id": "c1"}]},
+    )
+    monkeypatch.setattr(
+        llm_quiz,
+        "generate_question_blueprints",
+        lambda **kwargs: {"blueprints": blueprints},
+    )
+    monkeypatch.setattr(llm_quiz, "validate_quiz_post_assembly", lambda **kwargs: None)
+
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+    barrier = threading.Barrier(3, timeout=5)
+
+    def fake_call_llm_json(*, prompt, stage_tag, **kwargs):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        # All three authors must be in flight at once to pass the barrier
+        barrier.wait()
+        with lock:
+            in_flight -= 1
+        return {
+            "type": "true_false",
+            "prompt": "Statement?",
+            "correct_answer": True,
+            "rationale": "Because.",
+        }
+
+    monkeypatch.setattr(llm_quiz, "call_llm_json", fake_call_llm_json)
+
+    quiz = llm_quiz.generate_quiz_questions(
+        quiz_id=7,
+        source_paragraphs=["Source paragraph."],
+        inline_direct_questions=2,
+        final_direct_questions=1,
+        module_application_questions=0,
+        max_workers=3,
+    )
+
+    assert peak == 3
+    assert [q["question_id"] for q in quiz["questions"]] == ["q1", "q2", "q3"]
+    assert [q["quiz_role"] for q in quiz["questions"]] == [
+        "inline_direct",
+        "inline_direct",
+        "final_direct",
+    ]
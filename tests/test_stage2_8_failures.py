@@ -0,0 +1,159 @@
+import json
+import os
+import threading
+from types import SimpleNamespace
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from src.stage2_8 import llm_call, runner, stage2_8_main
+from src.stage2_8 import run_stage2_8 as stage
+from src.stage2_8.runner import QuizReviewFailed
+from src.utils import llm_cache, llm_gateway
+from src.utils.llm_cache import LLMResponseCache
+from src.utils.llm_gateway import LLMGateway
+
+
+def panel(text, slide_id, notes=None):
+    return {
+        "id": slide_id,
+        "type": "panel",
+        "notes": notes,
+        "content": {"blocks": [{"type": "paragraph", "text": text}]},
+    }
+
+
+def _module():
+    return {
+        "slides": [
+            panel("Fever needs review.", "s1", notes="[[QUIZ:1]]"),
+            panel("Refer danger signs.", "s2", notes="[[QUIZ:1:QUESTIONS=1,1,0]]"),
+            panel("Weigh every child.", "s3", notes="[[QUIZ:2]]"),
+            panel("Plot the weight.", "s4", notes="[[QUIZ:2:QUESTIONS=1,1,0]]"),
+        ]
+    }
+
+
+class FakePipeline:
+    """Quiz ids in `failing` fail review after the editor."""
+
+    def __init__(self, monkeypatch, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+        monkeypatch.setattr(stage, "run_quiz_pipeline", self)
+
+    def __call__(self, *, quiz_id, inline_direct_questions, final_direct_questions,
+                 module_application_questions, source_paragraphs):
+        self.calls.append(quiz_id)
+        roles = ["inline_direct"] * inline_direct_questions + ["final_direct"] * final_direct_questions
+        payload = {
+            "quiz_id": quiz_id,
+            "questions": [
+                {"question_id": f"q{i}", "quiz_role": role}
+                for i, role in enumerate(roles, 1)
+            ],
+        }
+        if quiz_id in self.failing:
+            raise QuizReviewFailed(quiz_id, payload=payload, issues=[{"question_id": "q1"}])
+        return payload
+
+
+def test_one_failing_quiz_does_not_lose_the_others(monkeypatch):
+    FakePipeline(monkeypatch, failing={1})
+
+    result = stage.run_stage2_8(module_json=_module(), max_concurrent_quizzes=2)
+
+    assert list(result["inline_quizzes"]) == [2]
+    assert list(result["final_quizzes"]) == [2]
+    failure = result["failed_quizzes"][1]
+    assert failure["error"] == "QuizReviewFailed: Quiz 1 failed quality review after editor"
+    assert len(failure["last_payload"]["questions"]) == 2
+    assert failure["reviewer_issues"] == [{"question_id": "q1"}]
+
+
+class ScriptedProvider:
+    """
+    Fake Responses API. The quiz reviewer fails the quiz ids in `failing`,
+    the distractor reviewer passes, the editor returns the question as is.
+    """
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.reviewed = []
+        self._lock = threading.Lock()
+
+    def create(self, **kwargs):
+        schema = kwargs["text"]["format"]["name"]
+        last = json.loads(kwargs["input"][-1]["content"][0]["text"])
+
+        if schema == "quiz_review":
+            quiz_id = last["quiz"]["quiz_id"]
+            with self._lock:
+                self.reviewed.append(quiz_id)
+            issues = [{"question_id": "q1", "problem": "Ambiguous.", "suggested_fixes": {}}]
+            out = {"status": "FAIL", "issues": issues} if quiz_id in self.failing else {"status": "PASS", "issues": []}
+        elif schema == "distractor_review":
+            out = {"status": "PASS", "issues": []}
+        else:
+            out = last["question"]
+
+        return SimpleNamespace(
+            output_text=json.dumps(out),
+            usage=SimpleNamespace(input_tokens=1, output_tokens=1),
+        )
+
+
+def _author(*, quiz_id, inline_direct_questions, final_direct_questions,
+            module_application_questions, source_paragraphs, plan=None):
+    mcq = {
+        "question_id": "q1", "type": "mcq", "prompt": f"Quiz {quiz_id}: first step?",
+        "options": {"A": "Refer", "B": "Wait", "C": "Ignore", "D": "Guess"},
+        "correct_answer": "A", "rationale": "Danger signs need referral.",
+        "quiz_role": "inline_direct", "question_style": "direct",
+        "cognitive_level": "recall", "claim_ids": ["c1"],
+    }
+    true_false = {
+        "question_id": "q2", "type": "true_false", "prompt": f"Quiz {quiz_id}: refer danger signs?",
+        "correct_answer": True, "rationale": "Stated in the source.",
+        "quiz_role": "final_direct", "question_style": "direct",
+        "cognitive_level": "recall", "claim_ids": ["c2"],
+    }
+    return {"quiz_id": quiz_id, "questions": [mcq, true_false]}
+
+
+def test_quizzes_option_regenerates_past_the_llm_cache_and_merges(tmp_path, monkeypatch):
+    for name in ("STAGE2_5_APPLIED_PATH", "STAGE2_6_PATH", "OUTPUT_PATH", "FAILURES_PATH"):
+        monkeypatch.setattr(stage2_8_main, name, tmp_path / getattr(stage2_8_main, name).name)
+    stage2_8_main.STAGE2_5_APPLIED_PATH.write_text(json.dumps(_module()), encoding="utf-8")
+    stage2_8_main.STAGE2_6_PATH.write_text(json.dumps({"slides": []}), encoding="utf-8")
+
+    # Real runner, reviewers and editor through a real gateway and cache; only the author is scripted.
+    monkeypatch.delenv("LLM_CACHE_DISABLE", raising=False)
+    monkeypatch.setattr(llm_cache, "_cache", LLMResponseCache(tmp_path / "c.sqlite"))
+    monkeypatch.setattr(llm_gateway, "log_usage", lambda **kwargs: None)
+    monkeypatch.setattr(llm_gateway, "_get_logs_dir", lambda: tmp_path)
+    monkeypatch.setattr(runner, "generate_quiz_questions", _author)
+    provider = ScriptedProvider(failing={1})
+    gateway = LLMGateway()
+    gateway._clients["openai"] = SimpleNamespace(responses=SimpleNamespace(create=provider.create))
+    monkeypatch.setattr(llm_call, "get_gateway", lambda: gateway)
+
+    assert stage2_8_main.main([]) == 1
+    report = json.loads(stage2_8_main.FAILURES_PATH.read_text(encoding="utf-8"))
+    assert [f["quiz_id"] for f in report["failed_quizzes"]] == [1]
+
+    # Same prompts at temperature 0: only a cache bypass reaches the (now passing) reviewer.
+    provider.failing.clear()
+    provider.reviewed.clear()
+    assert stage2_8_main.main(["--quizzes", "1"]) == 0
+    assert provider.reviewed and set(provider.reviewed) == {1}
+
+    merged = json.loads(stage2_8_main.OUTPUT_PATH.read_text(encoding="utf-8"))
+    quiz_slides = {s["id"]: s for s in merged["slides"] if s.get("slide_type") == "quiz"}
+    assert sorted(quiz_slides) == ["quiz_1_final", "quiz_1_inline", "quiz_2_final", "quiz_2_inline"]
+    assert quiz_slides["quiz_1_inline"]["questions"][0]["prompt"] == "Quiz 1: first step?"
+    assert not stage2_8_main.FAILURES_PATH.exists()
+
+    # A plain rerun hits the cache again: quiz 1's original (failing) review is replayed.
+    provider.reviewed.clear()
+    assert stage2_8_main.main([]) == 1
+    assert provider.reviewed == []
@@ -0,0 +1,108 @@
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from src.stage2_8 import run_stage2_8 as stage
+from src.stage2_8.llm_quiz import QuizPlan
+from src.stage2_8.quiz_detect import QuizState
+
+SOURCE = ["Fever in infants needs urgent review.", "Danger signs require referral."]
+CLAIMS = {"source_claims": [{"claim_id": "c1"}, {"claim_id": "c2"}, {"claim_id": "c3"}]}
+
+
+def _question(i, role, tag):
+    return {
+        "question_id": f"q{i}",
+        "type": "mcq",
+        "prompt": f"{tag} question {i}?",
+        "options": {"A": "a", "B": "b", "C": "c", "D": "d"},
+        "correct_answer": "A",
+        "rationale": "Because.",
+        "quiz_role": role,
+        "question_style": "direct",
+        "cognitive_level": "recall",
+        "claim_ids": [f"c{i}"],
+    }
+
+
+class FakeLLM:
+    """Stands in for Passes 1–2 and the author/review pipeline."""
+
+    def __init__(self, monkeypatch):
+        self.plans = []
+        self.pipelines = []
+        self.round = 0
+        monkeypatch.setattr(stage, "generate_quiz_plan", self.plan)
+        monkeypatch.setattr(stage, "run_quiz_pipeline", self.pipeline)
+
+    @staticmethod
+    def _roles(inline, final, application):
+        return ["inline_direct"] * inline + ["final_direct"] * final + ["module_application"] * application
+
+    def plan(self, *, quiz_id, inline_direct_questions, final_direct_questions,
+             module_application_questions, claims_payload=None, used_claim_ids=None, **kwargs):
+        self.plans.append((inline_direct_questions, final_direct_questions, module_application_questions,
+                           claims_payload is not None, used_claim_ids))
+        roles = self._roles(inline_direct_questions, final_direct_questions, module_application_questions)
+        blueprints = [
+            {"question_id": f"q{i}", "quiz_role": r, "claim_ids": [f"c{i}"]}
+            for i, r in enumerate(roles, 1)
+        ]
+        return QuizPlan(claims_payload=claims_payload or CLAIMS, blueprints=blueprints)
+
+    def pipeline(self, *, quiz_id, inline_direct_questions, final_direct_questions,
+                 module_application_questions, source_paragraphs, plan=None):
+        self.round += 1
+        self.pipelines.append(len(plan.blueprints))
+        roles = self._roles(inline_direct_questions, final_direct_questions, module_application_questions)
+        return {
+            "quiz_id": quiz_id,
+            "questions": [_question(i, r, f"round{self.round}") for i, r in enumerate(roles, 1)],
+        }
+
+
+def _job(inline, final, application, quiz_id=1):
+    state = QuizState(quiz_id=quiz_id, start_index=0, immediate_count=inline,
+                      deferred_count=final, application_count=application)
+    return stage.QuizJob(quiz_id=quiz_id, state=state, source_paragraphs=list(SOURCE))
+
+
+def test_unchanged_quiz_is_reused_even_under_a_new_quiz_id(memo, monkeypatch):
+    llm = FakeLLM(monkeypatch)
+    first = stage.run_quiz_job(_job(1, 1, 0))
+    again = stage.run_quiz_job(_job(1, 1, 0, quiz_id=4))
+
+    assert llm.pipelines == [2]
+    assert again["quiz_id"] == 4
+    assert again["questions"] == first["questions"]
+    assert memo.counts["stage2_8_quiz"] == {"reused": 1, "computed": 1}
+
+
+def test_count_change_authors_only_the_additional_questions(memo, monkeypatch):
+    llm = FakeLLM(monkeypatch)
+    first = stage.run_quiz_job(_job(1, 1, 0))
+
+    grown = stage.run_quiz_job(_job(2, 1, 1))
+    # Pass 2 + pipeline ran for the 2 extra questions, on the stored claims.
+    assert llm.plans[-1] == (1, 0, 1, True, {"c1", "c2"})
+    assert llm.pipelines == [2, 2]
+    assert [q["question_id"] for q in grown["questions"]] == ["q1", "q2", "q3", "q4"]
+    assert grown["questions"][:2] == first["questions"]
+    assert [q["quiz_role"] for q in grown["questions"][2:]] == ["inline_direct", "module_application"]
+
+    # Fewer questions: surplus dropped, no LLM work at all.
+    shrunk = stage.run_quiz_job(_job(1, 1, 0))
+    assert llm.pipelines == [2, 2]
+    assert shrunk["questions"] == first["questions"]
+
+
+def test_source_change_regenerates_the_quiz(memo, monkeypatch):
+    llm = FakeLLM(monkeypatch)
+    stage.run_quiz_job(_job(1, 1, 0))
+
+    job = _job(1, 1, 0)
+    job.source_paragraphs[0] = "Fever in infants always needs urgent review."
+    stage.run_quiz_job(job)
+
+    assert llm.pipelines == [2, 2]
+    assert [p[3] for p in llm.plans] == [False, False]
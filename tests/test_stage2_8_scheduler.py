@@ -0,0 +1,69 @@
+import os
+import threading
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from src.stage2_8 import run_stage2_8 as stage
+
+
+def panel(text, slide_id, notes=None):
+    return {
+        "id": slide_id,
+        "type": "panel",
+        "notes": notes,
+        "content": {"blocks": [{"type": "paragraph", "text": text}]},
+    }
+
+
+def _module():
+    return {
+        "slides": [
+            panel("Short.", "s1", notes="[[QUIZ:1]]"),
+            panel("Tiny.", "s2", notes="[[QUIZ:1:QUESTIONS=1,0,0]]"),
+            panel("A much longer source paragraph " * 20, "s3", notes="[[QUIZ:2]]"),
+            panel("More long text " * 20, "s4", notes="[[QUIZ:2:QUESTIONS=2,1,1]]"),
+        ]
+    }
+
+
+def _payload(quiz_id, inline, final, application):
+    roles = (
+        ["inline_direct"] * inline
+        + ["final_direct"] * final
+        + ["module_application"] * application
+    )
+    return {
+        "quiz_id": quiz_id,
+        "questions": [
+            {"question_id": f"q{i + 1}", "quiz_role": role}
+            for i, role in enumerate(roles)
+        ],
+    }
+
+
+def test_scheduler_starts_largest_quiz_first_and_output_is_deterministic(monkeypatch):
+    started = []
+    lock = threading.Lock()
+
+    def fake_pipeline(*, quiz_id, inline_direct_questions, final_direct_questions,
+                      module_application_questions, source_paragraphs):
+        with lock:
+            started.append(quiz_id)
+        return _payload(
+            quiz_id,
+            inline_direct_questions,
+            final_direct_questions,
+            module_application_questions,
+        )
+
+    monkeypatch.setattr(stage, "run_quiz_pipeline", fake_pipeline)
+
+    sequential = stage.run_stage2_8(module_json=_module(), max_concurrent_quizzes=1)
+    assert started == [2, 1]
+
+    concurrent = stage.run_stage2_8(module_json=_module(), max_concurrent_quizzes=4)
+
+    assert concurrent == sequential
+    assert list(concurrent["inline_quizzes"]) == [1, 2]
+    assert list(concurrent["final_quizzes"]) == [2]
+    assert list(concurrent["module_application_quizzes"]) == [2]
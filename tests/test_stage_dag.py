@@ -0,0 +1,130 @@
+import inspect
+from pathlib import Path
+
+import pytest
+
+from src.pipeline import stage_graph
+from src.pipeline.run_dag import run_graph
+from src.pipeline.stage_graph import StageNode, current_fingerprint, manifest_path, topo_order
+
+STAGES = (
+    StageNode(name="extract", module="fake.extract", inputs=("raw/*.txt",),
+              outputs=("out/a.json",), code=("code/extract",)),
+    StageNode(name="llm", module="fake.llm", inputs=("out/a.json",),
+              outputs=("out/b.json",), code=("code/llm",), uses_llm=True),
+    StageNode(name="export", module="fake.export", inputs=("out/b.json",),
+              outputs=("out/c.docx",), code=("code/export",)),
+)
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "raw").mkdir()
+    (tmp_path / "raw" / "module.txt").write_text("slide one")
+    for name in ("extract", "llm", "export"):
+        (tmp_path / "code" / name).mkdir(parents=True)
+        (tmp_path / "code" / name / "main.py").write_text("v1")
+    (tmp_path / "code" / "llm" / "prompts.py").write_text("p1")
+    return tmp_path
+
+
+class FakeRunner:
+    """Each stage upper-cases (extract) or copies its input."""
+
+    def __init__(self, fail=()):
+        self.ran = []
+        self.fail = set(fail)
+
+    def __call__(self, root, node):
+        self.ran.append(node.name)
+        if node.name in self.fail:
+            raise RuntimeError("boom")
+        sources = sorted(root.glob(node.inputs[0]))
+        text = "".join(p.read_text() for p in sources)
+        if node.name == "extract":
+            text = text.upper()
+        out = root / node.outputs[0]
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(text)
+
+
+def _run(root, runner, **kwargs):
+    return {r.name: r.status for r in run_graph(root, stages=STAGES, runner=runner, **kwargs)}
+
+
+def test_only_changed_stages_rerun(project):
+    runner = FakeRunner()
+    assert _run(project, runner) == {"extract": "ran", "llm": "ran", "export": "ran"}
+    assert manifest_path(project / "out" / "b.json").exists()
+
+    runner.ran.clear()
+    assert _run(project, runner) == {"extract": "fresh", "llm": "fresh", "export": "fresh"}
+    assert runner.ran == []
+
+    # Export layout tweak: the paid LLM stage is not re-run.
+    (project / "code" / "export" / "main.py").write_text("v2")
+    _run(project, runner)
+    assert runner.ran == ["export"]
+
+    # Prompt change re-runs the LLM stage and (only) what its output feeds.
+    runner.ran.clear()
+    (project / "code" / "llm" / "prompts.py").write_text("p2")
+    assert _run(project, runner, dry_run=True)["llm"] == "stale"
+    assert runner.ran == []
+    _run(project, runner)
+    assert runner.ran == ["llm"]  # output byte-identical → export stays fresh
+
+
+def test_identical_upstream_output_stops_propagation(project):
+    runner = FakeRunner()
+    _run(project, runner)
+    runner.ran.clear()
+
+    (project / "raw" / "module.txt").write_text("SLIDE ONE")  # same after upper()
+    _run(project, runner)
+    assert runner.ran == ["extract"]
+
+    (project / "raw" / "module.txt").write_text("slide two")
+    _run(project, runner)
+    assert runner.ran == ["extract", "extract", "llm", "export"]
+
+
+def test_failure_blocks_downstream_and_targets_limit_scope(project):
+    assert _run(project, FakeRunner(fail={"llm"})) == {
+        "extract": "ran", "llm": "failed", "export": "blocked",
+    }
+    assert _run(project, FakeRunner(), targets=["extract"]) == {"extract": "fresh"}
+    assert _run(project, FakeRunner(), force=["extract"], targets=["llm"]) == {
+        "extract": "ran", "llm": "ran",
+    }
+
+
+def test_topo_order_rejects_cycles():
+    a = StageNode(name="a", module="m", inputs=("y",), outputs=("x",), code=())
+    b = StageNode(name="b", module="m", inputs=("x",), outputs=("y",), code=())
+    with pytest.raises(ValueError):
+        topo_order([a, b])
+
+
+def test_llm_stages_fingerprint_shared_utils_and_the_model_they_call():
+    from src.stage2_5.run_stage2_5 import dispatch_request
+    from src.stage2_7.llm_engage import MODEL_NAME
+    from src.stage2_8.llm_call import call_llm_json
+
+    root = Path(__file__).resolve().parents[1]
+    stages = {node.name: node for node in stage_graph.STAGES}
+    for node in stages.values():
+        assert all((root / entry).exists() for entry in node.code), node.name
+    for name in ("stage2_5", "stage2_6", "stage2_7"):
+        assert "src/utils/sentences.py" in stages[name].code
+
+    settings = {"llm": {"provider": "openai", "model": "some-other-model"}}
+
+    def model(name):
+        return current_fingerprint(root, stages[name], settings=settings)["model"]
+
+    # Hard-coded models are recorded as called; settings llm.model only where it is read.
+    assert model("stage2_5") == model("stage2_6") == f"openai/{dispatch_request('THIS TASK IS PANEL SPLITTING ONLY').model}"
+    assert model("stage2_7") == f"openai/{MODEL_NAME}"
+    assert model("stage2_8") == f"openai/{inspect.signature(call_llm_json).parameters['model'].default}"
+    assert model("review") == "openai/some-other-model"
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from src.stage2_6.validate_sentence_shaping import validate_sentence_shaping
+from src.utils.text_preservation import check_preserved
+
+
+def test_counts_and_offsets_match_naive_search():
+    rng = random.Random(7)
+    for _ in range(500):
+        text = "".join(rng.choice("ab. ") for _ in range(rng.randint(0, 40)))
+        fragments = ["".join(rng.choice("ab. ") for _ in range(rng.randint(1, 4))) for _ in range(5)]
+
+        report = check_preserved(fragments, text, count_all=True)
+
+        for fragment, count, offset in zip(fragments, report.counts, report.offsets):
+            assert count == sum(text.startswith(fragment, i) for i in range(len(text)))
+            assert offset == text.find(fragment)
+
+        # The default (presence-only) check agrees on offsets and misses.
+        fast = check_preserved(fragments, text)
+        assert fast.offsets == report.offsets and fast.missing == report.missing
+
+
+def test_whole_fragments_and_missing_location():
+    haystack = ["Wash hands before care.", "Check the airway.", "Refer urgently."]
+    report = check_preserved(
+        ["Wash hands before care.", "Check the airway", "Refer urgently.", "Refer urgently."],
+        haystack,
+        whole_fragments=True,
+    )
+
+    # A substring of a haystack fragment does not count as whole.
+    assert report.missing == [1]
+    assert report.counts == [1, 0, 1, 1]
+    assert report.describe(1).startswith("Check the airway (expected after “…Wash hands before care.”")
+
+    dup = check_preserved(["Check"], "Check pulse. Check breathing.", count_all=True)
+    assert dup.ok and not dup.exactly_once and dup.repeated == [0]
+    with pytest.raises(ValueError, match="count_all"):
+        check_preserved(["Check"], "Check pulse.").repeated
+
+
+def test_sentence_shaping_reports_where_an_invented_sentence_was_expected():
+    source = "Fever needs urgent review today. Danger signs require referral now."
+    raw = {
+        "sentence_shaping": {
+            "groups": [
+                {"sentences": ["Fever needs urgent review today."]},
+                {"sentences": ["Danger signs always require referral."]},
+            ]
+        }
+    }
+
+    with pytest.raises(ValueError, match="verbatim") as err:
+        validate_sentence_shaping(raw, source)
+    assert "after “…Fever needs urgent review today.”" in str(err.value)
@@ -0,0 +1,47 @@
+import json
+
+from src.utils import config_loader, token_logger
+from src.utils.concurrency import run_bounded
+from src.utils.token_logger import UsageSink, usage_stage
+
+
+def test_settings_are_parsed_once_and_copied(monkeypatch):
+    config_loader.reload_settings()
+
+    def reparse(f):
+        raise AssertionError("settings.yaml parsed twice")
+
+    monkeypatch.setattr(config_loader.yaml, "safe_load", reparse)
+
+    first = config_loader.load_settings()
+    first["llm"]["model"] = "mutated"
+    assert config_loader.load_settings()["llm"]["model"] != "mutated"
+
+
+def test_sink_batches_concurrent_records_and_aggregates(tmp_path, monkeypatch, capsys):
+    sink = UsageSink(
+        tmp_path,
+        pricing={"m": {"input_per_1k": 1.0, "cached_input_per_1k": 0.5, "output_per_1k": 2.0}},
+        flush_interval_s=5.0,
+    )
+    monkeypatch.setattr(token_logger, "_sink", sink)
+
+    def call(i):
+        token_logger.log_usage(
+            model="m", prompt_tokens=1000, completion_tokens=500,
+            cached_tokens=1000 if i % 2 else 0, stage_tag="Stage X", latency_s=0.5,
+        )
+
+    with usage_stage("stage_x"):
+        run_bounded(call, range(40), max_workers=8)
+
+    lines = (tmp_path / "token_usage.jsonl").read_text().splitlines()
+    assert len(lines) == 40
+    assert {json.loads(l)["stage"] for l in lines} == {"stage_x"}
+
+    summary = json.loads((tmp_path / "usage_summary.jsonl").read_text())
+    assert summary["calls"] == 40
+    assert summary["cached_tokens"] == 20 * 1000
+    assert summary["cost_usd"] == 20 * 2.0 + 20 * 1.5
+    assert summary["latency_s"] == 20.0
+    assert "stage_x: 40 LLM calls" in capsys.readouterr().out
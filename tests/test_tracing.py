@@ -0,0 +1,104 @@
+import json
+
+from src.utils import llm_gateway, tracing, trace_report
+from src.utils.concurrency import run_bounded
+from src.utils.llm_gateway import LLMGateway, LLMRequest
+from src.utils.retry_policy import RetryPolicy
+from src.utils.tracing import Tracer, span, traced
+
+from tests.test_llm_gateway import FakeChatClient
+
+
+def _use_tracer(monkeypatch, tmp_path):
+    tracer = Tracer(tmp_path / "trace.jsonl")
+    monkeypatch.setattr(tracing, "_tracer", tracer)
+    return tracer
+
+
+def _spans(tracer):
+    tracer.flush()
+    return trace_report.load_spans(tracer.path)
+
+
+def test_spans_nest_across_worker_threads(monkeypatch, tmp_path):
+    tracer = _use_tracer(monkeypatch, tmp_path)
+
+    @traced("stage_x")
+    def run():
+        def one(slide_id):
+            with span("slide", kind="slide", slide_id=slide_id):
+                with span("inner", kind="llm"):
+                    pass
+        run_bounded(one, ["s1", "s2", "s3"], max_workers=3)
+
+    run()
+    spans = _spans(tracer)
+    by_id = {s["span_id"]: s for s in spans}
+
+    stage = next(s for s in spans if s["kind"] == "stage")
+    slides = [s for s in spans if s["kind"] == "slide"]
+    inner = [s for s in spans if s["kind"] == "llm"]
+
+    assert stage["parent_id"] is None and stage["stage"] == "stage_x"
+    assert {s["parent_id"] for s in slides} == {stage["span_id"]}
+    assert {s["stage"] for s in slides + inner} == {"stage_x"}
+    assert sorted(by_id[s["parent_id"]]["slide_id"] for s in inner) == ["s1", "s2", "s3"]
+    assert sorted(s["slide_id"] for s in inner) == ["s1", "s2", "s3"]
+
+
+def test_llm_span_records_retries_tokens_and_attempts(monkeypatch, tmp_path):
+    tracer = _use_tracer(monkeypatch, tmp_path)
+    monkeypatch.setenv("LLM_CACHE_DISABLE", "1")
+    monkeypatch.setattr(llm_gateway.time, "sleep", lambda s: None)
+    monkeypatch.setattr(llm_gateway, "log_usage", lambda **kwargs: None)
+    monkeypatch.setattr(llm_gateway, "_get_logs_dir", lambda: tmp_path)
+
+    gateway = LLMGateway()
+    gateway._clients["openai"] = FakeChatClient(["not json", '{"ok": true}'])
+    request = LLMRequest(messages=[{"role": "user", "content": "hi"}], model="m", stage_tag="Test")
+
+    with span("quiz", kind="quiz", quiz_id="q1"):
+        assert gateway.complete_json(request, policy=RetryPolicy(parse_attempts=2)) == {"ok": True}
+
+    spans = _spans(tracer)
+    llm = next(s for s in spans if s["kind"] == "llm")
+    attempts = [s for s in spans if s["kind"] == "attempt"]
+
+    assert llm["stage_tag"] == "Test" and llm["quiz_id"] == "q1"
+    assert llm["cache_hit"] is False
+    assert llm["attempts"] == 2 and llm["retries"] == 1 and llm["parse_failures"] == 1
+    assert llm["prompt_tokens"] == 22 and llm["completion_tokens"] == 6
+    assert [a["attempt"] for a in attempts] == [1, 2]
+    assert {a["parent_id"] for a in attempts} == {llm["span_id"]}
+
+
+def _span(span_id, parent_id, kind, start, end, **attrs):
+    return {
+        "span_id": span_id, "parent_id": parent_id, "name": kind, "kind": kind,
+        "start": start, "end": end, "duration_s": end - start, "status": "ok", **attrs,
+    }
+
+
+def test_report_percentiles_cost_and_critical_path(tmp_path, capsys):
+    spans = [
+        _span("root", None, "stage", 0, 10, stage="s"),
+        _span("a", "root", "quiz", 0, 4, stage="s", quiz_id="q1"),
+        _span("b", "root", "quiz", 0, 9, stage="s", quiz_id="q2"),
+        _span("b1", "b", "llm", 1, 8, stage="s", stage_tag="Pass1", model="m",
+              prompt_tokens=1000, completion_tokens=1000, retries=2),
+        _span("a1", "a", "llm", 0, 1, stage="s", stage_tag="Pass1", model="m",
+              cache_hit=True),
+    ]
+    pricing = {"m": {"input_per_1k": 1.0, "output_per_1k": 2.0}}
+
+    (row,) = trace_report.llm_latency_by(spans, "stage_tag", pricing=pricing)
+    assert row["calls"] == 2 and row["p50_s"] == 1 and row["p95_s"] == 7 and row["max_s"] == 7
+    assert row["retries"] == 2 and row["cache_hits"] == 1 and row["cost_usd"] == 3.0
+
+    assert [s["span_id"] for s in trace_report.critical_path(spans)] == ["root", "b", "b1"]
+
+    path = tmp_path / "trace_x.jsonl"
+    path.write_text("\n".join(json.dumps(s) for s in spans) + "\n")
+    assert trace_report.main([str(path)]) == 0
+    out = capsys.readouterr().out
+    assert "Critical path" in out and "quiz:quiz quiz_id=q2" in out